@@ -0,0 +1,123 @@
+import timeit
+
+from db.trusted_model import construct_trusted
+from models.post_model import PostInDBModel
+from models.response_items import ResponseItems
+from models.user_model import UserModelResponse
+
+NUMBER = 20
+PAGE_SIZE = 100
+
+
+def make_user(index: int, links_count: int, skills_count: int) -> dict:
+    """Making a user document as it is stored in the database
+
+    Args:
+        index (int): Number of the user
+        links_count (int): Number of the links of the user
+        skills_count (int): Number of the skills of the user
+
+    Returns:
+        dict: User document
+    """
+    return {
+        "key": f"user{index}",
+        "username": f"user{index}",
+        "firstname": "Иван",
+        "lastname": "Иванов",
+        "url": None,
+        "email": f"user{index}@mail.ru",
+        "password": "$2b$12$" + "x" * 53,
+        "place_residence": "Нижний Новгород",
+        "birth_date": 938131200000,
+        "followers_count": 10,
+        "subscriptions_count": 5,
+        "role_key": "user",
+        "role": {"name_ru": "Пользователь", "name_en": "User", "url": None},
+        "links": [
+            {"name": f"Link {i}", "url": f"https://example.com/{i}"}
+            for i in range(links_count)
+        ],
+        "skills": [
+            {
+                "key": f"skill{i}",
+                "name": f"Skill {i}",
+                "scope": "Программирование",
+                "url": f"http://localhost:8000/skill/icon/{i}.png",
+            }
+            for i in range(skills_count)
+        ],
+    }
+
+
+def make_post(index: int) -> dict:
+    """Making a post document as it is stored in the database
+
+    Args:
+        index (int): Number of the post
+
+    Returns:
+        dict: Post document
+    """
+    return {
+        "key": f"post{index}",
+        "name": "UML диаграммы",
+        "url_content": f"http://localhost:8000/post/content/post{index}.html",
+        "date_create": 1690000000000 + index,
+        "like_count": 25,
+        "comment_count": 3,
+        "skill": {
+            "key": "uml",
+            "name": "UML-диаграммы",
+            "scope": "Программирование",
+            "url": "http://localhost:8000/skill/icon/uml.png",
+        },
+        "author": {
+            "key": "user1",
+            "username": "ivanov",
+            "firstname": "Иван",
+            "lastname": "Иванов",
+            "url": None,
+        },
+    }
+
+
+def measure(name: str, model, items: list) -> None:
+    """Printing the cost of building a page of items with and without validation
+
+    Args:
+        name (str): Name of the case
+        model: Model of the items
+        items (list): Documents from the database
+
+    Returns:
+        None: Returns nothing
+    """
+    data = {"count": len(items), "last": None, "items": items}
+    validated = timeit.timeit(lambda: ResponseItems[model](**data), number=NUMBER)
+    trusted = timeit.timeit(
+        lambda: construct_trusted(ResponseItems[model], data), number=NUMBER
+    )
+    per_item = 1_000_000 / (NUMBER * len(items))
+    print(
+        f"{name:<28} validated {validated * per_item:8.1f} us/item   "
+        f"trusted {trusted * per_item:8.1f} us/item   "
+        f"x{validated / trusted:.1f}"
+    )
+
+
+def main():
+    """Comparing validated and trusted construction of the models
+    of the database results. Run from the backend folder:
+    python -m benchmarks.model_construction"""
+    measure("posts", PostInDBModel, [make_post(i) for i in range(PAGE_SIZE)])
+    for links_count, skills_count in ((2, 5), (20, 50), (100, 200)):
+        measure(
+            f"users, {links_count} links, {skills_count} skills",
+            UserModelResponse,
+            [make_user(i, links_count, skills_count) for i in range(PAGE_SIZE)],
+        )
+
+
+if __name__ == "__main__":
+    main()
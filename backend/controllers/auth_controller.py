@@ -3,6 +3,8 @@ from db.database_handler import DatabaseHandler
 from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
 from exceptions.refresh_token_exception import RefreshTokenException
+from exceptions.user_exists_exception import UserExistsException
+from handlers.cpu_executor import CPUExecutor
 from handlers.jwt_handler import JWTHandler
 from handlers.password_handler import PasswordHandler
 from models.message_model import MessageModel
@@ -12,9 +14,11 @@ from models.user_model import AuthModel, SignupModel, UserInDBModel
 
 
 class AuthController:
-    def __init__(self, database_controller: DatabaseHandler):
+    def __init__(
+        self, database_controller: DatabaseHandler, cpu_executor: CPUExecutor
+    ):
         self.__database_controller = database_controller
-        self.__password_handler = PasswordHandler()
+        self.__password_handler = PasswordHandler(cpu_executor)
         self.__jwt_handler = JWTHandler()
 
     async def signup(self, user_details: SignupModel) -> MessageModel:
@@ -39,7 +43,7 @@ class AuthController:
         if user != None:
             raise HTTPException(status_code=401, detail="Username is already used")
         try:
-            hashed_password = self.__password_handler.encode_password(
+            hashed_password = await self.__password_handler.encode_password(
                 user_details.password
             )
             role = await self.__database_controller.get_role_by_name_en(USER)
@@ -52,8 +56,6 @@ class AuthController:
                 firstname=user_details.firstname,
                 role_key=role.key if (role is not None) else None,
                 role=RoleModelResponse(**role.dict()) if (role is not None) else None,
-                subscriptions=[],
-                followers=[],
                 links=[],
                 skills=[],
             )
@@ -61,6 +63,9 @@ class AuthController:
             if result is None:
                 raise HTTPException(status_code=401, detail="Failed to signup user")
             return MessageModel(message="Registration is successful")
+        except UserExistsException as e:
+            # Another signup with the same email or username has finished first
+            raise HTTPException(status_code=401, detail=f"{e}")
         except:
             raise HTTPException(status_code=401, detail="Failed to signup user")
 
@@ -80,7 +85,7 @@ class AuthController:
         if user is None:
             raise HTTPException(status_code=401, detail="Invalid email")
 
-        if not self.__password_handler.verify_password(
+        if not await self.__password_handler.verify_password(
             user_details.password, user.password
         ):
             raise HTTPException(status_code=401, detail="Invalid password")
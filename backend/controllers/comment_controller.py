@@ -1,14 +1,13 @@
-from typing import List
 from fastapi import HTTPException
 from controllers.user_controller import UserController
 from db.database_handler import DatabaseHandler
-from exceptions.append_comment_exception import AppendCommentException
 from exceptions.update_post_exception import UpdatePostException
 from handlers.datetime_handler import DatetimeHandler
 from handlers.generator_handler import GeneratorHandler
-from models.comment_model import CommentInputModel, CommentModel
+from models.comment_model import CommentInDBModel, CommentInputModel
 from models.message_model import MessageModel
 from models.post_model import PostInDBModel
+from models.response_items import ResponseItems
 from models.short_user_model_response import ShortUserModelResponse
 
 
@@ -22,22 +21,20 @@ class CommentController:
         self.__generator_handler = GeneratorHandler()
         self.__datetime_handler = DatetimeHandler()
 
-    def __generate_comment_key(self, comments: list[CommentModel]) -> str:
-        """Creating a random key for comments
+    def __generate_comment_key(self, post_key: str, date_create: int) -> str:
+        """Creating a key for a comment. The keys of the comments of one post
+        have a common prefix and are sorted by the creation date
 
         Args:
-            comments (list[CommentModel]): List of comments to the post
+            post_key (str)
+            date_create (int): Comment creation date
 
         Returns:
             str: Generated key
         """
-        LENGTH_KEY = 12
-        while True:
-            key = self.__generator_handler.generate_random_combination(LENGTH_KEY)
-            result = list(filter(lambda item: key == item.key, comments))
-
-            if len(result) == 0:
-                return key
+        LENGTH_RAND_STR = 6
+        rand_str = self.__generator_handler.generate_random_combination(LENGTH_RAND_STR)
+        return f"{post_key}:{date_create:015d}{rand_str}"
 
     async def __get_post_by_key(self, post_key: str) -> PostInDBModel:
         """Getting a post from the database by the post key
@@ -56,29 +53,29 @@ class CommentController:
             raise HTTPException(status_code=404, detail="Post not found")
         return post
 
-    def __get_comment_by_key(
-        self, comment_key: str, post: PostInDBModel
-    ) -> CommentModel:
-        """Getting a comment from a post by the comment key
+    async def __get_comment_by_key(
+        self, comment_key: str, post_key: str
+    ) -> CommentInDBModel:
+        """Getting a comment to the post by the comment key
 
         Args:
             comment_key (str)
-            post (PostInDBModel)
+            post_key (str)
 
         Raises:
             HTTPException: If comment is not found
 
         Returns:
-            CommentModel: comment model
+            CommentInDBModel: comment model
         """
-        result = list(filter(lambda item: comment_key == item.key, post.comments))
-        if len(result) == 0:
+        comment = await self.__database_controller.get_comment_by_key(comment_key)
+        if comment is None or comment.post_key != post_key:
             raise HTTPException(status_code=404, detail="Comment not found")
-        return result[0]
+        return comment
 
     async def post_comment(
         self, comment: CommentInputModel, post_key: str, token: str
-    ) -> CommentModel:
+    ) -> CommentInDBModel:
         """Creating a comment
 
         Args:
@@ -90,24 +87,49 @@ class CommentController:
             HTTPException: If it is not successful to add comment to the post
 
         Returns:
-            CommentModel
+            CommentInDBModel
         """
-        post = await self.__get_post_by_key(post_key)
+        await self.__get_post_by_key(post_key)
         user = await self.__user_controller.get_user_by_token(token)
-        key = self.__generate_comment_key(post.comments)
-        comment = CommentModel(
+        date_create = self.__datetime_handler.now()
+        comment = CommentInDBModel(
             **comment.dict(),
             author=ShortUserModelResponse(**user.dict()),
-            key=key,
-            date_create=self.__datetime_handler.now(),
+            key=self.__generate_comment_key(post_key, date_create),
+            date_create=date_create,
+            post_key=post_key,
         )
+        result = await self.__database_controller.create_comment(comment)
+        if result is None:
+            raise HTTPException(
+                status_code=400, detail="Adding comment to post is not successful"
+            )
 
         try:
-            await self.__database_controller.append_comment_to_post(comment, post_key)
-            return comment
-        except AppendCommentException as e:
+            await self.__database_controller.change_comment_count_of_post(1, post_key)
+            return result
+        except UpdatePostException as e:
+            await self.__database_controller.delete_comment_by_key(result.key)
             raise HTTPException(status_code=400, detail=f"{e}")
 
+    async def get_comments(
+        self, post_key: str, limit: int, last_comment_key: str
+    ) -> ResponseItems[CommentInDBModel]:
+        """Getting the comments of the post from old to new
+
+        Args:
+            post_key (str)
+            limit (int): Limit of comments received
+            last_comment_key (str): The last comment key received
+            in the previous request
+
+        Returns:
+            ResponseItems[CommentInDBModel]: Query result
+        """
+        return await self.__database_controller.get_comments_by_post_key(
+            post_key, limit, last_comment_key
+        )
+
     async def get_author_key_by_comment_key(
         self, comment_key: str, post_key: str
     ) -> str:
@@ -119,14 +141,12 @@ class CommentController:
 
         Returns:
             str: Received user key
-        """        
-        post = await self.__get_post_by_key(post_key)
-        comment = self.__get_comment_by_key(comment_key, post)
+        """
+        await self.__get_post_by_key(post_key)
+        comment = await self.__get_comment_by_key(comment_key, post_key)
         return comment.author.key
 
-    async def delete_comment(
-        self, comment_key: str, post_key: str
-    ) -> List[CommentModel]:
+    async def delete_comment(self, comment_key: str, post_key: str) -> MessageModel:
         """Deleting a comment to a post
 
         Args:
@@ -137,17 +157,16 @@ class CommentController:
             HTTPException: If the comment to the post failed to delete
 
         Returns:
-            List[CommentModel]
-        """        
-        post = await self.__get_post_by_key(post_key)
-        comment = self.__get_comment_by_key(comment_key, post)
-        post.comments.remove(comment)
+            MessageModel
+        """
+        await self.__get_post_by_key(post_key)
+        comment = await self.__get_comment_by_key(comment_key, post_key)
+        await self.__database_controller.delete_comment_by_key(comment.key)
 
         try:
-            await self.__database_controller.update_post_by_key(
-                {"comments": (post.dict())["comments"]}, post_key
-            )
-            return post.comments
+            await self.__database_controller.change_comment_count_of_post(-1, post_key)
+            return MessageModel(message="Deletion successful")
         except UpdatePostException as e:
-
+            # The comment is put back, so the counter keeps matching the comments
+            await self.__database_controller.create_comment(comment)
             raise HTTPException(status_code=400, detail=f"{e}")
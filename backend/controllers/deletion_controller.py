@@ -0,0 +1,395 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple, Union
+from fastapi import HTTPException
+
+from controllers.post_controller import PostController
+from controllers.timeline_controller import TimelineController
+from db.database_handler import DatabaseHandler
+from db.identity_map import identity_map_var
+from exceptions.update_post_exception import UpdatePostException
+from exceptions.update_user_data_exception import UpdateUserDataException
+from handlers.datetime_handler import DatetimeHandler
+from handlers.generator_handler import GeneratorHandler
+from models.comment_model import CommentInDBModel
+from models.deletion_job_model import DeletionJobModel, DeletionStartedModel
+from models.event_model import EventInDBModel
+from models.like_model import LikeInDBModel
+from models.post_model import PostInDBModel
+from models.subscription_model import SubscriptionInDBModel
+from models.timeline_entry_model import TimelineEntryModel
+
+# The largest batch Deta Base writes at once
+BATCH_SIZE = 25
+LENGTH_JOB_KEY = 16
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+# A step of a job: name, the documents of the user and the deletion of one document
+Step = Tuple[
+    str, Callable[[str], AsyncIterator], Callable[[str, object], Awaitable[None]]
+]
+
+
+class DeletionController:
+    """Deleting the content of deleted users in the background.
+    A job goes through the collections one by one, reads the documents of the user
+    page by page and deletes them in batches, several batches at once.
+    The progress is saved after every batch, and the jobs interrupted
+    by a restart are continued when they have not been saved for the lease time"""
+
+    def __init__(
+        self,
+        database_controller: DatabaseHandler,
+        post_controller: PostController,
+        concurrency: int = 4,
+        lease: float = 600,
+    ):
+        self.__database_controller = database_controller
+        self.__post_controller = post_controller
+        self.__timeline_controller = TimelineController(database_controller)
+        self.__concurrency = max(concurrency, 1)
+        self.__lease = lease
+        self.__datetime_handler = DatetimeHandler()
+        self.__generator_handler = GeneratorHandler()
+        self.__tasks: Dict[str, asyncio.Task] = {}
+        self.__sweep_task: Union[asyncio.Task, None] = None
+        self.__steps: List[Step] = [
+            ("events", self.__iterate_events, self.__delete_event),
+            ("posts", self.__iterate_posts, self.__delete_post),
+            ("likes", self.__iterate_likes, self.__delete_like),
+            ("comments", self.__iterate_comments, self.__delete_comment),
+            ("subscriptions", self.__iterate_subscriptions, self.__delete_subscription),
+            ("followers", self.__iterate_followers, self.__delete_follower),
+            ("timeline", self.__iterate_timeline, self.__delete_timeline_entry),
+        ]
+
+    async def delete_user(self, key: str) -> DeletionStartedModel:
+        """Deleting a user at once and starting the deletion of their content
+
+        Args:
+            key (str): user's key
+
+        Raises:
+            HTTPException: If the job could not be saved
+
+        Returns:
+            DeletionStartedModel: The job id to follow the deletion
+        """
+        await self.__database_controller.delete_user_by_key(key)
+        now = self.__datetime_handler.now()
+        job = DeletionJobModel(
+            key=self.__generator_handler.generate_random_combination(LENGTH_JOB_KEY),
+            user_key=key,
+            status=RUNNING,
+            date_create=now,
+            date_update=now,
+        )
+        if await self.__database_controller.put_deletion_job(job) is None:
+            raise HTTPException(status_code=500, detail="Failed to start deletion")
+        self.__start_job(job)
+        return DeletionStartedModel(message="Deletion started", job_id=job.key)
+
+    async def get_job(self, job_id: str) -> DeletionJobModel:
+        """Getting the progress of a deletion job
+
+        Args:
+            job_id (str)
+
+        Raises:
+            HTTPException: If the job is not found
+
+        Returns:
+            DeletionJobModel
+        """
+        job = await self.__database_controller.get_deletion_job_by_key(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    async def __resume_stale(self) -> None:
+        """Continuing the jobs that have not been saved for the lease time,
+        their process has been stopped
+
+        Returns:
+            None: Returns nothing
+        """
+        stale = self.__datetime_handler.now() - int(self.__lease * 1000)
+        async for job in self.__database_controller.iterate_deletion_jobs_by_query(
+            {"status": RUNNING, "date_update?lt": stale}
+        ):
+            if job.key not in self.__tasks:
+                self.__start_job(job)
+
+    async def __sweep(self) -> None:
+        """Looking for stopped jobs every lease time, a job of a process
+        restarted within the lease becomes stale only after the start
+
+        Returns:
+            None: Returns nothing
+        """
+        while True:
+            await asyncio.sleep(self.__lease)
+            try:
+                await self.__resume_stale()
+            except Exception:
+                # The jobs are looked for again after the next lease time
+                logger.exception("Resuming deletion jobs failed")
+
+    async def start(self) -> None:
+        """Continuing the stopped jobs and looking for them
+        every lease time in the background
+
+        Returns:
+            None: Returns nothing
+        """
+        await self.__resume_stale()
+        self.__sweep_task = asyncio.create_task(self.__sweep())
+
+    async def close(self) -> None:
+        """Stopping the background sweep and the running jobs, the jobs continue
+        from the last saved batch after a restart
+
+        Returns:
+            None: Returns nothing
+        """
+        if self.__sweep_task is not None:
+            self.__sweep_task.cancel()
+            try:
+                await self.__sweep_task
+            except asyncio.CancelledError:
+                pass
+            self.__sweep_task = None
+        tasks = list(self.__tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __start_job(self, job: DeletionJobModel) -> None:
+        """Running the job in the background
+
+        Args:
+            job (DeletionJobModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        task = asyncio.create_task(self.__run(job))
+        self.__tasks[job.key] = task
+        task.add_done_callback(lambda _: self.__tasks.pop(job.key, None))
+
+    async def __save(self, job: DeletionJobModel) -> None:
+        """Saving the progress of the job
+
+        Args:
+            job (DeletionJobModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        job.date_update = self.__datetime_handler.now()
+        await self.__database_controller.put_deletion_job(job)
+
+    async def __run(self, job: DeletionJobModel) -> None:
+        """Running the steps of the job from the saved one
+
+        Args:
+            job (DeletionJobModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        # The task is not a part of the request that started it
+        identity_map_var.set(None)
+        try:
+            for index in range(job.step, len(self.__steps)):
+                name, iterate, delete = self.__steps[index]
+                job.step = index
+                await self.__delete_all(
+                    iterate(job.user_key),
+                    lambda item: delete(job.user_key, item),
+                    self.__concurrency,
+                    lambda count: self.__checkpoint(job, name, count),
+                )
+            job.step = len(self.__steps)
+            job.status = DONE
+        except Exception as e:
+            logger.exception("Deletion job %s failed", job.key)
+            job.status = FAILED
+            job.error = f"{e}"
+        await self.__save(job)
+
+    async def __checkpoint(self, job: DeletionJobModel, name: str, count: int) -> None:
+        """Counting a deleted batch and saving the progress
+
+        Args:
+            job (DeletionJobModel)
+            name (str): Name of the step
+            count (int): Number of the deleted documents
+
+        Returns:
+            None: Returns nothing
+        """
+        job.deleted[name] = job.deleted.get(name, 0) + count
+        await self.__save(job)
+
+    async def __delete_all(
+        self,
+        items: AsyncIterator,
+        delete: Callable[[object], Awaitable[None]],
+        concurrency: int,
+        on_batch: Callable[[int], Awaitable[None]] = None,
+    ) -> None:
+        """Deleting the documents in batches, at most concurrency batches at once.
+        The next documents are read while the batches are deleted
+
+        Args:
+            items (AsyncIterator): Documents to delete
+            delete (Callable[[object], Awaitable[None]]): Deleting one document
+            concurrency (int): Number of batches deleted at once
+            on_batch (Callable[[int], Awaitable[None]], optional): Called after
+            a batch is deleted with its size. Defaults to None.
+
+        Raises:
+            Exception: The first error of a batch, the other batches are stopped
+
+        Returns:
+            None: Returns nothing
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = set()
+
+        async def run_batch(batch: list) -> None:
+            try:
+                await asyncio.gather(*[delete(item) for item in batch])
+                if on_batch is not None:
+                    await on_batch(len(batch))
+            finally:
+                semaphore.release()
+
+        async def submit(batch: list) -> None:
+            await semaphore.acquire()
+            for task in [task for task in tasks if task.done()]:
+                tasks.discard(task)
+                task.result()
+            tasks.add(asyncio.create_task(run_batch(batch)))
+
+        try:
+            batch = []
+            async for item in items:
+                batch.append(item)
+                if len(batch) == BATCH_SIZE:
+                    await submit(batch)
+                    batch = []
+            if batch:
+                await submit(batch)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def __iterate_events(self, user_key: str) -> AsyncIterator[EventInDBModel]:
+        return self.__database_controller.iterate_events_by_query(
+            {"author.key": user_key}
+        )
+
+    async def __delete_event(self, user_key: str, event: EventInDBModel) -> None:
+        # The followers are deleted by a later step, the entries are found by them
+        await self.__timeline_controller.remove_event(event)
+        await self.__database_controller.delete_event_by_key(event.key)
+
+    def __iterate_posts(self, user_key: str) -> AsyncIterator[PostInDBModel]:
+        return self.__database_controller.iterate_posts_by_query(
+            {"author.key": user_key}
+        )
+
+    async def __delete_post(self, user_key: str, post: PostInDBModel) -> None:
+        # The likes and comments of the post go with it, whoever wrote them
+        await self.__post_controller.delete_post(post)
+
+    def __iterate_likes(self, user_key: str) -> AsyncIterator[LikeInDBModel]:
+        return self.__database_controller.iterate_likes_by_query({"user.key": user_key})
+
+    async def __delete_like(self, user_key: str, like: LikeInDBModel) -> None:
+        # The base has no transactions: if the process stops between the deletion
+        # and the decrement, the like is not found again and the decrement is lost
+        if not await self.__database_controller.remove_like(like):
+            # The user has removed the like meanwhile or the job has stopped
+            # after claiming the removal, the like is deleted without a decrement
+            await self.__database_controller.delete_like_by_key(like.key)
+            return
+        try:
+            await self.__database_controller.change_like_count_of_post(
+                -1, like.post_key
+            )
+        except UpdatePostException:
+            # The post has been deleted
+            pass
+
+    def __iterate_comments(self, user_key: str) -> AsyncIterator[CommentInDBModel]:
+        return self.__database_controller.iterate_comments_by_query(
+            {"author.key": user_key}
+        )
+
+    async def __delete_comment(self, user_key: str, comment: CommentInDBModel) -> None:
+        # As for a like, a stop after the deletion loses the decrement
+        await self.__database_controller.delete_comment_by_key(comment.key)
+        try:
+            await self.__database_controller.change_comment_count_of_post(
+                -1, comment.post_key
+            )
+        except UpdatePostException:
+            # The post has been deleted
+            pass
+
+    def __iterate_subscriptions(
+        self, user_key: str
+    ) -> AsyncIterator[SubscriptionInDBModel]:
+        return self.__database_controller.iterate_subscriptions_by_query(
+            {"follower.key": user_key}
+        )
+
+    async def __delete_subscription(
+        self, user_key: str, subscription: SubscriptionInDBModel
+    ) -> None:
+        await self.__database_controller.delete_subscription_by_key(subscription.key)
+        try:
+            # The counters of the deleted user are gone with the user
+            await self.__database_controller.change_user_counter(
+                "followers_count", -1, subscription.favorite.key
+            )
+        except UpdateUserDataException:
+            # The favorite has been deleted too
+            pass
+
+    def __iterate_followers(
+        self, user_key: str
+    ) -> AsyncIterator[SubscriptionInDBModel]:
+        return self.__database_controller.iterate_subscriptions_by_query(
+            {"favorite.key": user_key}
+        )
+
+    async def __delete_follower(
+        self, user_key: str, subscription: SubscriptionInDBModel
+    ) -> None:
+        await self.__database_controller.delete_subscription_by_key(subscription.key)
+        try:
+            await self.__database_controller.change_user_counter(
+                "subscriptions_count", -1, subscription.follower.key
+            )
+        except UpdateUserDataException:
+            # The follower has been deleted too
+            pass
+
+    def __iterate_timeline(self, user_key: str) -> AsyncIterator[TimelineEntryModel]:
+        return self.__database_controller.iterate_timeline_entries_by_query(
+            {"key?pfx": f"{user_key}:"}
+        )
+
+    async def __delete_timeline_entry(
+        self, user_key: str, entry: TimelineEntryModel
+    ) -> None:
+        await self.__database_controller.delete_timeline_entry_by_key(entry.key)
@@ -1,8 +1,10 @@
 from typing import Union
 from fastapi import HTTPException
 
+from controllers.timeline_controller import TimelineController
 from controllers.user_controller import UserController
 from db.database_handler import DatabaseHandler
+from exceptions.invalid_cursor_exception import InvalidCursorException
 from exceptions.update_event_exception import UpdateEventException
 from handlers.datetime_handler import DatetimeHandler
 from models.event_model import EventInDBModel, EventInputModel
@@ -18,6 +20,7 @@ class EventController:
     ):
         self.__database_controller = database_controller
         self.__user_controller = UserController(database_controller)
+        self.__timeline_controller = TimelineController(database_controller)
         self.__datetime_handler = DatetimeHandler()
         self.__allow_year_left = 0
         self.__allow_year_right = 1
@@ -43,22 +46,26 @@ class EventController:
             raise HTTPException(status_code=400, detail="Invalid year")
 
         user = await self.__user_controller.get_user_by_token(token)
-        result = await self.__database_controller.get_events_by_query(
-            query={
+        # A page of a filtered query can be empty while the next one is not,
+        # so all pages are read until the first match
+        async for _ in self.__database_controller.iterate_events_by_query(
+            {
                 "name": event.name,
                 "format_event": event.format_event,
                 "place": event.place,
                 "author.key": user.key,
                 "date": event.date,
-            }
-        )
-        if result.count > 0:
+            },
+            read_ahead=0,
+        ):
             raise HTTPException(status_code=400, detail="Event already exists")
         author = ShortUserModelResponse(**user.dict())
         event = EventInDBModel(**event.dict(), author=author)
         result = await self.__database_controller.create_event(event)
         if result is None:
             raise HTTPException(status_code=400, detail="Failed to add event")
+        if self.__timeline_controller.enabled:
+            await self.__timeline_controller.add_event(result)
         return result
 
     async def get_all_events(
@@ -87,33 +94,15 @@ class EventController:
         Returns:
             MessageModel
         """
+        event = None
+        if self.__timeline_controller.enabled:
+            # The timeline entries are found by the date of the deleted event
+            event = await self.__database_controller.get_event_by_key(key)
         await self.__database_controller.delete_event_by_key(key)
+        if event is not None:
+            await self.__timeline_controller.remove_event(event)
         return MessageModel(message="Deletion successful")
 
-    async def delete_event_by_user(self, key: str) -> MessageModel:
-        """Deleting user events
-
-        Args:
-            key (str): user's key
-
-        Raises:
-            HTTPException: If events are not deleted
-
-        Returns:
-            MessageModel
-        """
-        events = await self.__database_controller.get_events_by_query(
-            query={"author.key": key},
-        )
-        event_keys = [{"key": event.key} for event in events.items]
-        if len(event_keys) > 0:
-            result = await self.__database_controller.delete_events_after_user(
-                event_keys
-            )
-            if "failed" in result:
-                raise HTTPException(status_code=400, detail="Events not deleted")
-        return MessageModel(message="Events deleted successfully")
-
     async def get_author_key_by_event_key(self, event_key: str) -> str:
         """Getting the event author's key
 
@@ -138,40 +127,53 @@ class EventController:
         limit: int = 1000,
         last_event_key: str = None,
     ) -> ResponseItems[EventInDBModel]:
-        """Getting events by subscriptions
+        """Getting events by subscriptions sorted by date. The events are read
+        from the materialized timeline, if EVENT_FEED is "fanout",
+        otherwise from the events of the favorites
 
         Args:
             token (str): access token
             next_days (Union[int, None]): The number of days in the future when events will occur
             limit (int, optional): Limit of events received. Defaults to 1000.
-            last_event_key (str, optional): The last event key received
+            last_event_key (str, optional): The cursor received
             in the previous request. Defaults to None.
 
+        Raises:
+            HTTPException: If the cursor is invalid
 
         Returns:
             ResponseItems[EventInDBModel]: Query result
         """
         user = await self.__user_controller.get_user_by_token(token)
-        if len(user.subscriptions) == 0:
-            user_keys = {"author.key": None}
-        else:
-            if next_days is not None:
-                min_date = self.__datetime_handler.now()
-                max_date = self.__datetime_handler.now_next_days(next_days)
-                user_keys = [
-                    {
-                        "author.key": subs.favorite.key,
-                        "date?r": [min_date, max_date],
-                    }
-                    for subs in user.subscriptions
-                ]
-            else:
-                user_keys = [
-                    {"author.key": subs.favorite.key} for subs in user.subscriptions
-                ]
-        return await self.__database_controller.get_events_by_query(
-            limit, last_event_key, user_keys
+        date_range = None
+        if next_days is not None:
+            date_range = [
+                self.__datetime_handler.now(),
+                self.__datetime_handler.now_next_days(next_days),
+            ]
+        if self.__timeline_controller.enabled:
+            return await self.__timeline_controller.get_timeline(
+                user.key, limit, last_event_key, date_range
+            )
+
+        subscriptions = (
+            await self.__database_controller.get_all_subscriptions_of_follower(
+                user.key
+            )
         )
+        if len(subscriptions) == 0:
+            return ResponseItems[EventInDBModel](count=0, items=[])
+
+        try:
+            return await self.__database_controller.get_events_by_authors(
+                [subs.favorite.key for subs in subscriptions],
+                limit,
+                last_event_key,
+                date_range,
+            )
+        except InvalidCursorException as e:
+
+            raise HTTPException(status_code=400, detail=f"{e}")
 
     async def get_event_by_user_key(
         self, user_key: str, limit: int = 1000, last_event_key: str = None
@@ -211,9 +213,16 @@ class EventController:
             date, self.__allow_year_left, self.__allow_year_right
         ):
             raise HTTPException(status_code=400, detail="Invalid year")
+        old_event = None
+        if self.__timeline_controller.enabled:
+            # The timeline entries are found by the date before the update
+            old_event = await self.__database_controller.get_event_by_key(event_key)
         try:
             await self.__database_controller.update_event_by_key(event, event_key)
-            return MessageModel(message="Editing successful")
         except UpdateEventException as e:
 
             raise HTTPException(status_code=400, detail=f"{e}")
+        if old_event is not None:
+            result = await self.__database_controller.get_event_by_key(event_key)
+            await self.__timeline_controller.update_event(old_event, result)
+        return MessageModel(message="Editing successful")
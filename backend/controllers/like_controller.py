@@ -1,12 +1,12 @@
-from typing import List
 from fastapi import HTTPException
 
 from db.database_handler import DatabaseHandler
-from exceptions.append_like_exception import AppendLikeException
 from exceptions.update_post_exception import UpdatePostException
+from handlers.datetime_handler import DatetimeHandler
 from handlers.jwt_handler import JWTHandler
-from models.like_model import LikeModel
+from models.like_model import LikeInDBModel
 from models.message_model import MessageModel
+from models.response_items import ResponseItems
 from models.short_user_model_response import ShortUserModelResponse
 
 
@@ -17,6 +17,19 @@ class LikeController:
     ):
         self.__database_controller = database_controller
         self.__jwt_handler = JWTHandler()
+        self.__datetime_handler = DatetimeHandler()
+
+    def __generate_like_key(self, post_key: str, user_key: str) -> str:
+        """Creating the like key, the user can like the post only once
+
+        Args:
+            post_key (str)
+            user_key (str)
+
+        Returns:
+            str: Like key
+        """
+        return f"{post_key}:{user_key}"
 
     async def put_like(self, post_key: str, token: str) -> MessageModel:
         """Like the post
@@ -37,19 +50,25 @@ class LikeController:
             raise HTTPException(status_code=404, detail="Post not found")
 
         user_key = self.__jwt_handler.decode_token(token)
-        result = list(filter(lambda item: user_key == item.user.key, post.likes))
-        if len(result) > 0:
+        user = await self.__database_controller.get_user_by_key(user_key)
+        like = LikeInDBModel(
+            user=ShortUserModelResponse(**user.dict()),
+            post_key=post_key,
+            date_create=self.__datetime_handler.now(),
+            key=self.__generate_like_key(post_key, user_key),
+        )
+        result = await self.__database_controller.create_like(like)
+        if result is None:
             raise HTTPException(status_code=400, detail="Like already put")
 
-        user = await self.__database_controller.get_user_by_key(user_key)
-        like = LikeModel(user=ShortUserModelResponse(**user.dict()))
         try:
-            await self.__database_controller.append_like_to_post(like, post_key)
+            await self.__database_controller.change_like_count_of_post(1, post_key)
             return MessageModel(message="The like has been set successfully")
-        except AppendLikeException as e:
+        except UpdatePostException as e:
+            await self.__database_controller.delete_like_by_key(like.key)
             raise HTTPException(status_code=400, detail=f"{e}")
 
-    async def remove_like(self, post_key: str, token: str) -> List[LikeModel]:
+    async def remove_like(self, post_key: str, token: str) -> MessageModel:
         """Remove the like to the post
 
         Args:
@@ -61,23 +80,42 @@ class LikeController:
             it is not successful to remove the like
 
         Returns:
-            List[LikeModel]: Remaining likes
-        """        
+            MessageModel
+        """
         post = await self.__database_controller.get_post_by_key(post_key)
         if post is None:
             raise HTTPException(status_code=404, detail="Post not found")
 
         user_key = self.__jwt_handler.decode_token(token)
-        result = list(filter(lambda item: user_key == item.user.key, post.likes))
-        if len(result) == 0:
+        key = self.__generate_like_key(post_key, user_key)
+        like = await self.__database_controller.get_like_by_key(key)
+        if like is None:
             raise HTTPException(status_code=404, detail="Like not found")
 
-        post.likes.remove(result[0])
+        # Of concurrent removals only one deletes the like and changes the counter
+        if not await self.__database_controller.remove_like(like):
+            raise HTTPException(status_code=404, detail="Like not found")
         try:
-            await self.__database_controller.update_post_by_key(
-                {"likes": (post.dict())["likes"]}, post_key
-            )
-            return post.likes
+            await self.__database_controller.change_like_count_of_post(-1, post_key)
+            return MessageModel(message="The like has been removed successfully")
         except UpdatePostException as e:
-
+            # The like is put back, so the counter keeps matching the likes
+            await self.__database_controller.restore_like(like)
             raise HTTPException(status_code=400, detail=f"{e}")
+
+    async def get_likes(
+        self, post_key: str, limit: int, last_like_key: str
+    ) -> ResponseItems[LikeInDBModel]:
+        """Getting the likes of the post
+
+        Args:
+            post_key (str)
+            limit (int): Limit of likes received
+            last_like_key (str): The last like key received in the previous request
+
+        Returns:
+            ResponseItems[LikeInDBModel]: Query result
+        """
+        return await self.__database_controller.get_likes_by_query(
+            {"post_key": post_key}, limit, last_like_key
+        )
@@ -1,19 +1,24 @@
-from typing import Union
+from typing import Mapping, Type, Union
 from fastapi import HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 import os
-from dotenv import load_dotenv
 
 from controllers.user_controller import UserController
 from db.database_handler import DatabaseHandler
 from handlers.drive_handler import DriveHandler
+from exceptions.delete_file_exception import DeleteFileException
 from exceptions.get_photo_exception import GetPhotoException
+from exceptions.get_text_exception import GetTextException
+from exceptions.invalid_fields_exception import InvalidFieldsException
 from exceptions.update_post_exception import UpdatePostException
 from exceptions.upload_photo_exception import UploadPhotoException
+from exceptions.upload_text_exception import UploadTextException
+from handlers.blob_handler import BlobHandler
 from handlers.datetime_handler import DatetimeHandler
 from handlers.generator_handler import GeneratorHandler
+from handlers.projection_handler import ProjectionHandler
 from models.message_model import MessageModel
-from models.post_model import PostInDBModel, PostInputModel
+from models.post_model import PostInDBModel, PostInputModel, PostSummaryModel
 from models.response_items import ResponseItems
 from models.short_user_model_response import ShortUserModelResponse
 
@@ -24,7 +29,6 @@ class PostController:
         database_controller: DatabaseHandler,
         driver_controller: DriveHandler,
     ):
-        load_dotenv()
         self.__database_controller = database_controller
         self.__driver_controller = driver_controller
         self.__user_controller = UserController(database_controller)
@@ -33,6 +37,24 @@ class PostController:
         self.__directory_content = "post/content"
         self.__url = os.getenv("URL")
         self.__datetime_handler = DatetimeHandler()
+        self.__blob_handler = BlobHandler(database_controller)
+        self.__projection_handler = ProjectionHandler()
+        # "content": photos and contents are stored under the digest of their content
+        self.__content_addressing = os.getenv("MEDIA_STORAGE", "random") == "content"
+
+    def __get_content_digest(self, url_content: str) -> Union[str, None]:
+        """Getting the digest of a content-addressed post content by its URL
+
+        Args:
+            url_content (str)
+
+        Returns:
+            Union[str, None]: Digest or None if the content is not content-addressed
+        """
+        prefix = f"{self.__url}/{self.__directory_content}/"
+        if not url_content.startswith(prefix):
+            return None
+        return self.__blob_handler.parse_digest(url_content[len(prefix) :])
 
     async def create_post(self, post: PostInputModel, token: str) -> PostInDBModel:
         """Adding a new post to the database
@@ -52,15 +74,16 @@ class PostController:
             **post.dict(),
             date_create=self.__datetime_handler.now(),
             author=ShortUserModelResponse(**user.dict()),
-            likes=list(),
-            comments=list(),
         )
         result = await self.__database_controller.create_post(post)
         if result is None:
             raise HTTPException(status_code=400, detail="Failed to add post")
+        digest = self.__get_content_digest(result.url_content)
+        if digest is not None:
+            await self.__blob_handler.add_reference("content", digest)
         return result
 
-    def upload_photo(self, file: UploadFile) -> str:
+    async def upload_photo(self, file: UploadFile) -> str:
         """Uploading an image to disk
 
         Args:
@@ -72,11 +95,28 @@ class PostController:
         Returns:
             str: Photo URL
         """
-        LENGTH_RAND_STR = 15
-        rand_str = self.__generator_handler.generate_random_combination(LENGTH_RAND_STR)
-        name_file = f"{rand_str}_{file.filename}"
         try:
-            name = self.__driver_controller.upload_photo(
+            if self.__content_addressing:
+                digest, size = await self.__blob_handler.hash_content(file)
+                extension_file = file.filename.rsplit(".", 1)[-1].lower()
+                name_file = f"{digest}.{extension_file}"
+                name, _ = await self.__blob_handler.store(
+                    "photo",
+                    digest,
+                    f"{self.__directory_photo}/{name_file}",
+                    size,
+                    lambda: self.__driver_controller.upload_photo(
+                        name_file, self.__directory_photo, file
+                    ),
+                )
+                return f"{self.__url}/{name}"
+
+            LENGTH_RAND_STR = 15
+            rand_str = self.__generator_handler.generate_random_combination(
+                LENGTH_RAND_STR
+            )
+            name_file = f"{rand_str}_{file.filename}"
+            name = await self.__driver_controller.upload_photo(
                 name_file, self.__directory_photo, file
             )
             return f"{self.__url}/{name}"
@@ -84,7 +124,7 @@ class PostController:
 
             raise HTTPException(status_code=400, detail=f"{e}")
 
-    def upload_content(self, content: str, name_post: str) -> str:
+    async def upload_content(self, content: str, name_post: str) -> str:
         """Uploading an post content to disk
 
         Args:
@@ -97,77 +137,144 @@ class PostController:
         Returns:
             str: HTML content URL
         """
-        LENGTH_RAND_STR = 15
-        rand_str = self.__generator_handler.generate_random_combination(LENGTH_RAND_STR)
-        name_file = f"post_{name_post}_{rand_str}.html"
         try:
-            name = self.__driver_controller.upload_text(
+            if self.__content_addressing:
+                data = content.encode("utf-8")
+                digest, size = await self.__blob_handler.hash_content(data)
+                name_file = f"{digest}.html"
+                name, created = await self.__blob_handler.store(
+                    "content",
+                    digest,
+                    f"{self.__directory_content}/{name_file}",
+                    size,
+                    lambda: self.__driver_controller.upload_text(
+                        name_file, self.__directory_content, data, "text/html"
+                    ),
+                )
+                if created:
+                    # The content holds the photos it shows
+                    for photo_digest in self.__blob_handler.find_digests(
+                        content, f"{self.__url}/{self.__directory_photo}"
+                    ):
+                        await self.__blob_handler.add_reference("photo", photo_digest)
+                return f"{self.__url}/{name}"
+
+            LENGTH_RAND_STR = 15
+            rand_str = self.__generator_handler.generate_random_combination(
+                LENGTH_RAND_STR
+            )
+            name_file = f"post_{name_post}_{rand_str}.html"
+            name = await self.__driver_controller.upload_text(
                 name_file,
                 self.__directory_content,
                 content.encode("utf-8"),
                 "text/html",
             )
             return f"{self.__url}/{name}"
-        except UploadPhotoException as e:
+        except UploadTextException as e:
 
             raise HTTPException(status_code=400, detail=f"{e}")
 
-    def get_photo(self, name_image: str) -> Union[StreamingResponse, None]:
-        """Getting the photo by the name
+    async def get_photo(
+        self,
+        name_image: str,
+        width: int = None,
+        request_headers: Mapping[str, str] = None,
+    ) -> Union[Response, None]:
+        """Getting the photo by the name. Photo names end with a random string
+        or are the digest of the photo, so a photo never changes and is cached
+        by clients without revalidation
 
         Args:
             name_image (str)
+            width (int, optional): Desired width of the photo. Defaults to None.
+            request_headers (Mapping[str, str], optional): Defaults to None.
 
         Raises:
             HTTPException: If the file could not be retrieved
 
         Returns:
-            Union[StreamingResponse, None]: The resulting image
+            Union[Response, None]: The resulting image
         """
         try:
-            return self.__driver_controller.get_photo(
-                self.__directory_photo, name_image
+            return await self.__driver_controller.get_photo(
+                self.__directory_photo,
+                name_image,
+                width,
+                request_headers,
+                immutable=True,
             )
         except GetPhotoException as e:
 
             raise HTTPException(status_code=400, detail=f"{e}")
 
-    def get_content(self, name_content: str) -> Union[StreamingResponse, None]:
-        """Getting the content by the name
+    async def get_content(
+        self, name_content: str, request_headers: Mapping[str, str] = None
+    ) -> Union[Response, None]:
+        """Getting the content by the name. Content names end with a random string
+        or are the digest of the content, so the content never changes and is cached
+        by clients without revalidation
 
         Args:
             name_content (str)
+            request_headers (Mapping[str, str], optional): Defaults to None.
 
         Raises:
             HTTPException: If the file could not be retrieved
 
         Returns:
-            Union[StreamingResponse, None]: The resulting content
+            Union[Response, None]: The resulting content
         """
         try:
-            return self.__driver_controller.get_text(
-                self.__directory_content, name_content
+            return await self.__driver_controller.get_text(
+                self.__directory_content,
+                name_content,
+                request_headers,
+                immutable=True,
             )
-        except GetPhotoException as e:
+        except GetTextException as e:
+
+            raise HTTPException(status_code=400, detail=f"{e}")
+
+    def __get_post_model(self, fields: Union[str, None]) -> Type[PostInDBModel]:
+        """Getting the model of the posts with the requested fields
+
+        Args:
+            fields (Union[str, None]): "summary" or names of the fields
+
+        Raises:
+            HTTPException: If the post has no such field
 
+        Returns:
+            Type[PostInDBModel]
+        """
+        try:
+            return self.__projection_handler.get_model(
+                PostInDBModel, fields, PostSummaryModel
+            )
+        except InvalidFieldsException as e:
             raise HTTPException(status_code=400, detail=f"{e}")
 
     async def get_all_post(
-        self, limit: int, last_post_key: str
+        self, limit: int, last_post_key: str, fields: str = None
     ) -> ResponseItems[PostInDBModel]:
         """Getting all posts from the database
 
         Args:
             limit (int): Limit of posts received
             last_post_key (str): The last post key received in the previous request
+            fields (str, optional): "summary" or names of the fields
+            separated by commas. Defaults to None, all fields.
 
         Returns:
             ResponseItems[PostInDBModel]: Query result
         """
-        return await self.__database_controller.get_posts_by_query(limit, last_post_key)
+        return await self.__database_controller.get_posts_by_query(
+            limit, last_post_key, model=self.__get_post_model(fields)
+        )
 
     async def get_posts_by_skill(
-        self, name_skill: str, limit: int, last_post_key: str
+        self, name_skill: str, limit: int, last_post_key: str, fields: str = None
     ) -> ResponseItems[PostInDBModel]:
         """Getting posts by skill name  from the database
 
@@ -175,12 +282,17 @@ class PostController:
             name_skill (str)
             limit (int): Limit of posts received
             last_post_key (str): The last post key received in the previous request
+            fields (str, optional): "summary" or names of the fields
+            separated by commas. Defaults to None, all fields.
 
         Returns:
             ResponseItems[PostInDBModel]: Query result
         """
         return await self.__database_controller.get_posts_by_query(
-            limit, last_post_key, {"skill.name": name_skill}
+            limit,
+            last_post_key,
+            {"skill.name": name_skill},
+            self.__get_post_model(fields),
         )
 
     async def delete_post_by_key(self, key: str) -> MessageModel:
@@ -192,9 +304,44 @@ class PostController:
         Returns:
             MessageModel
         """
-        await self.__database_controller.delete_post_by_key(key)
+        post = await self.__database_controller.get_post_by_key(key)
+        if post is None:
+            await self.__database_controller.delete_post_by_key(key)
+        else:
+            await self.delete_post(post)
         return MessageModel(message="Deletion successful")
 
+    async def delete_post(self, post: PostInDBModel) -> None:
+        """Deleting a post, its likes, comments and content. A content-addressed content
+        loses a reference and is deleted by init/collect_blobs.py when nothing
+        uses it, a content with a random name belongs only to this post
+        and is deleted
+
+        Args:
+            post (PostInDBModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        # The likes and comments go first, the post is not found again
+        # if the deletion stops
+        await self.__database_controller.delete_likes_of_post(post.key)
+        await self.__database_controller.delete_comments_of_post(post.key)
+        await self.__database_controller.delete_post_by_key(post.key)
+        digest = self.__get_content_digest(post.url_content)
+        if digest is not None:
+            await self.__blob_handler.remove_reference("content", digest)
+            return
+        prefix = f"{self.__url}/{self.__directory_content}/"
+        if post.url_content.startswith(prefix):
+            try:
+                await self.__driver_controller.delete_text(
+                    self.__directory_content, post.url_content[len(prefix) :]
+                )
+            except DeleteFileException:
+                # The post is deleted, a file left on the drive is not visible
+                pass
+
     async def get_author_key_by_post_key(self, post_key: str) -> str:
         """Getting the post author's key
 
@@ -227,7 +374,15 @@ class PostController:
             MessageModel
         """
         try:
+            old_post = await self.__database_controller.get_post_by_key(post_key)
             await self.__database_controller.update_post_by_key(post.dict(), post_key)
+            if old_post is not None and old_post.url_content != post.url_content:
+                digest = self.__get_content_digest(post.url_content)
+                if digest is not None:
+                    await self.__blob_handler.add_reference("content", digest)
+                digest = self.__get_content_digest(old_post.url_content)
+                if digest is not None:
+                    await self.__blob_handler.remove_reference("content", digest)
             return MessageModel(message="Editing successful")
         except UpdatePostException as e:
 
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import os
+import time
+from typing import List, Union
+from fastapi import HTTPException
+
+from db.database_handler import DatabaseHandler
+from db.search_index import SearchIndex, read_snapshot, write_snapshot
+from models.response_items import ResponseItems
+from models.search_model import SearchHitModel
+from models.short_user_model_response import ShortUserModelResponse
+
+KINDS = ("post", "skill", "user")
+# Pages read while the index adds the current one
+READ_AHEAD = 2
+
+logger = logging.getLogger(__name__)
+
+
+class SearchController:
+    """Search over posts, skills and users with the in-process index.
+    Without a snapshot the index is built from the database at startup,
+    with a snapshot it is loaded from the file and rebuilt in the background.
+    Every refresh_interval seconds the index is rebuilt to pick up the changes
+    made by other processes"""
+
+    def __init__(
+        self,
+        database_controller: DatabaseHandler,
+        search_index: SearchIndex,
+        snapshot_path: Union[str, None],
+        refresh_interval: float,
+    ):
+        self.__database_controller = database_controller
+        self.__search_index = search_index
+        self.__snapshot_path = snapshot_path
+        self.__refresh_interval = refresh_interval
+        self.__refresh_task = None
+        self.__is_started = False
+
+    async def rebuild(self) -> None:
+        """Building the index from the database and saving the snapshot
+
+        Returns:
+            None: Returns nothing
+        """
+        fresh = SearchIndex()
+        self.__search_index.begin_rebuild()
+        try:
+            async for post in self.__database_controller.iterate_posts_by_query(
+                read_ahead=READ_AHEAD
+            ):
+                fresh.add_post(post)
+            async for skill in self.__database_controller.iterate_skills(
+                read_ahead=READ_AHEAD
+            ):
+                fresh.add_skill(skill)
+            async for user in self.__database_controller.iterate_users(
+                ShortUserModelResponse, read_ahead=READ_AHEAD
+            ):
+                fresh.add_user(user)
+        except BaseException:
+            self.__search_index.finish_rebuild(None)
+            raise
+        self.__search_index.finish_rebuild(fresh)
+        await self.save_snapshot()
+
+    async def save_snapshot(self) -> None:
+        """Saving the index to the snapshot file, if it is set
+
+        Returns:
+            None: Returns nothing
+        """
+        if self.__snapshot_path is None:
+            return
+        documents = self.__search_index.get_documents()
+        await asyncio.to_thread(write_snapshot, self.__snapshot_path, documents)
+
+    async def __refresh(self, delay: float) -> None:
+        """Rebuilding the index every refresh interval
+
+        Args:
+            delay (float): Seconds before the first rebuild
+
+        Returns:
+            None: Returns nothing
+        """
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.__refresh_interval
+            try:
+                await self.rebuild()
+            except Exception:
+                # The old index keeps working until the next attempt
+                logger.exception("Rebuilding the search index failed")
+
+    async def start(self) -> None:
+        """Loading the index from the snapshot or building it from the database
+        and starting the background refresh
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__is_started = True
+        documents = None
+        if self.__snapshot_path is not None:
+            documents = await asyncio.to_thread(read_snapshot, self.__snapshot_path)
+        delay = self.__refresh_interval
+        if documents is None:
+            try:
+                await self.rebuild()
+            except Exception:
+                # The application starts with an empty index and tries again later
+                logger.exception("Building the search index failed")
+                delay = min(delay, 60)
+        else:
+            self.__search_index.set_documents(documents)
+            age = time.time() - os.path.getmtime(self.__snapshot_path)
+            delay = max(self.__refresh_interval - age, 0)
+        if self.__refresh_interval > 0:
+            self.__refresh_task = asyncio.create_task(self.__refresh(delay))
+
+    async def close(self) -> None:
+        """Stopping the background refresh and saving the snapshot.
+        An index that was not started has not been built, so it is not saved
+
+        Returns:
+            None: Returns nothing
+        """
+        if not self.__is_started:
+            return
+        self.__is_started = False
+        if self.__refresh_task is not None:
+            self.__refresh_task.cancel()
+            try:
+                await self.__refresh_task
+            except asyncio.CancelledError:
+                pass
+            self.__refresh_task = None
+        await self.save_snapshot()
+
+    async def search(
+        self, query: str, kinds: List[str] = None, limit: int = 20
+    ) -> ResponseItems[SearchHitModel]:
+        """Searching posts, skills and users
+
+        Args:
+            query (str): Words or beginnings of words, typos are allowed
+            kinds (List[str], optional): "post", "skill" or "user".
+            Defaults to None, all kinds.
+            limit (int, optional): Limit of the results. Defaults to 20.
+
+        Raises:
+            HTTPException: If the kind is unknown
+
+        Returns:
+            ResponseItems[SearchHitModel]: The best matching items first
+        """
+        unknown = [kind for kind in kinds or [] if kind not in KINDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown kinds: {', '.join(unknown)}"
+            )
+        hits = self.__search_index.search(query, kinds, limit)
+        return ResponseItems[SearchHitModel](items=hits, count=len(hits))
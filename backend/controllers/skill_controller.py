@@ -1,9 +1,8 @@
-from typing import List, Union
+from typing import List, Mapping, Union
 from fastapi import HTTPException, UploadFile
 from transliterate import translit
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 import os
-from dotenv import load_dotenv
 
 from controllers.user_controller import UserController
 from db.database_handler import DatabaseHandler
@@ -23,7 +22,6 @@ class SkillController:
         database_controller: DatabaseHandler,
         driver_controller: DriveHandler,
     ):
-        load_dotenv()
         self.__database_controller = database_controller
         self.__driver_controller = driver_controller
         self.__user_controller = UserController(database_controller)
@@ -47,7 +45,7 @@ class SkillController:
             raise HTTPException(status_code=400, detail="Failed to add skill")
         return result
 
-    def upload_icon_skill(self, name: str, file: UploadFile) -> str:
+    async def upload_icon_skill(self, name: str, file: UploadFile) -> str:
         """Uploading the skill icon to disk
 
         Args:
@@ -64,7 +62,7 @@ class SkillController:
         size_icon = 128
         name_icon = self.__driver_controller.join_file_name(file, name_icon)
         try:
-            name = self.__driver_controller.upload_photo(
+            name = await self.__driver_controller.upload_photo(
                 name_icon, self.__directory, file, size_icon, size_icon
             )
             return f"{self.__url}/{name}"
@@ -72,20 +70,31 @@ class SkillController:
 
             raise HTTPException(status_code=400, detail=f"{e}")
 
-    def get_icon_by_name_file(self, name_file: str) -> Union[StreamingResponse, None]:
-        """Getting the skill icon by the name of the photo
+    async def get_icon_by_name_file(
+        self,
+        name_file: str,
+        width: int = None,
+        request_headers: Mapping[str, str] = None,
+    ) -> Union[Response, None]:
+        """Getting the skill icon by the name of the photo.
+        The icon is replaced when it is uploaded again under the same name,
+        so clients revalidate it on each use
 
         Args:
             name_file (str)
+            width (int, optional): Desired width of the icon. Defaults to None.
+            request_headers (Mapping[str, str], optional): Defaults to None.
 
         Raises:
             HTTPException: If the file could not be retrieved
 
         Returns:
-            Union[StreamingResponse, None]
+            Union[Response, None]
         """
         try:
-            return self.__driver_controller.get_photo(self.__directory, name_file)
+            return await self.__driver_controller.get_photo(
+                self.__directory, name_file, width, request_headers
+            )
         except GetPhotoException as e:
 
             raise HTTPException(status_code=400, detail=f"{e}")
@@ -0,0 +1,58 @@
+from fastapi import HTTPException
+
+from db.database_handler import DatabaseHandler
+from handlers.cpu_executor import CPUExecutor
+from handlers.drive_handler import DriveHandler
+from models.cache_stats_model import CacheStatsModel
+from models.executor_stats_model import ExecutorStatsModel
+from models.transport_stats_model import TransportStatsModel
+
+
+class StatsController:
+    def __init__(
+        self,
+        database_controller: DatabaseHandler,
+        cpu_executor: CPUExecutor,
+        driver_controller: DriveHandler,
+    ):
+        self.__database_controller = database_controller
+        self.__cpu_executor = cpu_executor
+        self.__driver_controller = driver_controller
+
+    def get_transport_stats(self) -> TransportStatsModel:
+        """Getting the statistics of the connection pool to the database
+
+        Returns:
+            TransportStatsModel
+        """
+        return self.__database_controller.get_transport_stats()
+
+    def get_user_cache_stats(self) -> CacheStatsModel:
+        """Getting the statistics of the user cache
+
+        Returns:
+            CacheStatsModel
+        """
+        return self.__database_controller.get_user_cache_stats()
+
+    def get_executor_stats(self) -> ExecutorStatsModel:
+        """Getting the statistics of the CPU executor
+
+        Returns:
+            ExecutorStatsModel
+        """
+        return self.__cpu_executor.get_stats()
+
+    def get_media_cache_stats(self) -> CacheStatsModel:
+        """Getting the statistics of the disk cache of photos and contents
+
+        Raises:
+            HTTPException: If the cache is disabled
+
+        Returns:
+            CacheStatsModel
+        """
+        stats = self.__driver_controller.get_disk_cache_stats()
+        if stats is None:
+            raise HTTPException(status_code=404, detail="Media cache is disabled")
+        return stats
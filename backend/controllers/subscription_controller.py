@@ -1,19 +1,54 @@
-from typing import List, Union
 from fastapi import HTTPException
 
+from controllers.timeline_controller import TimelineController
 from controllers.user_controller import UserController
 from consts.name_roles import USER
 from db.database_handler import DatabaseHandler
+from exceptions.update_user_data_exception import UpdateUserDataException
+from handlers.datetime_handler import DatetimeHandler
 from models.response_items import ResponseItems
 from models.result_subscribe_model import ResultSubscriptionModel
-from models.user_model import ShortUserModelResponse, UserModelResponse
-from models.subscription_model import SubscriptionModel
+from models.short_user_model_response import ShortUserModelResponse
+from models.subscription_model import SubscriptionInDBModel
+from models.user_model import UserInDBModel, UserModelResponse
 
 
 class SubscriptionController:
     def __init__(self, database_controller: DatabaseHandler):
         self.__database_controller = database_controller
         self.__user_controller = UserController(database_controller)
+        self.__timeline_controller = TimelineController(database_controller)
+        self.__datetime_handler = DatetimeHandler()
+
+    def __generate_subscription_key(self, follower_key: str, favorite_key: str) -> str:
+        """Creating the subscription key, the follower can subscribe
+        to the favorite only once
+
+        Args:
+            follower_key (str)
+            favorite_key (str)
+
+        Returns:
+            str: Subscription key
+        """
+        return f"{follower_key}:{favorite_key}"
+
+    async def __get_user_by_username(self, username: str) -> UserInDBModel:
+        """Getting a user from the database by username
+
+        Args:
+            username (str)
+
+        Raises:
+            HTTPException: If the user is not found
+
+        Returns:
+            UserInDBModel
+        """
+        user = await self.__database_controller.get_user_by_username(username)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return user
 
     async def subscribe(self, username: str, token: str) -> ResultSubscriptionModel:
         """Subscribing to another user
@@ -36,15 +71,6 @@ class SubscriptionController:
                 status_code=400, detail="You can't subscribe to yourself"
             )
 
-        result = list(
-            filter(
-                lambda item: username == item.favorite.username,
-                follower.subscriptions,
-            )
-        )
-        if len(result) != 0:
-            raise HTTPException(status_code=400, detail="Subscription already exists")
-
         favorite = await self.__database_controller.get_user_by_username(username)
         if favorite is None:
             raise HTTPException(status_code=404, detail="Favorite not found")
@@ -52,20 +78,34 @@ class SubscriptionController:
         if (follower.role.name_en != USER) or (favorite.role.name_en != USER):
             raise HTTPException(status_code=400, detail="Some of you are non-users")
 
-        subs = SubscriptionModel(favorite=favorite)
-        favorite.followers.append(ShortUserModelResponse(**follower.dict()))
-        follower.subscriptions.append(subs)
-        users = [favorite.dict(), follower.dict()]
-        result = await self.__database_controller.put_many_users(users)
-        if "failed" in result:
-            raise HTTPException(status_code=400, detail="Subscription failed")
+        subscription = SubscriptionInDBModel(
+            favorite=ShortUserModelResponse(**favorite.dict()),
+            follower=ShortUserModelResponse(**follower.dict()),
+            date_create=self.__datetime_handler.now(),
+            key=self.__generate_subscription_key(follower.key, favorite.key),
+        )
+        result = await self.__database_controller.create_subscription(subscription)
+        if result is None:
+            raise HTTPException(status_code=400, detail="Subscription already exists")
 
-        items_result = result["processed"]["items"]
-        result = ResultSubscriptionModel(
-            favorite=UserModelResponse(**items_result[0]),
-            follower=UserModelResponse(**items_result[1]),
+        try:
+            await self.__database_controller.change_subscription_counters(
+                1, follower.key, favorite.key
+            )
+        except UpdateUserDataException as e:
+            await self.__database_controller.delete_subscription_by_key(
+                subscription.key
+            )
+            raise HTTPException(status_code=400, detail="Subscription failed")
+        if self.__timeline_controller.enabled:
+            await self.__timeline_controller.add_subscription(follower.key, favorite.key)
+
+        favorite.followers_count += 1
+        follower.subscriptions_count += 1
+        return ResultSubscriptionModel(
+            favorite=UserModelResponse(**favorite.dict()),
+            follower=UserModelResponse(**follower.dict()),
         )
-        return result
 
     async def annul(self, username: str, token: str) -> ResultSubscriptionModel:
         """Cancel subscription
@@ -81,50 +121,95 @@ class SubscriptionController:
             ResultSubscriptionModel: favorite and follower
         """
         follower = await self.__user_controller.get_user_by_token(token)
-        res = list(
-            filter(
-                lambda item: username == item.favorite.username, follower.subscriptions
-            )
-        )
-        if len(res) == 0:
+        favorite = await self.__database_controller.get_user_by_username(username)
+        if favorite is None:
             raise HTTPException(status_code=404, detail="Favorite not found")
 
-        follower.subscriptions.remove(res[0])
-        favorite = await self.__database_controller.get_user_by_username(username)
-        favorite.followers.remove(
-            list(
-                filter(
-                    lambda item: follower.username == item.username,
-                    favorite.followers,
-                )
-            )[0]
-        )
-        users = [favorite.dict(), follower.dict()]
-        result = await self.__database_controller.put_many_users(users)
-        if "failed" in result:
+        key = self.__generate_subscription_key(follower.key, favorite.key)
+        subscription = await self.__database_controller.get_subscription_by_key(key)
+        if subscription is None:
+            raise HTTPException(status_code=404, detail="Favorite not found")
+
+        await self.__database_controller.delete_subscription_by_key(key)
+        try:
+            await self.__database_controller.change_subscription_counters(
+                -1, follower.key, favorite.key
+            )
+        except UpdateUserDataException as e:
+            # The subscription is put back, so the counters keep matching the edges
+            await self.__database_controller.create_subscription(subscription)
             raise HTTPException(status_code=400, detail="Unsubscribe failed")
-        items_result = result["processed"]["items"]
-        result = ResultSubscriptionModel(
-            favorite=UserModelResponse(**items_result[0]),
-            follower=UserModelResponse(**items_result[1]),
+        if self.__timeline_controller.enabled:
+            await self.__timeline_controller.remove_subscription(
+                follower.key, favorite.key
+            )
+
+        favorite.followers_count -= 1
+        follower.subscriptions_count -= 1
+        return ResultSubscriptionModel(
+            favorite=UserModelResponse(**favorite.dict()),
+            follower=UserModelResponse(**follower.dict()),
         )
-        return result
 
     async def get_subscriptions(
-        self, token: str, limit: Union[int, None]
-    ) -> List[SubscriptionModel]:
+        self, token: str, limit: int, last_subscription_key: str
+    ) -> ResponseItems[SubscriptionInDBModel]:
         """Getting all of my subscriptions
 
         Args:
             token (str): access token
-            limit (Union[int, None]): Limit of subscriptions received
+            limit (int): Limit of subscriptions received
+            last_subscription_key (str): The last subscription key received
+            in the previous request
 
         Returns:
-            List[SubscriptionModel]: Query result
-        """        
+            ResponseItems[SubscriptionInDBModel]: Query result
+        """
         user = await self.__user_controller.get_user_by_token(token)
+        return await self.__database_controller.get_subscriptions_of_follower(
+            user.key, limit, last_subscription_key
+        )
+
+    async def get_following(
+        self, username: str, limit: int, last_subscription_key: str
+    ) -> ResponseItems[SubscriptionInDBModel]:
+        """Getting the users the user is subscribed to
+
+        Args:
+            username (str)
+            limit (int): Limit of subscriptions received
+            last_subscription_key (str): The last subscription key received
+            in the previous request
+
+        Raises:
+            HTTPException: If the user is not found
+
+        Returns:
+            ResponseItems[SubscriptionInDBModel]: Query result
+        """
+        user = await self.__get_user_by_username(username)
+        return await self.__database_controller.get_subscriptions_of_follower(
+            user.key, limit, last_subscription_key
+        )
+
+    async def get_followers(
+        self, username: str, limit: int, last_subscription_key: str
+    ) -> ResponseItems[SubscriptionInDBModel]:
+        """Getting the followers of the user
+
+        Args:
+            username (str)
+            limit (int): Limit of subscriptions received
+            last_subscription_key (str): The last subscription key received
+            in the previous request
+
+        Raises:
+            HTTPException: If the user is not found
 
-        if limit is None:
-            return user.subscriptions
-        else:
-            return user.subscriptions[:limit]
+        Returns:
+            ResponseItems[SubscriptionInDBModel]: Query result
+        """
+        user = await self.__get_user_by_username(username)
+        return await self.__database_controller.get_subscriptions_to_favorite(
+            user.key, limit, last_subscription_key
+        )
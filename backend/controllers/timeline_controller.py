@@ -0,0 +1,185 @@
+import os
+from typing import List
+
+from db.database_handler import DatabaseHandler
+from handlers.datetime_handler import DatetimeHandler
+from models.event_model import EventInDBModel
+from models.response_items import ResponseItems
+from models.timeline_entry_model import TimelineEntryModel
+
+
+class TimelineController:
+    """Materialized timelines of events of the favorites. Each event is
+    copied to the timelines of the author's followers when it is written,
+    so the timeline is read with one query"""
+
+    def __init__(self, database_controller: DatabaseHandler):
+        self.__database_controller = database_controller
+        self.__datetime_handler = DatetimeHandler()
+        self.__enabled = os.getenv("EVENT_FEED", "query") == "fanout"
+
+    @property
+    def enabled(self) -> bool:
+        return self.__enabled
+
+    def __make_key(self, follower_key: str, event: EventInDBModel) -> str:
+        """Creating the key of a timeline entry, the entries of a follower
+        are sorted by the event date
+
+        Args:
+            follower_key (str)
+            event (EventInDBModel)
+
+        Returns:
+            str: Entry key
+        """
+        return f"{follower_key}:{event.date:015d}:{event.key}"
+
+    def __make_entries(
+        self, follower_keys: List[str], events: List[EventInDBModel]
+    ) -> List[TimelineEntryModel]:
+        """Creating timeline entries of the events for the followers
+
+        Args:
+            follower_keys (List[str]): Keys of the followers
+            events (List[EventInDBModel]): Events
+
+        Returns:
+            List[TimelineEntryModel]
+        """
+        return [
+            TimelineEntryModel(
+                follower_key=follower_key,
+                date=event.date,
+                event_key=event.key,
+                event=event,
+                key=self.__make_key(follower_key, event),
+            )
+            for follower_key in follower_keys
+            for event in events
+        ]
+
+    async def __get_follower_keys(self, author_key: str) -> List[str]:
+        """Getting the keys of the author's followers
+
+        Args:
+            author_key (str)
+
+        Returns:
+            List[str]
+        """
+        subscriptions = (
+            await self.__database_controller.get_all_subscriptions_to_favorite(
+                author_key
+            )
+        )
+        return [subs.follower.key for subs in subscriptions]
+
+    async def add_event(self, event: EventInDBModel) -> None:
+        """Adding the event to the timelines of the author's followers
+
+        Args:
+            event (EventInDBModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        follower_keys = await self.__get_follower_keys(event.author.key)
+        entries = self.__make_entries(follower_keys, [event])
+        await self.__database_controller.put_timeline_entries(entries)
+
+    async def update_event(
+        self, old_event: EventInDBModel, event: EventInDBModel
+    ) -> None:
+        """Replacing the event in the timelines of the author's followers
+
+        Args:
+            old_event (EventInDBModel): The event before the update
+            event (EventInDBModel): The updated event
+
+        Returns:
+            None: Returns nothing
+        """
+        await self.remove_event(old_event)
+        await self.add_event(event)
+
+    async def remove_event(self, event: EventInDBModel) -> None:
+        """Removing the event from the timelines of the author's followers.
+        The entry keys are built from the followers and the event date,
+        so the timelines are not searched
+
+        Args:
+            event (EventInDBModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        follower_keys = await self.__get_follower_keys(event.author.key)
+        await self.__database_controller.delete_timeline_entries(
+            [self.__make_key(follower_key, event) for follower_key in follower_keys]
+        )
+
+    async def add_subscription(self, follower_key: str, favorite_key: str) -> None:
+        """Adding the upcoming events of the favorite to the follower's timeline
+
+        Args:
+            follower_key (str)
+            favorite_key (str)
+
+        Returns:
+            None: Returns nothing
+        """
+        events = [
+            event
+            async for event in self.__database_controller.iterate_events_by_query(
+                {
+                    "author.key": favorite_key,
+                    "date?gte": self.__datetime_handler.now(),
+                }
+            )
+        ]
+        entries = self.__make_entries([follower_key], events)
+        await self.__database_controller.put_timeline_entries(entries)
+
+    async def remove_subscription(self, follower_key: str, favorite_key: str) -> None:
+        """Removing the events of the favorite from the follower's timeline
+
+        Args:
+            follower_key (str)
+            favorite_key (str)
+
+        Returns:
+            None: Returns nothing
+        """
+        await self.__database_controller.delete_timeline_entries_of_author(
+            follower_key, favorite_key
+        )
+
+    async def get_timeline(
+        self,
+        follower_key: str,
+        limit: int,
+        last_entry_key: str = None,
+        date_range: List[int] = None,
+    ) -> ResponseItems[EventInDBModel]:
+        """Getting the events of the follower's timeline sorted by date
+
+        Args:
+            follower_key (str)
+            limit (int): Limit of events received
+            last_entry_key (str, optional): The last entry key received
+            in the previous request. Defaults to None.
+            date_range (List[int], optional): Minimum and maximum date of events.
+            Defaults to None.
+
+        Returns:
+            ResponseItems[EventInDBModel]: Query result
+        """
+        result = await self.__database_controller.get_timeline(
+            follower_key, limit, last_entry_key, date_range
+        )
+        return ResponseItems[EventInDBModel](
+            count=result.count,
+            last=result.last,
+            items=[entry.event for entry in result.items],
+        )
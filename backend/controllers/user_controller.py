@@ -3,10 +3,13 @@ from typing import Union
 from fastapi import HTTPException
 from db.database_handler import DatabaseHandler
 from exceptions.decode_token_exception import DecodeTokenException
+from exceptions.invalid_fields_exception import InvalidFieldsException
 from exceptions.update_user_data_exception import UpdateUserDataException
 from handlers.datetime_handler import DatetimeHandler
+from handlers.projection_handler import ProjectionHandler
 from models.response_items import ResponseItems
 from models.message_model import MessageModel
+from models.short_user_model_response import ShortUserModelResponse
 from models.user_model import UserAdditionalDataModel, UserInDBModel, UserModelResponse
 from handlers.jwt_handler import JWTHandler
 
@@ -15,6 +18,7 @@ class UserController:
     def __init__(self, database_controller: DatabaseHandler):
         self.__database_controller = database_controller
         self.__jwt_handler = JWTHandler()
+        self.__projection_handler = ProjectionHandler()
 
     async def get_user_by_username(
         self, username: str
@@ -40,18 +44,31 @@ class UserController:
         raise HTTPException(status_code=400, detail="Key is empty")
 
     async def get_user_all(
-        self, limit: int, last_user_key: str
+        self, limit: int, last_user_key: str, fields: str = None
     ) -> ResponseItems[UserModelResponse]:
         """Getting all users
 
         Args:
             limit (int): Limit of users received
             last_user_key (str): The last user key received in the previous request
+            fields (str, optional): "summary" for the short cards of the users
+            or names of the fields separated by commas. Defaults to None, all fields.
+
+        Raises:
+            HTTPException: If the user has no such field
 
         Returns:
             ResponseItems[UserModelResponse]: Query result
         """
-        return await self.__database_controller.get_user_all(limit, last_user_key)
+        try:
+            model = self.__projection_handler.get_model(
+                UserModelResponse, fields, ShortUserModelResponse
+            )
+        except InvalidFieldsException as e:
+            raise HTTPException(status_code=400, detail=f"{e}")
+        return await self.__database_controller.get_user_all(
+            limit, last_user_key, model
+        )
 
     async def delete_user_by_key(self, key: str) -> MessageModel:
         """Deleting a user from the database
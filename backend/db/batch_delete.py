@@ -0,0 +1,35 @@
+import asyncio
+from typing import List
+
+from db.transport.storage_base import StorageBase
+
+# The base has no batch delete, a batch is this many single deletes
+BATCH_SIZE = 25
+# Number of batches deleted at once
+MAX_CONCURRENT_BATCHES = 4
+
+
+async def delete_keys(
+    base: StorageBase, keys: List[str], concurrency: int = MAX_CONCURRENT_BATCHES
+) -> None:
+    """Deleting documents by keys in batches, at most concurrency batches at once,
+    so a large deletion does not flood the base
+
+    Args:
+        base (StorageBase): Base of the documents
+        keys (List[str]): The document keys in the database
+        concurrency (int, optional): Number of batches deleted at once.
+        Defaults to MAX_CONCURRENT_BATCHES.
+
+    Returns:
+        None: Returns nothing
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def run(batch: List[str]) -> None:
+        async with semaphore:
+            await asyncio.gather(*[base.delete(key) for key in batch])
+
+    await asyncio.gather(
+        *[run(keys[i : i + BATCH_SIZE]) for i in range(0, len(keys), BATCH_SIZE)]
+    )
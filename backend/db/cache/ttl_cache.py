@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+from typing import Any, Union
+
+from models.cache_stats_model import CacheStatsModel
+
+
+class TTLCache:
+    """Bounded cache whose entries expire after a time to live.
+    When the cache is full, the least recently used entry is evicted"""
+
+    def __init__(self, name: str, max_size: int, ttl: float):
+        self.__name = name
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__items = OrderedDict()
+        # Changes with every invalidation so that a value read from the database
+        # before a write is not put into the cache after it
+        self.__generation = 0
+        self.__stats = CacheStatsModel(name=name, max_size=max_size, ttl=ttl)
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    def get(self, key: str) -> Union[Any, None]:
+        """Getting a value by key
+
+        Args:
+            key (str)
+
+        Returns:
+            Union[Any, None]: The value if it is in the cache and has not expired,
+            otherwise None
+        """
+        item = self.__items.get(key)
+        if item is not None:
+            value, expire_at = item
+            if expire_at > time.monotonic():
+                self.__items.move_to_end(key)
+                self.__stats.hits += 1
+                return value
+            del self.__items[key]
+        self.__stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, generation: int = None) -> None:
+        """Putting a value into the cache
+
+        Args:
+            key (str)
+            value (Any)
+            generation (int, optional): Cache generation taken before the value
+            was read. If the cache has been invalidated since then, the value is not saved.
+            Defaults to None.
+
+        Returns:
+            None: Returns nothing
+        """
+        if generation is not None and generation != self.__generation:
+            return
+        self.__items[key] = (value, time.monotonic() + self.__ttl)
+        self.__items.move_to_end(key)
+        while len(self.__items) > self.__max_size:
+            self.__items.popitem(last=False)
+            self.__stats.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Removing a value from the cache
+
+        Args:
+            key (str)
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__generation += 1
+        self.__stats.invalidations += 1
+        self.__items.pop(key, None)
+
+    def clear(self) -> None:
+        """Removing all values from the cache
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__generation += 1
+        self.__items.clear()
+
+    def get_stats(self) -> CacheStatsModel:
+        """Getting the cache statistics
+
+        Returns:
+            CacheStatsModel
+        """
+        stats = self.__stats.copy()
+        stats.size = len(self.__items)
+        requests = stats.hits + stats.misses
+        stats.hit_rate = stats.hits / requests if requests > 0 else 0
+        return stats
@@ -1,41 +1,147 @@
-from typing import Union
-from deta import Deta
-
+import asyncio
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator, List, Type, Union
+from pydantic import BaseModel
+
+from db.cache.ttl_cache import TTLCache
+from db.handlers.blob_database_handler import BlobDatabaseHandler
+from db.handlers.comment_database_handler import CommentDatabaseHandler
+from db.handlers.deletion_job_database_handler import DeletionJobDatabaseHandler
 from db.handlers.event_database_handler import EventDatabaseHandler
+from db.handlers.like_database_handler import LikeDatabaseHandler
 from db.handlers.post_database_handler import PostDatabaseHandler
 from db.handlers.role_database_handler import RoleDatabaseHandler
 from db.handlers.skill_database_handler import SkillDatabaseHandler
+from db.handlers.subscription_database_handler import SubscriptionDatabaseHandler
 from db.handlers.suggestion_database_handler import SuggetionDatabaseHandler
+from db.handlers.timeline_database_handler import TimelineDatabaseHandler
 from db.handlers.user_database_handler import UserDatabaseHandler
-from exceptions.append_comment_exception import AppendCommentException
-from exceptions.append_like_exception import AppendLikeException
+from db.identity_map import identity_map_var
+from db.query_planner import QueryPlanner
+from db.search_index import SearchIndex
+from db.transport.transport import Transport
 from exceptions.append_links_exception import AppendLinksException
 from exceptions.append_skills_exception import AppendSkillsException
+from exceptions.update_blob_exception import UpdateBlobException
 from exceptions.update_event_exception import UpdateEventException
 from exceptions.update_item_exception import UpdateItemException
 from exceptions.update_post_exception import UpdatePostException
 from exceptions.update_suggestion_exception import UpdateSuggestionException
 from exceptions.update_user_data_exception import UpdateUserDataException
-from models.comment_model import CommentModel
+from models.blob_model import BlobInDBModel
+from models.cache_stats_model import CacheStatsModel
+from models.comment_model import CommentInDBModel
+from models.deletion_job_model import DeletionJobModel
 from models.event_model import EventInDBModel, EventInputModel
-from models.like_model import LikeModel
+from models.like_model import LikeInDBModel
 from models.post_model import PostInDBModel
 from models.response_items import ResponseItems
 from models.role_model import RoleInDBModel
 from models.skill_model import SkillCreateDataModel, SkillInDBModel
+from models.subscription_model import SubscriptionInDBModel
 from models.suggestion_model import SuggestionInDBModel
+from models.timeline_entry_model import TimelineEntryModel
+from models.transport_stats_model import TransportStatsModel
 from models.user_model import UserInDBModel, UserModelResponse
 
 
 class DatabaseHandler:
-    def __init__(self, deta: Deta):
-        self.__deta = deta
-        self.__user_handler = UserDatabaseHandler(self.__deta)
-        self.__role_handler = RoleDatabaseHandler(self.__deta)
-        self.__skill_handler = SkillDatabaseHandler(self.__deta)
-        self.__event_handler = EventDatabaseHandler(self.__deta)
-        self.__post_handler = PostDatabaseHandler(self.__deta)
-        self.__suggestion_handler = SuggetionDatabaseHandler(self.__deta)
+    def __init__(
+        self,
+        transport: Transport,
+        user_cache: TTLCache,
+        query_planner: QueryPlanner,
+        search_index: SearchIndex = None,
+    ):
+        self.__transport = transport
+        self.__user_cache = user_cache
+        self.__query_planner = query_planner
+        # Posts, skills and users written by the application are indexed at once
+        self.__search_index = search_index
+        self.__user_handler = UserDatabaseHandler(self.__transport, self.__user_cache)
+        self.__role_handler = RoleDatabaseHandler(self.__transport)
+        self.__skill_handler = SkillDatabaseHandler(self.__transport)
+        self.__event_handler = EventDatabaseHandler(self.__transport)
+        self.__post_handler = PostDatabaseHandler(self.__transport)
+        self.__like_handler = LikeDatabaseHandler(self.__transport)
+        self.__comment_handler = CommentDatabaseHandler(self.__transport)
+        self.__subscription_handler = SubscriptionDatabaseHandler(self.__transport)
+        self.__timeline_handler = TimelineDatabaseHandler(self.__transport)
+        self.__suggestion_handler = SuggetionDatabaseHandler(self.__transport)
+        self.__blob_handler = BlobDatabaseHandler(self.__transport)
+        self.__deletion_job_handler = DeletionJobDatabaseHandler(self.__transport)
+
+    async def close(self) -> None:
+        """Closing the connections of all database handlers
+
+        Returns:
+            None: Returns nothing
+        """
+        await self.__transport.close()
+
+    def get_transport_stats(self) -> TransportStatsModel:
+        """Getting the statistics of connections to the database
+
+        Returns:
+            TransportStatsModel
+        """
+        return self.__transport.get_stats()
+
+    def get_user_cache_stats(self) -> CacheStatsModel:
+        """Getting the statistics of the user cache
+
+        Returns:
+            CacheStatsModel
+        """
+        return self.__user_cache.get_stats()
+
+    async def __get_through_identity_map(self, collection: str, key: str, load):
+        """Getting a document from the identity map of the current request,
+        if it is not loaded yet, then it is loaded and remembered
+
+        Args:
+            collection (str): Name of the collection of the document
+            key (str): The document key in the database
+            load: Coroutine function loading the document by key
+
+        Returns:
+            The loaded document model or None
+        """
+        identity_map = identity_map_var.get()
+        if identity_map is None:
+            return await load(key)
+        if identity_map.contains(collection, key):
+            return identity_map.get(collection, key)
+        # A document changed during the loading is not remembered
+        generation = identity_map.generation
+        item = await load(key)
+        identity_map.set(collection, key, item, generation)
+        return item
+
+    @contextmanager
+    def __changing(self, collection: str, *keys: str) -> Iterator[None]:
+        """Removing changed documents from the identity map of the current request
+        before and after the change, so a read running concurrently with the change
+        does not remember the old document
+
+        Args:
+            collection (str): Name of the collection of the documents
+            keys (str): The document keys in the database
+
+        Returns:
+            Iterator[None]
+        """
+        identity_map = identity_map_var.get()
+        if identity_map is None:
+            yield
+            return
+        for key in keys:
+            identity_map.discard(collection, key)
+        try:
+            yield
+        finally:
+            for key in keys:
+                identity_map.discard(collection, key)
 
     # User
     async def get_user_by_email(self, email: str) -> Union[UserInDBModel, None]:
@@ -48,7 +154,7 @@ class DatabaseHandler:
             Union[UserInDBModel, None]: If a user is found,
             then returns UserInDBModel otherwise None
         """
-        return await self.__user_handler.get_one_by_query({"email": email})
+        return await self.__user_handler.get_by_unique("email", email)
 
     async def get_user_by_username(self, username: str) -> Union[UserInDBModel, None]:
         """Get one user by username from the database
@@ -60,7 +166,7 @@ class DatabaseHandler:
             Union[UserInDBModel, None]: If a user is found,
             then returns UserInDBModel otherwise None
         """
-        return await self.__user_handler.get_one_by_query({"username": username})
+        return await self.__user_handler.get_by_unique("username", username)
 
     async def get_user_by_key(self, key: str) -> Union[UserInDBModel, None]:
         """Get a user by key from the database
@@ -71,21 +177,50 @@ class DatabaseHandler:
         Returns:
             Union[UserInDBModel, None]: If a user is found,
             then returns UserInDBModel otherwise None"""
-        return await self.__user_handler.get_by_key(key)
+        return await self.__get_through_identity_map(
+            "users", key, self.__user_handler.get_by_key
+        )
 
     async def get_user_all(
-        self, limit: int, last_user_key: str
+        self,
+        limit: int,
+        last_user_key: str,
+        model: Type[BaseModel] = UserModelResponse,
     ) -> ResponseItems[UserModelResponse]:
         """Get all users in the database
 
         Args:
             limit (int): Limit of users received
             last_user_key (str): The last user key received in the previous request
+            model (Type[BaseModel], optional): Model of the items.
+            Defaults to UserModelResponse.
 
         Returns:
             ResponseItems[UserModelResponse]: Query result
         """
-        return await self.__user_handler.get_many_by_query(limit, last_user_key)
+        return await self.__user_handler.get_many_by_query(
+            limit, last_user_key, model=model
+        )
+
+    def iterate_users(
+        self,
+        model: Type[BaseModel] = UserModelResponse,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[UserModelResponse]:
+        """Iterate over all users in the database
+
+        Args:
+            model (Type[BaseModel], optional): Model of the items.
+            Defaults to UserModelResponse.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[UserModelResponse]
+        """
+        return self.__user_handler.iterate(None, model, read_ahead, max_bytes)
 
     async def put_many_users(self, users: list) -> dict:
         """Put multiple users in the database
@@ -96,7 +231,8 @@ class DatabaseHandler:
         Returns:
             dict: Returns a dict with "processed" and "failed"(if any) items
         """
-        return await self.__user_handler.put_many(users)
+        with self.__changing("users", *[user["key"] for user in users]):
+            return await self.__user_handler.put_many(users)
 
     async def create_user(self, data: UserInDBModel) -> Union[UserInDBModel, None]:
         """Adding a new user to the database
@@ -104,11 +240,17 @@ class DatabaseHandler:
         Args:
             user (UserInDBModel): New user model
 
+        Raises:
+            UserExistsException: If the email or the username is already taken
+
         Returns:
             Union[UserInDBModel, None]: The model of the user added
             to the database otherwise None
         """
-        return await self.__user_handler.create(data)
+        user = await self.__user_handler.create(data)
+        if user is not None and self.__search_index is not None:
+            self.__search_index.add_user(user)
+        return user
 
     async def delete_user_by_key(self, key: str) -> None:
         """Delete a user from the database by key
@@ -119,7 +261,10 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        return await self.__user_handler.delete_by_key(key)
+        with self.__changing("users", key):
+            await self.__user_handler.delete_by_key(key)
+            if self.__search_index is not None:
+                self.__search_index.remove("user", key)
 
     async def append_links_to_user(self, links: list, key: str) -> None:
         """Add links to the user
@@ -134,11 +279,12 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        try:
-            return await self.__user_handler.append_links(links, key)
-        except UpdateItemException as e:
+        with self.__changing("users", key):
+            try:
+                return await self.__user_handler.append_links(links, key)
+            except UpdateItemException as e:
 
-            raise AppendLinksException("Adding links to the user is not successful")
+                raise AppendLinksException("Adding links to the user is not successful")
 
     async def append_skills_to_user(self, skills: list, key: str) -> None:
         """Add skills to the user
@@ -153,11 +299,14 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        try:
-            return await self.__user_handler.append_skills(skills, key)
-        except UpdateItemException as e:
+        with self.__changing("users", key):
+            try:
+                return await self.__user_handler.append_skills(skills, key)
+            except UpdateItemException as e:
 
-            raise AppendSkillsException("Adding skills to the user is not successful")
+                raise AppendSkillsException(
+                    "Adding skills to the user is not successful"
+                )
 
     async def update_simple_data_to_user(self, data: dict, key: str) -> None:
         """Simple updating of user data
@@ -172,10 +321,72 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        try:
-            return await self.__user_handler.simple_data_update(data, key)
-        except UpdateItemException as e:
+        with self.__changing("users", key):
+            try:
+                return await self.__user_handler.simple_data_update(data, key)
+            except UpdateItemException as e:
+
+                raise UpdateUserDataException("Updating user data was not successful")
+
+    async def change_user_counter(self, name: str, value: int, key: str) -> None:
+        """Changing one counter of the user, such as the number of followers
+
+        Args:
+            name (str): Counter field name
+            value (int): The value by which the counter changes
+            key (str): The user's key in the database
+
+        Raises:
+            UpdateUserDataException: If the user data update was not successful
+
+        Returns:
+            None: Returns nothing
+        """
+        with self.__changing("users", key):
+            try:
+                await self.__user_handler.increment_counter(name, value, key)
+            except UpdateItemException as e:
+
+                raise UpdateUserDataException("Updating user data was not successful")
+
+    async def change_subscription_counters(
+        self, value: int, follower_key: str, favorite_key: str
+    ) -> None:
+        """Changing the number of subscriptions of the follower
+        and the number of followers of the favorite, both counters change or none
+
+        Args:
+            value (int): The value by which the counters change
+            follower_key (str): The follower's key in the database
+            favorite_key (str): The favorite's key in the database
+
+        Raises:
+            UpdateUserDataException: If the user data update was not successful
 
+        Returns:
+            None: Returns nothing
+        """
+        with self.__changing("users", follower_key, favorite_key):
+            counters = [
+                ("subscriptions_count", follower_key),
+                ("followers_count", favorite_key),
+            ]
+            results = await asyncio.gather(
+                *[
+                    self.__user_handler.increment_counter(name, value, key)
+                    for name, key in counters
+                ],
+                return_exceptions=True,
+            )
+            if not any(isinstance(result, BaseException) for result in results):
+                return
+            # Both counters change or none, the one that has changed is reverted
+            for (name, key), result in zip(counters, results):
+                if not isinstance(result, BaseException):
+                    try:
+                        await self.__user_handler.increment_counter(name, -value, key)
+                    except UpdateItemException:
+                        pass
             raise UpdateUserDataException("Updating user data was not successful")
 
     # Role
@@ -224,7 +435,10 @@ class DatabaseHandler:
             Union[SkillInDBModel, None]: The model of the skill added
             to the database otherwise None
         """
-        return await self.__skill_handler.create(data)
+        skill = await self.__skill_handler.create(data)
+        if skill is not None and self.__search_index is not None:
+            self.__search_index.add_skill(skill)
+        return skill
 
     async def get_skill_all(
         self, limit: int, last_skill_key: str
@@ -240,6 +454,21 @@ class DatabaseHandler:
         """
         return await self.__skill_handler.get_many_by_query(limit, last_skill_key)
 
+    def iterate_skills(
+        self, read_ahead: int = 1, max_bytes: int = None
+    ) -> AsyncIterator[SkillInDBModel]:
+        """Iterate over all skills in the database
+
+        Args:
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[SkillInDBModel]
+        """
+        return self.__skill_handler.iterate(None, read_ahead, max_bytes)
+
     async def get_skill_by_key(self, key: str) -> Union[SkillInDBModel, None]:
         """Get a skill by key from the database
 
@@ -283,6 +512,64 @@ class DatabaseHandler:
             limit, last_event_key, query
         )
 
+    def iterate_events_by_query(
+        self, query: dict = None, read_ahead: int = 1, max_bytes: int = None
+    ) -> AsyncIterator[EventInDBModel]:
+        """Iterate over all events matching the criteria
+
+        Args:
+            query (dict, optional): Choosing criteria. Defaults to None
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[EventInDBModel]
+        """
+        return self.__event_handler.iterate(query, read_ahead, max_bytes)
+
+    async def get_events_by_authors(
+        self,
+        author_keys: List[str],
+        limit: int,
+        cursor: str = None,
+        date_range: List[int] = None,
+    ) -> ResponseItems[EventInDBModel]:
+        """Get the events of several authors from the database sorted by date.
+        The authors are queried in groups of bounded size concurrently
+
+        Args:
+            author_keys (List[str]): Keys of the authors
+            limit (int): Limit of events received
+            cursor (str, optional): The cursor received in the previous request.
+            Defaults to None.
+            date_range (List[int], optional): Minimum and maximum date of events.
+            Defaults to None.
+
+        Raises:
+            InvalidCursorException: If the cursor is invalid
+
+        Returns:
+            ResponseItems[EventInDBModel]: Query result
+        """
+        clauses = []
+        for author_key in author_keys:
+            clause = {"author.key": author_key}
+            if date_range is not None:
+                clause["date?r"] = date_range
+            clauses.append(clause)
+
+        async def fetch(query: List[dict], limit: int, last: str):
+            return await self.__event_handler.get_many_by_query(limit, last, query)
+
+        items, last = await self.__query_planner.fetch_merged(
+            fetch, clauses, "date", limit, cursor
+        )
+        # The items have been built by the event handler already
+        return ResponseItems[EventInDBModel].construct(
+            count=len(items), last=last, items=items
+        )
+
     async def delete_event_by_key(self, key: str) -> None:
         """Delete a event from the database by key
 
@@ -292,7 +579,8 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        return await self.__event_handler.delete(key)
+        with self.__changing("events", key):
+            return await self.__event_handler.delete(key)
 
     async def get_event_by_key(self, key: str) -> Union[EventInDBModel, None]:
         """Get a event by key from the database
@@ -304,7 +592,9 @@ class DatabaseHandler:
             Union[EventInDBModel, None]: If a event is found,
             then returns EventInDBModel otherwise None
         """
-        return await self.__event_handler.get_by_key(key)
+        return await self.__get_through_identity_map(
+            "events", key, self.__event_handler.get_by_key
+        )
 
     async def update_event_by_key(self, event: EventInputModel, key: str) -> None:
         """Updating of event data
@@ -319,22 +609,12 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        try:
-            return await self.__event_handler.update(event, key)
-        except UpdateItemException as e:
-
-            raise UpdateEventException("Updating event data was not successful")
-
-    async def delete_events_after_user(self, keys: list[dict]) -> dict:
-        """Deleting events by keys
-
-        Args:
-            keys (list[dict]): List of event keys
+        with self.__changing("events", key):
+            try:
+                return await self.__event_handler.update(event, key)
+            except UpdateItemException as e:
 
-        Returns:
-            dict: Returns a dict with processed and failed(if any) items
-        """
-        return await self.__event_handler.delete_after_user(keys)
+                raise UpdateEventException("Updating event data was not successful")
 
     # Post
     async def create_post(self, post: PostInDBModel) -> Union[PostInDBModel, None]:
@@ -347,10 +627,17 @@ class DatabaseHandler:
             Union[PostInDBModel, None]: The model of the post added
             to the database otherwise None
         """
-        return await self.__post_handler.create(post)
+        post = await self.__post_handler.create(post)
+        if post is not None and self.__search_index is not None:
+            self.__search_index.add_post(post)
+        return post
 
     async def get_posts_by_query(
-        self, limit: int, last_post_key: str, query: dict = None
+        self,
+        limit: int,
+        last_post_key: str,
+        query: dict = None,
+        model: Type[BaseModel] = PostInDBModel,
     ) -> ResponseItems[PostInDBModel]:
         """Get posts by different criteria from the database
 
@@ -358,11 +645,37 @@ class DatabaseHandler:
             limit (int): Limit of posts received
             last_post_key (str): The last post key received in the previous request
             query (dict, optional): Choosing criteria. Defaults to None
+            model (Type[BaseModel], optional): Model of the items.
+            Defaults to PostInDBModel.
 
         Returns:
             ResponseItems[PostInDBModel]: Query result
         """
-        return await self.__post_handler.get_many_by_query(limit, last_post_key, query)
+        return await self.__post_handler.get_many_by_query(
+            limit, last_post_key, query, model
+        )
+
+    def iterate_posts_by_query(
+        self,
+        query: dict = None,
+        model: Type[BaseModel] = PostInDBModel,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[PostInDBModel]:
+        """Iterate over all posts matching the criteria
+
+        Args:
+            query (dict, optional): Choosing criteria. Defaults to None
+            model (Type[BaseModel], optional): Model of the items.
+            Defaults to PostInDBModel.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[PostInDBModel]
+        """
+        return self.__post_handler.iterate(query, model, read_ahead, max_bytes)
 
     async def get_post_by_key(self, key: str) -> Union[PostInDBModel, None]:
         """Get post by key from the database
@@ -374,7 +687,9 @@ class DatabaseHandler:
             Union[PostInDBModel, None]: If a post is found,
             then returns PostInDBModel otherwise None
         """
-        return await self.__post_handler.get_by_key(key)
+        return await self.__get_through_identity_map(
+            "posts", key, self.__post_handler.get_by_key
+        )
 
     async def delete_post_by_key(self, key: str) -> None:
         """Delete a post from the database by key
@@ -385,7 +700,10 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        return await self.__post_handler.delete_by_key(key)
+        with self.__changing("posts", key):
+            await self.__post_handler.delete_by_key(key)
+            if self.__search_index is not None:
+                self.__search_index.remove("post", key)
 
     async def update_post_by_key(self, post: dict, post_key: str) -> None:
         """Updating of post data
@@ -400,51 +718,462 @@ class DatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        try:
-            return await self.__post_handler.update(post, post_key)
-        except UpdateItemException as e:
+        with self.__changing("posts", post_key):
+            try:
+                await self.__post_handler.update(post, post_key)
+            except UpdateItemException as e:
 
-            raise UpdatePostException("Updating post data was not successful")
+                raise UpdatePostException("Updating post data was not successful")
+            if self.__search_index is not None:
+                # The update has only some of the fields, the index needs the whole post
+                post = await self.__post_handler.get_by_key(post_key)
+                if post is not None:
+                    self.__search_index.add_post(post)
 
-    async def append_like_to_post(self, like: LikeModel, post_key: str) -> None:
-        """Add like to the post
+    async def change_like_count_of_post(self, value: int, post_key: str) -> None:
+        """Changing the number of likes of the post
 
         Args:
-            like (LikeModel)
+            value (int): The value by which the number of likes changes
             post_key (str): The post key in the database
 
         Raises:
-            AppendLikeException: If it is not successful to add like to the post
+            UpdatePostException: If the post data update was not successful
 
         Returns:
             None: Returns nothing
         """
-        try:
-            return await self.__post_handler.append_like(like, post_key)
-        except UpdateItemException as e:
+        with self.__changing("posts", post_key):
+            try:
+                return await self.__post_handler.increment_counter(
+                    "like_count", value, post_key
+                )
+            except UpdateItemException as e:
 
-            raise AppendLikeException("Adding like to post is not successful")
+                raise UpdatePostException("Updating post data was not successful")
 
-    async def append_comment_to_post(
-        self, comment: CommentModel, post_key: str
-    ) -> None:
-        """Add comment to post
+    async def change_comment_count_of_post(self, value: int, post_key: str) -> None:
+        """Changing the number of comments of the post
 
         Args:
-            comment (CommentModel): comment model
-            post_key (str): post key in the database
+            value (int): The value by which the number of comments changes
+            post_key (str): The post key in the database
 
         Raises:
-            AppendCommentException: If it is not successful to add comment to the post
+            UpdatePostException: If the post data update was not successful
 
         Returns:
             None: Returns nothing
         """
-        try:
-            return await self.__post_handler.append_comment(comment, post_key)
-        except UpdateItemException as e:
+        with self.__changing("posts", post_key):
+            try:
+                return await self.__post_handler.increment_counter(
+                    "comment_count", value, post_key
+                )
+            except UpdateItemException as e:
+
+                raise UpdatePostException("Updating post data was not successful")
+
+    # Like
+    async def create_like(self, like: LikeInDBModel) -> Union[LikeInDBModel, None]:
+        """Adding a new like to the database, if the like has not been set yet
+
+        Args:
+            like (LikeInDBModel): New like model
+
+        Returns:
+            Union[LikeInDBModel, None]: The model of the like added
+            to the database otherwise None
+        """
+        return await self.__like_handler.insert(like)
+
+    async def get_like_by_key(self, key: str) -> Union[LikeInDBModel, None]:
+        """Get a like by key from the database
+
+        Args:
+            key (str): The like key in the database
+
+        Returns:
+            Union[LikeInDBModel, None]: If a like is found,
+            then returns LikeInDBModel otherwise None
+        """
+        return await self.__like_handler.get_by_key(key)
+
+    async def get_likes_by_query(
+        self, query: dict, limit: int, last_like_key: str
+    ) -> ResponseItems[LikeInDBModel]:
+        """Get likes by different criteria from the database
+
+        Args:
+            query (dict): Choosing criteria
+            limit (int): Limit of likes received
+            last_like_key (str): The last like key received in the previous request
+
+        Returns:
+            ResponseItems[LikeInDBModel]: Query result
+        """
+        return await self.__like_handler.get_many_by_query(query, limit, last_like_key)
+
+    def iterate_likes_by_query(
+        self, query: dict, read_ahead: int = 1, max_bytes: int = None
+    ) -> AsyncIterator[LikeInDBModel]:
+        """Iterate over all likes matching the criteria
+
+        Args:
+            query (dict): Choosing criteria
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[LikeInDBModel]
+        """
+        return self.__like_handler.iterate(query, read_ahead, max_bytes)
+
+    async def delete_like_by_key(self, key: str) -> None:
+        """Delete a like from the database by key
+
+        Args:
+            key (str): The like key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__like_handler.delete_by_key(key)
+
+    async def remove_like(self, like: LikeInDBModel) -> bool:
+        """Deleting a like once for all concurrent removals of it
+
+        Args:
+            like (LikeInDBModel): The like read before the removal
+
+        Returns:
+            bool: True if the like has been deleted by this call,
+            False if it has been removed by another one
+        """
+        return await self.__like_handler.remove(like)
+
+    async def restore_like(self, like: LikeInDBModel) -> Union[LikeInDBModel, None]:
+        """Putting back a removed like
+
+        Args:
+            like (LikeInDBModel): The removed like
+
+        Returns:
+            Union[LikeInDBModel, None]: The model of the like put back
+            otherwise None
+        """
+        return await self.__like_handler.restore(like)
+
+    async def delete_likes_of_post(self, post_key: str) -> None:
+        """Delete all likes of the post from the database
+
+        Args:
+            post_key (str): The post key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__like_handler.delete_by_post(post_key)
+
+    # Comment
+    async def create_comment(
+        self, comment: CommentInDBModel
+    ) -> Union[CommentInDBModel, None]:
+        """Adding a new comment to the database
+
+        Args:
+            comment (CommentInDBModel): New comment model
+
+        Returns:
+            Union[CommentInDBModel, None]: The model of the comment added
+            to the database otherwise None
+        """
+        return await self.__comment_handler.insert(comment)
+
+    async def get_comment_by_key(self, key: str) -> Union[CommentInDBModel, None]:
+        """Get a comment by key from the database
+
+        Args:
+            key (str): The comment key in the database
+
+        Returns:
+            Union[CommentInDBModel, None]: If a comment is found,
+            then returns CommentInDBModel otherwise None
+        """
+        return await self.__comment_handler.get_by_key(key)
+
+    async def get_comments_by_post_key(
+        self, post_key: str, limit: int, last_comment_key: str
+    ) -> ResponseItems[CommentInDBModel]:
+        """Get the comments of the post from the database from old to new
+
+        Args:
+            post_key (str): The post key in the database
+            limit (int): Limit of comments received
+            last_comment_key (str): The last comment key received
+            in the previous request
+
+        Returns:
+            ResponseItems[CommentInDBModel]: Query result
+        """
+        return await self.__comment_handler.get_many_by_prefix(
+            f"{post_key}:", limit, last_comment_key
+        )
+
+    def iterate_comments_by_query(
+        self, query: dict, read_ahead: int = 1, max_bytes: int = None
+    ) -> AsyncIterator[CommentInDBModel]:
+        """Iterate over all comments matching the criteria
+
+        Args:
+            query (dict): Choosing criteria
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[CommentInDBModel]
+        """
+        return self.__comment_handler.iterate(query, read_ahead, max_bytes)
+
+    async def delete_comment_by_key(self, key: str) -> None:
+        """Delete a comment from the database by key
+
+        Args:
+            key (str): The comment key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__comment_handler.delete_by_key(key)
+
+    async def delete_comments_of_post(self, post_key: str) -> None:
+        """Delete all comments of the post from the database
+
+        Args:
+            post_key (str): The post key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__comment_handler.delete_by_post(post_key)
+
+    # Subscription
+    async def create_subscription(
+        self, subscription: SubscriptionInDBModel
+    ) -> Union[SubscriptionInDBModel, None]:
+        """Adding a new subscription to the database, if it does not exist yet
+
+        Args:
+            subscription (SubscriptionInDBModel): New subscription model
+
+        Returns:
+            Union[SubscriptionInDBModel, None]: The model of the subscription added
+            to the database otherwise None
+        """
+        return await self.__subscription_handler.insert(subscription)
+
+    async def get_subscription_by_key(
+        self, key: str
+    ) -> Union[SubscriptionInDBModel, None]:
+        """Get a subscription by key from the database
+
+        Args:
+            key (str): The subscription key in the database
+
+        Returns:
+            Union[SubscriptionInDBModel, None]: If a subscription is found,
+            then returns SubscriptionInDBModel otherwise None
+        """
+        return await self.__subscription_handler.get_by_key(key)
+
+    async def get_subscriptions_of_follower(
+        self, follower_key: str, limit: int, last_subscription_key: str
+    ) -> ResponseItems[SubscriptionInDBModel]:
+        """Get the subscriptions of the follower from the database
+
+        Args:
+            follower_key (str): The follower's key in the database
+            limit (int): Limit of subscriptions received
+            last_subscription_key (str): The last subscription key received
+            in the previous request
+
+        Returns:
+            ResponseItems[SubscriptionInDBModel]: Query result
+        """
+        return await self.__subscription_handler.get_many_by_query(
+            {"key?pfx": f"{follower_key}:"}, limit, last_subscription_key
+        )
+
+    async def get_all_subscriptions_of_follower(
+        self, follower_key: str
+    ) -> List[SubscriptionInDBModel]:
+        """Get all the subscriptions of the follower from the database
+
+        Args:
+            follower_key (str): The follower's key in the database
+
+        Returns:
+            List[SubscriptionInDBModel]: Query result
+        """
+        return await self.__subscription_handler.get_all_by_query(
+            {"key?pfx": f"{follower_key}:"}
+        )
+
+    async def get_all_subscriptions_to_favorite(
+        self, favorite_key: str
+    ) -> List[SubscriptionInDBModel]:
+        """Get all the subscriptions to the favorite from the database
+
+        Args:
+            favorite_key (str): The favorite's key in the database
+
+        Returns:
+            List[SubscriptionInDBModel]: Query result
+        """
+        return await self.__subscription_handler.get_all_by_query(
+            {"favorite.key": favorite_key}
+        )
+
+    async def get_subscriptions_to_favorite(
+        self, favorite_key: str, limit: int, last_subscription_key: str
+    ) -> ResponseItems[SubscriptionInDBModel]:
+        """Get the subscriptions to the favorite from the database,
+        that is, the favorite's followers
+
+        Args:
+            favorite_key (str): The favorite's key in the database
+            limit (int): Limit of subscriptions received
+            last_subscription_key (str): The last subscription key received
+            in the previous request
+
+        Returns:
+            ResponseItems[SubscriptionInDBModel]: Query result
+        """
+        return await self.__subscription_handler.get_many_by_query(
+            {"favorite.key": favorite_key}, limit, last_subscription_key
+        )
+
+    async def delete_subscription_by_key(self, key: str) -> None:
+        """Delete a subscription from the database by key
+
+        Args:
+            key (str): The subscription key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__subscription_handler.delete_by_key(key)
+
+    def iterate_subscriptions_by_query(
+        self, query: dict, read_ahead: int = 1, max_bytes: int = None
+    ) -> AsyncIterator[SubscriptionInDBModel]:
+        """Iterate over all subscriptions matching the criteria
+
+        Args:
+            query (dict): Choosing criteria
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[SubscriptionInDBModel]
+        """
+        return self.__subscription_handler.iterate(query, read_ahead, max_bytes)
+
+    # Timeline
+    async def put_timeline_entries(self, entries: List[TimelineEntryModel]) -> None:
+        """Put entries to the timelines of the followers
+
+        Args:
+            entries (List[TimelineEntryModel]): List of timeline entries
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__timeline_handler.put_many(entries)
+
+    async def get_timeline(
+        self,
+        follower_key: str,
+        limit: int,
+        last_entry_key: str = None,
+        date_range: List[int] = None,
+    ) -> ResponseItems[TimelineEntryModel]:
+        """Get the timeline of the follower from the database sorted by date
+
+        Args:
+            follower_key (str): The follower's key in the database
+            limit (int): Limit of entries received
+            last_entry_key (str, optional): The last entry key received
+            in the previous request. Defaults to None.
+            date_range (List[int], optional): Minimum and maximum date of events.
+            Defaults to None.
+
+        Returns:
+            ResponseItems[TimelineEntryModel]: Query result
+        """
+        query = {"key?pfx": f"{follower_key}:"}
+        if date_range is not None:
+            query["date?r"] = date_range
+        return await self.__timeline_handler.get_many_by_query(
+            query, limit, last_entry_key
+        )
+
+    async def delete_timeline_entries(self, keys: List[str]) -> None:
+        """Delete timeline entries by keys
+
+        Args:
+            keys (List[str]): The entry keys in the database
 
-            raise AppendCommentException("Adding comment to post is not successful")
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__timeline_handler.delete_by_keys(keys)
+
+    async def delete_timeline_entries_of_author(
+        self, follower_key: str, author_key: str
+    ) -> None:
+        """Delete the events of the author from the timeline of the follower
+
+        Args:
+            follower_key (str): The follower's key in the database
+            author_key (str): The author's key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__timeline_handler.delete_by_query(
+            {"key?pfx": f"{follower_key}:", "event.author.key": author_key}
+        )
+
+    def iterate_timeline_entries_by_query(
+        self, query: dict, read_ahead: int = 1, max_bytes: int = None
+    ) -> AsyncIterator[TimelineEntryModel]:
+        """Iterate over all timeline entries matching the criteria
+
+        Args:
+            query (dict): Choosing criteria
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[TimelineEntryModel]
+        """
+        return self.__timeline_handler.iterate(query, read_ahead, max_bytes)
+
+    async def delete_timeline_entry_by_key(self, key: str) -> None:
+        """Delete a timeline entry from the database by key
+
+        Args:
+            key (str): The entry key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__timeline_handler.delete_by_key(key)
 
     # Suggestion
     async def add_suggestion(
@@ -496,3 +1225,134 @@ class DatabaseHandler:
             raise UpdateSuggestionException(
                 "Updating suggestion data was not successful"
             )
+
+    async def create_blob(self, blob: BlobInDBModel) -> Union[BlobInDBModel, None]:
+        """Adding a new blob to the database, if there is no blob with the same digest
+
+        Args:
+            blob (BlobInDBModel): New blob model
+
+        Returns:
+            Union[BlobInDBModel, None]: The model of the blob added
+            to the database otherwise None
+        """
+        return await self.__blob_handler.insert(blob)
+
+    async def get_blob_by_key(self, key: str) -> Union[BlobInDBModel, None]:
+        """Get a blob by key from the database
+
+        Args:
+            key (str): The blob key in the database
+
+        Returns:
+            Union[BlobInDBModel, None]: If a blob is found,
+            then returns BlobInDBModel otherwise None
+        """
+        return await self.__blob_handler.get_by_key(key)
+
+    async def get_blobs_by_query(
+        self, query: dict, limit: int, last_blob_key: str
+    ) -> ResponseItems[BlobInDBModel]:
+        """Get blobs by different criteria from the database
+
+        Args:
+            query (dict): Choosing criteria
+            limit (int): Limit of blobs received
+            last_blob_key (str): The last blob key received in the previous request
+
+        Returns:
+            ResponseItems[BlobInDBModel]: Query result
+        """
+        return await self.__blob_handler.get_many_by_query(query, limit, last_blob_key)
+
+    async def update_blob(self, data: dict, key: str) -> None:
+        """Updating of blob data
+
+        Args:
+            data (dict): blob data
+            key (str): The blob key in the database
+
+        Raises:
+            UpdateBlobException: If there is no blob or the update was not successful
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            return await self.__blob_handler.update(data, key)
+        except UpdateItemException as e:
+
+            raise UpdateBlobException("Updating blob data was not successful")
+
+    async def change_blob_ref_count(self, value: int, key: str) -> None:
+        """Changing the number of references to the blob
+
+        Args:
+            value (int): The value by which the number of references changes
+            key (str): The blob key in the database
+
+        Raises:
+            UpdateBlobException: If there is no blob or the update was not successful
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            return await self.__blob_handler.increment_ref_count(value, key)
+        except UpdateItemException as e:
+
+            raise UpdateBlobException("Updating blob data was not successful")
+
+    async def delete_blob_by_key(self, key: str) -> None:
+        """Delete a blob from the database by key
+
+        Args:
+            key (str): The blob key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__blob_handler.delete_by_key(key)
+
+    # Deletion job
+    async def put_deletion_job(
+        self, job: DeletionJobModel
+    ) -> Union[DeletionJobModel, None]:
+        """Putting a deletion job in the database, the previous state is replaced
+
+        Args:
+            job (DeletionJobModel)
+
+        Returns:
+            Union[DeletionJobModel, None]: The model of the job put
+            in the database otherwise None
+        """
+        return await self.__deletion_job_handler.put(job)
+
+    async def get_deletion_job_by_key(self, key: str) -> Union[DeletionJobModel, None]:
+        """Get a deletion job by key from the database
+
+        Args:
+            key (str): The job key in the database
+
+        Returns:
+            Union[DeletionJobModel, None]: If a job is found,
+            then returns DeletionJobModel otherwise None
+        """
+        return await self.__deletion_job_handler.get_by_key(key)
+
+    def iterate_deletion_jobs_by_query(
+        self, query: dict, read_ahead: int = 1, max_bytes: int = None
+    ) -> AsyncIterator[DeletionJobModel]:
+        """Iterate over all deletion jobs matching the criteria
+
+        Args:
+            query (dict): Choosing criteria
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[DeletionJobModel]
+        """
+        return self.__deletion_job_handler.iterate(query, read_ahead, max_bytes)
@@ -0,0 +1,137 @@
+from typing import AsyncIterator, Union
+
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
+from exceptions.update_item_exception import UpdateItemException
+from models.blob_model import BlobInDBModel
+from models.response_items import ResponseItems
+
+
+class BlobDatabaseHandler:
+    def __init__(self, transport: Transport):
+        self.__blobs_db = transport.open_base("blobs")
+
+    async def insert(self, blob: BlobInDBModel) -> Union[BlobInDBModel, None]:
+        """Adding a new blob to the database, if there is no blob with the same key
+
+        Args:
+            blob (BlobInDBModel): New blob model
+
+        Returns:
+            Union[BlobInDBModel, None]: The model of the blob added
+            to the database otherwise None
+        """
+        try:
+            blob = await self.__blobs_db.insert(blob.dict(), blob.key)
+            return construct_trusted(BlobInDBModel, blob)
+        except:
+            return None
+
+    async def get_by_key(self, key: str) -> Union[BlobInDBModel, None]:
+        """Get a blob by key from the database
+
+        Args:
+            key (str): The blob key in the database
+
+        Returns:
+            Union[BlobInDBModel, None]: If a blob is found,
+            then returns BlobInDBModel otherwise None
+        """
+        blob = await self.__blobs_db.get(key)
+        return construct_trusted_or_none(BlobInDBModel, blob)
+
+    async def get_many_by_query(
+        self, query: dict, limit: int, last_blob_key: str
+    ) -> ResponseItems[BlobInDBModel]:
+        """Get blobs by different criteria from the database
+
+        Args:
+            query (dict): Choosing criteria
+            limit (int): Limit of blobs received
+            last_blob_key (str): The last blob key received in the previous request
+
+        Returns:
+            ResponseItems[BlobInDBModel]: Query result
+        """
+        result = await self.__blobs_db.fetch(query, limit=limit, last=last_blob_key)
+        return construct_trusted(
+            ResponseItems[BlobInDBModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[BlobInDBModel]:
+        """Iterate over all blobs matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[BlobInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__blobs_db.fetch(query, limit=limit, last=last),
+            BlobInDBModel,
+            read_ahead,
+            max_bytes,
+        )
+
+    async def update(self, blob: dict, key: str) -> None:
+        """Updating of blob data
+
+        Args:
+            blob (dict): blob data
+            key (str): The blob key in the database
+
+        Raises:
+            UpdateItemException: If there is no blob or the update was not successful
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            return await self.__blobs_db.update(blob, key)
+        except BaseException as e:
+
+            raise UpdateItemException("Updating data was not successful")
+
+    async def increment_ref_count(self, value: int, key: str) -> None:
+        """Changing the number of references to the blob
+
+        Args:
+            value (int): The value by which the number of references changes
+            key (str): The blob key in the database
+
+        Raises:
+            UpdateItemException: If there is no blob or the update was not successful
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            return await self.__blobs_db.update(
+                {"ref_count": self.__blobs_db.util.increment(value)}, key
+            )
+        except BaseException as e:
+
+            raise UpdateItemException("Updating data was not successful")
+
+    async def delete_by_key(self, key: str) -> None:
+        """Delete a blob from the database by key
+
+        Args:
+            key (str): The blob key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__blobs_db.delete(key)
@@ -0,0 +1,121 @@
+from typing import AsyncIterator, Union
+
+from db.batch_delete import delete_keys
+from db.page_iterator import iterate_pages
+from db.transport.conflict import is_conflict
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
+from models.comment_model import CommentInDBModel
+from models.response_items import ResponseItems
+
+
+class CommentDatabaseHandler:
+    def __init__(self, transport: Transport):
+        self.__comments_db = transport.open_base("comments")
+
+    async def insert(self, comment: CommentInDBModel) -> Union[CommentInDBModel, None]:
+        """Adding a new comment to the database, if there is no comment
+        with the same key
+
+        Args:
+            comment (CommentInDBModel): New comment model
+
+        Raises:
+            Exception: Errors of the transport other than an existing key
+
+        Returns:
+            Union[CommentInDBModel, None]: The model of the comment added
+            to the database otherwise None
+        """
+        try:
+            comment = await self.__comments_db.insert(comment.dict(), comment.key)
+            return construct_trusted(CommentInDBModel, comment)
+        except Exception as e:
+            if not is_conflict(e):
+                raise
+            return None
+
+    async def get_by_key(self, key: str) -> Union[CommentInDBModel, None]:
+        """Get a comment by key from the database
+
+        Args:
+            key (str): The comment key in the database
+
+        Returns:
+            Union[CommentInDBModel, None]: If a comment is found,
+            then returns CommentInDBModel otherwise None
+        """
+        comment = await self.__comments_db.get(key)
+        return construct_trusted_or_none(CommentInDBModel, comment)
+
+    async def get_many_by_prefix(
+        self, prefix: str, limit: int, last_comment_key: str
+    ) -> ResponseItems[CommentInDBModel]:
+        """Get comments whose keys start with the prefix, in the order of the keys
+
+        Args:
+            prefix (str): Beginning of the comment keys
+            limit (int): Limit of comments received
+            last_comment_key (str): The last comment key received
+            in the previous request
+
+        Returns:
+            ResponseItems[CommentInDBModel]: Query result
+        """
+        result = await self.__comments_db.fetch(
+            {"key?pfx": prefix}, limit=limit, last=last_comment_key
+        )
+        return construct_trusted(
+            ResponseItems[CommentInDBModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[CommentInDBModel]:
+        """Iterate over all comments matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[CommentInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__comments_db.fetch(query, limit=limit, last=last),
+            CommentInDBModel,
+            read_ahead,
+            max_bytes,
+        )
+
+    async def delete_by_key(self, key: str) -> None:
+        """Delete a comment from the database by key
+
+        Args:
+            key (str): The comment key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__comments_db.delete(key)
+
+    async def delete_by_post(self, post_key: str) -> None:
+        """Delete all comments of the post from the database in batches
+
+        Args:
+            post_key (str): The post key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        keys = [
+            comment.key async for comment in self.iterate({"key?pfx": f"{post_key}:"})
+        ]
+        await delete_keys(self.__comments_db, keys)
@@ -0,0 +1,65 @@
+from typing import AsyncIterator, Union
+
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
+from models.deletion_job_model import DeletionJobModel
+
+
+class DeletionJobDatabaseHandler:
+    def __init__(self, transport: Transport):
+        self.__jobs_db = transport.open_base("deletion_jobs")
+
+    async def put(self, job: DeletionJobModel) -> Union[DeletionJobModel, None]:
+        """Putting a job in the database, the previous state is replaced
+
+        Args:
+            job (DeletionJobModel)
+
+        Returns:
+            Union[DeletionJobModel, None]: The model of the job put
+            in the database otherwise None
+        """
+        try:
+            job = await self.__jobs_db.put(job.dict(), job.key)
+            return construct_trusted(DeletionJobModel, job)
+        except:
+            return None
+
+    async def get_by_key(self, key: str) -> Union[DeletionJobModel, None]:
+        """Get a job by key from the database
+
+        Args:
+            key (str): The job key in the database
+
+        Returns:
+            Union[DeletionJobModel, None]: If a job is found,
+            then returns DeletionJobModel otherwise None
+        """
+        job = await self.__jobs_db.get(key)
+        return construct_trusted_or_none(DeletionJobModel, job)
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[DeletionJobModel]:
+        """Iterate over all jobs matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[DeletionJobModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__jobs_db.fetch(query, limit=limit, last=last),
+            DeletionJobModel,
+            read_ahead,
+            max_bytes,
+        )
@@ -1,7 +1,9 @@
 from datetime import timedelta
-from typing import Union
-from deta import Deta
+from typing import AsyncIterator, Union
 
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
 from exceptions.update_item_exception import UpdateItemException
 from handlers.datetime_handler import DatetimeHandler
 from models.event_model import EventInDBModel, EventInputModel
@@ -9,8 +11,8 @@ from models.response_items import ResponseItems
 
 
 class EventDatabaseHandler:
-    def __init__(self, deta: Deta):
-        self.__event_db = deta.AsyncBase("events")
+    def __init__(self, transport: Transport):
+        self.__event_db = transport.open_base("events")
         self.__datetime_handler = DatetimeHandler()
 
     async def get_many_by_query(
@@ -28,8 +30,34 @@ class EventDatabaseHandler:
             ResponseItems[EventInDBModel]: Query result
         """
         result = await self.__event_db.fetch(query, limit=limit, last=last_event_key)
-        return ResponseItems[EventInDBModel](
-            count=result.count, last=result.last, items=result.items
+        return construct_trusted(
+            ResponseItems[EventInDBModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[EventInDBModel]:
+        """Iterate over all events matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[EventInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__event_db.fetch(query, limit=limit, last=last),
+            EventInDBModel,
+            read_ahead,
+            max_bytes,
         )
 
     async def create(self, event: EventInDBModel) -> Union[EventInDBModel, None]:
@@ -50,7 +78,7 @@ class EventDatabaseHandler:
                 data=event.dict(),
                 expire_at=self.__datetime_handler.convert_to_int(expire_at),
             )
-            return EventInDBModel(**event)
+            return construct_trusted(EventInDBModel, event)
         except:
             return None
 
@@ -76,7 +104,7 @@ class EventDatabaseHandler:
             then returns EventInDBModel otherwise None
         """
         event = await self.__event_db.get(key)
-        return EventInDBModel(**event) if event is not None else None
+        return construct_trusted_or_none(EventInDBModel, event)
 
     async def update(self, event: EventInputModel, key: str) -> None:
         """Updating of event data
@@ -103,14 +131,3 @@ class EventDatabaseHandler:
         except BaseException as e:
 
             raise UpdateItemException("Updating data was not successful")
-
-    async def delete_after_user(self, keys: list[dict]) -> dict:
-        """Deleting events by keys
-
-        Args:
-            keys (list[dict]): List of event keys
-
-        Returns:
-            dict: Returns a dict with processed and failed(if any) items
-        """
-        return await self.__event_db.put_many(keys, expire_in=3)
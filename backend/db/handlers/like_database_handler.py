@@ -0,0 +1,172 @@
+from typing import AsyncIterator, Union
+
+from db.batch_delete import delete_keys
+from db.page_iterator import iterate_pages
+from db.transport.conflict import is_conflict
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
+from models.like_model import LikeInDBModel
+from models.response_items import ResponseItems
+
+# Seconds a removal of a like is remembered, concurrent removals come
+# within this time
+REMOVAL_TTL = 600
+
+
+class LikeDatabaseHandler:
+    def __init__(self, transport: Transport):
+        self.__likes_db = transport.open_base("likes")
+        self.__removals_db = transport.open_base("like_removals")
+
+    def __get_removal_key(self, like: LikeInDBModel) -> str:
+        """Creating the key of a removal, a like put again after the removal
+        has another creation date and gets another key
+
+        Args:
+            like (LikeInDBModel)
+
+        Returns:
+            str: Removal key
+        """
+        return f"{like.key}:{like.date_create}"
+
+    async def insert(self, like: LikeInDBModel) -> Union[LikeInDBModel, None]:
+        """Adding a new like to the database, if there is no like with the same key
+
+        Args:
+            like (LikeInDBModel): New like model
+
+        Raises:
+            Exception: Errors of the transport other than an existing key
+
+        Returns:
+            Union[LikeInDBModel, None]: The model of the like added
+            to the database, None if the like has been put already
+        """
+        try:
+            like = await self.__likes_db.insert(like.dict(), like.key)
+            return construct_trusted(LikeInDBModel, like)
+        except Exception as e:
+            if not is_conflict(e):
+                raise
+            return None
+
+    async def remove(self, like: LikeInDBModel) -> bool:
+        """Deleting a like once for all concurrent removals. The removal is claimed
+        by inserting its key, only the call that has claimed it deletes the like
+
+        Args:
+            like (LikeInDBModel): The like read before the removal
+
+        Raises:
+            Exception: Errors of the transport other than an existing key
+
+        Returns:
+            bool: True if the like has been deleted by this call,
+            False if another removal has claimed it
+        """
+        key = self.__get_removal_key(like)
+        try:
+            await self.__removals_db.insert(
+                {"like_key": like.key}, key, expire_in=REMOVAL_TTL
+            )
+        except Exception as e:
+            if not is_conflict(e):
+                raise
+            return False
+        await self.__likes_db.delete(like.key)
+        return True
+
+    async def restore(self, like: LikeInDBModel) -> Union[LikeInDBModel, None]:
+        """Putting back a removed like, it can be removed again
+
+        Args:
+            like (LikeInDBModel): The removed like
+
+        Returns:
+            Union[LikeInDBModel, None]: The model of the like put back,
+            None if the like has been put again meanwhile
+        """
+        result = await self.insert(like)
+        await self.__removals_db.delete(self.__get_removal_key(like))
+        return result
+
+    async def get_by_key(self, key: str) -> Union[LikeInDBModel, None]:
+        """Get a like by key from the database
+
+        Args:
+            key (str): The like key in the database
+
+        Returns:
+            Union[LikeInDBModel, None]: If a like is found,
+            then returns LikeInDBModel otherwise None
+        """
+        like = await self.__likes_db.get(key)
+        return construct_trusted_or_none(LikeInDBModel, like)
+
+    async def get_many_by_query(
+        self, query: dict, limit: int, last_like_key: str
+    ) -> ResponseItems[LikeInDBModel]:
+        """Get likes by different criteria from the database
+
+        Args:
+            query (dict): Choosing criteria
+            limit (int): Limit of likes received
+            last_like_key (str): The last like key received in the previous request
+
+        Returns:
+            ResponseItems[LikeInDBModel]: Query result
+        """
+        result = await self.__likes_db.fetch(query, limit=limit, last=last_like_key)
+        return construct_trusted(
+            ResponseItems[LikeInDBModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[LikeInDBModel]:
+        """Iterate over all likes matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[LikeInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__likes_db.fetch(query, limit=limit, last=last),
+            LikeInDBModel,
+            read_ahead,
+            max_bytes,
+        )
+
+    async def delete_by_key(self, key: str) -> None:
+        """Delete a like from the database by key
+
+        Args:
+            key (str): The like key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__likes_db.delete(key)
+
+    async def delete_by_post(self, post_key: str) -> None:
+        """Delete all likes of the post from the database in batches
+
+        Args:
+            post_key (str): The post key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        keys = [like.key async for like in self.iterate({"post_key": post_key})]
+        await delete_keys(self.__likes_db, keys)
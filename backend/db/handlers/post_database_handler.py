@@ -1,16 +1,17 @@
-from typing import Union
-from deta import Deta
+from typing import AsyncIterator, Type, Union
+from pydantic import BaseModel
 
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
 from exceptions.update_item_exception import UpdateItemException
-from models.comment_model import CommentModel
-from models.like_model import LikeModel
 from models.post_model import PostInDBModel
 from models.response_items import ResponseItems
 
 
 class PostDatabaseHandler:
-    def __init__(self, deta: Deta):
-        self.__posts_db = deta.AsyncBase("posts")
+    def __init__(self, transport: Transport):
+        self.__posts_db = transport.open_base("posts")
 
     async def create(self, post: PostInDBModel) -> Union[PostInDBModel, None]:
         """Adding a new post to the database
@@ -24,12 +25,16 @@ class PostDatabaseHandler:
         """
         try:
             post = await self.__posts_db.put(post.dict())
-            return PostInDBModel(**post)
+            return construct_trusted(PostInDBModel, post)
         except:
             return None
 
     async def get_many_by_query(
-        self, limit: int, last_post_key: str, query: dict = None
+        self,
+        limit: int,
+        last_post_key: str,
+        query: dict = None,
+        model: Type[BaseModel] = PostInDBModel,
     ) -> ResponseItems[PostInDBModel]:
         """Get posts by different criteria from the database
 
@@ -37,13 +42,44 @@ class PostDatabaseHandler:
             limit (int): Limit of posts received
             last_post_key (str): The last post key received in the previous request
             query (dict, optional): Choosing criteria. Defaults to None
+            model (Type[BaseModel], optional): Model of the items, only its fields
+            are read from the documents. Defaults to PostInDBModel.
 
         Returns:
             ResponseItems[PostInDBModel]: Query result
         """
         result = await self.__posts_db.fetch(query, limit=limit, last=last_post_key)
-        return ResponseItems[PostInDBModel](
-            count=result.count, last=result.last, items=result.items
+        return construct_trusted(
+            ResponseItems[model],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        model: Type[BaseModel] = PostInDBModel,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[PostInDBModel]:
+        """Iterate over all posts matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            model (Type[BaseModel], optional): Model of the items, only its fields
+            are read from the documents. Defaults to PostInDBModel.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[PostInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__posts_db.fetch(query, limit=limit, last=last),
+            model,
+            read_ahead,
+            max_bytes,
         )
 
     async def get_by_key(self, key: str) -> Union[PostInDBModel, None]:
@@ -57,7 +93,7 @@ class PostDatabaseHandler:
             then returns PostInDBModel otherwise None
         """
         post = await self.__posts_db.get(key)
-        return PostInDBModel(**post) if post is not None else None
+        return construct_trusted_or_none(PostInDBModel, post)
 
     async def delete_by_key(self, key: str) -> None:
         """Delete a post from the database by key
@@ -89,11 +125,12 @@ class PostDatabaseHandler:
             
             raise UpdateItemException("Updating data was not successful")
 
-    async def append_like(self, like: LikeModel, post_key: str) -> None:
-        """Add like to post
+    async def increment_counter(self, name: str, value: int, post_key: str) -> None:
+        """Changing a counter of the post, such as the number of likes or comments
 
         Args:
-            like (LikeModel): like model
+            name (str): Counter field name
+            value (int): The value by which the counter changes
             post_key (str): post key in the database
 
         Raises:
@@ -104,29 +141,8 @@ class PostDatabaseHandler:
         """
         try:
             return await self.__posts_db.update(
-                {"likes": self.__posts_db.util.append(like.dict())}, post_key
+                {name: self.__posts_db.util.increment(value)}, post_key
             )
         except BaseException as e:
-            
-            raise UpdateItemException("Updating data was not successful")
-
-    async def append_comment(self, comment: CommentModel, post_key: str) -> None:
-        """Add comment to post
-
-        Args:
-            comment (CommentModel): comment model
-            post_key (str): post key in the database
-
-        Raises:
-            UpdateItemException: If data update was not successful
 
-        Returns:
-            None: Returns nothing
-        """
-        try:
-            return await self.__posts_db.update(
-                {"comments": self.__posts_db.util.append(comment.dict())}, post_key
-            )
-        except BaseException as e:
-            
             raise UpdateItemException("Updating data was not successful")
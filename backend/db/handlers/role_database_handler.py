@@ -1,13 +1,15 @@
-from typing import Union
-from deta import Deta
+from typing import AsyncIterator, Union
 
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
 from models.response_items import ResponseItems
 from models.role_model import RoleInDBModel
 
 
 class RoleDatabaseHandler:
-    def __init__(self, deta: Deta):
-        self.__roles_db = deta.AsyncBase("roles")
+    def __init__(self, transport: Transport):
+        self.__roles_db = transport.open_base("roles")
 
     async def get_one_by_query(self, query: dict = None) -> Union[RoleInDBModel, None]:
         """Get one role by different criteria from the database
@@ -21,7 +23,7 @@ class RoleDatabaseHandler:
         res_fetch = await self.__roles_db.fetch(query, limit=1)
         if res_fetch.count > 0:
             role_dict = res_fetch.items[0]
-            return RoleInDBModel(**role_dict)
+            return construct_trusted(RoleInDBModel, role_dict)
         else:
             None
 
@@ -35,12 +37,13 @@ class RoleDatabaseHandler:
             Union[RoleInDBModel, None]: If a role is found, then returns RoleInDBModel otherwise None
         """
         role = await self.__roles_db.get(key)
-        return RoleInDBModel(**role) if role is not None else None
+        return construct_trusted_or_none(RoleInDBModel, role)
 
     async def get_many_by_query(
         self, query: Union[dict, list] = None
     ) -> ResponseItems[RoleInDBModel]:
-        """Get roles by different criteria from the database
+        """Get all roles by different criteria from the database,
+        reading them page by page
 
         Args:
             query (Union[dict, list], optional): Choosing criteria. Defaults to None.
@@ -48,7 +51,30 @@ class RoleDatabaseHandler:
         Returns:
             ResponseItems[RoleInDBModel]: Query result
         """
-        roles = await self.__roles_db.fetch(query)
-        return ResponseItems[RoleInDBModel](
-            count=roles.count, last=roles.last, items=roles.items
+        roles = [role async for role in self.iterate(query)]
+        return ResponseItems[RoleInDBModel].construct(items=roles, count=len(roles))
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[RoleInDBModel]:
+        """Iterate over all roles matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[RoleInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__roles_db.fetch(query, limit=limit, last=last),
+            RoleInDBModel,
+            read_ahead,
+            max_bytes,
         )
@@ -1,13 +1,15 @@
-from typing import Union
-from deta import Deta
+from typing import AsyncIterator, Union
 
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
 from models.response_items import ResponseItems
 from models.skill_model import SkillCreateDataModel, SkillInDBModel
 
 
 class SkillDatabaseHandler:
-    def __init__(self, deta: Deta):
-        self.__skills_db = deta.AsyncBase("skills")
+    def __init__(self, transport: Transport):
+        self.__skills_db = transport.open_base("skills")
 
     async def create(self, skill: SkillCreateDataModel) -> Union[SkillInDBModel, None]:
         """Adding a new skill to the database
@@ -21,7 +23,7 @@ class SkillDatabaseHandler:
         """
         try:
             skill = await self.__skills_db.put(skill.dict())
-            return SkillInDBModel(**skill)
+            return construct_trusted(SkillInDBModel, skill)
         except:
             return None
 
@@ -39,8 +41,34 @@ class SkillDatabaseHandler:
             ResponseItems[SkillInDBModel]: Query result
         """
         result = await self.__skills_db.fetch(query, limit=limit, last=last_skill_key)
-        return ResponseItems[SkillInDBModel](
-            count=result.count, last=result.last, items=result.items
+        return construct_trusted(
+            ResponseItems[SkillInDBModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[SkillInDBModel]:
+        """Iterate over all skills matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[SkillInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__skills_db.fetch(query, limit=limit, last=last),
+            SkillInDBModel,
+            read_ahead,
+            max_bytes,
         )
 
     async def get_by_key(self, key: str) -> Union[SkillInDBModel, None]:
@@ -53,4 +81,4 @@ class SkillDatabaseHandler:
             Union[SkillInDBModel, None]: If a skill is found, then returns SkillInDBModel otherwise None
         """
         skill = await self.__skills_db.get(key)
-        return SkillInDBModel(**skill) if skill is not None else None
+        return construct_trusted_or_none(SkillInDBModel, skill)
@@ -0,0 +1,124 @@
+from typing import AsyncIterator, List, Union
+
+from db.page_iterator import iterate_pages
+from db.transport.conflict import is_conflict
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted, construct_trusted_or_none
+from models.response_items import ResponseItems
+from models.subscription_model import SubscriptionInDBModel
+
+
+class SubscriptionDatabaseHandler:
+    def __init__(self, transport: Transport):
+        self.__subscriptions_db = transport.open_base("subscriptions")
+
+    async def insert(
+        self, subscription: SubscriptionInDBModel
+    ) -> Union[SubscriptionInDBModel, None]:
+        """Adding a new subscription to the database, if there is no subscription
+        with the same key
+
+        Args:
+            subscription (SubscriptionInDBModel): New subscription model
+
+        Raises:
+            Exception: Errors of the transport other than an existing key
+
+        Returns:
+            Union[SubscriptionInDBModel, None]: The model of the subscription added
+            to the database otherwise None
+        """
+        try:
+            subscription = await self.__subscriptions_db.insert(
+                subscription.dict(), subscription.key
+            )
+            return construct_trusted(SubscriptionInDBModel, subscription)
+        except Exception as e:
+            if not is_conflict(e):
+                raise
+            return None
+
+    async def get_by_key(self, key: str) -> Union[SubscriptionInDBModel, None]:
+        """Get a subscription by key from the database
+
+        Args:
+            key (str): The subscription key in the database
+
+        Returns:
+            Union[SubscriptionInDBModel, None]: If a subscription is found,
+            then returns SubscriptionInDBModel otherwise None
+        """
+        subscription = await self.__subscriptions_db.get(key)
+        return construct_trusted_or_none(SubscriptionInDBModel, subscription)
+
+    async def get_many_by_query(
+        self, query: dict, limit: int, last_subscription_key: str
+    ) -> ResponseItems[SubscriptionInDBModel]:
+        """Get subscriptions by different criteria from the database
+
+        Args:
+            query (dict): Choosing criteria
+            limit (int): Limit of subscriptions received
+            last_subscription_key (str): The last subscription key received
+            in the previous request
+
+        Returns:
+            ResponseItems[SubscriptionInDBModel]: Query result
+        """
+        result = await self.__subscriptions_db.fetch(
+            query, limit=limit, last=last_subscription_key
+        )
+        return construct_trusted(
+            ResponseItems[SubscriptionInDBModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[SubscriptionInDBModel]:
+        """Iterate over all subscriptions matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[SubscriptionInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__subscriptions_db.fetch(
+                query, limit=limit, last=last
+            ),
+            SubscriptionInDBModel,
+            read_ahead,
+            max_bytes,
+        )
+
+    async def get_all_by_query(self, query: dict) -> List[SubscriptionInDBModel]:
+        """Get all subscriptions by different criteria from the database,
+        reading them page by page
+
+        Args:
+            query (dict): Choosing criteria
+
+        Returns:
+            List[SubscriptionInDBModel]: Query result
+        """
+        return [subscription async for subscription in self.iterate(query)]
+
+    async def delete_by_key(self, key: str) -> None:
+        """Delete a subscription from the database by key
+
+        Args:
+            key (str): The subscription key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__subscriptions_db.delete(key)
@@ -1,5 +1,7 @@
-from typing import Union
-from deta import Deta
+from typing import AsyncIterator, Union
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted
 from exceptions.update_item_exception import UpdateItemException
 from models.response_items import ResponseItems
 
@@ -7,8 +9,8 @@ from models.suggestion_model import SuggestionInDBModel
 
 
 class SuggetionDatabaseHandler:
-    def __init__(self, deta: Deta):
-        self.__suggestions_db = deta.AsyncBase("suggestions")
+    def __init__(self, transport: Transport):
+        self.__suggestions_db = transport.open_base("suggestions")
 
     async def add(
         self, suggestion: SuggestionInDBModel
@@ -24,7 +26,7 @@ class SuggetionDatabaseHandler:
         """
         try:
             suggestion = await self.__suggestions_db.put(suggestion.dict())
-            return SuggestionInDBModel(**suggestion)
+            return construct_trusted(SuggestionInDBModel, suggestion)
         except:
             return None
 
@@ -42,8 +44,36 @@ class SuggetionDatabaseHandler:
             ResponseItems[SuggestionInDBModel]: Query result
         """
         result = await self.__suggestions_db.fetch(query, limit=limit, last=last_key)
-        return ResponseItems[SuggestionInDBModel](
-            count=result.count, last=result.last, items=result.items
+        return construct_trusted(
+            ResponseItems[SuggestionInDBModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[SuggestionInDBModel]:
+        """Iterate over all suggestions matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[SuggestionInDBModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__suggestions_db.fetch(
+                query, limit=limit, last=last
+            ),
+            SuggestionInDBModel,
+            read_ahead,
+            max_bytes,
         )
 
     async def update(self, suggestion: dict, suggestion_key: str) -> None:
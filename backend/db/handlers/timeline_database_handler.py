@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from datetime import timedelta
+from itertools import groupby
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Union
+
+from db.batch_delete import delete_keys
+from db.page_iterator import iterate_pages
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted
+from handlers.datetime_handler import DatetimeHandler
+from models.response_items import ResponseItems
+from models.timeline_entry_model import TimelineEntryModel
+
+MAX_PUT_MANY = 25
+PUT_ATTEMPTS = 3
+# Number of batches of entries written or deleted at once
+MAX_CONCURRENT_BATCHES = 4
+
+logger = logging.getLogger(__name__)
+
+
+class TimelineDatabaseHandler:
+    def __init__(self, transport: Transport):
+        self.__timelines_db = transport.open_base("timelines")
+        self.__datetime_handler = DatetimeHandler()
+
+    async def __run_batches(
+        self, batches: list, send: Callable[[Any], Awaitable]
+    ) -> None:
+        """Sending the batches, at most MAX_CONCURRENT_BATCHES at once,
+        so an event of an author with many followers does not flood the base
+
+        Args:
+            batches (list): Batches of entries or keys
+            send (Callable[[Any], Awaitable]): Sending one batch
+
+        Returns:
+            None: Returns nothing
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+        async def run(batch: Any) -> None:
+            async with semaphore:
+                await send(batch)
+
+        await asyncio.gather(*[run(batch) for batch in batches])
+
+    async def __put_batch(self, items: List[dict], expire_at: int) -> None:
+        """Putting a batch of entries, the failed ones are put again
+        up to PUT_ATTEMPTS times. The entries that still fail are only logged,
+        the event itself has been saved already
+
+        Args:
+            items (List[dict]): Up to MAX_PUT_MANY entries
+            expire_at (int): Expiration time of the entries
+
+        Returns:
+            None: Returns nothing
+        """
+        for _ in range(PUT_ATTEMPTS):
+            result = await self.__timelines_db.put_many(items, expire_at=expire_at)
+            if "failed" not in result:
+                return
+            items = result["failed"]["items"]
+        logger.error(
+            "Failed to put timeline entries: %s",
+            ", ".join(str(item.get("key")) for item in items),
+        )
+
+    async def put_many(self, entries: List[TimelineEntryModel]) -> None:
+        """Put timeline entries in the database in batches. An entry expires
+        together with its event
+
+        Args:
+            entries (List[TimelineEntryModel]): List of timeline entries
+
+        Returns:
+            None: Returns nothing
+        """
+        batches = []
+        entries = sorted(entries, key=lambda entry: entry.date)
+        for date, group in groupby(entries, key=lambda entry: entry.date):
+            expire_at = self.__datetime_handler.convert_to_int(
+                self.__datetime_handler.add_timedelta(date, timedelta(minutes=20))
+            )
+            items = [entry.dict() for entry in group]
+            for i in range(0, len(items), MAX_PUT_MANY):
+                batches.append((items[i : i + MAX_PUT_MANY], expire_at))
+        await self.__run_batches(batches, lambda batch: self.__put_batch(*batch))
+
+    async def get_many_by_query(
+        self, query: dict, limit: int, last_entry_key: str
+    ) -> ResponseItems[TimelineEntryModel]:
+        """Get timeline entries by different criteria from the database
+
+        Args:
+            query (dict): Choosing criteria
+            limit (int): Limit of entries received
+            last_entry_key (str): The last entry key received in the previous request
+
+        Returns:
+            ResponseItems[TimelineEntryModel]: Query result
+        """
+        result = await self.__timelines_db.fetch(
+            query, limit=limit, last=last_entry_key
+        )
+        return construct_trusted(
+            ResponseItems[TimelineEntryModel],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[TimelineEntryModel]:
+        """Iterate over all timeline entries matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[TimelineEntryModel]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__timelines_db.fetch(
+                query, limit=limit, last=last
+            ),
+            TimelineEntryModel,
+            read_ahead,
+            max_bytes,
+        )
+
+    async def delete_by_key(self, key: str) -> None:
+        """Delete a timeline entry from the database by key
+
+        Args:
+            key (str): The entry key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        return await self.__timelines_db.delete(key)
+
+    async def delete_by_keys(self, keys: List[str]) -> None:
+        """Delete timeline entries from the database by keys in batches
+
+        Args:
+            keys (List[str]): The entry keys in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        await delete_keys(self.__timelines_db, keys, MAX_CONCURRENT_BATCHES)
+
+    async def delete_by_query(self, query: dict) -> None:
+        """Delete all timeline entries matching the criteria from the database
+        in batches
+
+        Args:
+            query (dict): Choosing criteria
+
+        Returns:
+            None: Returns nothing
+        """
+        keys = [entry.key async for entry in self.iterate(query)]
+        await self.delete_by_keys(keys)
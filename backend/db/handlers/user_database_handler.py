@@ -1,14 +1,147 @@
-from typing import Union
-from deta import Deta
-
+import secrets
+import string
+from typing import AsyncIterator, Type, Union
+from pydantic import BaseModel
+
+from db.cache.ttl_cache import TTLCache
+from db.page_iterator import iterate_pages
+from db.transport.conflict import is_conflict
+from db.transport.transport import Transport
+from db.trusted_model import construct_trusted
 from exceptions.update_item_exception import UpdateItemException
+from exceptions.user_exists_exception import UserExistsException
+from handlers.datetime_handler import DatetimeHandler
 from models.response_items import ResponseItems
 from models.user_model import UserInDBModel, UserModelResponse
 
+KEY_ALPHABET = string.ascii_lowercase + string.digits
+RESERVE_ATTEMPTS = 3
+# Seconds a signup has to write the user after reserving its email and username
+RESERVE_GRACE = 60
+
+
+def normalize_unique(value: str) -> str:
+    """Getting the key of an email or a username in its index base,
+    the values that differ only in case are the same
+
+    Args:
+        value (str): Email or username
+
+    Returns:
+        str
+    """
+    return value.strip().lower()
+
 
 class UserDatabaseHandler:
-    def __init__(self, deta: Deta):
-        self.__users_db = deta.AsyncBase("users")
+    """Users and the index bases of their unique fields. A document of
+    users_by_email and users_by_username is keyed by the normalized value
+    and keeps the key of the user, so the lookups are a single get"""
+
+    def __init__(self, transport: Transport, cache: TTLCache):
+        self.__users_db = transport.open_base("users")
+        self.__indexes = {
+            "email": transport.open_base("users_by_email"),
+            "username": transport.open_base("users_by_username"),
+        }
+        self.__cache = cache
+        self.__datetime_handler = DatetimeHandler()
+
+    async def get_by_unique(self, field: str, value: str) -> Union[UserInDBModel, None]:
+        """Get a user by email or username through its index base
+
+        Args:
+            field (str): "email" or "username"
+            value (str): Value of the field
+
+        Returns:
+            Union[UserInDBModel, None]: If a user is found,
+            then returns UserInDBModel otherwise None
+        """
+        value = normalize_unique(value)
+        entry = await self.__indexes[field].get(value)
+        if entry is None:
+            return None
+        user = await self.get_by_key(entry["user_key"])
+        # An entry left by a failed delete does not find another user
+        if user is None or normalize_unique(getattr(user, field)) != value:
+            return None
+        return user
+
+    async def __reserve(self, field: str, value: str, user_key: str) -> bool:
+        """Inserting the entry of the value if no user has it. An entry
+        of a user that has another value now is replaced, as well as an entry
+        of a missing user older than RESERVE_GRACE: a younger one may belong
+        to a signup that is still writing the user
+
+        Args:
+            field (str): "email" or "username"
+            value (str): Value of the field
+            user_key (str): The user's key in the database
+
+        Returns:
+            bool: False if the value belongs to another user
+        """
+        value = normalize_unique(value)
+        index = self.__indexes[field]
+        for _ in range(RESERVE_ATTEMPTS):
+            now = self.__datetime_handler.now()
+            try:
+                await index.insert({"user_key": user_key, "date_create": now}, value)
+                return True
+            except Exception as e:
+                if not is_conflict(e):
+                    raise
+            entry = await index.get(value)
+            if entry is None:
+                # The entry has been released since the insert
+                continue
+            if entry["user_key"] == user_key:
+                return True
+            owner = await self.__users_db.get(entry["user_key"])
+            if owner is not None:
+                if normalize_unique(owner.get(field) or "") == value:
+                    return False
+            elif now - entry.get("date_create", 0) < RESERVE_GRACE * 1000:
+                return False
+            # The entry is left by a failed release or an interrupted signup.
+            # It is deleted only if no other signup has replaced it meanwhile
+            current = await index.get(value)
+            if current is not None and current["user_key"] == entry["user_key"]:
+                await index.delete(value)
+        return False
+
+    async def __release(self, field: str, value: str, user_key: str) -> None:
+        """Deleting the entry of the value if it belongs to the user
+
+        Args:
+            field (str): "email" or "username"
+            value (str): Value of the field
+            user_key (str): The user's key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        value = normalize_unique(value)
+        entry = await self.__indexes[field].get(value)
+        if entry is not None and entry["user_key"] == user_key:
+            await self.__indexes[field].delete(value)
+
+    async def index_user(self, user: dict) -> None:
+        """Putting the entries of the user's email and username,
+        for users written without create
+
+        Args:
+            user (dict): User document
+
+        Returns:
+            None: Returns nothing
+        """
+        for field, index in self.__indexes.items():
+            if user.get(field):
+                await index.put(
+                    {"user_key": user["key"]}, normalize_unique(user[field])
+                )
 
     async def get_one_by_query(self, query: dict = None) -> Union[UserInDBModel, None]:
         """Get one user by different criteria from the database
@@ -23,12 +156,16 @@ class UserDatabaseHandler:
         res_fetch = await self.__users_db.fetch(query, limit=1)
         if res_fetch.count > 0:
             user_dict = res_fetch.items[0]
-            return UserInDBModel(**user_dict)
+            return construct_trusted(UserInDBModel, user_dict)
         else:
             return None
 
     async def get_many_by_query(
-        self, limit: int, last_user_key: str, query: dict = None
+        self,
+        limit: int,
+        last_user_key: str,
+        query: dict = None,
+        model: Type[BaseModel] = UserModelResponse,
     ) -> ResponseItems[UserModelResponse]:
         """Get users by different criteria from the database
 
@@ -37,30 +174,94 @@ class UserDatabaseHandler:
             limit (int): Limit of users received
             last_user_key (str): The last user key received in the previous request
             query (dict, optional): Choosing criteria. Defaults to None.
+            model (Type[BaseModel], optional): Model of the items, only its fields
+            are read from the documents. Defaults to UserModelResponse.
 
         Returns:
             ResponseItems[UserModelResponse]: Query result
         """
         result = await self.__users_db.fetch(query, limit=limit, last=last_user_key)
-        return ResponseItems[UserModelResponse](
-            count=result.count, last=result.last, items=result.items
+        return construct_trusted(
+            ResponseItems[model],
+            {"count": result.count, "last": result.last, "items": result.items},
+        )
+
+    def iterate(
+        self,
+        query: Union[dict, list] = None,
+        model: Type[BaseModel] = UserModelResponse,
+        read_ahead: int = 1,
+        max_bytes: int = None,
+    ) -> AsyncIterator[UserModelResponse]:
+        """Iterate over all users matching the criteria, the next pages
+        are read while the current one is processed
+
+        Args:
+            query (Union[dict, list], optional): Choosing criteria. Defaults to None.
+            model (Type[BaseModel], optional): Model of the items, only its fields
+            are read from the documents. Defaults to UserModelResponse.
+            read_ahead (int, optional): Number of pages read ahead. Defaults to 1.
+            max_bytes (int, optional): Limit of bytes of the pages read ahead.
+            Defaults to None.
+
+        Returns:
+            AsyncIterator[UserModelResponse]
+        """
+        return iterate_pages(
+            lambda limit, last: self.__users_db.fetch(query, limit=limit, last=last),
+            model,
+            read_ahead,
+            max_bytes,
         )
 
     async def create(self, user: UserInDBModel) -> Union[UserInDBModel, None]:
-        """Adding a new user to the database
+        """Adding a new user to the database. The email and the username
+        are inserted into their index bases first, so two users cannot get them
 
         Args:
             user (UserInDBModel): New user model
 
+        Raises:
+            UserExistsException: If the email or the username is already taken
+            Exception: Errors of the transport, the reserved entries are released
+
         Returns:
             Union[UserInDBModel, None]: The model of the user added 
             to the database otherwise None
         """
+        data = user.dict()
+        if data["key"] is None:
+            data["key"] = "".join(secrets.choice(KEY_ALPHABET) for _ in range(12))
+        reserved = []
         try:
-            user = await self.__users_db.put(user.dict())
-            return UserInDBModel(**user)
-        except:
-            return None
+            if not await self.__reserve("email", data["email"], data["key"]):
+                raise UserExistsException("Account already exists")
+            reserved.append("email")
+            if not await self.__reserve("username", data["username"], data["key"]):
+                raise UserExistsException("Username is already used")
+            reserved.append("username")
+            user = await self.__users_db.put(data)
+            return construct_trusted(UserInDBModel, user)
+        except Exception:
+            await self.__release_all(reserved, data)
+            raise
+
+    async def __release_all(self, fields: list, user: dict) -> None:
+        """Deleting the entries reserved by a signup that failed
+
+        Args:
+            fields (list): Reserved fields
+            user (dict): User document
+
+        Returns:
+            None: Returns nothing
+        """
+        for field in fields:
+            try:
+                await self.__release(field, user[field], user["key"])
+            except Exception:
+                # The entry points to no user, so lookups ignore it
+                pass
 
     async def get_by_key(self, key: str) -> Union[UserInDBModel, None]:
         """Get a user by key from the database
@@ -71,8 +272,14 @@ class UserDatabaseHandler:
         Returns:
             Union[UserInDBModel, None]: If a user is found, then returns UserInDBModel otherwise None
         """
-        user = await self.__users_db.get(key)
-        return UserInDBModel(**user) if user is not None else None
+        user = self.__cache.get(key)
+        if user is None:
+            generation = self.__cache.generation
+            user = await self.__users_db.get(key)
+            if user is None:
+                return None
+            self.__cache.set(key, user, generation)
+        return construct_trusted(UserInDBModel, user)
 
     async def delete_by_key(self, key: str) -> None:
         """Delete a user from the database by key
@@ -83,7 +290,15 @@ class UserDatabaseHandler:
         Returns:
             None: Returns nothing
         """
-        return await self.__users_db.delete(key)
+        try:
+            user = await self.__users_db.get(key)
+            await self.__users_db.delete(key)
+            if user is not None:
+                for field in self.__indexes:
+                    if user.get(field):
+                        await self.__release(field, user[field], key)
+        finally:
+            self.__cache.invalidate(key)
 
     async def put_many(self, users: list) -> dict:
         """Put multiple users in the database
@@ -94,7 +309,14 @@ class UserDatabaseHandler:
         Returns:
             dict: Returns a dict with "processed" and "failed"(if any) items
         """
-        return await self.__users_db.put_many(users)
+        try:
+            result = await self.__users_db.put_many(users)
+            for user in users:
+                await self.index_user(user)
+            return result
+        finally:
+            for user in users:
+                self.__cache.invalidate(user["key"])
 
     async def append_links(self, links: list, key: str) -> None:
         """Add links to the user
@@ -116,6 +338,8 @@ class UserDatabaseHandler:
         except BaseException as e:
             
             raise UpdateItemException("Updating data was not successful")
+        finally:
+            self.__cache.invalidate(key)
 
     async def append_skills(self, skills: list, key: str) -> None:
         """Add skills to the user
@@ -137,6 +361,8 @@ class UserDatabaseHandler:
         except BaseException as e:
             
             raise UpdateItemException("Updating data was not successful")
+        finally:
+            self.__cache.invalidate(key)
 
     async def simple_data_update(self, data: dict, key: str) -> None:
         """Simple updating of user data
@@ -156,3 +382,29 @@ class UserDatabaseHandler:
         except BaseException as e:
             
             raise UpdateItemException("Updating data was not successful")
+        finally:
+            self.__cache.invalidate(key)
+
+    async def increment_counter(self, name: str, value: int, key: str) -> None:
+        """Changing a counter of the user, such as the number of followers
+
+        Args:
+            name (str): Counter field name
+            value (int): The value by which the counter changes
+            key (str): The user's key in the database
+
+        Raises:
+            UpdateItemException: If data update was not successful
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            return await self.__users_db.update(
+                {name: self.__users_db.util.increment(value)}, key
+            )
+        except BaseException as e:
+
+            raise UpdateItemException("Updating data was not successful")
+        finally:
+            self.__cache.invalidate(key)
@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Union
+
+
+class IdentityMap:
+    """Documents loaded from the database during one request, so that
+    the same document is fetched only once"""
+
+    def __init__(self):
+        self.__items = {}
+        # Grows with every change, so a document loaded before a change
+        # is not remembered after it
+        self.__generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    def contains(self, collection: str, key: str) -> bool:
+        return (collection, key) in self.__items
+
+    def get(self, collection: str, key: str) -> Union[Any, None]:
+        return self.__items.get((collection, key))
+
+    def set(
+        self,
+        collection: str,
+        key: str,
+        item: Union[Any, None],
+        generation: int = None,
+    ) -> None:
+        if generation is not None and generation != self.__generation:
+            return
+        self.__items[(collection, key)] = item
+
+    def discard(self, collection: str, key: str) -> None:
+        self.__generation += 1
+        self.__items.pop((collection, key), None)
+
+
+identity_map_var: ContextVar[Union[IdentityMap, None]] = ContextVar(
+    "identity_map", default=None
+)
+
+
+@contextmanager
+def identity_map_scope():
+    """Opening a new identity map for the code inside the block"""
+    token = identity_map_var.set(IdentityMap())
+    try:
+        yield
+    finally:
+        identity_map_var.reset(token)
@@ -0,0 +1,95 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Type, Union
+import orjson
+from pydantic import BaseModel
+
+from db.trusted_model import construct_trusted
+from models.response_items import ResponseItems
+
+# The largest page Deta Base returns
+PAGE_SIZE = 1000
+
+# Reads one page of a query: fetch(limit, last) -> page with items and last
+FetchPage = Callable[[int, Union[str, None]], Awaitable[ResponseItems]]
+
+
+async def iterate_pages(
+    fetch: FetchPage,
+    model: Type[BaseModel],
+    read_ahead: int = 1,
+    max_bytes: int = None,
+    page_size: int = PAGE_SIZE,
+) -> AsyncIterator[Any]:
+    """Iterating over all items of a query, following the last keys of the pages.
+    While the caller processes a page, the next pages are read in the background
+
+    Args:
+        fetch (FetchPage): Function that reads one page of the query
+        model (Type[BaseModel]): Model of the items
+        read_ahead (int, optional): Number of pages read ahead of the caller,
+        0 reads a page only when the previous one is processed. Defaults to 1.
+        max_bytes (int, optional): The next page is not read while the pages read
+        ahead take this many bytes of JSON. Defaults to None, no limit.
+        page_size (int, optional): Limit of items of one page. Defaults to PAGE_SIZE.
+
+    Returns:
+        AsyncIterator[Any]: Items of the query
+    """
+    if read_ahead <= 0:
+        last = None
+        while True:
+            result = await fetch(page_size, last)
+            for item in result.items:
+                yield construct_trusted(model, item)
+            if result.last is None:
+                return
+            last = result.last
+
+    pages = deque()
+    state = {"bytes": 0, "error": None, "done": False}
+    condition = asyncio.Condition()
+
+    def has_room() -> bool:
+        if len(pages) >= read_ahead:
+            return False
+        return max_bytes is None or not pages or state["bytes"] < max_bytes
+
+    async def read() -> None:
+        last = None
+        try:
+            while True:
+                async with condition:
+                    await condition.wait_for(has_room)
+                result = await fetch(page_size, last)
+                size = len(orjson.dumps(result.items)) if max_bytes is not None else 0
+                async with condition:
+                    pages.append((result.items, size))
+                    state["bytes"] += size
+                    condition.notify_all()
+                if result.last is None:
+                    break
+                last = result.last
+        except Exception as e:
+            state["error"] = e
+        async with condition:
+            state["done"] = True
+            condition.notify_all()
+
+    reader = asyncio.create_task(read())
+    try:
+        while True:
+            async with condition:
+                await condition.wait_for(lambda: pages or state["done"])
+                if not pages:
+                    break
+                items, size = pages.popleft()
+                state["bytes"] -= size
+                condition.notify_all()
+            for item in items:
+                yield construct_trusted(model, item)
+        if state["error"] is not None:
+            raise state["error"]
+    finally:
+        # The caller may stop early, then the pages read ahead are not needed
+        reader.cancel()
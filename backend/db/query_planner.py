@@ -0,0 +1,277 @@
+import asyncio
+import base64
+import heapq
+import json
+from typing import AsyncIterator, Awaitable, Callable, List, Tuple, Union
+
+from exceptions.invalid_cursor_exception import InvalidCursorException
+from models.response_items import ResponseItems
+
+# Reads one page of a query: fetch(query, limit, last) -> ResponseItems
+Fetch = Callable[[List[dict], int, Union[str, None]], Awaitable[ResponseItems]]
+
+# The first range of values of the sort field read from a group, a day in ms
+WINDOW = 24 * 60 * 60 * 1000
+
+
+class QueryPlanner:
+    """Running a query with many OR-clauses as several queries with a bounded
+    number of clauses and merging their results in the order of a field"""
+
+    def __init__(self, chunk_size: int, page_size: int = 1000, window: int = WINDOW):
+        self.__chunk_size = chunk_size
+        self.__page_size = page_size
+        self.__window = max(window, 1)
+
+    def __split(self, clauses: List[dict]) -> List[List[dict]]:
+        """Splitting the clauses into groups of at most chunk_size clauses
+
+        Args:
+            clauses (List[dict]): OR-clauses of the query
+
+        Returns:
+            List[List[dict]]: Groups of clauses
+        """
+        return [
+            clauses[i : i + self.__chunk_size]
+            for i in range(0, len(clauses), self.__chunk_size)
+        ]
+
+    def __encode_cursor(self, position: Tuple, windows: List[int]) -> str:
+        """Creating a continuation cursor from the position of the last item
+
+        Args:
+            position (Tuple): Value of the sort field and key of the last item
+            windows (List[int]): Ranges of the field read from the groups,
+            the next page starts with them
+
+        Returns:
+            str: Cursor
+        """
+        data = json.dumps([*position, windows]).encode("utf-8")
+        return base64.urlsafe_b64encode(data).decode("ascii")
+
+    def __decode_cursor(self, cursor: str) -> Tuple[Tuple, Union[List[int], None]]:
+        """Getting the position of the last item from the continuation cursor
+
+        Args:
+            cursor (str)
+
+        Raises:
+            InvalidCursorException: If the cursor was not created by the planner
+
+        Returns:
+            Tuple[Tuple, Union[List[int], None]]: Value of the sort field and key
+            of the last item, and the ranges of the field read from the groups
+        """
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            # The cursors created before the ranges were kept have no ranges
+            value, key, *rest = data
+            windows = rest[0] if rest else None
+            if windows is not None and not all(
+                isinstance(window, int) and window > 0 for window in windows
+            ):
+                raise ValueError("Invalid ranges")
+            return (value, key), windows
+        except (ValueError, TypeError) as e:
+
+            raise InvalidCursorException("Invalid cursor")
+
+    async def __fetch_range(
+        self,
+        fetch: Fetch,
+        clauses: List[dict],
+        bounds: dict,
+        limit: int,
+        last: Union[str, None] = None,
+    ) -> ResponseItems:
+        """Reading a page of a group of clauses limited by conditions on the field
+
+        Args:
+            fetch (Fetch): Function that reads one page of a query
+            clauses (List[dict]): OR-clauses of the group
+            bounds (dict): Conditions on the sort field added to every clause
+            limit (int): Limit of items received
+            last (Union[str, None], optional): The last key of the previous page.
+            Defaults to None.
+
+        Returns:
+            ResponseItems: Page of items in the order of the keys
+        """
+        return await fetch([{**clause, **bounds} for clause in clauses], limit, last)
+
+    async def __find_lowest(
+        self,
+        fetch: Fetch,
+        clauses: List[dict],
+        sort_field: str,
+        low: Union[int, None],
+        limit: int,
+    ) -> Tuple[Union[int, None], Union[list, None]]:
+        """Finding the lowest value of the field from low on. Every page is
+        a sample of the items, the items below its lowest value are read until
+        there are none, so each request reads at most limit items
+
+        Args:
+            fetch (Fetch): Function that reads one page of a query
+            clauses (List[dict]): OR-clauses of the group
+            sort_field (str): Name of the field by which the items are sorted
+            low (Union[int, None]): The lowest value allowed or None
+            limit (int): Limit of items of one request
+
+        Returns:
+            Tuple[Union[int, None], Union[list, None]]: The lowest value,
+            or None and all the items if there are at most limit of them
+        """
+        bounds = {} if low is None else {f"{sort_field}?gte": low}
+        result = await self.__fetch_range(fetch, clauses, bounds, limit)
+        if result.last is None:
+            return None, list(result.items)
+        lowest = min(getattr(item, sort_field) for item in result.items)
+        while True:
+            result = await self.__fetch_range(
+                fetch, clauses, {**bounds, f"{sort_field}?lt": lowest}, limit
+            )
+            if not result.items:
+                return lowest, None
+            lowest = min(getattr(item, sort_field) for item in result.items)
+
+    async def __iterate_group(
+        self,
+        fetch: Fetch,
+        clauses: List[dict],
+        sort_field: str,
+        low: Union[int, None],
+        limit: int,
+        windows: List[int],
+        index: int,
+    ) -> AsyncIterator:
+        """Iterating over the items of a group of clauses sorted by the field.
+        The base returns the items in the order of the keys, so the group
+        is read in ranges of values of the field that hold at most limit items:
+        a full range is halved, a range with few items is doubled for the next
+        read and an empty range looks for the next lowest value
+
+        Args:
+            fetch (Fetch): Function that reads one page of a query
+            clauses (List[dict]): OR-clauses of the group
+            sort_field (str): Name of the field by which the items are sorted,
+            its values are integers
+            low (Union[int, None]): The lowest value of the field or None
+            limit (int): Limit of items of one request
+            windows (List[int]): Ranges of the field of the groups, the range
+            of this group is kept there for the next page
+            index (int): Index of the group
+
+        Returns:
+            AsyncIterator: Items sorted by the field and then by the key
+        """
+        position = lambda item: (getattr(item, sort_field), item.key)
+        window = windows[index]
+        low, items = await self.__find_lowest(fetch, clauses, sort_field, low, limit)
+        while items is None:
+            high = low + window - 1
+            bounds = {f"{sort_field}?gte": low, f"{sort_field}?lte": high}
+            result = await self.__fetch_range(fetch, clauses, bounds, limit)
+            if result.last is not None and window > 1:
+                window = max(window // 2, 1)
+                windows[index] = window
+                continue
+            chunk = list(result.items)
+            # Only the items of one value are left, all of them are read
+            while result.last is not None:
+                result = await self.__fetch_range(
+                    fetch, clauses, bounds, self.__page_size, result.last
+                )
+                chunk += result.items
+            for item in sorted(chunk, key=position):
+                yield item
+            if len(chunk) < limit // 2:
+                window *= 2
+                windows[index] = window
+            low = high + 1
+            if not chunk:
+                low, items = await self.__find_lowest(
+                    fetch, clauses, sort_field, low, limit
+                )
+        for item in sorted(items, key=position):
+            yield item
+
+    async def fetch_merged(
+        self,
+        fetch: Fetch,
+        clauses: List[dict],
+        sort_field: str,
+        limit: int,
+        cursor: Union[str, None] = None,
+    ) -> Tuple[list, Union[str, None]]:
+        """Getting one page of items matching any of the clauses,
+        sorted by the field and then by the key
+
+        The groups of clauses are read concurrently, each group is read
+        in ranges of the field of at most limit items and the groups are merged
+        as they are read, so a page reads about limit items from every group
+        whatever the number of items after the cursor. The cursor keeps
+        the position of the last returned item and the ranges of the groups,
+        the next page is read only from that value of the field
+
+        Args:
+            fetch (Fetch): Function that reads one page of a query
+            clauses (List[dict]): OR-clauses of the query
+            sort_field (str): Name of the field by which the items are sorted,
+            its values are integers
+            limit (int): Limit of items received
+            cursor (Union[str, None], optional): The cursor received
+            in the previous request. Defaults to None.
+
+        Raises:
+            InvalidCursorException: If the cursor was not created by the planner
+
+        Returns:
+            Tuple[list, Union[str, None]]: Items and the cursor of the next page
+            or None if there are no more items
+        """
+        after = None
+        groups = self.__split(clauses)
+        windows = [self.__window] * len(groups)
+        if cursor is not None:
+            after, cursor_windows = self.__decode_cursor(cursor)
+            if cursor_windows is not None and len(cursor_windows) == len(groups):
+                windows = cursor_windows
+        position = lambda item: (getattr(item, sort_field), item.key)
+        # One more item than the limit shows whether there is a next page
+        step = min(max(limit, 1) + 1, self.__page_size)
+        streams = [
+            self.__iterate_group(
+                fetch,
+                group,
+                sort_field,
+                None if after is None else after[0],
+                step,
+                windows,
+                index,
+            )
+            for index, group in enumerate(groups)
+        ]
+
+        async def next_item(index: int) -> None:
+            async for item in streams[index]:
+                if after is None or position(item) > after:
+                    heapq.heappush(heap, (position(item), index, item))
+                    return
+
+        heap = []
+        items = []
+        try:
+            await asyncio.gather(*[next_item(i) for i in range(len(streams))])
+            while heap:
+                _, index, item = heapq.heappop(heap)
+                if len(items) == limit:
+                    return items, self.__encode_cursor(position(items[-1]), windows)
+                items.append(item)
+                await next_item(index)
+            return items, None
+        finally:
+            for stream in streams:
+                await stream.aclose()
@@ -0,0 +1,421 @@
+import bisect
+import gzip
+import os
+import re
+import tempfile
+from typing import Dict, Iterable, List, Tuple, Union
+import orjson
+
+from models.post_model import PostInDBModel, PostSummaryModel
+from models.search_model import SearchHitModel
+from models.short_user_model_response import ShortUserModelResponse
+from models.skill_model import SkillInDBModel
+from models.user_model import UserInDBModel
+
+SNAPSHOT_VERSION = 1
+WORD_PATTERN = re.compile(r"\w+")
+# Scores of the ways a word of the query matches a word of a document
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.7
+TRIGRAM_SCORE = 0.5
+MIN_TRIGRAM_LENGTH = 3
+MIN_SIMILARITY = 0.3
+# Fields of the items returned by the search
+POST_FIELDS = set(PostSummaryModel.__fields__)
+USER_FIELDS = set(ShortUserModelResponse.__fields__)
+
+# A document: the words of its fields with their weights and the item
+# returned by the search
+Document = Tuple[Dict[str, float], dict]
+
+
+def normalize(text: str) -> List[str]:
+    """Splitting the text into words in lower case
+
+    Args:
+        text (str)
+
+    Returns:
+        List[str]: Words
+    """
+    return WORD_PATTERN.findall(text.lower().replace("ё", "е"))
+
+
+def get_trigrams(word: str) -> set:
+    """Getting the trigrams of the word, padded as in pg_trgm
+
+    Args:
+        word (str)
+
+    Returns:
+        set: Trigrams
+    """
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """In-process inverted index over post names, skills and users.
+    Words of a query match words of the documents exactly, by prefix
+    or by similar trigrams, so typos are forgiven.
+    The index is kept in memory and saved to a snapshot file"""
+
+    def __init__(self):
+        self.__clear()
+        # Documents changed since a rebuild had started, None if there is no rebuild
+        self.__changed: Union[set, None] = None
+
+    def __clear(self) -> None:
+        """Removing all documents
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__documents: Dict[str, Document] = {}
+        # Word -> document id -> weight of the word in the document
+        self.__postings: Dict[str, Dict[str, float]] = {}
+        self.__words: List[str] = []
+        self.__trigrams: Dict[str, set] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.__documents)
+
+    def __add_word(self, word: str) -> None:
+        """Adding a new word to the prefix and trigram lookups
+
+        Args:
+            word (str)
+
+        Returns:
+            None: Returns nothing
+        """
+        bisect.insort(self.__words, word)
+        for trigram in get_trigrams(word):
+            self.__trigrams.setdefault(trigram, set()).add(word)
+
+    def __remove_word(self, word: str) -> None:
+        """Removing a word that no document has from the lookups
+
+        Args:
+            word (str)
+
+        Returns:
+            None: Returns nothing
+        """
+        index = bisect.bisect_left(self.__words, word)
+        if index < len(self.__words) and self.__words[index] == word:
+            del self.__words[index]
+        for trigram in get_trigrams(word):
+            words = self.__trigrams.get(trigram)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self.__trigrams[trigram]
+
+    def __put(self, doc_id: str, document: Document) -> None:
+        """Putting the document into the index, replacing the previous version
+
+        Args:
+            doc_id (str): Kind and key of the document
+            document (Document)
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__delete(doc_id)
+        self.__documents[doc_id] = document
+        for word, weight in document[0].items():
+            postings = self.__postings.get(word)
+            if postings is None:
+                postings = self.__postings[word] = {}
+                self.__add_word(word)
+            postings[doc_id] = weight
+
+    def __delete(self, doc_id: str) -> None:
+        """Removing the document from the index
+
+        Args:
+            doc_id (str): Kind and key of the document
+
+        Returns:
+            None: Returns nothing
+        """
+        document = self.__documents.pop(doc_id, None)
+        if document is None:
+            return
+        for word in document[0]:
+            postings = self.__postings.get(word)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.__postings[word]
+                self.__remove_word(word)
+
+    def __make_words(self, fields: List[Tuple[str, float]]) -> Dict[str, float]:
+        """Getting the words of the fields with the largest weight of each word
+
+        Args:
+            fields (List[Tuple[str, float]]): Text and weight of each field
+
+        Returns:
+            Dict[str, float]
+        """
+        words = {}
+        for text, weight in fields:
+            for word in normalize(text or ""):
+                words[word] = max(words.get(word, 0.0), weight)
+        return words
+
+    def __change(self, doc_id: str, document: Union[Document, None]) -> None:
+        """Applying a change made by the application
+
+        Args:
+            doc_id (str): Kind and key of the document
+            document (Union[Document, None]): None if the document is deleted
+
+        Returns:
+            None: Returns nothing
+        """
+        if document is None:
+            self.__delete(doc_id)
+        else:
+            self.__put(doc_id, document)
+        if self.__changed is not None:
+            self.__changed.add(doc_id)
+
+    def add_post(self, post: PostInDBModel) -> None:
+        """Adding or updating a post
+
+        Args:
+            post (PostInDBModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        words = self.__make_words([(post.name, 2.0), (post.skill.name, 1.0)])
+        item = post.dict(include=POST_FIELDS)
+        self.__change(f"post:{post.key}", (words, item))
+
+    def add_skill(self, skill: SkillInDBModel) -> None:
+        """Adding or updating a skill
+
+        Args:
+            skill (SkillInDBModel)
+
+        Returns:
+            None: Returns nothing
+        """
+        words = self.__make_words([(skill.name, 2.0), (skill.scope, 1.0)])
+        self.__change(f"skill:{skill.key}", (words, skill.dict()))
+
+    def add_user(self, user: Union[UserInDBModel, ShortUserModelResponse]) -> None:
+        """Adding or updating a user
+
+        Args:
+            user (Union[UserInDBModel, ShortUserModelResponse])
+
+        Returns:
+            None: Returns nothing
+        """
+        words = self.__make_words(
+            [(user.username, 2.0), (user.firstname, 2.0), (user.lastname, 2.0)]
+        )
+        item = user.dict(include=USER_FIELDS)
+        self.__change(f"user:{user.key}", (words, item))
+
+    def remove(self, kind: str, key: str) -> None:
+        """Removing a document
+
+        Args:
+            kind (str): "post", "skill" or "user"
+            key (str): The document key in the database
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__change(f"{kind}:{key}", None)
+
+    def __match_word(self, word: str) -> Dict[str, float]:
+        """Finding the documents with the word of the query
+
+        Args:
+            word (str): Normalized word of the query
+
+        Returns:
+            Dict[str, float]: Document id and the best score of the word in it
+        """
+        scores = {}
+
+        def add(found: str, score: float) -> None:
+            for doc_id, weight in self.__postings[found].items():
+                if scores.get(doc_id, 0.0) < weight * score:
+                    scores[doc_id] = weight * score
+
+        index = bisect.bisect_left(self.__words, word)
+        while index < len(self.__words) and self.__words[index].startswith(word):
+            found = self.__words[index]
+            add(found, EXACT_SCORE if found == word else PREFIX_SCORE)
+            index += 1
+
+        if len(word) >= MIN_TRIGRAM_LENGTH:
+            trigrams = get_trigrams(word)
+            shared = {}
+            for trigram in trigrams:
+                for found in self.__trigrams.get(trigram, ()):
+                    shared[found] = shared.get(found, 0) + 1
+            for found, count in shared.items():
+                similarity = count / (len(trigrams) + len(get_trigrams(found)) - count)
+                if similarity >= MIN_SIMILARITY and not found.startswith(word):
+                    add(found, TRIGRAM_SCORE * similarity)
+        return scores
+
+    def search(
+        self, query: str, kinds: Iterable[str] = None, limit: int = 20
+    ) -> List[SearchHitModel]:
+        """Searching the documents with all words of the query
+
+        Args:
+            query (str)
+            kinds (Iterable[str], optional): Kinds of the documents.
+            Defaults to None, all kinds.
+            limit (int, optional): Limit of the documents. Defaults to 20.
+
+        Returns:
+            List[SearchHitModel]: The best matching documents first
+        """
+        words = list(dict.fromkeys(normalize(query)))
+        if not words:
+            return []
+        kinds = set(kinds) if kinds else None
+        total = None
+        for word in words:
+            scores = self.__match_word(word)
+            if total is None:
+                total = {
+                    doc_id: score
+                    for doc_id, score in scores.items()
+                    if kinds is None or doc_id.split(":", 1)[0] in kinds
+                }
+            else:
+                total = {
+                    doc_id: score + scores[doc_id]
+                    for doc_id, score in total.items()
+                    if doc_id in scores
+                }
+            if not total:
+                return []
+        best = sorted(total.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        hits = []
+        for doc_id, score in best:
+            kind, key = doc_id.split(":", 1)
+            item = self.__documents[doc_id][1]
+            hits.append(
+                SearchHitModel(kind=kind, key=key, score=round(score, 4), item=item)
+            )
+        return hits
+
+    def begin_rebuild(self) -> None:
+        """Starting to remember the changes made by the application,
+        so that a rebuild from the database does not lose them
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__changed = set()
+
+    def finish_rebuild(self, other: Union["SearchIndex", None]) -> None:
+        """Replacing the documents with the documents of the index built from
+        the database. The changes made since the rebuild had started are kept
+
+        Args:
+            other (Union[SearchIndex, None]): The index built from the database,
+            None if the rebuild failed, then the index stays as it is
+
+        Returns:
+            None: Returns nothing
+        """
+        changed, self.__changed = self.__changed or set(), None
+        if other is None:
+            return
+        for doc_id in changed:
+            document = self.__documents.get(doc_id)
+            if document is None:
+                other.__delete(doc_id)
+            else:
+                other.__put(doc_id, document)
+        self.__documents = other.__documents
+        self.__postings = other.__postings
+        self.__words = other.__words
+        self.__trigrams = other.__trigrams
+
+    def get_documents(self) -> Dict[str, Document]:
+        """Getting a copy of the documents
+
+        Returns:
+            Dict[str, Document]
+        """
+        return dict(self.__documents)
+
+    def set_documents(self, documents: Dict[str, Document]) -> None:
+        """Replacing all documents, for example with the documents of a snapshot
+
+        Args:
+            documents (Dict[str, Document])
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__clear()
+        for doc_id, document in documents.items():
+            self.__put(doc_id, document)
+
+
+def write_snapshot(path: str, documents: Dict[str, Document]) -> None:
+    """Writing the documents to the snapshot file
+
+    Args:
+        path (str)
+        documents (Dict[str, Document])
+
+    Returns:
+        None: Returns nothing
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "documents": [
+            [doc_id, words, item] for doc_id, (words, item) in documents.items()
+        ],
+    }
+    data = gzip.compress(orjson.dumps(data), compresslevel=6)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_snapshot(path: str) -> Union[Dict[str, Document], None]:
+    """Reading the documents from the snapshot file
+
+    Args:
+        path (str)
+
+    Returns:
+        Union[Dict[str, Document], None]: None if there is no snapshot,
+        it cannot be read or was written by another version
+    """
+    try:
+        with open(path, "rb") as file:
+            data = orjson.loads(gzip.decompress(file.read()))
+    except (OSError, ValueError, EOFError):
+        return None
+    if data.get("version") != SNAPSHOT_VERSION:
+        return None
+    return {doc_id: (words, item) for doc_id, words, item in data["documents"]}
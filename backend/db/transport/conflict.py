@@ -0,0 +1,24 @@
+import aiohttp
+
+from exceptions.item_exists_exception import ItemExistsException
+
+# Status Deta Base answers an insert of an existing key with
+CONFLICT_STATUS = 409
+
+
+def is_conflict(error: BaseException) -> bool:
+    """Checking whether an insert failed because the key already exists,
+    other errors (network, timeouts) are not conflicts
+
+    Args:
+        error (BaseException): Error raised by insert
+
+    Returns:
+        bool
+    """
+    if isinstance(error, ItemExistsException):
+        return True
+    return (
+        isinstance(error, aiohttp.ClientResponseError)
+        and error.status == CONFLICT_STATUS
+    )
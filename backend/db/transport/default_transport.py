@@ -0,0 +1,25 @@
+from deta import Deta
+
+from db.transport.transport import Transport
+from models.transport_stats_model import TransportStatsModel
+
+
+class DefaultTransport(Transport):
+    """Every Base keeps its own session, as the Deta client creates it"""
+
+    def __init__(self, deta: Deta):
+        self.__deta = deta
+        self.__bases = []
+
+    def open_base(self, name: str):
+        base = self.__deta.AsyncBase(name)
+        self.__bases.append(base)
+        return base
+
+    async def close(self) -> None:
+        for base in self.__bases:
+            await base.close()
+        self.__bases.clear()
+
+    def get_stats(self) -> TransportStatsModel:
+        return TransportStatsModel(name="default")
@@ -0,0 +1,125 @@
+import time
+from types import SimpleNamespace
+import aiohttp
+from deta import Deta
+
+from db.transport.transport import Transport
+from models.transport_stats_model import TransportStatsModel
+
+
+class PooledTransport(Transport):
+    """All Bases share one aiohttp session over a bounded keep-alive connection pool"""
+
+    def __init__(
+        self,
+        deta: Deta,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30,
+    ):
+        self.__deta = deta
+        self.__limit = limit
+        self.__limit_per_host = limit_per_host
+        self.__keepalive_timeout = keepalive_timeout
+        self.__session = None
+        # Sessions created by the Deta client for each Base, they are never used
+        self.__default_sessions = []
+        self.__stats = TransportStatsModel(
+            name="pooled",
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+        )
+
+    async def __on_request_start(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ):
+        self.__stats.requests += 1
+
+    async def __on_queued_start(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionQueuedStartParams,
+    ):
+        context.queued_at = time.perf_counter()
+
+    async def __on_queued_end(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionQueuedEndParams,
+    ):
+        wait_time = (time.perf_counter() - context.queued_at) * 1000
+        self.__stats.waits += 1
+        self.__stats.wait_time_total_ms += wait_time
+        self.__stats.wait_time_max_ms = max(self.__stats.wait_time_max_ms, wait_time)
+
+    async def __on_connection_create_end(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ):
+        self.__stats.misses += 1
+
+    async def __on_connection_reuseconn(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ):
+        self.__stats.hits += 1
+
+    def __get_session(self, headers) -> aiohttp.ClientSession:
+        """Getting the shared session, it is created on the first call
+
+        Args:
+            headers: Headers with the project key that the Deta client sends
+
+        Returns:
+            aiohttp.ClientSession
+        """
+        if self.__session is None:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self.__on_request_start)
+            trace_config.on_connection_queued_start.append(self.__on_queued_start)
+            trace_config.on_connection_queued_end.append(self.__on_queued_end)
+            trace_config.on_connection_create_end.append(
+                self.__on_connection_create_end
+            )
+            trace_config.on_connection_reuseconn.append(
+                self.__on_connection_reuseconn
+            )
+            connector = aiohttp.TCPConnector(
+                limit=self.__limit,
+                limit_per_host=self.__limit_per_host,
+                keepalive_timeout=self.__keepalive_timeout,
+            )
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                headers=headers,
+                raise_for_status=True,
+                trace_configs=[trace_config],
+            )
+        return self.__session
+
+    def open_base(self, name: str):
+        base = self.__deta.AsyncBase(name)
+        self.__default_sessions.append(base._session)
+        base._session = self.__get_session(base._session.headers)
+        return base
+
+    async def close(self) -> None:
+        for session in self.__default_sessions:
+            await session.close()
+        self.__default_sessions.clear()
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def get_stats(self) -> TransportStatsModel:
+        return self.__stats.copy()
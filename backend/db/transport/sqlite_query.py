@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Any, List, Set, Tuple, Union
+
+FIELD_PATTERN = re.compile(r"^[\w-]+(\.[\w-]+)*$")
+# Greater than any character, so "prefix" <= value < "prefix" + PREFIX_END
+# holds for every value starting with the prefix
+PREFIX_END = "\U0010ffff"
+COMPARISONS = {"lt": "<", "gt": ">", "lte": "<=", "gte": ">="}
+
+
+def get_path(field: str) -> str:
+    """Getting the JSON path of a document field, nested fields are written
+    through a dot
+
+    Args:
+        field (str): For example "author.key"
+
+    Raises:
+        ValueError: If the field name cannot be a part of a JSON path
+
+    Returns:
+        str: SQL string literal with the path
+    """
+    if not FIELD_PATTERN.match(field):
+        raise ValueError(f"Invalid field: {field}")
+    return "'$" + "".join(f'."{part}"' for part in field.split(".")) + "'"
+
+
+def get_column(field: str) -> str:
+    """Getting the SQL expression of a document field, the key is a column
+    of the table. Indexes are created on the same expressions
+
+    Args:
+        field (str): For example "author.key"
+
+    Returns:
+        str: SQL expression
+    """
+    if field == "key":
+        return "key"
+    return f"json_extract(data, {get_path(field)})"
+
+
+def to_sql_value(value: Any) -> Any:
+    """Converting a value of a query to the value SQLite compares with the field
+
+    Args:
+        value (Any)
+
+    Returns:
+        Any
+    """
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return value
+
+
+def build_condition(
+    field: str, operator: Union[str, None], value: Any, params: List[Any]
+) -> str:
+    """Translating one condition of a query into SQL
+
+    Args:
+        field (str): Field name
+        operator (Union[str, None]): Operator after "?" or None for equality
+        value (Any): Value of the condition
+        params (List[Any]): Parameters of the statement, the values are added to it
+
+    Raises:
+        ValueError: If the operator is unknown
+
+    Returns:
+        str: SQL condition
+    """
+    column = get_column(field)
+    if operator is None or operator == "ne":
+        if value is None:
+            return f"{column} IS {'NOT ' if operator else ''}NULL"
+        params.append(to_sql_value(value))
+        return f"{column} {'IS NOT' if operator else '='} ?"
+    if operator in COMPARISONS:
+        params.append(value)
+        return f"{column} {COMPARISONS[operator]} ?"
+    if operator == "r":
+        start, end = value
+        params.extend([start, end])
+        return f"{column} BETWEEN ? AND ?"
+    if operator == "pfx":
+        params.extend([value, value + PREFIX_END])
+        return f"({column} >= ? AND {column} < ?)"
+    if operator in ("contains", "not_contains"):
+        # An array contains the element, a string contains the substring
+        path = get_path(field)
+        params.extend([to_sql_value(value), value if isinstance(value, str) else ""])
+        condition = (
+            f"(CASE json_type(data, {path}) "
+            f"WHEN 'array' THEN EXISTS (SELECT 1 FROM json_each(data, {path}) "
+            f"WHERE json_each.value = ?) "
+            f"WHEN 'text' THEN instr({column}, ?) > 0 ELSE 0 END)"
+        )
+        return f"NOT {condition}" if operator == "not_contains" else condition
+    raise ValueError(f"Unknown operator: {operator}")
+
+
+def build_where(query: Union[dict, list, None]) -> Tuple[str, List[Any], Set[str]]:
+    """Translating a query of Deta Base into a SQL condition. A dict is a set of
+    conditions that all must hold, a list is a set of dicts of which one must hold
+
+    Args:
+        query (Union[dict, list, None])
+
+    Raises:
+        ValueError: If the query has an unknown operator or an invalid field
+
+    Returns:
+        Tuple[str, List[Any], Set[str]]: Condition, its parameters and the fields
+        that are worth indexing
+    """
+    params = []
+    fields = set()
+    if not query:
+        return "1", params, fields
+    clauses = []
+    for item in query if isinstance(query, list) else [query]:
+        conditions = []
+        for name, value in item.items():
+            field, _, operator = name.partition("?")
+            conditions.append(build_condition(field, operator or None, value, params))
+            if field != "key" and operator not in ("contains", "not_contains"):
+                fields.add(field)
+        clauses.append("(" + " AND ".join(conditions or ["1"]) + ")")
+    return " OR ".join(clauses), params, fields
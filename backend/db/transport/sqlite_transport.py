@@ -0,0 +1,410 @@
+import asyncio
+import json
+import os
+import re
+import secrets
+import sqlite3
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, List, Union
+
+from db.transport.sqlite_query import build_where, get_column
+from db.transport.storage_base import ExpireAt
+from db.transport.transport import Transport
+from exceptions.item_exists_exception import ItemExistsException
+from exceptions.item_not_found_exception import ItemNotFoundException
+from models.response_items import ResponseItems
+from models.transport_stats_model import TransportStatsModel
+
+NAME_PATTERN = re.compile(r"^[\w-]+$")
+KEY_ALPHABET = string.ascii_lowercase + string.digits
+MAX_PUT_MANY = 25
+# Expired documents are not returned at once and are deleted at most this often
+PURGE_INTERVAL = 60
+
+
+class Increment:
+    def __init__(self, value: Union[int, float]):
+        self.value = value
+
+
+class Append:
+    def __init__(self, value: Any):
+        self.value = value if isinstance(value, list) else [value]
+
+
+class Prepend:
+    def __init__(self, value: Any):
+        self.value = value if isinstance(value, list) else [value]
+
+
+class Trim:
+    pass
+
+
+class SqliteUtil:
+    """Operations of an update, the same as Deta Base util"""
+
+    def increment(self, value: Union[int, float] = 1) -> Increment:
+        return Increment(value)
+
+    def append(self, value: Any) -> Append:
+        return Append(value)
+
+    def prepend(self, value: Any) -> Prepend:
+        return Prepend(value)
+
+    def trim(self) -> Trim:
+        return Trim()
+
+
+def get_expire_at(
+    expire_in: int = None, expire_at: ExpireAt = None
+) -> Union[int, None]:
+    """Getting the expiration time as Deta Base does
+
+    Args:
+        expire_in (int, optional): Seconds from now. Defaults to None.
+        expire_at (ExpireAt, optional): Unix timestamp in seconds or datetime.
+        Defaults to None.
+
+    Returns:
+        Union[int, None]: Unix timestamp in seconds or None if the document never expires
+    """
+    if expire_in is not None:
+        return int(time.time() + expire_in)
+    if isinstance(expire_at, datetime):
+        return int(expire_at.timestamp())
+    if expire_at is not None:
+        return int(expire_at)
+    return None
+
+
+def apply_update(document: dict, field: str, value: Any) -> None:
+    """Changing a field of the document, nested fields are written through a dot
+
+    Args:
+        document (dict)
+        field (str)
+        value (Any): New value or an operation of SqliteUtil
+
+    Returns:
+        None: Returns nothing
+    """
+    *parents, name = field.split(".")
+    for parent in parents:
+        child = document.get(parent)
+        if not isinstance(child, dict):
+            child = document[parent] = {}
+        document = child
+    if isinstance(value, Trim):
+        document.pop(name, None)
+    elif isinstance(value, Increment):
+        document[name] = (document.get(name) or 0) + value.value
+    elif isinstance(value, Append):
+        document[name] = list(document.get(name) or []) + value.value
+    elif isinstance(value, Prepend):
+        document[name] = value.value + list(document.get(name) or [])
+    else:
+        document[name] = value
+
+
+class SqliteBase:
+    """Deta Base kept in a table of the local SQLite database"""
+
+    def __init__(self, transport: "SqliteTransport", name: str):
+        self.__transport = transport
+        self.__table = f'"base_{name}"'
+        self.util = SqliteUtil()
+
+    def __make_item(self, data: Any, key: str = None) -> dict:
+        """Making a document with a key from the data
+
+        Args:
+            data (Any): Dict or a value, which is kept in the "value" field
+            key (str, optional): Defaults to None, the key of the data or a new one
+
+        Returns:
+            dict
+        """
+        item = dict(data) if isinstance(data, dict) else {"value": data}
+        if key is not None:
+            item["key"] = key
+        if item.get("key") is None:
+            item["key"] = "".join(secrets.choice(KEY_ALPHABET) for _ in range(12))
+        return item
+
+    def __load(self, data: str, expire_at: Union[int, None]) -> dict:
+        item = json.loads(data)
+        if expire_at is not None:
+            item["__expires"] = expire_at
+        return item
+
+    def __dump(self, item: dict) -> str:
+        return json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+
+    def __write(
+        self, connection: sqlite3.Connection, items: List[dict], expire_at, insert=False
+    ) -> None:
+        connection.executemany(
+            f"INSERT {'' if insert else 'OR REPLACE '}INTO {self.__table} "
+            "(key, data, expire_at) VALUES (?, ?, ?)",
+            [(item["key"], self.__dump(item), expire_at) for item in items],
+        )
+
+    async def get(self, key: str) -> Union[dict, None]:
+        def run(connection: sqlite3.Connection):
+            row = connection.execute(
+                f"SELECT data, expire_at FROM {self.__table} "
+                "WHERE key = ? AND (expire_at IS NULL OR expire_at > ?)",
+                (key, int(time.time())),
+            ).fetchone()
+            return self.__load(*row) if row is not None else None
+
+        return await self.__transport.run(self.__table, run)
+
+    async def put(
+        self,
+        data: Any,
+        key: str = None,
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> dict:
+        result = await self.put_many(
+            [self.__make_item(data, key)], expire_in=expire_in, expire_at=expire_at
+        )
+        return result["processed"]["items"][0]
+
+    async def put_many(
+        self,
+        items: List[Any],
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> dict:
+        if len(items) > MAX_PUT_MANY:
+            raise ValueError(f"No more than {MAX_PUT_MANY} items can be put at once")
+        items = [self.__make_item(item) for item in items]
+        expire_at = get_expire_at(expire_in, expire_at)
+
+        def run(connection: sqlite3.Connection):
+            with connection:
+                self.__write(connection, items, expire_at)
+            if expire_at is not None:
+                items_with_expires = [dict(item, __expires=expire_at) for item in items]
+                return {"processed": {"items": items_with_expires}}
+            return {"processed": {"items": items}}
+
+        return await self.__transport.run(self.__table, run)
+
+    async def insert(
+        self,
+        data: Any,
+        key: str = None,
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> dict:
+        item = self.__make_item(data, key)
+        expire_at = get_expire_at(expire_in, expire_at)
+
+        def run(connection: sqlite3.Connection):
+            try:
+                with connection:
+                    # An expired document does not block the key
+                    connection.execute(
+                        f"DELETE FROM {self.__table} WHERE key = ? AND expire_at <= ?",
+                        (item["key"], int(time.time())),
+                    )
+                    self.__write(connection, [item], expire_at, insert=True)
+            except sqlite3.IntegrityError:
+                raise ItemExistsException(f"Item with key {item['key']} already exists")
+            return item if expire_at is None else dict(item, __expires=expire_at)
+
+        return await self.__transport.run(self.__table, run)
+
+    async def update(
+        self,
+        updates: dict,
+        key: str,
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> None:
+        new_expire_at = get_expire_at(expire_in, expire_at)
+
+        def run(connection: sqlite3.Connection):
+            with connection:
+                row = connection.execute(
+                    f"SELECT data, expire_at FROM {self.__table} "
+                    "WHERE key = ? AND (expire_at IS NULL OR expire_at > ?)",
+                    (key, int(time.time())),
+                ).fetchone()
+                if row is None:
+                    raise ItemNotFoundException(f"Key {key} not found")
+                item = json.loads(row[0])
+                for field, value in updates.items():
+                    if field != "key":
+                        apply_update(item, field, value)
+                expires = new_expire_at if new_expire_at is not None else row[1]
+                self.__write(connection, [item], expires)
+
+        await self.__transport.run(self.__table, run)
+
+    async def delete(self, key: str) -> None:
+        def run(connection: sqlite3.Connection):
+            with connection:
+                connection.execute(f"DELETE FROM {self.__table} WHERE key = ?", (key,))
+
+        await self.__transport.run(self.__table, run)
+
+    async def fetch(
+        self, query: Union[dict, list] = None, *, limit: int = 1000, last: str = None
+    ) -> ResponseItems[dict]:
+        where, params, fields = build_where(query)
+        limit = limit or 1000
+        params = [int(time.time()), last or ""] + params
+
+        def run(connection: sqlite3.Connection):
+            self.__transport.create_indexes(connection, self.__table, fields)
+            rows = connection.execute(
+                f"SELECT data, expire_at FROM {self.__table} "
+                f"WHERE (expire_at IS NULL OR expire_at > ?) AND key > ? AND ({where}) "
+                "ORDER BY key LIMIT ?",
+                params + [limit + 1],
+            ).fetchall()
+            items = [self.__load(*row) for row in rows[:limit]]
+            has_more = len(rows) > limit
+            return ResponseItems[dict].construct(
+                items=items,
+                count=len(items),
+                last=items[-1]["key"] if has_more and items else None,
+            )
+
+        return await self.__transport.run(self.__table, run)
+
+    async def close(self) -> None:
+        pass
+
+
+class SqliteTransport(Transport):
+    """Bases kept in tables of a local SQLite database in WAL mode.
+    All statements run one after another in one thread with one connection,
+    so the event loop is not blocked and writes do not conflict.
+    A field of a query gets an index the first time it is queried"""
+
+    def __init__(self, path: str):
+        self.__path = path
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self.__connection = None
+        self.__tables = set()
+        self.__indexes = set()
+        self.__purged_at = 0
+        self.__stats = TransportStatsModel(name="sqlite")
+
+    def __connect(self) -> sqlite3.Connection:
+        """Opening the connection, it is done in the thread of the transport
+
+        Returns:
+            sqlite3.Connection
+        """
+        if self.__connection is None:
+            directory = os.path.dirname(os.path.abspath(self.__path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.__path, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self.__connection = connection
+        return self.__connection
+
+    def __prepare(self, connection: sqlite3.Connection, table: str) -> None:
+        """Creating the table of a Base and deleting the expired documents
+
+        Args:
+            connection (sqlite3.Connection)
+            table (str): Quoted table name
+
+        Returns:
+            None: Returns nothing
+        """
+        if table not in self.__tables:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, data TEXT NOT NULL, expire_at INTEGER)"
+            )
+            index = f'"{table[1:-1]}_expire_at"'
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} ON {table}(expire_at) "
+                "WHERE expire_at IS NOT NULL"
+            )
+            self.__tables.add(table)
+        now = int(time.time())
+        if now - self.__purged_at >= PURGE_INTERVAL:
+            self.__purged_at = now
+            for name in self.__tables:
+                connection.execute(f"DELETE FROM {name} WHERE expire_at <= ?", (now,))
+
+    def create_indexes(
+        self, connection: sqlite3.Connection, table: str, fields: set
+    ) -> None:
+        """Creating the indexes on the queried fields that do not have them yet
+
+        Args:
+            connection (sqlite3.Connection)
+            table (str): Quoted table name
+            fields (set): Fields of the query
+
+        Returns:
+            None: Returns nothing
+        """
+        for field in fields:
+            if (table, field) in self.__indexes:
+                continue
+            index = f'"{table[1:-1]}_{re.sub(r"[^0-9A-Za-z_]", "_", field)}"'
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {index} ON {table}({get_column(field)})"
+            )
+            self.__indexes.add((table, field))
+
+    async def run(self, table: str, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Running a function with the connection in the thread of the transport
+
+        Args:
+            table (str): Quoted name of the table the function works with
+            func (Callable[[sqlite3.Connection], Any])
+
+        Returns:
+            Any: Function result
+        """
+
+        def call():
+            connection = self.__connect()
+            self.__prepare(connection, table)
+            return func(connection)
+
+        self.__stats.requests += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, call)
+
+    def open_base(self, name: str) -> SqliteBase:
+        if not NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid Base name: {name}")
+        return SqliteBase(self, name)
+
+    async def close(self) -> None:
+        def close_connection():
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.__executor, close_connection)
+        # The thread owning the connection is not needed any more
+        self.__executor.shutdown(wait=True)
+
+    def get_stats(self) -> TransportStatsModel:
+        return self.__stats.copy()
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Any, List, Protocol, Union
+
+from models.response_items import ResponseItems
+
+# Expiration time: Unix timestamp in seconds or datetime
+ExpireAt = Union[int, float, datetime, None]
+
+
+class StorageUtil(Protocol):
+    """Operations of an update that change the stored value"""
+
+    def increment(self, value: Union[int, float] = 1) -> Any:
+        pass
+
+    def append(self, value: Any) -> Any:
+        pass
+
+    def prepend(self, value: Any) -> Any:
+        pass
+
+    def trim(self) -> Any:
+        pass
+
+
+class StorageBase(Protocol):
+    """Collection of documents that the database handlers work with.
+    It has the semantics of Deta Base:
+    every document has a string key, a query is a dict of conditions that all
+    must hold or a list of such dicts of which one must hold, nested fields are
+    written through a dot ("author.key") and operators are added to the field
+    name ("date?r", "key?pfx", "ref_count?lte").
+    Documents are fetched in the order of their keys"""
+
+    util: StorageUtil
+
+    async def get(self, key: str) -> Union[dict, None]:
+        """Getting a document by key, None if there is no such document"""
+        pass
+
+    async def put(
+        self,
+        data: Any,
+        key: str = None,
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> dict:
+        """Putting a document, the document with the same key is replaced"""
+        pass
+
+    async def put_many(
+        self,
+        items: List[Any],
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> dict:
+        """Putting up to 25 documents, returns {"processed": {"items": [...]}}"""
+        pass
+
+    async def insert(
+        self,
+        data: Any,
+        key: str = None,
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> dict:
+        """Putting a document, raises an error if the key already exists"""
+        pass
+
+    async def update(
+        self,
+        updates: dict,
+        key: str,
+        *,
+        expire_in: int = None,
+        expire_at: ExpireAt = None,
+    ) -> None:
+        """Changing fields of a document, raises an error if there is no document"""
+        pass
+
+    async def delete(self, key: str) -> None:
+        """Deleting a document by key"""
+        pass
+
+    async def fetch(
+        self, query: Union[dict, list] = None, *, limit: int = 1000, last: str = None
+    ) -> ResponseItems[dict]:
+        """Getting a page of documents by query. If there are more documents,
+        last is the key to continue from"""
+        pass
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+
+from db.transport.storage_base import StorageBase
+from models.transport_stats_model import TransportStatsModel
+
+
+class Transport(ABC):
+    @abstractmethod
+    def open_base(self, name: str) -> StorageBase:
+        """Opening a Base by name on top of the transport
+
+        Args:
+            name (str): Base name
+
+        Returns:
+            StorageBase: Base client, such as Deta AsyncBase
+        """
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Closing all connections opened by the transport
+
+        Returns:
+            None: Returns nothing
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> TransportStatsModel:
+        """Getting the transport statistics
+
+        Returns:
+            TransportStatsModel
+        """
+        pass
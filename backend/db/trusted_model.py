@@ -0,0 +1,91 @@
+from functools import lru_cache
+from typing import List, Tuple, Type, TypeVar, Union
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _get_plan(model: Type[BaseModel]) -> List[Tuple]:
+    """Getting how to fill each field of the model, once per model class
+
+    Args:
+        model (Type[BaseModel])
+
+    Returns:
+        List[Tuple]: Name, alias, nested model or None, shape, field
+    """
+    plan = []
+    for name, field in model.__fields__.items():
+        nested = field.type_
+        if not (isinstance(nested, type) and issubclass(nested, BaseModel)):
+            nested = None
+        if field.shape not in (SHAPE_SINGLETON, SHAPE_LIST):
+            nested = None
+        plan.append((name, field.alias, nested, field.shape, field))
+    return plan
+
+
+def construct_trusted(model: Type[Model], data: dict) -> Model:
+    """Building a model from a document of our own database without validation.
+    Nested models are built the same way, keys that are not fields of the model
+    are dropped. If a required field is missing, the model is validated as usual,
+    so that a damaged document raises the same error as before
+
+    Args:
+        model (Type[Model])
+        data (dict): Document from the database
+
+    Returns:
+        Model
+    """
+    values = {}
+    fields_set = set()
+    for name, alias, nested, shape, field in _get_plan(model):
+        if alias in data:
+            value = data[alias]
+            fields_set.add(name)
+            if shape == SHAPE_LIST and isinstance(value, list):
+                # Lists are copied, so the model does not share them with
+                # a document kept in the cache
+                if nested is not None:
+                    value = [
+                        (
+                            construct_trusted(nested, item)
+                            if isinstance(item, dict)
+                            else item
+                        )
+                        for item in value
+                    ]
+                else:
+                    value = list(value)
+            elif nested is not None and isinstance(value, dict):
+                value = construct_trusted(nested, value)
+            values[name] = value
+        elif field.required:
+            return model(**data)
+        else:
+            values[name] = field.get_default()
+    # The same as model.construct, without going over the fields once again
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    if model.__private_attributes__:
+        instance._init_private_attributes()
+    return instance
+
+
+def construct_trusted_or_none(
+    model: Type[Model], data: Union[dict, None]
+) -> Union[Model, None]:
+    """Building a model from a document that may be missing
+
+    Args:
+        model (Type[Model])
+        data (Union[dict, None]): Document from the database
+
+    Returns:
+        Union[Model, None]: None if there is no document
+    """
+    return construct_trusted(model, data) if data is not None else None
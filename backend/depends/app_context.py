@@ -0,0 +1,257 @@
+import os
+import tempfile
+from deta import Deta
+
+from controllers.auth_controller import AuthController
+from controllers.comment_controller import CommentController
+from controllers.deletion_controller import DeletionController
+from controllers.event_controller import EventController
+from controllers.like_controller import LikeController
+from controllers.link_controller import LinkController
+from controllers.post_controller import PostController
+from controllers.role_controller import RoleController
+from controllers.search_controller import SearchController
+from controllers.skill_controller import SkillController
+from controllers.stats_controller import StatsController
+from controllers.subscription_controller import SubscriptionController
+from controllers.suggestion_controller import SuggestionController
+from controllers.user_controller import UserController
+from db.cache.ttl_cache import TTLCache
+from db.database_handler import DatabaseHandler
+from db.query_planner import QueryPlanner
+from db.search_index import SearchIndex
+from db.transport.default_transport import DefaultTransport
+from db.transport.pooled_transport import PooledTransport
+from db.transport.sqlite_transport import SqliteTransport
+from db.transport.transport import Transport
+from handlers.access_handler import AccessHandler
+from handlers.cpu_executor import CPUExecutor
+from handlers.disk_cache import DiskCache
+from handlers.drive_handler import DriveHandler
+from handlers.http_cache_handler import HTTPCacheHandler
+from handlers.image_handler import ImageHandler
+
+
+class AppContext:
+    """Objects shared by all requests, created once per process"""
+
+    def __init__(self):
+        self.__is_open = False
+
+    def __create_transport(self) -> Transport:
+        """Creating the transport for Base requests according to the settings
+
+        Returns:
+            Transport
+        """
+        name = os.getenv("BASE_TRANSPORT", "pooled")
+        if name == "default":
+            return DefaultTransport(self.__deta)
+        if name == "sqlite":
+            return SqliteTransport(os.getenv("SQLITE_PATH", "data/show-skills.db"))
+        return PooledTransport(
+            self.__deta,
+            limit=int(os.getenv("BASE_POOL_LIMIT", 100)),
+            limit_per_host=int(os.getenv("BASE_POOL_LIMIT_PER_HOST", 20)),
+            keepalive_timeout=float(os.getenv("BASE_POOL_KEEPALIVE_TIMEOUT", 30)),
+        )
+
+    def open(self) -> "AppContext":
+        """Creating the Deta client, database and drive handlers, CPU executor
+        and controllers.
+        Repeated calls return the already created context
+
+        Returns:
+            AppContext
+        """
+        if self.__is_open:
+            return self
+
+        self.__deta = Deta(os.getenv("DETA_PROJECT_KEY"))
+        user_cache = TTLCache(
+            "users",
+            max_size=int(os.getenv("USER_CACHE_MAX_SIZE", 10000)),
+            ttl=float(os.getenv("USER_CACHE_TTL", 60)),
+        )
+        query_planner = QueryPlanner(int(os.getenv("QUERY_CHUNK_SIZE", 20)))
+        search_index = SearchIndex()
+        self.__database_handler = DatabaseHandler(
+            self.__create_transport(), user_cache, query_planner, search_index
+        )
+        image_handler = ImageHandler(
+            [int(size) for size in os.getenv("PHOTO_SIZES", "64,256,1024").split(",")],
+            os.getenv("PHOTO_FORMAT", "webp"),
+        )
+        self.__cpu_executor = CPUExecutor(
+            os.getenv("CPU_EXECUTOR", "thread"),
+            int(os.getenv("CPU_EXECUTOR_WORKERS", 0)) or None,
+        )
+        media_cache_size = int(os.getenv("MEDIA_CACHE_SIZE", 256 * 1024 * 1024))
+        disk_cache = (
+            DiskCache(
+                os.getenv("MEDIA_CACHE_DIR")
+                or os.path.join(tempfile.gettempdir(), "show-skills-media"),
+                max_size=media_cache_size,
+                max_file_size=int(
+                    os.getenv("MEDIA_CACHE_MAX_FILE_SIZE", 16 * 1024 * 1024)
+                ),
+                ttl=float(os.getenv("MEDIA_CACHE_TTL", 3600)),
+            )
+            if media_cache_size > 0
+            else None
+        )
+        self.__drive_handler = DriveHandler(
+            self.__deta,
+            image_handler,
+            self.__cpu_executor,
+            HTTPCacheHandler(int(os.getenv("MEDIA_CACHE_MAX_AGE", 31536000))),
+            disk_cache,
+            [
+                encoding.strip()
+                for encoding in os.getenv("TEXT_ENCODINGS", "br,gzip").split(",")
+                if encoding.strip()
+            ],
+            int(os.getenv("DRIVE_CHUNK_SIZE", 10 * 1024 * 1024)),
+        )
+
+        self.__access_handler = AccessHandler(self.__database_handler)
+        self.__auth_controller = AuthController(
+            self.__database_handler, self.__cpu_executor
+        )
+        self.__comment_controller = CommentController(self.__database_handler)
+        self.__event_controller = EventController(self.__database_handler)
+        self.__like_controller = LikeController(self.__database_handler)
+        self.__link_controller = LinkController(self.__database_handler)
+        self.__post_controller = PostController(
+            self.__database_handler, self.__drive_handler
+        )
+        self.__role_controller = RoleController(self.__database_handler)
+        self.__deletion_controller = DeletionController(
+            self.__database_handler,
+            self.__post_controller,
+            int(os.getenv("DELETION_CONCURRENCY", 4)),
+            float(os.getenv("DELETION_JOB_LEASE", 600)),
+        )
+        self.__search_controller = SearchController(
+            self.__database_handler,
+            search_index,
+            os.getenv("SEARCH_SNAPSHOT_PATH")
+            or os.path.join(tempfile.gettempdir(), "show-skills-search.json.gz"),
+            float(os.getenv("SEARCH_REFRESH_INTERVAL", 600)),
+        )
+        self.__skill_controller = SkillController(
+            self.__database_handler, self.__drive_handler
+        )
+        self.__stats_controller = StatsController(
+            self.__database_handler, self.__cpu_executor, self.__drive_handler
+        )
+        self.__subscription_controller = SubscriptionController(
+            self.__database_handler
+        )
+        self.__suggestion_controller = SuggestionController(self.__database_handler)
+        self.__user_controller = UserController(self.__database_handler)
+
+        self.__is_open = True
+        return self
+
+    async def start(self) -> None:
+        """Opening the context, preparing the search index and continuing
+        the deletion jobs stopped by a restart
+
+        Returns:
+            None: Returns nothing
+        """
+        await self.open().search_controller.start()
+        await self.__deletion_controller.start()
+
+    async def close(self) -> None:
+        """Stopping the deletion jobs, saving the search index, releasing
+        the connections of the database and drive handlers, deleting
+        the cached files and stopping the CPU executor
+
+        Returns:
+            None: Returns nothing
+        """
+        if not self.__is_open:
+            return
+        self.__is_open = False
+        await self.__deletion_controller.close()
+        await self.__search_controller.close()
+        await self.__database_handler.close()
+        await self.__drive_handler.close()
+        self.__cpu_executor.shutdown()
+
+    @property
+    def database_handler(self) -> DatabaseHandler:
+        return self.__database_handler
+
+    @property
+    def drive_handler(self) -> DriveHandler:
+        return self.__drive_handler
+
+    @property
+    def cpu_executor(self) -> CPUExecutor:
+        return self.__cpu_executor
+
+    @property
+    def access_handler(self) -> AccessHandler:
+        return self.__access_handler
+
+    @property
+    def auth_controller(self) -> AuthController:
+        return self.__auth_controller
+
+    @property
+    def comment_controller(self) -> CommentController:
+        return self.__comment_controller
+
+    @property
+    def deletion_controller(self) -> DeletionController:
+        return self.__deletion_controller
+
+    @property
+    def event_controller(self) -> EventController:
+        return self.__event_controller
+
+    @property
+    def like_controller(self) -> LikeController:
+        return self.__like_controller
+
+    @property
+    def link_controller(self) -> LinkController:
+        return self.__link_controller
+
+    @property
+    def post_controller(self) -> PostController:
+        return self.__post_controller
+
+    @property
+    def role_controller(self) -> RoleController:
+        return self.__role_controller
+
+    @property
+    def search_controller(self) -> SearchController:
+        return self.__search_controller
+
+    @property
+    def skill_controller(self) -> SkillController:
+        return self.__skill_controller
+
+    @property
+    def stats_controller(self) -> StatsController:
+        return self.__stats_controller
+
+    @property
+    def subscription_controller(self) -> SubscriptionController:
+        return self.__subscription_controller
+
+    @property
+    def suggestion_controller(self) -> SuggestionController:
+        return self.__suggestion_controller
+
+    @property
+    def user_controller(self) -> UserController:
+        return self.__user_controller
+
+
+app_context = AppContext()
@@ -0,0 +1,6 @@
+from depends.app_context import app_context
+from handlers.access_handler import AccessHandler
+
+
+async def get_access_handler() -> AccessHandler:
+    return app_context.open().access_handler
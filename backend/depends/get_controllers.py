@@ -0,0 +1,71 @@
+from controllers.auth_controller import AuthController
+from controllers.comment_controller import CommentController
+from controllers.deletion_controller import DeletionController
+from controllers.event_controller import EventController
+from controllers.like_controller import LikeController
+from controllers.link_controller import LinkController
+from controllers.post_controller import PostController
+from controllers.role_controller import RoleController
+from controllers.search_controller import SearchController
+from controllers.skill_controller import SkillController
+from controllers.stats_controller import StatsController
+from controllers.subscription_controller import SubscriptionController
+from controllers.suggestion_controller import SuggestionController
+from controllers.user_controller import UserController
+from depends.app_context import app_context
+
+
+async def get_auth_controller() -> AuthController:
+    return app_context.open().auth_controller
+
+
+async def get_comment_controller() -> CommentController:
+    return app_context.open().comment_controller
+
+
+async def get_deletion_controller() -> DeletionController:
+    return app_context.open().deletion_controller
+
+
+async def get_event_controller() -> EventController:
+    return app_context.open().event_controller
+
+
+async def get_like_controller() -> LikeController:
+    return app_context.open().like_controller
+
+
+async def get_link_controller() -> LinkController:
+    return app_context.open().link_controller
+
+
+async def get_post_controller() -> PostController:
+    return app_context.open().post_controller
+
+
+async def get_role_controller() -> RoleController:
+    return app_context.open().role_controller
+
+
+async def get_search_controller() -> SearchController:
+    return app_context.open().search_controller
+
+
+async def get_skill_controller() -> SkillController:
+    return app_context.open().skill_controller
+
+
+async def get_stats_controller() -> StatsController:
+    return app_context.open().stats_controller
+
+
+async def get_subscription_controller() -> SubscriptionController:
+    return app_context.open().subscription_controller
+
+
+async def get_suggestion_controller() -> SuggestionController:
+    return app_context.open().suggestion_controller
+
+
+async def get_user_controller() -> UserController:
+    return app_context.open().user_controller
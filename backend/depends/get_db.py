@@ -1,11 +1,6 @@
-from deta import Deta
-import os
-from dotenv import load_dotenv
-
 from db.database_handler import DatabaseHandler
+from depends.app_context import app_context
 
 
-async def get_db():
-    load_dotenv()
-    deta = Deta(os.getenv("DETA_PROJECT_KEY"))
-    return DatabaseHandler(deta)
+async def get_db() -> DatabaseHandler:
+    return app_context.open().database_handler
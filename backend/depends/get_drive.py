@@ -1,11 +1,6 @@
-from deta import Deta
-import os
-from dotenv import load_dotenv
-
+from depends.app_context import app_context
 from handlers.drive_handler import DriveHandler
 
 
-async def get_drive():
-    load_dotenv()
-    deta = Deta(os.getenv("DETA_PROJECT_KEY"))
-    return DriveHandler(deta)
+async def get_drive() -> DriveHandler:
+    return app_context.open().drive_handler
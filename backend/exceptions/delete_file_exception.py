@@ -1,4 +1,4 @@
-class AppendLikeException(Exception):
+class DeleteFileException(Exception):
     def __init__(self, message):
         self.message = message
 
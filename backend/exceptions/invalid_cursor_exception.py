@@ -1,4 +1,4 @@
-class AppendCommentException(Exception):
+class InvalidCursorException(Exception):
     def __init__(self, message):
         self.message = message
 
@@ -0,0 +1,233 @@
+from typing import AsyncIterator, List, Union
+from urllib.parse import quote
+import aiohttp
+from fastapi import UploadFile
+
+# Deta Drive accepts parts of a multipart upload from 5 MB to 10 MB,
+# only the last part may be smaller
+MIN_CHUNK_SIZE = 5 * 1024 * 1024
+MAX_CHUNK_SIZE = 10 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class DriveFile:
+    """A file being downloaded from the drive"""
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        size: Union[int, None],
+        etag: Union[str, None],
+        last_modified: Union[str, None],
+    ):
+        self.chunks = chunks
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class AsyncDrive:
+    """Client of one Deta Drive working over aiohttp, files are uploaded
+    and downloaded in chunks without blocking the event loop"""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        project_key: str,
+        project_id: str,
+        name: str,
+        chunk_size: int = MAX_CHUNK_SIZE,
+        host: str = "drive.deta.sh",
+    ):
+        self.__session = session
+        self.__chunk_size = min(max(chunk_size, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+        self.__headers = {"X-Api-Key": project_key}
+        self.__url = f"https://{host}/v1/{project_id}/{name}"
+
+    async def __read_chunks(
+        self, data: Union[UploadFile, bytes, str]
+    ) -> AsyncIterator[bytes]:
+        """Reading the data in chunks of the set size
+
+        Args:
+            data (Union[UploadFile, bytes, str])
+
+        Returns:
+            AsyncIterator[bytes]: Chunks of the data
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if isinstance(data, bytes):
+            for i in range(0, len(data), self.__chunk_size):
+                yield data[i : i + self.__chunk_size]
+            return
+        await data.seek(0)
+        while True:
+            chunk = await data.read(self.__chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    async def put(
+        self,
+        name: str,
+        data: Union[UploadFile, bytes, str],
+        content_type: str = None,
+    ) -> str:
+        """Uploading a file. A file larger than one chunk is uploaded
+        in parts with a multipart upload
+
+        Args:
+            name (str): File name
+            data (Union[UploadFile, bytes, str]): File content
+            content_type (str, optional): Defaults to None.
+
+        Raises:
+            aiohttp.ClientError: If the file could not be uploaded
+
+        Returns:
+            str: File name
+        """
+        headers = dict(self.__headers)
+        if content_type is not None:
+            headers["Content-Type"] = content_type
+        name_query = quote(name, safe="")
+
+        chunks = self.__read_chunks(data)
+        first = await self.__next_chunk(chunks) or b""
+        second = await self.__next_chunk(chunks)
+        if second is None:
+            async with self.__session.post(
+                f"{self.__url}/files?name={name_query}", data=first, headers=headers
+            ) as response:
+                response.raise_for_status()
+                return (await response.json())["name"]
+
+        async with self.__session.post(
+            f"{self.__url}/uploads?name={name_query}", headers=headers
+        ) as response:
+            response.raise_for_status()
+            upload_id = (await response.json())["upload_id"]
+        upload_url = f"{self.__url}/uploads/{upload_id}"
+        try:
+            part = 1
+            for chunk in (first, second):
+                await self.__put_part(upload_url, name_query, part, chunk)
+                part += 1
+            async for chunk in chunks:
+                await self.__put_part(upload_url, name_query, part, chunk)
+                part += 1
+            async with self.__session.patch(
+                f"{upload_url}?name={name_query}", headers=self.__headers
+            ) as response:
+                response.raise_for_status()
+            return name
+        except BaseException:
+            async with self.__session.delete(
+                f"{upload_url}?name={name_query}", headers=self.__headers
+            ):
+                pass
+            raise
+
+    @staticmethod
+    async def __next_chunk(chunks: AsyncIterator[bytes]) -> Union[bytes, None]:
+        """Getting the next chunk
+
+        Args:
+            chunks (AsyncIterator[bytes])
+
+        Returns:
+            Union[bytes, None]: Chunk or None if the chunks are over
+        """
+        try:
+            return await chunks.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    async def __put_part(
+        self, upload_url: str, name_query: str, part: int, chunk: bytes
+    ) -> None:
+        """Uploading one part of a multipart upload
+
+        Args:
+            upload_url (str): URL of the upload
+            name_query (str): Quoted file name
+            part (int): Part number starting from 1
+            chunk (bytes): Part content
+
+        Raises:
+            aiohttp.ClientError: If the part could not be uploaded
+
+        Returns:
+            None: Returns nothing
+        """
+        async with self.__session.post(
+            f"{upload_url}/parts?name={name_query}&part={part}",
+            data=chunk,
+            headers=self.__headers,
+        ) as response:
+            response.raise_for_status()
+
+    async def delete_many(self, names: List[str]) -> None:
+        """Deleting files, the names of missing files are ignored
+
+        Args:
+            names (List[str]): Up to 1000 file names
+
+        Raises:
+            aiohttp.ClientError: If the files could not be deleted
+
+        Returns:
+            None: Returns nothing
+        """
+        async with self.__session.delete(
+            f"{self.__url}/files", json={"names": names}, headers=self.__headers
+        ) as response:
+            response.raise_for_status()
+
+    async def get(self, name: str) -> Union[DriveFile, None]:
+        """Getting a file, its content is read chunk by chunk
+
+        Args:
+            name (str): File name
+
+        Raises:
+            aiohttp.ClientError: If the file could not be retrieved
+
+        Returns:
+            Union[DriveFile, None]: The file or None if there is no file
+        """
+        response = await self.__session.get(
+            f"{self.__url}/files/download?name={quote(name, safe='')}",
+            headers=self.__headers,
+        )
+        if response.status == 404:
+            response.release()
+            return None
+        if response.status >= 400:
+            response.release()
+            response.raise_for_status()
+        return DriveFile(
+            self.__iter_response(response),
+            response.content_length,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    async def __iter_response(
+        self, response: aiohttp.ClientResponse
+    ) -> AsyncIterator[bytes]:
+        """Reading the response body in chunks, the connection is returned
+        to the pool when the body is read or the reading is stopped
+
+        Args:
+            response (aiohttp.ClientResponse)
+
+        Returns:
+            AsyncIterator[bytes]: Chunks of the body
+        """
+        try:
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            response.release()
@@ -0,0 +1,149 @@
+import hashlib
+import re
+from typing import Awaitable, Callable, List, Tuple, Union
+from fastapi import UploadFile
+
+from db.database_handler import DatabaseHandler
+from exceptions.update_blob_exception import UpdateBlobException
+from handlers.datetime_handler import DatetimeHandler
+from models.blob_model import BlobInDBModel
+
+READ_CHUNK_SIZE = 1024 * 1024
+DIGEST_PATTERN = re.compile(r"^([0-9a-f]{64})\.\w+$")
+
+
+class BlobHandler:
+    """Content-addressed storage of files: a file is stored under the digest
+    of its content, so the same content is uploaded only once.
+    A blob counts the references to it from posts and post contents,
+    blobs without references are deleted by init/collect_blobs.py"""
+
+    def __init__(self, database_controller: DatabaseHandler):
+        self.__database_controller = database_controller
+        self.__datetime_handler = DatetimeHandler()
+
+    async def hash_content(self, data: Union[UploadFile, bytes]) -> Tuple[str, int]:
+        """Calculating the digest of the content, the file is read in chunks
+
+        Args:
+            data (Union[UploadFile, bytes])
+
+        Returns:
+            Tuple[str, int]: SHA-256 digest in hex and the content size
+        """
+        if isinstance(data, bytes):
+            return hashlib.sha256(data).hexdigest(), len(data)
+        digest = hashlib.sha256()
+        size = 0
+        await data.seek(0)
+        while chunk := await data.read(READ_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+        await data.seek(0)
+        return digest.hexdigest(), size
+
+    def parse_digest(self, name_file: str) -> Union[str, None]:
+        """Getting the digest from the name of a content-addressed file
+
+        Args:
+            name_file (str): File name with the extension
+
+        Returns:
+            Union[str, None]: Digest or None if the name is not a digest
+        """
+        match = DIGEST_PATTERN.match(name_file)
+        return match.group(1) if match is not None else None
+
+    def find_digests(self, text: str, url_prefix: str) -> List[str]:
+        """Finding the content-addressed files that the text links to
+
+        Args:
+            text (str): For example the HTML content of a post
+            url_prefix (str): URL of the folder of the files
+
+        Returns:
+            List[str]: Digests of the files without repetitions
+        """
+        pattern = re.escape(url_prefix.rstrip("/")) + r"/([0-9a-f]{64})\.\w+"
+        return list(dict.fromkeys(re.findall(pattern, text)))
+
+    async def store(
+        self,
+        kind: str,
+        digest: str,
+        name: str,
+        size: int,
+        upload: Callable[[], Awaitable[str]],
+    ) -> Tuple[str, bool]:
+        """Storing a file under its digest. If a blob with this digest
+        already exists, the upload is skipped and the name of the stored file
+        is returned
+
+        Args:
+            kind (str): Kind of files, such as photo or content
+            digest (str): Digest of the content
+            name (str): Path of the file on the drive
+            size (int): Content size
+            upload (Callable[[], Awaitable[str]]): Uploading the file to the drive
+
+        Raises:
+            Exception: Errors of the upload
+
+        Returns:
+            Tuple[str, bool]: Path of the file and whether the blob has been created
+        """
+        key = f"{kind}:{digest}"
+        now = self.__datetime_handler.now()
+        try:
+            # Uploading the same content again postpones the garbage collection
+            await self.__database_controller.update_blob({"date_update": now}, key)
+            # The stored file may have another name, such as the extension
+            # of the first upload of a photo
+            blob = await self.__database_controller.get_blob_by_key(key)
+            if blob is not None:
+                return blob.name, False
+        except UpdateBlobException:
+            pass
+
+        name = await upload()
+        blob = await self.__database_controller.create_blob(
+            BlobInDBModel(
+                name=name, size=size, date_create=now, date_update=now, key=key
+            )
+        )
+        return name, blob is not None
+
+    async def add_reference(self, kind: str, digest: str) -> None:
+        """Adding a reference to the blob
+
+        Args:
+            kind (str): Kind of files, such as photo or content
+            digest (str): Digest of the content
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            await self.__database_controller.change_blob_ref_count(
+                1, f"{kind}:{digest}"
+            )
+        except UpdateBlobException:
+            # The file was uploaded before content addressing was enabled
+            pass
+
+    async def remove_reference(self, kind: str, digest: str) -> None:
+        """Removing a reference to the blob
+
+        Args:
+            kind (str): Kind of files, such as photo or content
+            digest (str): Digest of the content
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            await self.__database_controller.change_blob_ref_count(
+                -1, f"{kind}:{digest}"
+            )
+        except UpdateBlobException:
+            pass
@@ -0,0 +1,143 @@
+import gzip
+import zlib
+from typing import AsyncIterator, Dict, List, Union
+import brotli
+
+# Compression is done in the workers of the CPU executor, the functions are at
+# the module level, so the process pool can pickle them
+
+
+def compress_gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data: bytes) -> bytes:
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+
+# Encodings in the order of preference and the extensions of the stored files
+EXTENSIONS = {"br": "br", "gzip": "gz"}
+COMPRESSORS = {"br": compress_brotli, "gzip": compress_gzip}
+
+
+class GzipCompressor:
+    """Gzip compression of a stream of chunks"""
+
+    def __init__(self, level: int):
+        self.__compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        result = self.__compressor.compress(data)
+        if flush:
+            result += self.__compressor.flush(zlib.Z_SYNC_FLUSH)
+        return result
+
+    def finish(self) -> bytes:
+        return self.__compressor.flush()
+
+
+class BrotliCompressor:
+    """Brotli compression of a stream of chunks"""
+
+    def __init__(self, quality: int):
+        self.__compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        result = self.__compressor.process(data)
+        if flush:
+            result += self.__compressor.flush()
+        return result
+
+    def finish(self) -> bytes:
+        return self.__compressor.finish()
+
+
+class CompressionHandler:
+    def parse_accept_encoding(
+        self, accept_encoding: Union[str, None]
+    ) -> Dict[str, float]:
+        """Parsing the Accept-Encoding header
+
+        Args:
+            accept_encoding (Union[str, None])
+
+        Returns:
+            Dict[str, float]: Quality value of each listed encoding
+        """
+        qualities = {}
+        if accept_encoding is None:
+            return qualities
+        for item in accept_encoding.split(","):
+            coding, _, params = item.strip().partition(";")
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            qualities[coding] = quality
+        return qualities
+
+    def negotiate(
+        self, accept_encoding: Union[str, None], encodings: List[str]
+    ) -> Union[str, None]:
+        """Choosing the encoding of the response
+
+        Args:
+            accept_encoding (Union[str, None]): Accept-Encoding header
+            encodings (List[str]): Available encodings in the order of preference
+
+        Returns:
+            Union[str, None]: The encoding or None if the response is sent as is
+        """
+        qualities = self.parse_accept_encoding(accept_encoding)
+        best, best_quality = None, 0.0
+        for encoding in encodings:
+            quality = qualities.get(encoding, qualities.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def create_compressor(
+        self, encoding: str, gzip_level: int = 6, brotli_quality: int = 4
+    ) -> Union[GzipCompressor, BrotliCompressor]:
+        """Creating a compressor of a stream of chunks
+
+        Args:
+            encoding (str): "br" or "gzip"
+            gzip_level (int, optional): Defaults to 6.
+            brotli_quality (int, optional): Defaults to 4.
+
+        Returns:
+            Union[GzipCompressor, BrotliCompressor]
+        """
+        if encoding == "br":
+            return BrotliCompressor(brotli_quality)
+        return GzipCompressor(gzip_level)
+
+    async def decompress_gzip(
+        self, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Decompressing gzip data chunk by chunk
+
+        Args:
+            chunks (AsyncIterator[bytes]): Chunks of the compressed data
+
+        Returns:
+            AsyncIterator[bytes]: Chunks of the decompressed data
+        """
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            async for chunk in chunks:
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+            data = decompressor.flush()
+            if data:
+                yield data
+        finally:
+            await chunks.aclose()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Tuple
+
+from models.executor_stats_model import ExecutorStatsModel
+
+
+def _timed_call(func: Callable, args: tuple) -> Tuple[Any, float, float]:
+    """Calling the function in a worker and measuring when it ran.
+    The function is at the module level, so the process pool can pickle it
+
+    Args:
+        func (Callable): Function to call
+        args (tuple): Function arguments
+
+    Returns:
+        Tuple[Any, float, float]: Result, start and end time of the call
+    """
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at, time.time()
+
+
+class CPUExecutor:
+    """Pool of workers for CPU-heavy synchronous work, such as image processing
+    and password hashing, so that it does not block the event loop"""
+
+    def __init__(self, kind: str = "thread", max_workers: int = None):
+        max_workers = max_workers or os.cpu_count() or 1
+        if kind == "process":
+            self.__executor: Executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            kind = "thread"
+            self.__executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="cpu"
+            )
+        self.__max_workers = max_workers
+        self.__stats = ExecutorStatsModel(kind=kind, max_workers=self.__max_workers)
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Running the function in a worker of the pool.
+        In the process pool the function and its arguments must be picklable
+
+        Args:
+            func (Callable): Function to call
+            args: Function arguments
+
+        Returns:
+            Any: Function result
+        """
+        loop = asyncio.get_running_loop()
+        self.__stats.in_flight += 1
+        self.__update_queue_depth()
+        submitted_at = time.time()
+        try:
+            result, started_at, ended_at = await loop.run_in_executor(
+                self.__executor, _timed_call, func, args
+            )
+        except BaseException:
+            self.__stats.errors += 1
+            raise
+        finally:
+            self.__stats.in_flight -= 1
+            self.__update_queue_depth()
+
+        wait_time = max(started_at - submitted_at, 0) * 1000
+        run_time = (ended_at - started_at) * 1000
+        self.__stats.tasks += 1
+        self.__stats.wait_time_total_ms += wait_time
+        self.__stats.wait_time_max_ms = max(self.__stats.wait_time_max_ms, wait_time)
+        self.__stats.run_time_total_ms += run_time
+        self.__stats.run_time_max_ms = max(self.__stats.run_time_max_ms, run_time)
+        return result
+
+    def __update_queue_depth(self) -> None:
+        """Counting the tasks waiting for a free worker
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__stats.queue_depth = max(self.__stats.in_flight - self.__max_workers, 0)
+        self.__stats.queue_depth_max = max(
+            self.__stats.queue_depth_max, self.__stats.queue_depth
+        )
+
+    def shutdown(self) -> None:
+        """Stopping the workers of the pool
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> ExecutorStatsModel:
+        """Getting the statistics of the pool
+
+        Returns:
+            ExecutorStatsModel
+        """
+        return self.__stats.copy()
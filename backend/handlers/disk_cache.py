@@ -0,0 +1,287 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Union
+
+from handlers.async_drive import DriveFile
+from models.cache_stats_model import CacheStatsModel
+
+READ_CHUNK_SIZE = 64 * 1024
+# Removed files are deleted with a delay so that responses
+# that have already started sending them can finish
+REMOVE_DELAY = 60
+# The result of a load that was not saved to the cache
+_BYPASS = object()
+
+
+class CachedFile:
+    """A file saved in the disk cache"""
+
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        etag: Union[str, None],
+        last_modified: Union[str, None],
+    ):
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class DiskCache:
+    """Cache of drive files on the local disk bounded by the total size of files.
+    When the cache is full, the least recently used file is evicted.
+    Concurrent requests for a missing file wait for one load of it"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int,
+        max_file_size: int,
+        ttl: float,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        # Each process keeps its own files, the index is held in memory
+        self.__directory = tempfile.mkdtemp(prefix="media_", dir=directory)
+        self.__max_size = max_size
+        self.__max_file_size = min(max_file_size, max_size)
+        self.__ttl = ttl
+        # Key: (CachedFile or None if there is no such file on the drive, expire_at)
+        self.__items = OrderedDict()
+        self.__size = 0
+        self.__loading = {}
+        self.__stats = CacheStatsModel(name="media", max_size=max_size, ttl=ttl)
+
+    def __remove_later(self, item: Union[CachedFile, None]) -> None:
+        """Deleting the file of an item after a delay
+
+        Args:
+            item (Union[CachedFile, None])
+
+        Returns:
+            None: Returns nothing
+        """
+        if item is not None:
+            asyncio.get_running_loop().call_later(
+                REMOVE_DELAY, self.__remove_file, item.path
+            )
+
+    def __pop(self, key: str) -> None:
+        """Removing an item from the index
+
+        Args:
+            key (str)
+
+        Returns:
+            None: Returns nothing
+        """
+        item, _ = self.__items.pop(key)
+        if item is not None:
+            self.__size -= item.size
+        self.__remove_later(item)
+
+    @staticmethod
+    def __remove_file(path: str) -> None:
+        """Deleting a file if it still exists
+
+        Args:
+            path (str)
+
+        Returns:
+            None: Returns nothing
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def __save(self, file: DriveFile) -> CachedFile:
+        """Writing a drive file to the cache folder
+
+        Args:
+            file (DriveFile)
+
+        Raises:
+            OSError: If the file could not be written
+
+        Returns:
+            CachedFile: The saved file, it is not in the index yet
+        """
+        fd, path = tempfile.mkstemp(dir=self.__directory)
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as output:
+                async for chunk in file.chunks:
+                    await asyncio.to_thread(output.write, chunk)
+                    size += len(chunk)
+        except BaseException:
+            await file.chunks.aclose()
+            self.__remove_file(path)
+            raise
+        return CachedFile(path, size, file.etag, file.last_modified)
+
+    def __put(self, key: str, item: Union[CachedFile, None]) -> None:
+        """Adding an item to the index and evicting the least recently used
+        items while the files take more space than allowed
+
+        Args:
+            key (str)
+            item (Union[CachedFile, None])
+
+        Returns:
+            None: Returns nothing
+        """
+        if key in self.__items:
+            self.__pop(key)
+        self.__items[key] = (item, time.monotonic() + self.__ttl)
+        if item is not None:
+            self.__size += item.size
+        while self.__size > self.__max_size:
+            self.__pop(next(iter(self.__items)))
+            self.__stats.evictions += 1
+
+    async def __load(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Union[DriveFile, None]]],
+        future: asyncio.Future,
+    ) -> Union[CachedFile, DriveFile, None]:
+        """Loading a file from the drive and saving it to the cache.
+        The result is passed to the requests waiting for the same key
+
+        Args:
+            key (str)
+            load (Callable[[], Awaitable[Union[DriveFile, None]]]): Reading from the drive
+            future (asyncio.Future): Result for the waiting requests
+
+        Returns:
+            Union[CachedFile, DriveFile, None]: The cached file, the drive file
+            if it is too large for the cache or None if there is no file
+        """
+        try:
+            file = await load()
+            if file is not None and (
+                file.size is None or file.size > self.__max_file_size
+            ):
+                future.set_result(_BYPASS)
+                return file
+            item = await self.__save(file) if file is not None else None
+            # The key is invalidated while loading if the file has been uploaded again
+            if self.__loading.get(key) is future:
+                self.__put(key, item)
+            else:
+                self.__remove_later(item)
+            future.set_result(item)
+            return item
+        except asyncio.CancelledError:
+            future.set_result(_BYPASS)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            if self.__loading.get(key) is future:
+                del self.__loading[key]
+
+    async def get(
+        self, key: str, load: Callable[[], Awaitable[Union[DriveFile, None]]]
+    ) -> Union[CachedFile, DriveFile, None]:
+        """Getting a file from the cache, a missing file is loaded once
+        for all concurrent requests
+
+        Args:
+            key (str): Drive name and file path
+            load (Callable[[], Awaitable[Union[DriveFile, None]]]): Reading from the drive
+
+        Raises:
+            Exception: Errors of the load
+
+        Returns:
+            Union[CachedFile, DriveFile, None]: The cached file, the drive file
+            if it is too large for the cache or None if there is no file
+        """
+        if key in self.__items:
+            item, expire_at = self.__items[key]
+            if expire_at > time.monotonic():
+                self.__items.move_to_end(key)
+                self.__stats.hits += 1
+                return item
+            self.__pop(key)
+        self.__stats.misses += 1
+
+        future = self.__loading.get(key)
+        if future is not None:
+            result = await asyncio.shield(future)
+            return await load() if result is _BYPASS else result
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may wait for the result, the exception is marked as retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.__loading[key] = future
+        return await self.__load(key, load, future)
+
+    def invalidate(self, key: str) -> None:
+        """Removing a file from the cache, a load already in progress
+        is not saved
+
+        Args:
+            key (str): Drive name and file path
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__stats.invalidations += 1
+        self.__loading.pop(key, None)
+        if key in self.__items:
+            self.__pop(key)
+
+    async def iter_range(
+        self, item: CachedFile, start: int, end: int
+    ) -> AsyncIterator[bytes]:
+        """Reading a range of a cached file
+
+        Args:
+            item (CachedFile)
+            start (int): First byte
+            end (int): Last byte
+
+        Returns:
+            AsyncIterator[bytes]: Chunks of the range
+        """
+        with open(item.path, "rb") as file:
+            file.seek(start)
+            left = end - start + 1
+            while left > 0:
+                chunk = await asyncio.to_thread(file.read, min(READ_CHUNK_SIZE, left))
+                if not chunk:
+                    return
+                left -= len(chunk)
+                yield chunk
+
+    def close(self) -> None:
+        """Deleting the cached files
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__items.clear()
+        self.__loading.clear()
+        self.__size = 0
+        shutil.rmtree(self.__directory, ignore_errors=True)
+
+    def get_stats(self) -> CacheStatsModel:
+        """Getting the cache statistics, the sizes are in bytes
+
+        Returns:
+            CacheStatsModel
+        """
+        stats = self.__stats.copy()
+        stats.size = self.__size
+        requests = stats.hits + stats.misses
+        stats.hit_rate = stats.hits / requests if requests > 0 else 0
+        return stats
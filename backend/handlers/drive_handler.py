@@ -1,36 +1,110 @@
-import io
-from typing import BinaryIO, Union
+from typing import AsyncIterator, List, Mapping, Union
+import aiohttp
 from deta import Deta
-from deta.drive import DriveStreamingBody
 from fastapi import UploadFile
-from fastapi.responses import StreamingResponse
-from PIL import Image
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
+from exceptions.delete_file_exception import DeleteFileException
 from exceptions.get_file_exception import GetFileException
 from exceptions.get_photo_exception import GetPhotoException
 from exceptions.get_text_exception import GetTextException
+from exceptions.range_not_satisfiable_exception import RangeNotSatisfiableException
 from exceptions.upload_file_exception import UploadFileException
 from exceptions.upload_photo_exception import UploadPhotoException
 from exceptions.upload_text_exception import UploadTextException
+from handlers.async_drive import MAX_CHUNK_SIZE, AsyncDrive, DriveFile
+from handlers.compression_handler import COMPRESSORS, EXTENSIONS, CompressionHandler
+from handlers.cpu_executor import CPUExecutor
+from handlers.disk_cache import CachedFile, DiskCache
+from handlers.http_cache_handler import HTTPCacheHandler
+from handlers.image_handler import ImageHandler
+from models.cache_stats_model import CacheStatsModel
 
 
 class DriveHandler:
-    def __init__(self, deta: Deta):
+    def __init__(
+        self,
+        deta: Deta,
+        image_handler: ImageHandler,
+        cpu_executor: CPUExecutor,
+        http_cache_handler: HTTPCacheHandler,
+        disk_cache: Union[DiskCache, None] = None,
+        text_encodings: List[str] = None,
+        chunk_size: int = MAX_CHUNK_SIZE,
+    ):
         self.__deta = deta
+        self.__image_handler = image_handler
+        self.__cpu_executor = cpu_executor
+        self.__http_cache_handler = http_cache_handler
+        self.__disk_cache = disk_cache
+        self.__compression_handler = CompressionHandler()
+        # Texts are stored compressed with these encodings, in the order of preference
+        self.__text_encodings = [
+            encoding for encoding in EXTENSIONS if encoding in (text_encodings or [])
+        ]
+        self.__chunk_size = chunk_size
+        self.__session = None
+        self.__drives = {}
+
+    def __get_drive(self, name_drive: str) -> AsyncDrive:
+        """Getting the drive client, one per folder for the whole process.
+        All clients share one aiohttp session created on the first call
+
+        Args:
+            name_drive (str): Name of the folder for files
+
+        Returns:
+            AsyncDrive
+        """
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession()
+        if name_drive not in self.__drives:
+            self.__drives[name_drive] = AsyncDrive(
+                self.__session,
+                self.__deta.project_key,
+                self.__deta.project_id,
+                name_drive,
+                self.__chunk_size,
+            )
+        return self.__drives[name_drive]
+
+    async def close(self) -> None:
+        """Releasing the drive clients and their session, deleting the cached files
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__drives.clear()
+        if self.__disk_cache is not None:
+            self.__disk_cache.close()
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
 
-    def __upload_file(
+    def get_disk_cache_stats(self) -> Union[CacheStatsModel, None]:
+        """Getting the statistics of the disk cache of files
+
+        Returns:
+            Union[CacheStatsModel, None]: None if the cache is disabled
+        """
+        if self.__disk_cache is None:
+            return None
+        return self.__disk_cache.get_stats()
+
+    async def __upload_file(
         self,
         name_file: str,
         name_drive: str,
-        file: Union[BinaryIO, bytes, str],
+        file: Union[UploadFile, bytes, str],
         content_type: str = None,
     ) -> str:
-        """Uploading files
+        """Uploading files in chunks, large files are uploaded in parts.
+        The previous version of the file is removed from the disk cache
 
         Args:
             name_file (str)
             name_drive (str): Name of the folder for files
-            file (Union[BinaryIO, bytes])
+            file (Union[UploadFile, bytes, str])
             content_type (str, optional): Defaults to None.
 
         Raises:
@@ -39,18 +113,20 @@ class DriveHandler:
         Returns:
             str: The name of the directory with the file name
         """
-        items = self.__deta.Drive(name_drive)
-        print(name_file, name_drive, file)
+        items = self.__get_drive(name_drive)
         try:
-            return items.put(name_file, file, content_type=content_type)
+            return await items.put(name_file, file, content_type=content_type)
         except Exception as e:
 
             raise UploadFileException(f"{e}")
+        finally:
+            if self.__disk_cache is not None:
+                self.__disk_cache.invalidate(f"{name_drive}/{name_file}")
 
-    def __get_file(
+    async def __get_file(
         self, name_file: str, name_drive: str
-    ) -> Union[DriveStreamingBody, None]:
-        """Getting a file
+    ) -> Union[CachedFile, DriveFile, None]:
+        """Getting a file, through the disk cache if it is enabled
 
         Args:
             name_file (str)
@@ -60,46 +136,163 @@ class DriveHandler:
             GetFileException: If the file could not be retrieved
 
         Returns:
-            Union[DriveStreamingBody, None]: The resulting image
+            Union[CachedFile, DriveFile, None]: The file or None if there is no file
         """
-        items = self.__deta.Drive(name_drive)
+        items = self.__get_drive(name_drive)
         try:
-            return items.get(name_file)
+            if self.__disk_cache is None:
+                return await items.get(name_file)
+            return await self.__disk_cache.get(
+                f"{name_drive}/{name_file}", lambda: items.get(name_file)
+            )
         except Exception as e:
 
             raise GetFileException(f"{e}")
 
-    def __get_extension(self, name_file: str) -> str:
-        """Getting the file extension
+    def __make_not_modified_response(
+        self,
+        etag: Union[str, None],
+        immutable: bool,
+        extra_headers: Mapping[str, str] = None,
+    ) -> Response:
+        """Making a response without a body for a client that has the content
 
         Args:
-            name_file (str)
+            etag (Union[str, None])
+            immutable (bool): The content under this name never changes
+            extra_headers (Mapping[str, str], optional): Defaults to None.
 
         Returns:
-            str: file extension
+            Response: Response with the code 304
         """
-        extension_file = name_file.split(".")[-1]
-        return extension_file
+        headers = {
+            "Cache-Control": self.__http_cache_handler.get_cache_control(immutable),
+            **(extra_headers or {}),
+        }
+        if etag is not None:
+            headers["ETag"] = etag
+        return Response(status_code=304, headers=headers)
+
+    async def __release(self, file: Union[CachedFile, DriveFile]) -> None:
+        """Closing the download of a file whose body is not sent
+
+        Args:
+            file (Union[CachedFile, DriveFile])
+
+        Returns:
+            None: Returns nothing
+        """
+        if isinstance(file, DriveFile):
+            await file.chunks.aclose()
+
+    def __read_chunks(self, file: Union[CachedFile, DriveFile]) -> AsyncIterator[bytes]:
+        """Getting the chunks of a file wherever it is stored
+
+        Args:
+            file (Union[CachedFile, DriveFile])
+
+        Returns:
+            AsyncIterator[bytes]
+        """
+        if isinstance(file, CachedFile):
+            return self.__disk_cache.iter_range(file, 0, file.size - 1)
+        return file.chunks
+
+    async def __make_response(
+        self,
+        file: Union[CachedFile, DriveFile, None],
+        media_type: str,
+        request_headers: Mapping[str, str],
+        etag: str = None,
+        immutable: bool = False,
+        extra_headers: Mapping[str, str] = None,
+    ) -> Union[Response, None]:
+        """Making a response with a file taking into account the validators
+        and the range requested by the client
+
+        Args:
+            file (Union[CachedFile, DriveFile, None]): A cached file is sent
+            from the disk
+            media_type (str)
+            request_headers (Mapping[str, str]): Request headers
+            etag (str, optional): ETag of the content, if None the ETag
+            of the drive is used. Defaults to None.
+            immutable (bool, optional): The content under this name never
+            changes. Defaults to False.
+            extra_headers (Mapping[str, str], optional): Headers added to the
+            response, such as Content-Encoding. Defaults to None.
+
+        Returns:
+            Union[Response, None]: The response or None if there is no file
+        """
+        if file is None:
+            return None
+        etag = etag or file.etag
+        if self.__http_cache_handler.is_not_modified(
+            etag, request_headers.get("if-none-match")
+        ):
+            await self.__release(file)
+            return self.__make_not_modified_response(etag, immutable, extra_headers)
+
+        headers = {
+            "Cache-Control": self.__http_cache_handler.get_cache_control(immutable),
+            **(extra_headers or {}),
+        }
+        if etag is not None:
+            headers["ETag"] = etag
+        if file.last_modified is not None:
+            headers["Last-Modified"] = file.last_modified
+        if file.size is None:
+            return StreamingResponse(
+                file.chunks, media_type=media_type, headers=headers
+            )
+
+        headers["Accept-Ranges"] = "bytes"
+        try:
+            byte_range = self.__http_cache_handler.parse_range(
+                request_headers.get("range"),
+                file.size,
+                etag,
+                request_headers.get("if-range"),
+            )
+        except RangeNotSatisfiableException:
+            await self.__release(file)
+            return Response(
+                status_code=416, headers={"Content-Range": f"bytes */{file.size}"}
+            )
+        if byte_range is None:
+            headers["Content-Length"] = str(file.size)
+            if isinstance(file, CachedFile):
+                return FileResponse(file.path, media_type=media_type, headers=headers)
+            return StreamingResponse(
+                file.chunks, media_type=media_type, headers=headers
+            )
+
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{file.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            (
+                self.__disk_cache.iter_range(file, start, end)
+                if isinstance(file, CachedFile)
+                else self.__http_cache_handler.slice_chunks(file.chunks, start, end)
+            ),
+            status_code=206,
+            media_type=media_type,
+            headers=headers,
+        )
 
-    def __resize_file(
-        self, file: BinaryIO, extension_file: str, size_height: int, size_width: int
-    ) -> bytes:
-        """Changing the file size
+    def __get_extension(self, name_file: str) -> str:
+        """Getting the file extension
 
         Args:
-            file (BinaryIO)
-            extension_file (str)
-            size_height (int)
-            size_width (int)
+            name_file (str)
 
         Returns:
-            bytes: The resulting image
+            str: file extension
         """
-        img = Image.open(file)
-        resized_img = img.resize((size_width, size_height), Image.ANTIALIAS)
-        img_byte_arr = io.BytesIO()
-        resized_img.save(img_byte_arr, format=extension_file)
-        return img_byte_arr.getvalue()
+        extension_file = name_file.split(".")[-1]
+        return extension_file
 
     def join_file_name(self, file: UploadFile, name_file: str) -> str:
         """Combining the file name with the extension
@@ -114,7 +307,7 @@ class DriveHandler:
         extension_file = self.__get_extension(file.filename)
         return f"{name_file}.{extension_file}"
 
-    def upload_photo(
+    async def upload_photo(
         self,
         name_file: str,
         name_directory: str,
@@ -122,7 +315,7 @@ class DriveHandler:
         size_height: int = None,
         size_width: int = None,
     ) -> str:
-        """Uploading an image to disk
+        """Uploading an image to disk together with its reduced copies
 
         Args:
             name_file (str)
@@ -140,31 +333,57 @@ class DriveHandler:
         if file.content_type.find("image") == -1:
             raise UploadPhotoException("Invalid file format")
 
-        if (size_height is not None) and (size_width is not None):
-            extension_file = self.__get_extension(file.filename)
-            img = self.__resize_file(file.file, extension_file, size_height, size_width)
-        else:
-            img = file.file
+        img = await file.read()
+        # Without resizing the original is streamed from the uploaded file
+        original = file
+        try:
+            if (size_height is not None) and (size_width is not None):
+                extension_file = self.__get_extension(file.filename)
+                img = await self.__cpu_executor.run(
+                    self.__image_handler.resize,
+                    img,
+                    extension_file,
+                    size_height,
+                    size_width,
+                )
+                original = img
+            derivatives = await self.__cpu_executor.run(
+                self.__image_handler.make_derivatives, img
+            )
+        except (OSError, ValueError) as e:
+
+            raise UploadPhotoException("Invalid file format")
 
         try:
-            return self.__upload_file(f"{name_directory}/{name_file}", "photos", img)
+            for size, derivative in derivatives.items():
+                await self.__upload_file(
+                    f"{name_directory}/"
+                    + self.__image_handler.get_derivative_name(name_file, size),
+                    "photos",
+                    derivative,
+                    self.__image_handler.media_type,
+                )
+            return await self.__upload_file(
+                f"{name_directory}/{name_file}", "photos", original
+            )
         except UploadFileException as e:
 
             raise UploadPhotoException(f"{e}")
 
-    def upload_text(
+    async def upload_text(
         self,
         name_file: str,
         name_directory: str,
-        text: str,
+        text: Union[str, bytes],
         content_type: str = None,
     ) -> str:
-        """Uploading an image to disk
+        """Uploading a text to disk. The text is stored compressed with each
+        of the text encodings, the original is stored only if there is no gzip copy
 
         Args:
             name_file (str)
             name_directory (str)
-            text (str)
+            text (Union[str, bytes])
             content_type (str, optional): Defaults to None.
 
         Raises:
@@ -173,69 +392,182 @@ class DriveHandler:
         Returns:
             str: The name of the directory and file
         """
-
+        name = f"{name_directory}/{name_file}"
+        data = text.encode("utf-8") if isinstance(text, str) else text
         try:
-            return self.__upload_file(
-                f"{name_directory}/{name_file}", "text", text, content_type
-            )
+            for encoding in self.__text_encodings:
+                compressed = await self.__cpu_executor.run(COMPRESSORS[encoding], data)
+                await self.__upload_file(
+                    f"{name}.{EXTENSIONS[encoding]}", "text", compressed, content_type
+                )
+            if "gzip" in self.__text_encodings:
+                return name
+            return await self.__upload_file(name, "text", data, content_type)
         except UploadFileException as e:
 
             raise UploadTextException(f"{e}")
 
-    def get_text(
-        self, name_directory: str, name_file: str
-    ) -> Union[StreamingResponse, None]:
-        """Getting a text by name and directory
+    async def delete_text(self, name_directory: str, name_file: str) -> None:
+        """Deleting a text together with its compressed copies
 
         Args:
             name_directory (str)
             name_file (str)
 
         Raises:
-            GetPhotoException: If the file could not be retrieved
+            DeleteFileException: If the files could not be deleted
 
         Returns:
-            Union[StreamingResponse, None]: The resulting text
+            None: Returns nothing
         """
-        extension_file = self.__get_extension(name_file)
+        name = f"{name_directory}/{name_file}"
+        names = [name] + [f"{name}.{extension}" for extension in EXTENSIONS.values()]
+        try:
+            await self.__get_drive("text").delete_many(names)
+        except Exception as e:
+
+            raise DeleteFileException(f"{e}")
+        finally:
+            if self.__disk_cache is not None:
+                for file_name in names:
+                    self.__disk_cache.invalidate(f"text/{file_name}")
+
+    async def get_text(
+        self,
+        name_directory: str,
+        name_file: str,
+        request_headers: Mapping[str, str] = None,
+        immutable: bool = False,
+    ) -> Union[Response, None]:
+        """Getting a text by name and directory. A compressed copy is sent
+        if the client accepts its encoding, otherwise the gzip copy
+        is decompressed on the fly
+
+        Args:
+            name_directory (str)
+            name_file (str)
+            request_headers (Mapping[str, str], optional): Request headers with
+            the accepted encodings, the validators and the range. Defaults to None.
+            immutable (bool, optional): The text under this name never changes,
+            so the client may keep it without revalidation. Defaults to False.
+
+        Raises:
+            GetTextException: If the file could not be retrieved
+
+        Returns:
+            Union[Response, None]: The resulting text
+        """
+        request_headers = request_headers or {}
+        media_type = f"text/{self.__get_extension(name_file)}"
+        name = f"{name_directory}/{name_file}"
+        encoding = self.__compression_handler.negotiate(
+            request_headers.get("accept-encoding"), self.__text_encodings
+        )
+        extra_headers = {"Vary": "Accept-Encoding"} if self.__text_encodings else {}
+        etag = (
+            self.__http_cache_handler.make_etag(name, encoding or "identity")
+            if immutable
+            else None
+        )
+        if self.__http_cache_handler.is_not_modified(
+            etag, request_headers.get("if-none-match")
+        ):
+            return self.__make_not_modified_response(etag, immutable, extra_headers)
 
         try:
-            result = self.__get_file(f"{name_directory}/{name_file}", "text")
-            return (
-                StreamingResponse(
-                    result.iter_chunks(), media_type=f"text/{extension_file}"
-                )
-                if result is not None
-                else None
+            if encoding is not None:
+                result = await self.__get_file(f"{name}.{EXTENSIONS[encoding]}", "text")
+                if result is not None:
+                    return await self.__make_response(
+                        result,
+                        media_type,
+                        request_headers,
+                        etag,
+                        immutable,
+                        {**extra_headers, "Content-Encoding": encoding},
+                    )
+            elif "gzip" in self.__text_encodings:
+                # The client does not accept compressed texts
+                result = await self.__get_file(f"{name}.gz", "text")
+                if result is not None:
+                    chunks = self.__compression_handler.decompress_gzip(
+                        self.__read_chunks(result)
+                    )
+                    return await self.__make_response(
+                        DriveFile(chunks, None, None, result.last_modified),
+                        media_type,
+                        request_headers,
+                        etag,
+                        immutable,
+                        extra_headers,
+                    )
+            # Texts uploaded before compression was enabled are stored as is
+            result = await self.__get_file(name, "text")
+            return await self.__make_response(
+                result, media_type, request_headers, etag, immutable, extra_headers
             )
         except GetFileException as e:
 
             raise GetTextException(f"{e}")
 
-    def get_photo(
-        self, name_directory: str, name_file: str
-    ) -> Union[StreamingResponse, None]:
+    async def get_photo(
+        self,
+        name_directory: str,
+        name_file: str,
+        width: int = None,
+        request_headers: Mapping[str, str] = None,
+        immutable: bool = False,
+    ) -> Union[Response, None]:
         """Getting a photo by name and directory
 
         Args:
             name_directory (str)
             name_file (str)
+            width (int, optional): Desired width, the narrowest copy that is
+            not narrower is returned. Defaults to None, that is the original.
+            request_headers (Mapping[str, str], optional): Request headers with
+            the validators and the range. Defaults to None.
+            immutable (bool, optional): The photo under this name never changes,
+            so the client may keep it without revalidation. Defaults to False.
 
         Raises:
             GetPhotoException: If the file could not be retrieved
 
         Returns:
-            Union[StreamingResponse, None]: The resulting image
+            Union[Response, None]: The resulting image
         """
-        extension_file = self.__get_extension(name_file)
+        request_headers = request_headers or {}
+        media_type = f"image/{self.__get_extension(name_file)}"
+        size = self.__image_handler.choose_size(width)
+        etag = (
+            self.__http_cache_handler.make_etag(
+                f"{name_directory}/{name_file}", str(size)
+            )
+            if immutable
+            else None
+        )
+        if self.__http_cache_handler.is_not_modified(
+            etag, request_headers.get("if-none-match")
+        ):
+            return self.__make_not_modified_response(etag, immutable)
+
         try:
-            result = self.__get_file(f"{name_directory}/{name_file}", "photos")
-            return (
-                StreamingResponse(
-                    result.iter_chunks(), media_type=f"image/{extension_file}"
+            result = None
+            if size is not None:
+                # Photos uploaded before the copies appeared have only the original
+                result = await self.__get_file(
+                    f"{name_directory}/"
+                    + self.__image_handler.get_derivative_name(name_file, size),
+                    "photos",
+                )
+            if result is not None:
+                media_type = self.__image_handler.media_type
+            else:
+                result = await self.__get_file(
+                    f"{name_directory}/{name_file}", "photos"
                 )
-                if result is not None
-                else None
+            return await self.__make_response(
+                result, media_type, request_headers, etag, immutable
             )
         except GetFileException as e:
 
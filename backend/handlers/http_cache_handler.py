@@ -0,0 +1,129 @@
+import hashlib
+from typing import AsyncIterator, Tuple, Union
+
+from exceptions.range_not_satisfiable_exception import RangeNotSatisfiableException
+
+
+class HTTPCacheHandler:
+    """Validators, cache headers and byte ranges of the served files"""
+
+    def __init__(self, max_age: int = 31536000):
+        self.__max_age = max_age
+
+    def make_etag(self, *parts: str) -> str:
+        """Making a strong ETag from the parts that identify the content
+
+        Args:
+            parts (str): For example the file path and the width of the copy
+
+        Returns:
+            str: ETag in quotes
+        """
+        digest = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def get_cache_control(self, immutable: bool) -> str:
+        """Getting the Cache-Control header
+
+        Args:
+            immutable (bool): The content under this name never changes
+
+        Returns:
+            str: Cache-Control value
+        """
+        if immutable:
+            return f"public, max-age={self.__max_age}, immutable"
+        return "public, no-cache"
+
+    def is_not_modified(self, etag: Union[str, None], if_none_match: str) -> bool:
+        """Checking the If-None-Match header against the ETag of the content
+
+        Args:
+            etag (Union[str, None])
+            if_none_match (str): If-None-Match header
+
+        Returns:
+            bool: True if the client already has this content
+        """
+        if etag is None or if_none_match is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses the weak comparison
+        etag = etag.removeprefix("W/")
+        return any(
+            tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+        )
+
+    def parse_range(
+        self,
+        range_header: str,
+        size: Union[int, None],
+        etag: Union[str, None] = None,
+        if_range: str = None,
+    ) -> Union[Tuple[int, int], None]:
+        """Parsing the Range header. Only one range is served, for several ranges,
+        an unknown size or a changed content the whole file is sent
+
+        Args:
+            range_header (str): Range header, for example "bytes=0-499"
+            size (Union[int, None]): File size
+            etag (Union[str, None], optional): ETag of the content. Defaults to None.
+            if_range (str, optional): If-Range header. Defaults to None.
+
+        Raises:
+            RangeNotSatisfiableException: If the range is outside the file
+
+        Returns:
+            Union[Tuple[int, int], None]: First and last byte of the range
+            or None if the whole file is sent
+        """
+        if range_header is None or size is None:
+            return None
+        if if_range is not None and (etag is None or if_range.strip() != etag):
+            return None
+        unit, _, ranges = range_header.partition("=")
+        if unit.strip() != "bytes" or "," in ranges:
+            return None
+        start, sep, end = ranges.strip().partition("-")
+        if not sep or not (start.isdigit() or end.isdigit()):
+            return None
+        if start.isdigit() and end and not end.isdigit():
+            return None
+        if not start:
+            # The last bytes of the file
+            length = int(end)
+            if length == 0:
+                raise RangeNotSatisfiableException("Range not satisfiable")
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+        if start >= size or start > end:
+            raise RangeNotSatisfiableException("Range not satisfiable")
+        return start, end
+
+    async def slice_chunks(
+        self, chunks: AsyncIterator[bytes], start: int, end: int
+    ) -> AsyncIterator[bytes]:
+        """Leaving only the bytes of the range in the chunks of the file
+
+        Args:
+            chunks (AsyncIterator[bytes]): Chunks of the whole file
+            start (int): First byte
+            end (int): Last byte
+
+        Returns:
+            AsyncIterator[bytes]: Chunks of the range
+        """
+        position = 0
+        try:
+            async for chunk in chunks:
+                chunk_start = max(start - position, 0)
+                chunk_end = min(end + 1 - position, len(chunk))
+                position += len(chunk)
+                if chunk_start < chunk_end:
+                    yield chunk[chunk_start:chunk_end]
+                if position > end:
+                    break
+        finally:
+            await chunks.aclose()
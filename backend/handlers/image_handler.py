@@ -0,0 +1,86 @@
+import io
+from typing import Dict, List, Union
+from PIL import Image
+
+
+class ImageHandler:
+    """Resizing uploaded images and creating their reduced copies in several widths"""
+
+    def __init__(self, sizes: List[int], format_image: str = "webp"):
+        self.__sizes = sorted(sizes)
+        self.__format = format_image.lower()
+
+    @property
+    def media_type(self) -> str:
+        return f"image/{self.__format}"
+
+    def get_derivative_name(self, name_file: str, size: int) -> str:
+        """Getting the file name of the image copy of the given width
+
+        Args:
+            name_file (str): File name of the original image
+            size (int): Width of the copy
+
+        Returns:
+            str: File name of the copy
+        """
+        stem = name_file.rsplit(".", 1)[0]
+        return f"{stem}_w{size}.{self.__format}"
+
+    def choose_size(self, width: Union[int, None]) -> Union[int, None]:
+        """Choosing the smallest copy that is not narrower than the requested width
+
+        Args:
+            width (Union[int, None]): Requested width
+
+        Returns:
+            Union[int, None]: Width of the copy or None if the original is needed
+        """
+        if width is None:
+            return None
+        for size in self.__sizes:
+            if size >= width:
+                return size
+        return None
+
+    def resize(
+        self, data: bytes, extension_file: str, size_height: int, size_width: int
+    ) -> bytes:
+        """Changing the image size
+
+        Args:
+            data (bytes): The original image
+            extension_file (str)
+            size_height (int)
+            size_width (int)
+
+        Returns:
+            bytes: The resulting image
+        """
+        img = Image.open(io.BytesIO(data))
+        resized_img = img.resize((size_width, size_height), Image.LANCZOS)
+        img_byte_arr = io.BytesIO()
+        resized_img.save(img_byte_arr, format=extension_file)
+        return img_byte_arr.getvalue()
+
+    def make_derivatives(self, data: bytes) -> Dict[int, bytes]:
+        """Creating copies of the image in all configured widths.
+        Images are not enlarged, a narrow image keeps its width
+
+        Args:
+            data (bytes): The original image
+
+        Returns:
+            Dict[int, bytes]: Copies by width
+        """
+        img = Image.open(io.BytesIO(data))
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        result = {}
+        for size in self.__sizes:
+            copy = img.copy()
+            copy.thumbnail((size, img.height), Image.LANCZOS)
+            img_byte_arr = io.BytesIO()
+            copy.save(img_byte_arr, format=self.__format)
+            result[size] = img_byte_arr.getvalue()
+        return result
@@ -1,5 +1,4 @@
 import os
-from dotenv import load_dotenv
 import jwt
 from datetime import datetime, timedelta
 
@@ -10,7 +9,6 @@ from exceptions.refresh_token_exception import RefreshTokenException
 
 class JWTHandler:
     def __init__(self):
-        load_dotenv()
         self.__secret = os.getenv("APP_SECRET_STRING")
         self.__algorithm = os.getenv("ALGORITHM")
         self.__access_token_expire_minutes = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")
@@ -1,13 +1,25 @@
-from dotenv import load_dotenv
 from passlib.context import CryptContext
 
+from handlers.cpu_executor import CPUExecutor
+
+# Hashing is done in the workers of the CPU executor, the functions are at
+# the module level, so the process pool can pickle them
+hasher = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return hasher.hash(password)
+
+
+def check_password(password: str, encoded_password: str) -> bool:
+    return hasher.verify(password, encoded_password)
+
 
 class PasswordHandler:
-    def __init__(self):
-        load_dotenv()
-        self.__hasher = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def __init__(self, cpu_executor: CPUExecutor):
+        self.__cpu_executor = cpu_executor
 
-    def encode_password(self, password: str) -> str:
+    async def encode_password(self, password: str) -> str:
         """Getting the password hash
 
         Args:
@@ -16,9 +28,9 @@ class PasswordHandler:
         Returns:
             str: resulting hash
         """
-        return self.__hasher.hash(password)
+        return await self.__cpu_executor.run(hash_password, password)
 
-    def verify_password(self, password: str, encoded_password: str):
+    async def verify_password(self, password: str, encoded_password: str) -> bool:
         """Checking for a password match
 
         Args:
@@ -28,4 +40,6 @@ class PasswordHandler:
         Returns:
             bool: True if the password matched the hash, else False
         """
-        return self.__hasher.verify(password, encoded_password)
+        return await self.__cpu_executor.run(
+            check_password, password, encoded_password
+        )
@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Tuple, Type, Union
+from pydantic import BaseModel, create_model
+
+from exceptions.invalid_fields_exception import InvalidFieldsException
+
+SUMMARY = "summary"
+
+
+@lru_cache(maxsize=256)
+def _create_projection(model: Type[BaseModel], names: Tuple[str]) -> Type[BaseModel]:
+    """Creating a model with only the chosen fields of the model,
+    once per set of fields
+
+    Args:
+        model (Type[BaseModel])
+        names (Tuple[str]): Fields of the model
+
+    Returns:
+        Type[BaseModel]
+    """
+    fields = {}
+    for name in names:
+        field = model.__fields__[name]
+        fields[name] = (field.outer_type_, field.field_info)
+    return create_model(f"{model.__name__}Projection", **fields)
+
+
+class ProjectionHandler:
+    """Choosing the model of the items of a list, so that only the requested
+    fields are read from the documents and sent to the client"""
+
+    def get_model(
+        self,
+        model: Type[BaseModel],
+        fields: Union[str, None],
+        summary_model: Type[BaseModel],
+    ) -> Type[BaseModel]:
+        """Getting the model for the fields parameter
+
+        Args:
+            model (Type[BaseModel]): Full model of the items
+            fields (Union[str, None]): "summary" or names of the fields
+            separated by commas, None for the full model
+            summary_model (Type[BaseModel]): Model of the short view of the items
+
+        Raises:
+            InvalidFieldsException: If the model has no such field
+
+        Returns:
+            Type[BaseModel]
+        """
+        if fields is None or not fields.strip():
+            return model
+        if fields.strip() == SUMMARY:
+            return summary_model
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        names = list(dict.fromkeys(names))
+        unknown = [name for name in names if name not in model.__fields__]
+        if unknown:
+            raise InvalidFieldsException(f"Unknown fields: {', '.join(unknown)}")
+        # The key is always sent, it is needed to open the item
+        if "key" in model.__fields__ and "key" not in names:
+            names.insert(0, "key")
+        return _create_projection(model, tuple(names))
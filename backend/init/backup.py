@@ -0,0 +1,538 @@
+import argparse
+import gzip
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterator, List, Union
+from dotenv import load_dotenv
+from deta import Deta
+
+BASES = [
+    "users",
+    "users_by_email",
+    "users_by_username",
+    "posts",
+    "likes",
+    "comments",
+    "events",
+    "timelines",
+    "subscriptions",
+    "roles",
+    "skills",
+    "suggestions",
+    "blobs",
+    "deletion_jobs",
+]
+DRIVES = ["photos", "text"]
+MAX_PUT_MANY = 25
+PUT_ATTEMPTS = 3
+PAGE_SIZE = 1000
+EXPORT_CHECKPOINT = "export.json"
+# Seconds between the progress lines of one base or drive
+REPORT_INTERVAL = 5
+
+
+class Clients:
+    """Deta Base and Drive clients of the current thread, a client keeps
+    one connection and cannot be shared between threads"""
+
+    def __init__(self, deta: Deta):
+        self.__deta = deta
+        self.__local = threading.local()
+
+    def __get(self, kind: str, name: str, create: Callable):
+        """Getting the client of the current thread, it is created on first use
+
+        Args:
+            kind (str): "bases" or "drives"
+            name (str): Name of the base or drive
+            create (Callable): Creating a client by name
+
+        Returns:
+            Base or Drive client
+        """
+        clients = self.__local.__dict__.setdefault(kind, {})
+        if name not in clients:
+            clients[name] = create(name)
+        return clients[name]
+
+    def base(self, name: str):
+        """Getting the Base client of the current thread
+
+        Args:
+            name (str): Base name
+
+        Returns:
+            Deta Base
+        """
+        return self.__get("bases", name, self.__deta.Base)
+
+    def drive(self, name: str):
+        """Getting the Drive client of the current thread
+
+        Args:
+            name (str): Drive name
+
+        Returns:
+            Deta Drive
+        """
+        return self.__get("drives", name, self.__deta.Drive)
+
+
+class Checkpoint:
+    """Progress of an export or an import kept in the archive folder,
+    every base and drive continues from its saved state"""
+
+    def __init__(self, path: str):
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.__state = json.load(f)
+
+    def get(self, name: str) -> dict:
+        """Getting the saved state
+
+        Args:
+            name (str): For example "base:users"
+
+        Returns:
+            dict: State, empty if nothing has been saved
+        """
+        return dict(self.__state.get(name, {}))
+
+    def save(self, name: str, state: dict) -> None:
+        """Saving the state to the file
+
+        Args:
+            name (str): For example "base:users"
+            state (dict)
+
+        Returns:
+            None: Returns nothing
+        """
+        with self.__lock:
+            self.__state[name] = state
+            # The file is replaced at once, so a crash keeps the previous state
+            with open(f"{self.__path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(self.__state, f)
+            os.replace(f"{self.__path}.tmp", self.__path)
+
+
+class Progress:
+    """Printing the number of items and bytes processed and the throughput"""
+
+    def __init__(self, name: str, items: int = 0):
+        self.__name = name
+        self.__items = items
+        self.__size = 0
+        self.__start = time.monotonic()
+        self.__reported = self.__start
+
+    def add(self, items: int, size: int) -> None:
+        """Counting processed items, the progress is printed every REPORT_INTERVAL
+
+        Args:
+            items (int): Number of items
+            size (int): Their size in bytes
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__items += items
+        self.__size += size
+        if time.monotonic() - self.__reported >= REPORT_INTERVAL:
+            self.report()
+
+    def report(self) -> None:
+        """Printing the progress
+
+        Returns:
+            None: Returns nothing
+        """
+        self.__reported = time.monotonic()
+        seconds = max(self.__reported - self.__start, 1e-6)
+        megabytes = self.__size / 1024 / 1024
+        print(
+            f"{self.__name}: {self.__items} items, {megabytes:.1f} MB, "
+            f"{megabytes / seconds:.2f} MB/s, {self.__items / seconds:.0f} items/s"
+        )
+
+
+def open_append(path: str, offset: int) -> io.BufferedWriter:
+    """Opening a file of the archive to continue it from the saved offset,
+    the data written after the last checkpoint is dropped
+
+    Args:
+        path (str)
+        offset (int): Size of the file at the last checkpoint
+
+    Returns:
+        io.BufferedWriter
+    """
+    f = open(path, "ab")
+    f.truncate(offset)
+    f.seek(offset)
+    return f
+
+
+def export_base(
+    clients: Clients, name: str, folder: str, checkpoint: Checkpoint
+) -> None:
+    """Writing all items of the base to bases/<name>.ndjson.gz, one JSON
+    document per line. Every page is a separate gzip member, so the file
+    is continued after the last saved page
+
+    Args:
+        clients (Clients)
+        name (str): Base name
+        folder (str): Archive folder
+        checkpoint (Checkpoint)
+
+    Returns:
+        None: Returns nothing
+    """
+    key = f"base:{name}"
+    state = checkpoint.get(key)
+    if state.get("done"):
+        return
+    count = state.get("count", 0)
+    last = state.get("last")
+    progress = Progress(key, count)
+    with open_append(
+        os.path.join(folder, "bases", f"{name}.ndjson.gz"), state.get("offset", 0)
+    ) as f:
+        while True:
+            result = clients.base(name).fetch(limit=PAGE_SIZE, last=last)
+            data = b"".join(
+                json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n"
+                for item in result.items
+            )
+            f.write(gzip.compress(data))
+            f.flush()
+            count += len(result.items)
+            last = result.last
+            checkpoint.save(
+                key,
+                {
+                    "offset": f.tell(),
+                    "last": last,
+                    "count": count,
+                    "done": last is None,
+                },
+            )
+            progress.add(len(result.items), len(data))
+            if last is None:
+                break
+    progress.report()
+
+
+def read_file(clients: Clients, drive: str, name: str) -> Union[bytes, None]:
+    """Downloading a file of the drive
+
+    Args:
+        clients (Clients)
+        drive (str): Drive name
+        name (str): File name
+
+    Returns:
+        Union[bytes, None]: Content or None if the file has been deleted
+    """
+    content = clients.drive(drive).get(name)
+    if content is None:
+        return None
+    try:
+        return content.read()
+    finally:
+        content.close()
+
+
+def export_drive(
+    clients: Clients,
+    name: str,
+    folder: str,
+    checkpoint: Checkpoint,
+    executor: ThreadPoolExecutor,
+    concurrency: int,
+) -> None:
+    """Writing all files of the drive to drives/<name>.tar, the files are
+    downloaded concurrently and written in the order of the listing.
+    Photos and post contents are compressed already, so the tar is not
+
+    Args:
+        clients (Clients)
+        name (str): Drive name
+        folder (str): Archive folder
+        checkpoint (Checkpoint)
+        executor (ThreadPoolExecutor)
+        concurrency (int): Number of files downloaded at once
+
+    Returns:
+        None: Returns nothing
+    """
+    key = f"drive:{name}"
+    state = checkpoint.get(key)
+    if state.get("done"):
+        return
+    count = state.get("count", 0)
+    last = state.get("last")
+    progress = Progress(key, count)
+    with open_append(
+        os.path.join(folder, "drives", f"{name}.tar"), state.get("offset", 0)
+    ) as f:
+        with tarfile.open(fileobj=f, mode="w") as tar:
+            while True:
+                result = clients.drive(name).list(limit=PAGE_SIZE, last=last)
+                names = result.get("names", [])
+                for i in range(0, len(names), concurrency):
+                    group = names[i : i + concurrency]
+                    contents = executor.map(
+                        lambda file_name: read_file(clients, name, file_name), group
+                    )
+                    size = 0
+                    for file_name, content in zip(group, list(contents)):
+                        if content is None:
+                            continue
+                        info = tarfile.TarInfo(file_name)
+                        info.size = len(content)
+                        info.mtime = int(time.time())
+                        tar.addfile(info, io.BytesIO(content))
+                        count += 1
+                        size += len(content)
+                    progress.add(len(group), size)
+                f.flush()
+                last = result.get("paging", {}).get("last")
+                # The end of the archive written on closing is dropped on resuming
+                checkpoint.save(
+                    key,
+                    {
+                        "offset": tar.offset,
+                        "last": last,
+                        "count": count,
+                        "done": last is None,
+                    },
+                )
+                if last is None:
+                    break
+    progress.report()
+
+
+def read_lines(path: str, skip: int) -> Iterator[dict]:
+    """Reading the documents of an exported base
+
+    Args:
+        path (str)
+        skip (int): Number of documents imported already
+
+    Returns:
+        Iterator[dict]
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in islice(f, skip, None):
+            yield json.loads(line)
+
+
+def put_batch(clients: Clients, name: str, batch: List[dict]) -> None:
+    """Putting a batch of documents, the failed ones are put again
+    up to PUT_ATTEMPTS times
+
+    Args:
+        clients (Clients)
+        name (str): Base name
+        batch (List[dict]): Up to 25 documents
+
+    Raises:
+        RuntimeError: If some documents have not been put
+
+    Returns:
+        None: Returns nothing
+    """
+    for _ in range(PUT_ATTEMPTS):
+        result = clients.base(name).put_many(batch)
+        if "failed" not in result:
+            return
+        batch = result["failed"]["items"]
+    keys = ", ".join(str(item.get("key")) for item in batch)
+    raise RuntimeError(f"Failed to put items of {name}: {keys}")
+
+
+def import_base(
+    clients: Clients,
+    name: str,
+    folder: str,
+    checkpoint: Checkpoint,
+    executor: ThreadPoolExecutor,
+    concurrency: int,
+) -> None:
+    """Putting the documents of bases/<name>.ndjson.gz into the base,
+    concurrency batches of put_many at once
+
+    Args:
+        clients (Clients)
+        name (str): Base name
+        folder (str): Archive folder
+        checkpoint (Checkpoint)
+        executor (ThreadPoolExecutor)
+        concurrency (int): Number of put_many requests sent at once
+
+    Raises:
+        RuntimeError: If some documents have not been put, the import
+        continues from the last checkpoint when run again
+
+    Returns:
+        None: Returns nothing
+    """
+    key = f"base:{name}"
+    path = os.path.join(folder, "bases", f"{name}.ndjson.gz")
+    state = checkpoint.get(key)
+    if state.get("done") or not os.path.exists(path):
+        return
+    count = state.get("count", 0)
+    progress = Progress(key, count)
+    items = read_lines(path, count)
+    while True:
+        group = list(islice(items, MAX_PUT_MANY * concurrency))
+        if not group:
+            break
+        batches = [
+            group[i : i + MAX_PUT_MANY] for i in range(0, len(group), MAX_PUT_MANY)
+        ]
+        # The checkpoint is saved only when every item of the group is put
+        list(executor.map(lambda batch: put_batch(clients, name, batch), batches))
+        count += len(group)
+        checkpoint.save(key, {"count": count, "done": False})
+        progress.add(len(group), sum(len(json.dumps(item)) for item in group))
+    checkpoint.save(key, {"count": count, "done": True})
+    progress.report()
+
+
+def import_drive(
+    clients: Clients,
+    name: str,
+    folder: str,
+    checkpoint: Checkpoint,
+    executor: ThreadPoolExecutor,
+    concurrency: int,
+) -> None:
+    """Uploading the files of drives/<name>.tar to the drive,
+    concurrency files at once
+
+    Args:
+        clients (Clients)
+        name (str): Drive name
+        folder (str): Archive folder
+        checkpoint (Checkpoint)
+        executor (ThreadPoolExecutor)
+        concurrency (int): Number of files uploaded at once
+
+    Returns:
+        None: Returns nothing
+    """
+    key = f"drive:{name}"
+    path = os.path.join(folder, "drives", f"{name}.tar")
+    state = checkpoint.get(key)
+    if state.get("done") or not os.path.exists(path):
+        return
+    count = state.get("count", 0)
+    progress = Progress(key, count)
+    with tarfile.open(path, mode="r|") as tar:
+        members = (
+            (member.name, tar.extractfile(member).read())
+            for member in islice(tar, count, None)
+        )
+        while True:
+            group = list(islice(members, concurrency))
+            if not group:
+                break
+            list(
+                executor.map(
+                    lambda file: clients.drive(name).put(file[0], data=file[1]), group
+                )
+            )
+            count += len(group)
+            checkpoint.save(key, {"count": count, "done": False})
+            progress.add(len(group), sum(len(content) for _, content in group))
+    checkpoint.save(key, {"count": count, "done": True})
+    progress.report()
+
+
+def check_export(folder: str, names: List[str]) -> None:
+    """Checking that the exported bases and drives have been exported completely,
+    the ones missing from the archive are skipped by the import
+
+    Args:
+        folder (str): Archive folder
+        names (List[str]): For example "base:users"
+
+    Raises:
+        SystemExit: If the export of one of them has not finished
+    """
+    export = Checkpoint(os.path.join(folder, EXPORT_CHECKPOINT))
+    for name in names:
+        state = export.get(name)
+        if state and not state.get("done"):
+            raise SystemExit(f"The export of {name} has not finished")
+
+
+def main():
+    """Exporting the bases and drives of a project to an archive folder
+    or importing them from it, see the README"""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("folder", help="Archive folder")
+    parser.add_argument("--bases", nargs="*", default=BASES)
+    parser.add_argument("--drives", nargs="*", default=DRIVES)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("BACKUP_CONCURRENCY", 8)),
+        help="Number of requests sent at once",
+    )
+    args = parser.parse_args()
+
+    # Another project is chosen with BACKUP_PROJECT_KEY, keys are not passed
+    # in arguments to keep them out of the shell history
+    deta = Deta(os.getenv("BACKUP_PROJECT_KEY") or os.getenv("DETA_PROJECT_KEY"))
+    clients = Clients(deta)
+    concurrency = max(args.concurrency, 1)
+    with ThreadPoolExecutor(concurrency) as executor:
+        if args.command == "export":
+            os.makedirs(os.path.join(args.folder, "bases"), exist_ok=True)
+            os.makedirs(os.path.join(args.folder, "drives"), exist_ok=True)
+            checkpoint = Checkpoint(os.path.join(args.folder, EXPORT_CHECKPOINT))
+            for name in args.bases:
+                export_base(clients, name, args.folder, checkpoint)
+            for name in args.drives:
+                export_drive(
+                    clients, name, args.folder, checkpoint, executor, concurrency
+                )
+        else:
+            check_export(
+                args.folder,
+                [f"base:{name}" for name in args.bases]
+                + [f"drive:{name}" for name in args.drives],
+            )
+            # The progress is kept per project, the same archive can be loaded
+            # into several ones
+            checkpoint = Checkpoint(
+                os.path.join(args.folder, f"import-{deta.project_id}.json")
+            )
+            for name in args.bases:
+                import_base(
+                    clients, name, args.folder, checkpoint, executor, concurrency
+                )
+            for name in args.drives:
+                import_drive(
+                    clients, name, args.folder, checkpoint, executor, concurrency
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import gzip
+import os
+import re
+import time
+from dotenv import load_dotenv
+from deta import Deta
+
+PHOTO_DIGEST_PATTERN = re.compile(r"/post/photo/([0-9a-f]{64})\.\w+")
+
+
+def fetch_all(base, query: dict) -> list:
+    """Fetching all items of the base by the query
+
+    Args:
+        base: Deta Base
+        query (dict): Choosing criteria
+
+    Returns:
+        list: Items
+    """
+    result = base.fetch(query)
+    items = result.items
+    while result.last is not None:
+        result = base.fetch(query, last=result.last)
+        items += result.items
+    return items
+
+
+def main():
+    """Deleting the content-addressed photos and post contents that nothing
+    references. A blob is kept for BLOB_GC_GRACE seconds after its last upload,
+    so that the photos of a post that is still being written are not deleted.
+    Collecting a post content releases the photos it shows"""
+    load_dotenv()
+    deta = Deta(os.getenv("DETA_PROJECT_KEY"))
+    blobs_base = deta.Base("blobs")
+    drives = {"photo": deta.Drive("photos"), "content": deta.Drive("text")}
+    photo_sizes = [
+        int(size) for size in os.getenv("PHOTO_SIZES", "64,256,1024").split(",")
+    ]
+    photo_format = os.getenv("PHOTO_FORMAT", "webp")
+    grace = int(os.getenv("BLOB_GC_GRACE", 86400))
+
+    while True:
+        cutoff = (int(time.time()) - grace) * 1000
+        blobs = fetch_all(blobs_base, {"ref_count?lte": 0, "date_update?lt": cutoff})
+        deleted = 0
+        for blob in blobs:
+            # The blob could have been referenced again since the fetch
+            blob = blobs_base.get(blob["key"])
+            if blob is None or blob["ref_count"] > 0 or blob["date_update"] >= cutoff:
+                continue
+            kind = blob["key"].split(":", 1)[0]
+            name = blob["name"]
+            if kind == "content":
+                # Contents are stored compressed, or as is if compression is disabled
+                html = ""
+                content = drives["content"].get(f"{name}.gz")
+                if content is not None:
+                    html = gzip.decompress(content.read()).decode("utf-8")
+                    content.close()
+                else:
+                    content = drives["content"].get(name)
+                    if content is not None:
+                        html = content.read().decode("utf-8")
+                        content.close()
+                for digest in set(PHOTO_DIGEST_PATTERN.findall(html)):
+                    try:
+                        blobs_base.update(
+                            {"ref_count": blobs_base.util.increment(-1)},
+                            f"photo:{digest}",
+                        )
+                    except Exception:
+                        pass
+                drives["content"].delete_many([name, f"{name}.gz", f"{name}.br"])
+            else:
+                stem = name.rsplit(".", 1)[0]
+                drives["photo"].delete_many(
+                    [name] + [f"{stem}_w{size}.{photo_format}" for size in photo_sizes]
+                )
+            blobs_base.delete(blob["key"])
+            deleted += 1
+            print(f"Deleted {name}")
+        # Collected contents may have released more photos
+        if deleted == 0:
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+from dotenv import load_dotenv
+from deta import Deta
+
+MAX_PUT_MANY = 25
+
+
+def main():
+    """Filling the users_by_email and users_by_username bases
+    with the users registered before they appeared"""
+    load_dotenv()
+    deta = Deta(os.getenv("DETA_PROJECT_KEY"))
+    users_base = deta.Base("users")
+    indexes = {
+        "email": deta.Base("users_by_email"),
+        "username": deta.Base("users_by_username"),
+    }
+
+    result = users_base.fetch()
+    users = result.items
+    while result.last is not None:
+        result = users_base.fetch(last=result.last)
+        users += result.items
+
+    for field, index_base in indexes.items():
+        entries = [
+            {"key": user[field].strip().lower(), "user_key": user["key"]}
+            for user in users
+            if user.get(field)
+        ]
+        for i in range(0, len(entries), MAX_PUT_MANY):
+            index_base.put_many(entries[i : i + MAX_PUT_MANY])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+from typing import Iterator, List
+from dotenv import load_dotenv
+from deta import Deta
+
+MAX_PUT_MANY = 25
+PUT_ATTEMPTS = 3
+
+
+def iterate(base) -> Iterator[dict]:
+    """Iterating over all items of the base page by page,
+    the next page is read when the current one is processed
+
+    Args:
+        base: Deta Base
+
+    Returns:
+        Iterator[dict]: Items
+    """
+    result = base.fetch()
+    yield from result.items
+    while result.last is not None:
+        result = base.fetch(last=result.last)
+        yield from result.items
+
+
+def put_all(base, items: List[dict]) -> None:
+    """Putting the items in batches, the failed ones are put again
+    up to PUT_ATTEMPTS times
+
+    Args:
+        base: Deta Base
+        items (List[dict]): Items
+
+    Raises:
+        RuntimeError: If some items have not been put
+
+    Returns:
+        None: Returns nothing
+    """
+    for i in range(0, len(items), MAX_PUT_MANY):
+        batch = items[i : i + MAX_PUT_MANY]
+        for _ in range(PUT_ATTEMPTS):
+            result = base.put_many(batch)
+            if "failed" not in result:
+                break
+            batch = result["failed"]["items"]
+        else:
+            keys = ", ".join(str(item.get("key")) for item in batch)
+            raise RuntimeError(f"Failed to put comments: {keys}")
+
+
+def main():
+    """Moving the comments embedded in post documents to the comments base
+    and replacing the arrays with counters. The array of a post is removed
+    only when all its comments are stored, so the script can be run again
+    if it stops"""
+    load_dotenv()
+    deta = Deta(os.getenv("DETA_PROJECT_KEY"))
+    posts_base = deta.Base("posts")
+    comments_base = deta.Base("comments")
+
+    for post in iterate(posts_base):
+        if "comments" not in post:
+            continue
+        # The keys of the comments of a post are sorted by the creation date,
+        # as the keys of new comments. The old key keeps them unique
+        comments = [
+            {
+                "text": comment["text"],
+                "name": comment["name"],
+                "author": comment["author"],
+                "date_create": comment["date_create"],
+                "post_key": post["key"],
+                "key": f"{post['key']}:{comment['date_create']:015d}"
+                f"{comment.get('key') or index}",
+            }
+            for index, comment in enumerate(post["comments"])
+        ]
+        put_all(comments_base, comments)
+        posts_base.update(
+            {"comments": posts_base.util.trim(), "comment_count": len(comments)},
+            post["key"],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import time
+from typing import Iterator, List
+from dotenv import load_dotenv
+from deta import Deta
+
+MAX_PUT_MANY = 25
+PUT_ATTEMPTS = 3
+
+
+def iterate(base) -> Iterator[dict]:
+    """Iterating over all items of the base page by page,
+    the next page is read when the current one is processed
+
+    Args:
+        base: Deta Base
+
+    Returns:
+        Iterator[dict]: Items
+    """
+    result = base.fetch()
+    yield from result.items
+    while result.last is not None:
+        result = base.fetch(last=result.last)
+        yield from result.items
+
+
+def put_all(base, items: List[dict]) -> None:
+    """Putting the items in batches, the failed ones are put again
+    up to PUT_ATTEMPTS times
+
+    Args:
+        base: Deta Base
+        items (List[dict]): Items
+
+    Raises:
+        RuntimeError: If some items have not been put
+
+    Returns:
+        None: Returns nothing
+    """
+    for i in range(0, len(items), MAX_PUT_MANY):
+        batch = items[i : i + MAX_PUT_MANY]
+        for _ in range(PUT_ATTEMPTS):
+            result = base.put_many(batch)
+            if "failed" not in result:
+                break
+            batch = result["failed"]["items"]
+        else:
+            keys = ", ".join(str(item.get("key")) for item in batch)
+            raise RuntimeError(f"Failed to put likes: {keys}")
+
+
+def main():
+    """Moving the likes embedded in post documents to the likes base
+    and replacing the arrays with counters. The array of a post is removed
+    only when all its likes are stored, so the script can be run again
+    if it stops"""
+    load_dotenv()
+    deta = Deta(os.getenv("DETA_PROJECT_KEY"))
+    posts_base = deta.Base("posts")
+    likes_base = deta.Base("likes")
+    now = int(time.time()) * 1000
+
+    for post in iterate(posts_base):
+        if "likes" not in post:
+            continue
+        # A user liked a post once, the key is the same as for new likes
+        likes = {
+            f"{post['key']}:{like['user']['key']}": {
+                "user": like["user"],
+                "post_key": post["key"],
+                "date_create": now,
+                "key": f"{post['key']}:{like['user']['key']}",
+            }
+            for like in post["likes"]
+        }
+        likes = list(likes.values())
+        put_all(likes_base, likes)
+        posts_base.update(
+            {"likes": posts_base.util.trim(), "like_count": len(likes)},
+            post["key"],
+        )
+
+
+if __name__ == "__main__":
+    main()
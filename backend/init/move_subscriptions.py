@@ -0,0 +1,123 @@
+import os
+import time
+from typing import Iterator, List
+from dotenv import load_dotenv
+from deta import Deta
+
+MAX_PUT_MANY = 25
+PUT_ATTEMPTS = 3
+
+
+def iterate(base, query: dict = None) -> Iterator[dict]:
+    """Iterating over all items of the base matching the criteria page by page,
+    the next page is read when the current one is processed
+
+    Args:
+        base: Deta Base
+        query (dict, optional): Choosing criteria. Defaults to None.
+
+    Returns:
+        Iterator[dict]: Items
+    """
+    result = base.fetch(query)
+    yield from result.items
+    while result.last is not None:
+        result = base.fetch(query, last=result.last)
+        yield from result.items
+
+
+def count(base, query: dict) -> int:
+    """Counting the items of the base matching the criteria
+
+    Args:
+        base: Deta Base
+        query (dict): Choosing criteria
+
+    Returns:
+        int: Number of items
+    """
+    return sum(1 for _ in iterate(base, query))
+
+
+def put_all(base, items: List[dict]) -> None:
+    """Putting the items in batches, the failed ones are put again
+    up to PUT_ATTEMPTS times
+
+    Args:
+        base: Deta Base
+        items (List[dict]): Items
+
+    Raises:
+        RuntimeError: If some items have not been put
+
+    Returns:
+        None: Returns nothing
+    """
+    for i in range(0, len(items), MAX_PUT_MANY):
+        batch = items[i : i + MAX_PUT_MANY]
+        for _ in range(PUT_ATTEMPTS):
+            result = base.put_many(batch)
+            if "failed" not in result:
+                break
+            batch = result["failed"]["items"]
+        else:
+            keys = ", ".join(str(item.get("key")) for item in batch)
+            raise RuntimeError(f"Failed to put subscriptions: {keys}")
+
+
+def main():
+    """Moving the subscriptions embedded in user documents
+    to the subscriptions base and replacing the arrays with counters.
+    First the edges of all users are stored, then the counters of every user
+    are counted from the stored edges and the arrays are removed,
+    so the script can be run again if it stops"""
+    load_dotenv()
+    deta = Deta(os.getenv("DETA_PROJECT_KEY"))
+    users_base = deta.Base("users")
+    subscriptions_base = deta.Base("subscriptions")
+    now = int(time.time()) * 1000
+
+    for user in iterate(users_base):
+        if "subscriptions" not in user:
+            continue
+        follower = {
+            "username": user["username"],
+            "firstname": user["firstname"],
+            "lastname": user["lastname"],
+            "key": user["key"],
+            "url": user.get("url"),
+        }
+        subscriptions = [
+            {
+                "favorite": subs["favorite"],
+                "follower": follower,
+                "number_visits": subs.get("number_visits", 1),
+                "date_create": now,
+                "key": f"{user['key']}:{subs['favorite']['key']}",
+            }
+            for subs in user["subscriptions"]
+        ]
+        put_all(subscriptions_base, subscriptions)
+
+    # The followers array may disagree with the subscriptions arrays,
+    # the counters follow the edges
+    for user in iterate(users_base):
+        if "subscriptions" not in user and "followers" not in user:
+            continue
+        users_base.update(
+            {
+                "subscriptions": users_base.util.trim(),
+                "followers": users_base.util.trim(),
+                "subscriptions_count": count(
+                    subscriptions_base, {"follower.key": user["key"]}
+                ),
+                "followers_count": count(
+                    subscriptions_base, {"favorite.key": user["key"]}
+                ),
+            },
+            user["key"],
+        )
+
+
+if __name__ == "__main__":
+    main()
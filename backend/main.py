@@ -1,25 +1,36 @@
 import os
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
+from depends.app_context import app_context
+from middlewares.compression_middleware import CompressionMiddleware
+from middlewares.identity_map_middleware import IdentityMapMiddleware
+
 from routes import (
     auth_router,
     comment_router,
     like_router,
     post_router,
     role_router,
+    search_router,
     skill_router,
     suggestion_router,
     user_router,
     subscription_router,
     link_router,
     event_router,
+    stats_router,
 )
 
 
 load_dotenv()
-app = FastAPI(title=os.getenv("PROJECT_NAME"), description="👩‍🍳👩‍🏭👨‍🎨👨‍💻👨‍🔬👨‍🔧")
+app = FastAPI(
+    title=os.getenv("PROJECT_NAME"),
+    description="👩‍🍳👩‍🏭👨‍🎨👨‍💻👨‍🔬👨‍🔧",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +39,22 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(IdentityMapMiddleware)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", 1000)),
+)
+
+
+@app.on_event("startup")
+async def startup():
+    await app_context.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await app_context.close()
+
 
 app.include_router(auth_router.router, prefix="/auth")
 app.include_router(comment_router.router, prefix="/comment")
@@ -40,3 +67,5 @@ app.include_router(subscription_router.router, prefix="/subscription")
 app.include_router(role_router.router, prefix="/role")
 app.include_router(user_router.router, prefix="/user")
 app.include_router(event_router.router, prefix="/event")
+app.include_router(stats_router.router, prefix="/stats")
+app.include_router(search_router.router, prefix="/search")
@@ -0,0 +1,127 @@
+from starlette.datastructures import Headers, MutableHeaders
+
+from handlers.compression_handler import CompressionHandler
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+
+class CompressionMiddleware:
+    """Compressing responses with brotli or gzip according to Accept-Encoding.
+    Small bodies, already encoded responses and binary files are sent as is"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.__app = app
+        self.__minimum_size = minimum_size
+        self.__gzip_level = gzip_level
+        self.__brotli_quality = brotli_quality
+        self.__compression_handler = CompressionHandler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.__app(scope, receive, send)
+        encoding = self.__compression_handler.negotiate(
+            Headers(scope=scope).get("accept-encoding"), ["br", "gzip"]
+        )
+        if encoding is None:
+            return await self.__app(scope, receive, send)
+        await self.__app(scope, receive, self.__wrap_send(send, encoding))
+
+    def __is_compressible(self, message: dict) -> bool:
+        """Checking whether the response may be compressed
+
+        Args:
+            message (dict): The http.response.start message
+
+        Returns:
+            bool
+        """
+        headers = Headers(raw=message["headers"])
+        if message["status"] in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def __wrap_send(self, send, encoding: str):
+        """Wrapping the send function so that the body is compressed
+
+        Args:
+            send: ASGI send function
+            encoding (str): "br" or "gzip"
+
+        Returns:
+            ASGI send function
+        """
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        def set_encoding_headers(message: dict) -> MutableHeaders:
+            headers = MutableHeaders(raw=message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            # The compressed body is another representation of the resource
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            return headers
+
+        async def wrapped_send(message):
+            nonlocal start_message, compressor, passthrough
+            if passthrough:
+                return await send(message)
+            if message["type"] == "http.response.start":
+                start_message = message
+                if not self.__is_compressible(message):
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.__minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    return await send(message)
+                compressor = self.__compression_handler.create_compressor(
+                    encoding, self.__gzip_level, self.__brotli_quality
+                )
+                headers = set_encoding_headers(start_message)
+                if more_body:
+                    # The size of a streamed body is not known in advance
+                    del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    return await send({"type": "http.response.body", "body": body})
+
+            if more_body:
+                # Every chunk is flushed so that the client gets the data of
+                # a streamed response without waiting for the end
+                data = compressor.compress(body, flush=True)
+                if data:
+                    await send(
+                        {"type": "http.response.body", "body": data, "more_body": True}
+                    )
+            else:
+                data = compressor.compress(body) + compressor.finish()
+                await send({"type": "http.response.body", "body": data})
+
+        return wrapped_send
@@ -0,0 +1,14 @@
+from db.identity_map import identity_map_scope
+
+
+class IdentityMapMiddleware:
+    """Every HTTP request gets its own identity map of loaded documents"""
+
+    def __init__(self, app):
+        self.__app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.__app(scope, receive, send)
+        with identity_map_scope():
+            await self.__app(scope, receive, send)
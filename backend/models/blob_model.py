@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class BlobInDBModel(BaseModel):
+    """A file of the drive stored under the digest of its content"""
+
+    name: str
+    size: int
+    ref_count: int = 0
+    date_create: int
+    date_update: int
+    key: str
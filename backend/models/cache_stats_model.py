@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+class CacheStatsModel(BaseModel):
+    name: str
+    max_size: int
+    ttl: float
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "name": "users",
+                "max_size": 10000,
+                "ttl": 60,
+                "size": 250,
+                "hits": 9000,
+                "misses": 1000,
+                "hit_rate": 0.9,
+                "evictions": 0,
+                "invalidations": 40,
+            }
+        }
@@ -22,3 +22,7 @@ class CommentModel(CommentInputModel):
     author: ShortUserModelResponse
     key: Union[str, None]
     date_create: int
+
+
+class CommentInDBModel(CommentModel):
+    post_key: str
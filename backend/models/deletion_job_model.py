@@ -0,0 +1,41 @@
+from typing import Dict, Union
+from pydantic import BaseModel
+
+
+class DeletionJobModel(BaseModel):
+    """Background deletion of the content of a deleted user.
+    step is the index of the collection being deleted, the job continues
+    from it after a restart"""
+
+    key: str
+    user_key: str
+    status: str
+    step: int = 0
+    deleted: Dict[str, int] = {}
+    error: Union[str, None]
+    date_create: int
+    date_update: int
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "key": "kqzjvxwmbtrnpsla",
+                "user_key": "c0jyqx0ul4tv",
+                "status": "running",
+                "step": 1,
+                "deleted": {"events": 12, "posts": 50},
+                "error": None,
+                "date_create": 1690000000000,
+                "date_update": 1690000004000,
+            }
+        }
+
+
+class DeletionStartedModel(BaseModel):
+    message: str
+    job_id: str
+
+    class Config:
+        schema_extra = {
+            "example": {"message": "Deletion started", "job_id": "kqzjvxwmbtrnpsla"},
+        }
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+
+class ExecutorStatsModel(BaseModel):
+    kind: str
+    max_workers: int
+    in_flight: int = 0
+    queue_depth: int = 0
+    queue_depth_max: int = 0
+    tasks: int = 0
+    errors: int = 0
+    wait_time_total_ms: float = 0
+    wait_time_max_ms: float = 0
+    run_time_total_ms: float = 0
+    run_time_max_ms: float = 0
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "kind": "thread",
+                "max_workers": 4,
+                "in_flight": 5,
+                "queue_depth": 1,
+                "queue_depth_max": 6,
+                "tasks": 320,
+                "errors": 0,
+                "wait_time_total_ms": 840.2,
+                "wait_time_max_ms": 95.4,
+                "run_time_total_ms": 61250.0,
+                "run_time_max_ms": 410.3,
+            }
+        }
@@ -5,3 +5,9 @@ from models.short_user_model_response import ShortUserModelResponse
 
 class LikeModel(BaseModel):
     user: ShortUserModelResponse
+
+
+class LikeInDBModel(LikeModel):
+    post_key: str
+    date_create: int
+    key: str
@@ -1,8 +1,5 @@
-from typing import List
 from pydantic import BaseModel
 
-from models.comment_model import CommentModel
-from models.like_model import LikeModel
 from models.skill_model import SkillInDBModel
 from models.short_user_model_response import ShortUserModelResponse
 
@@ -30,6 +27,16 @@ class PostInputModel(BaseModel):
 class PostInDBModel(PostInputModel):
     date_create: int
     author: ShortUserModelResponse
-    likes: List[LikeModel]
-    comments: List[CommentModel]
+    like_count: int = 0
+    comment_count: int = 0
     key: str = None
+
+
+class PostSummaryModel(BaseModel):
+    key: str = None
+    name: str
+    date_create: int
+    skill: SkillInDBModel
+    author: ShortUserModelResponse
+    like_count: int = 0
+    comment_count: int = 0
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+class SearchHitModel(BaseModel):
+    kind: str
+    key: str
+    score: float
+    item: dict
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "kind": "skill",
+                "key": "3ed34r43f3",
+                "score": 2.0,
+                "item": {
+                    "key": "3ed34r43f3",
+                    "name": "UML-диаграммы",
+                    "scope": "Программирование",
+                    "url": "http://localhost:8000/skill/icon/uml.png",
+                },
+            }
+        }
@@ -6,3 +6,9 @@ from models.short_user_model_response import ShortUserModelResponse
 class SubscriptionModel(BaseModel):
     favorite: ShortUserModelResponse
     number_visits: int = 1
+
+
+class SubscriptionInDBModel(SubscriptionModel):
+    follower: ShortUserModelResponse
+    date_create: int
+    key: str
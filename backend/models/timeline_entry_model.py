@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from models.event_model import EventInDBModel
+
+
+class TimelineEntryModel(BaseModel):
+    follower_key: str
+    date: int
+    event_key: str
+    event: EventInDBModel
+    key: str
@@ -0,0 +1,31 @@
+from typing import Union
+from pydantic import BaseModel
+
+
+class TransportStatsModel(BaseModel):
+    name: str
+    limit: Union[int, None]
+    limit_per_host: Union[int, None]
+    keepalive_timeout: Union[float, None]
+    requests: int = 0
+    hits: int = 0
+    misses: int = 0
+    waits: int = 0
+    wait_time_total_ms: float = 0
+    wait_time_max_ms: float = 0
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "name": "pooled",
+                "limit": 100,
+                "limit_per_host": 20,
+                "keepalive_timeout": 30,
+                "requests": 1500,
+                "hits": 1480,
+                "misses": 20,
+                "waits": 3,
+                "wait_time_total_ms": 12.5,
+                "wait_time_max_ms": 7.1,
+            }
+        }
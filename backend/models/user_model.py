@@ -7,7 +7,6 @@ from models.link_model import LinkModel
 from models.role_model import RoleModelResponse
 from models.short_user_model_response import ShortUserModelResponse
 from models.skill_model import SkillInDBModel
-from models.subscription_model import SubscriptionModel
 
 datetime_handler = DatetimeHandler()
 
@@ -54,12 +53,12 @@ class FullUserModelResponse(BaseModel):
     place_residence: Union[str, None]
     email: str
     birth_date: Union[int, None]
-    followers: List[ShortUserModelResponse]
+    followers_count: int = 0
     links: List[LinkModel]
     role: Union[RoleModelResponse, None]
     skills: List[SkillInDBModel]
 
-    subscriptions: List[SubscriptionModel]
+    subscriptions_count: int = 0
     role_key: Union[str, None]
 
 
@@ -71,7 +70,8 @@ class UserModelResponse(ShortUserModelResponse):
     place_residence: Union[str, None]
     email: str
     birth_date: Union[int, None]
-    followers: List[ShortUserModelResponse]
+    followers_count: int = 0
+    subscriptions_count: int = 0
     links: List[LinkModel]
     role: Union[RoleModelResponse, None]
     skills: List[SkillInDBModel]
@@ -3,8 +3,7 @@ from fastapi import Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from controllers.auth_controller import AuthController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_controllers import get_auth_controller
 from models.http_error import HTTPError
 from models.message_model import MessageModel
 from models.token_model import AccessTokenModel, PairTokenModel
@@ -25,8 +24,10 @@ router = APIRouter(tags=["Auth"])
     },
     summary="Register in the system",
 )
-async def signup(user_details: SignupModel, db: DatabaseHandler = Depends(get_db)):
-    auth_controller = AuthController(db)
+async def signup(
+    user_details: SignupModel,
+    auth_controller: AuthController = Depends(get_auth_controller),
+):
     return await auth_controller.signup(user_details)
 
 
@@ -41,8 +42,10 @@ async def signup(user_details: SignupModel, db: DatabaseHandler = Depends(get_db
     },
     summary="Log in to the system",
 )
-async def login(user_details: AuthModel, db: DatabaseHandler = Depends(get_db)):
-    auth_controller = AuthController(db)
+async def login(
+    user_details: AuthModel,
+    auth_controller: AuthController = Depends(get_auth_controller),
+):
     return await auth_controller.login(user_details)
 
 
@@ -63,7 +66,6 @@ async def login(user_details: AuthModel, db: DatabaseHandler = Depends(get_db)):
 )
 async def refresh_token(
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    auth_controller: AuthController = Depends(get_auth_controller),
 ):
-    auth_controller = AuthController(db)
     return auth_controller.refresh_token(credentials)
@@ -1,18 +1,19 @@
-from typing import List
 from fastapi import APIRouter, Depends, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 from consts.name_roles import ADMIN, SUPER_ADMIN, USER
 from controllers.comment_controller import CommentController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_comment_controller
 from handlers.access.owner.any_owner import AnyOwner
 from handlers.access.owner.own_owner import OwnOwner
 from handlers.access.role_access import RoleAccess
 from handlers.access_handler import AccessHandler
-from models.comment_model import CommentInputModel, CommentModel
+from models.comment_model import CommentInDBModel, CommentInputModel
 from models.http_error import HTTPError
+from models.message_model import MessageModel
+from models.response_items import ResponseItems
 
 security = HTTPBearer()
 router = APIRouter(tags=["Comment"])
@@ -21,7 +22,7 @@ router = APIRouter(tags=["Comment"])
 @router.post(
     "/",
     responses={
-        200: {"model": CommentModel},
+        200: {"model": CommentInDBModel},
         400: {
             "model": HTTPError,
             "description": """If the user key is invalid or 
@@ -51,22 +52,34 @@ async def post_comment(
     comment: CommentInputModel,
     post_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    comment_controller: CommentController = Depends(get_comment_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(comment, post_key, token):
-        comment_controller = CommentController(db)
         return await comment_controller.post_comment(comment, post_key, token)
 
     return await inside_func(comment, post_key, credentials.credentials)
 
 
+@router.get(
+    "/",
+    responses={200: {"model": ResponseItems[CommentInDBModel]}},
+    summary="Getting the comments of the post from old to new",
+)
+async def get_comments(
+    post_key: str = Query(),
+    limit: int = Query(default=100),
+    last_comment_key: str = Query(default=None),
+    comment_controller: CommentController = Depends(get_comment_controller),
+):
+    return await comment_controller.get_comments(post_key, limit, last_comment_key)
+
+
 @router.delete(
     "/",
     responses={
-        200: {"model": List[CommentModel]},
+        200: {"model": MessageModel},
         400: {
             "model": HTTPError,
             "description": """If the user key is invalid or
@@ -96,11 +109,9 @@ async def delete_comment(
     comment_key: str = Query(),
     post_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    comment_controller: CommentController = Depends(get_comment_controller),
 ):
-    access_handler = AccessHandler(db)
-    comment_controller = CommentController(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
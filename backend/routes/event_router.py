@@ -3,8 +3,8 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 from controllers.event_controller import EventController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_event_controller
 from handlers.access.owner.any_owner import AnyOwner
 from handlers.access.owner.own_owner import OwnOwner
 from handlers.access.role_access import RoleAccess
@@ -47,13 +47,11 @@ router = APIRouter(tags=["Event"])
 async def create_event(
     event: EventInputModel,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    event_controller: EventController = Depends(get_event_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(event, token):
-        event_controller = EventController(db)
         return await event_controller.create_event(event, token)
 
     return await inside_func(event, credentials.credentials)
@@ -87,16 +85,14 @@ async def get_all_events(
     credentials: HTTPAuthorizationCredentials = Security(security),
     limit: int = Query(default=1000),
     last_event_key: str = Query(default=None),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    event_controller: EventController = Depends(get_event_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(ADMIN), RoleAccess(SUPER_ADMIN)],
     )
     async def inside_func(limit, last_event_key):
-        event_controller = EventController(db)
         return await event_controller.get_all_events(limit, last_event_key)
 
     return await inside_func(limit, last_event_key)
@@ -108,7 +104,7 @@ async def get_all_events(
         200: {"model": ResponseItems[EventInDBModel]},
         400: {
             "model": HTTPError,
-            "description": "If the user key is invalid",
+            "description": "If the user key or the cursor is invalid",
         },
         401: {
             "model": HTTPError,
@@ -131,10 +127,9 @@ async def get_events_by_subscription(
     limit: int = Query(default=1000),
     last_event_key: str = Query(default=None),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    event_controller: EventController = Depends(get_event_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(USER)],
@@ -145,7 +140,6 @@ async def get_events_by_subscription(
         limit,
         last_event_key,
     ):
-        event_controller = EventController(db)
         return await event_controller.get_events_by_subscription(
             token,
             next_days,
@@ -185,10 +179,9 @@ async def get_events_by_user(
     limit: int = Query(default=1000),
     last_event_key: str = Query(default=None),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    event_controller: EventController = Depends(get_event_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
@@ -198,7 +191,6 @@ async def get_events_by_user(
         ],
     )
     async def inside_func(key, limit, last_event_key):
-        event_controller = EventController(db)
         return await event_controller.get_event_by_user_key(key, limit, last_event_key)
 
     return await inside_func(key, limit, last_event_key)
@@ -235,11 +227,9 @@ async def get_events_by_user(
 async def delete_event(
     key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    event_controller: EventController = Depends(get_event_controller),
 ):
-    access_handler = AccessHandler(db)
-    event_controller = EventController(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
@@ -291,11 +281,9 @@ async def edit_event(
     event: EventInputModel,
     event_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    event_controller: EventController = Depends(get_event_controller),
 ):
-    access_handler = AccessHandler(db)
-    event_controller = EventController(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
@@ -1,17 +1,17 @@
-from typing import List
 from fastapi import APIRouter, Depends, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 from consts.name_roles import USER
 from controllers.like_controller import LikeController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_like_controller
 from handlers.access.role_access import RoleAccess
 from handlers.access_handler import AccessHandler
 from models.http_error import HTTPError
-from models.like_model import LikeModel
+from models.like_model import LikeInDBModel
 from models.message_model import MessageModel
+from models.response_items import ResponseItems
 
 security = HTTPBearer()
 router = APIRouter(tags=["Like"])
@@ -49,13 +49,11 @@ router = APIRouter(tags=["Like"])
 async def put_like(
     post_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    like_controller: LikeController = Depends(get_like_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(post_key, token):
-        like_controller = LikeController(db)
         return await like_controller.put_like(post_key, token)
 
     return await inside_func(post_key, credentials.credentials)
@@ -64,7 +62,7 @@ async def put_like(
 @router.delete(
     "/",
     responses={
-        200: {"model": List[LikeModel]},
+        200: {"model": MessageModel},
         400: {
             "model": HTTPError,
             "description": """If the user key is invalid or 
@@ -93,13 +91,25 @@ async def put_like(
 async def remove_like(
     post_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    like_controller: LikeController = Depends(get_like_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(post_key, token):
-        like_controller = LikeController(db)
         return await like_controller.remove_like(post_key, token)
 
     return await inside_func(post_key, credentials.credentials)
+
+
+@router.get(
+    "/",
+    responses={200: {"model": ResponseItems[LikeInDBModel]}},
+    summary="Getting the likes of the post",
+)
+async def get_likes(
+    post_key: str = Query(),
+    limit: int = Query(default=100),
+    last_like_key: str = Query(default=None),
+    like_controller: LikeController = Depends(get_like_controller),
+):
+    return await like_controller.get_likes(post_key, limit, last_like_key)
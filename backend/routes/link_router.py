@@ -4,8 +4,8 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 from consts.name_roles import USER
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_link_controller
 from handlers.access.role_access import RoleAccess
 from handlers.access_handler import AccessHandler
 from models.http_error import HTTPError
@@ -45,13 +45,11 @@ router = APIRouter(tags=["Link"])
 async def add_link(
     link: LinkModel,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    link_controller: LinkController = Depends(get_link_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(link, token):
-        link_controller = LinkController(db)
         return await link_controller.add_link(link, token)
 
     return await inside_func(link, credentials.credentials)
@@ -88,13 +86,11 @@ async def add_link(
 async def remove_link(
     url_link: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    link_controller: LinkController = Depends(get_link_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(url_link, token):
-        link_controller = LinkController(db)
         return await link_controller.remove_link(url_link, token)
 
     return await inside_func(url_link, credentials.credentials)
@@ -1,14 +1,12 @@
-from fastapi import APIRouter, Depends, Query, UploadFile, Path
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, Path
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 from consts.name_roles import ADMIN, SUPER_ADMIN, USER
 from controllers.post_controller import PostController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
-from depends.get_drive import get_drive
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_post_controller
 from handlers.access.role_access import RoleAccess
-from handlers.drive_handler import DriveHandler
 from handlers.access_handler import AccessHandler
 from handlers.access.owner.any_owner import AnyOwner
 from handlers.access.owner.own_owner import OwnOwner
@@ -49,14 +47,11 @@ router = APIRouter(tags=["Post"])
 async def create_post(
     post: PostInputModel,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(post, token):
-        post_controller = PostController(db, drive)
         return await post_controller.create_post(post, token)
 
     return await inside_func(post, credentials.credentials)
@@ -90,15 +85,12 @@ async def create_post(
 async def upload_image_to_post(
     file: UploadFile,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(file):
-        post_controller = PostController(db, drive)
-        return post_controller.upload_photo(file)
+        return await post_controller.upload_photo(file)
 
     return await inside_func(file)
 
@@ -107,40 +99,45 @@ async def upload_image_to_post(
     "/photo/{name_image}",
     responses={
         200: {"description": "File in the format *StreamingResponse*"},
+        206: {"description": "The part of the file requested in the Range header"},
+        304: {"description": "If the ETag from If-None-Match has not changed"},
         400: {
             "model": HTTPError,
             "description": "if the file could not be retrieved",
         },
+        416: {"description": "If the range is outside the file"},
     },
     summary="Getting the photo by the name",
 )
 async def get_image_by_name(
+    request: Request,
     name_image: str = Path(example="python.png"),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    w: int = Query(default=None, gt=0),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    post_controller = PostController(db, drive)
-    return post_controller.get_photo(name_image)
+    return await post_controller.get_photo(name_image, w, request.headers)
 
 
 @router.get(
     "/content/{name_content}",
     responses={
         200: {"description": "File in the format *StreamingResponse*"},
+        206: {"description": "The part of the file requested in the Range header"},
+        304: {"description": "If the ETag from If-None-Match has not changed"},
         400: {
             "model": HTTPError,
             "description": "if the file could not be retrieved",
         },
+        416: {"description": "If the range is outside the file"},
     },
     summary="Getting the content by the name",
 )
 async def get_content_by_name(
+    request: Request,
     name_content: str = Path(example="post_uml_zgqeuipptbrjwhd.html"),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    post_controller = PostController(db, drive)
-    return post_controller.get_content(name_content)
+    return await post_controller.get_content(name_content, request.headers)
 
 
 @router.post(
@@ -170,48 +167,51 @@ async def get_content_by_name(
 async def upload_content_to_post(
     content: UnloadContentPostModel,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(content_html, name_post):
-        post_controller = PostController(db, drive)
-        return post_controller.upload_content(content_html, name_post)
+        return await post_controller.upload_content(content_html, name_post)
 
     return await inside_func(content.content, content.name)
 
 
 @router.get(
     "/all",
-    responses={200: {"model": ResponseItems[PostInDBModel]}},
+    responses={
+        200: {"model": ResponseItems[PostInDBModel]},
+        400: {"model": HTTPError, "description": "If the post has no such field"},
+    },
     summary="Getting all posts from the database",
 )
 async def get_all_posts(
     limit: int = Query(default=100),
     last_user_key: str = Query(default=None),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    fields: str = Query(default=None, example="summary"),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    post_controller = PostController(db, drive)
-    return await post_controller.get_all_post(limit, last_user_key)
+    return await post_controller.get_all_post(limit, last_user_key, fields)
 
 
 @router.get(
     "/by_skill",
-    responses={200: {"model": ResponseItems[PostInDBModel]}},
+    responses={
+        200: {"model": ResponseItems[PostInDBModel]},
+        400: {"model": HTTPError, "description": "If the post has no such field"},
+    },
     summary="Getting posts by skill name from the database",
 )
 async def get_posts_by_skill(
     name_skill: str = Query(example="Питон"),
     limit: int = Query(default=100),
     last_user_key: str = Query(default=None),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    fields: str = Query(default=None, example="summary"),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    post_controller = PostController(db, drive)
-    return await post_controller.get_posts_by_skill(name_skill, limit, last_user_key)
+    return await post_controller.get_posts_by_skill(
+        name_skill, limit, last_user_key, fields
+    )
 
 
 @router.delete(
@@ -245,12 +245,9 @@ async def get_posts_by_skill(
 async def delete_post_by_key(
     post_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    access_handler = AccessHandler(db)
-    post_controller = PostController(db, drive)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
@@ -302,12 +299,9 @@ async def edit_post(
     post: PostInputModel,
     post_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    post_controller: PostController = Depends(get_post_controller),
 ):
-    access_handler = AccessHandler(db)
-    post_controller = PostController(db, drive)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
@@ -3,9 +3,9 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 from consts.name_roles import ADMIN, SUPER_ADMIN
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_role_controller
 from controllers.role_controller import RoleController
-from db.database_handler import DatabaseHandler
 from handlers.access.role_access import RoleAccess
 from handlers.access_handler import AccessHandler
 from handlers.access.assign.admin_assign import AdminAssign
@@ -44,16 +44,14 @@ router = APIRouter(tags=["Role"])
 )
 async def get_all_rolles_that_can_assign(
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    role_controller: RoleController = Depends(get_role_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
     )
     async def inside_func():
-        role_controller = RoleController(db)
         return await role_controller.get_all_roles()
 
     return await inside_func()
@@ -91,10 +89,9 @@ async def assign_role(
     role_key: str = Query(),
     user_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    role_controller: RoleController = Depends(get_role_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
@@ -105,7 +102,6 @@ async def assign_role(
     )
     @access_handler.maker_assign_access(user_key)
     async def inside_func(role_key, user_key):
-        role_controller = RoleController(db)
         return await role_controller.assign_role_to_user(role_key, user_key)
 
     return await inside_func(role_key, user_key)
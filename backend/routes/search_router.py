@@ -0,0 +1,27 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+
+from controllers.search_controller import SearchController
+from depends.get_controllers import get_search_controller
+from models.http_error import HTTPError
+from models.response_items import ResponseItems
+from models.search_model import SearchHitModel
+
+router = APIRouter(tags=["Search"])
+
+
+@router.get(
+    "",
+    responses={
+        200: {"model": ResponseItems[SearchHitModel]},
+        400: {"model": HTTPError, "description": "If the kind is unknown"},
+    },
+    summary="Searching posts, skills and users by words or their beginnings",
+)
+async def search(
+    q: str = Query(min_length=1, max_length=200, example="uml диаг"),
+    kind: List[str] = Query(default=None, example=["post", "skill"]),
+    limit: int = Query(default=20, gt=0, le=100),
+    search_controller: SearchController = Depends(get_search_controller),
+):
+    return await search_controller.search(q, kind, limit)
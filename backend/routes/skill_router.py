@@ -1,18 +1,16 @@
 from typing import List
-from fastapi import APIRouter, Depends, Query, UploadFile, Path
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, Path
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 
 from controllers.skill_controller import SkillController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
-from depends.get_drive import get_drive
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_skill_controller
 from handlers.access.role_access import RoleAccess
 from models.http_error import HTTPError
 from models.response_items import ResponseItems
 from models.skill_model import SkillCreateDataModel, SkillInDBModel
-from handlers.drive_handler import DriveHandler
 from handlers.access_handler import AccessHandler
 from consts.name_roles import ADMIN, SUPER_ADMIN, USER
 
@@ -47,17 +45,14 @@ router = APIRouter(tags=["Skill"])
 async def create(
     skill: SkillCreateDataModel,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    skill_controller: SkillController = Depends(get_skill_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
     )
     async def inside_func(skill):
-        skill_controller = SkillController(db, drive)
         return await skill_controller.create_skill(skill)
 
     return await inside_func(skill)
@@ -92,18 +87,15 @@ async def upload_icon_skill(
     file: UploadFile,
     name: str = Query(example="Python"),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    skill_controller: SkillController = Depends(get_skill_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
     )
     async def inside_func(name, file):
-        skill_controller = SkillController(db, drive)
-        return skill_controller.upload_icon_skill(name, file)
+        return await skill_controller.upload_icon_skill(name, file)
 
     return await inside_func(name, file)
 
@@ -112,20 +104,23 @@ async def upload_icon_skill(
     "/icon/{name_file}",
     responses={
         200: {"description": "File in the format *StreamingResponse*"},
+        206: {"description": "The part of the file requested in the Range header"},
+        304: {"description": "If the ETag from If-None-Match has not changed"},
         400: {
             "model": HTTPError,
             "description": "if the file could not be retrieved",
         },
+        416: {"description": "If the range is outside the file"},
     },
     summary="Getting the skill icon by the name of the photo",
 )
 async def get_icon_by_name_file(
+    request: Request,
     name_file: str = Path(example="python.png"),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    w: int = Query(default=None, gt=0),
+    skill_controller: SkillController = Depends(get_skill_controller),
 ):
-    skill_controller = SkillController(db, drive)
-    return skill_controller.get_icon_by_name_file(name_file)
+    return await skill_controller.get_icon_by_name_file(name_file, w, request.headers)
 
 
 @router.get(
@@ -136,11 +131,8 @@ async def get_icon_by_name_file(
 async def get_all_skills(
     limit: int = Query(default=100),
     last_skill_key: str = Query(default=None),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    skill_controller: SkillController = Depends(get_skill_controller),
 ):
-    skill_controller = SkillController(db, drive)
-
     return await skill_controller.get_skill_all(limit, last_skill_key)
 
 
@@ -176,17 +168,14 @@ async def get_all_skills(
 async def add_skill_to_myself(
     skill_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    skill_controller: SkillController = Depends(get_skill_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(USER)],
     )
     async def inside_func(skill_key, token):
-        skill_controller = SkillController(db, drive)
         return await skill_controller.add_skill(skill_key, token)
 
     return await inside_func(skill_key, credentials.credentials)
@@ -223,17 +212,14 @@ async def add_skill_to_myself(
 async def delete_skill_to_myself(
     skill_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
-    drive: DriveHandler = Depends(get_drive),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    skill_controller: SkillController = Depends(get_skill_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(USER)],
     )
     async def inside_func(skill_key, token):
-        skill_controller = SkillController(db, drive)
         return await skill_controller.remove_skill(skill_key, token)
 
     return await inside_func(skill_key, credentials.credentials)
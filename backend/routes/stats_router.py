@@ -0,0 +1,177 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import Security
+
+from consts.name_roles import ADMIN, SUPER_ADMIN
+from controllers.stats_controller import StatsController
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_stats_controller
+from handlers.access.role_access import RoleAccess
+from handlers.access_handler import AccessHandler
+from models.cache_stats_model import CacheStatsModel
+from models.executor_stats_model import ExecutorStatsModel
+from models.http_error import HTTPError
+from models.transport_stats_model import TransportStatsModel
+
+security = HTTPBearer()
+router = APIRouter(tags=["Stats"])
+
+
+@router.get(
+    "/transport",
+    responses={
+        200: {"model": TransportStatsModel},
+        400: {
+            "model": HTTPError,
+            "description": "If the user key is invalid",
+        },
+        401: {
+            "model": HTTPError,
+            "description": "If the token is invalid, expired or scope is invalid",
+        },
+        403: {
+            "model": HTTPError,
+            "description": """If authentication failed, invalid authentication credentials 
+            or no access rights to this method""",
+        },
+        500: {
+            "model": HTTPError,
+            "description": "If an error occurred while verifying access",
+        },
+    },
+    summary="Getting the statistics of the connection pool to the database",
+)
+async def get_transport_stats(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    stats_controller: StatsController = Depends(get_stats_controller),
+):
+    @access_handler.maker_role_access(
+        credentials.credentials,
+        [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
+    )
+    async def inside_func():
+        return stats_controller.get_transport_stats()
+
+    return await inside_func()
+
+
+@router.get(
+    "/user_cache",
+    responses={
+        200: {"model": CacheStatsModel},
+        400: {
+            "model": HTTPError,
+            "description": "If the user key is invalid",
+        },
+        401: {
+            "model": HTTPError,
+            "description": "If the token is invalid, expired or scope is invalid",
+        },
+        403: {
+            "model": HTTPError,
+            "description": """If authentication failed, invalid authentication credentials 
+            or no access rights to this method""",
+        },
+        500: {
+            "model": HTTPError,
+            "description": "If an error occurred while verifying access",
+        },
+    },
+    summary="Getting the statistics of the user cache",
+)
+async def get_user_cache_stats(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    stats_controller: StatsController = Depends(get_stats_controller),
+):
+    @access_handler.maker_role_access(
+        credentials.credentials,
+        [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
+    )
+    async def inside_func():
+        return stats_controller.get_user_cache_stats()
+
+    return await inside_func()
+
+
+@router.get(
+    "/executor",
+    responses={
+        200: {"model": ExecutorStatsModel},
+        400: {
+            "model": HTTPError,
+            "description": "If the user key is invalid",
+        },
+        401: {
+            "model": HTTPError,
+            "description": "If the token is invalid, expired or scope is invalid",
+        },
+        403: {
+            "model": HTTPError,
+            "description": """If authentication failed, invalid authentication credentials 
+            or no access rights to this method""",
+        },
+        500: {
+            "model": HTTPError,
+            "description": "If an error occurred while verifying access",
+        },
+    },
+    summary="Getting the statistics of the CPU executor",
+)
+async def get_executor_stats(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    stats_controller: StatsController = Depends(get_stats_controller),
+):
+    @access_handler.maker_role_access(
+        credentials.credentials,
+        [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
+    )
+    async def inside_func():
+        return stats_controller.get_executor_stats()
+
+    return await inside_func()
+
+
+@router.get(
+    "/media_cache",
+    responses={
+        200: {"model": CacheStatsModel},
+        400: {
+            "model": HTTPError,
+            "description": "If the user key is invalid",
+        },
+        401: {
+            "model": HTTPError,
+            "description": "If the token is invalid, expired or scope is invalid",
+        },
+        403: {
+            "model": HTTPError,
+            "description": """If authentication failed, invalid authentication credentials 
+            or no access rights to this method""",
+        },
+        404: {
+            "model": HTTPError,
+            "description": "If the media cache is disabled",
+        },
+        500: {
+            "model": HTTPError,
+            "description": "If an error occurred while verifying access",
+        },
+    },
+    summary="Getting the statistics of the disk cache of photos and contents",
+)
+async def get_media_cache_stats(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    stats_controller: StatsController = Depends(get_stats_controller),
+):
+    @access_handler.maker_role_access(
+        credentials.credentials,
+        [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
+    )
+    async def inside_func():
+        return stats_controller.get_media_cache_stats()
+
+    return await inside_func()
@@ -1,17 +1,17 @@
-from typing import List
 from fastapi import APIRouter, Depends, Query
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi import Security
 
 from controllers.subscription_controller import SubscriptionController
 from consts.name_roles import USER
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_subscription_controller
 from handlers.access.role_access import RoleAccess
 from handlers.access_handler import AccessHandler
 from models.http_error import HTTPError
+from models.response_items import ResponseItems
 from models.result_subscribe_model import ResultSubscriptionModel
-from models.subscription_model import SubscriptionModel
+from models.subscription_model import SubscriptionInDBModel
 
 
 security = HTTPBearer()
@@ -50,13 +50,11 @@ router = APIRouter(tags=["Subscription"])
 async def subscribe(
     username_favorite: str = Query(example="ivanov"),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    subscription_controller: SubscriptionController = Depends(get_subscription_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(username_favorite, credentials):
-        subscription_controller = SubscriptionController(db)
         return await subscription_controller.subscribe(
             username_favorite, credentials.credentials
         )
@@ -95,13 +93,11 @@ async def subscribe(
 async def annul(
     username_favorite: str = Query(example="ivanov"),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    subscription_controller: SubscriptionController = Depends(get_subscription_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(username_favorite, credentials):
-        subscription_controller = SubscriptionController(db)
         return await subscription_controller.annul(
             username_favorite, credentials.credentials
         )
@@ -112,7 +108,7 @@ async def annul(
 @router.get(
     "/my",
     responses={
-        200: {"model": List[SubscriptionModel]},
+        200: {"model": ResponseItems[SubscriptionInDBModel]},
         400: {
             "model": HTTPError,
             "description": "If the user key is invalid",
@@ -134,15 +130,60 @@ async def annul(
     summary="Getting all of my subscriptions",
 )
 async def get_my_subscription(
-    limit: int = Query(default=None),
+    limit: int = Query(default=100),
+    last_subscription_key: str = Query(default=None),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    subscription_controller: SubscriptionController = Depends(get_subscription_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
-    async def inside_func(token, limit):
-        subscription_controller = SubscriptionController(db)
-        return await subscription_controller.get_subscriptions(token, limit)
+    async def inside_func(token, limit, last_subscription_key):
+        return await subscription_controller.get_subscriptions(
+            token, limit, last_subscription_key
+        )
+
+    return await inside_func(credentials.credentials, limit, last_subscription_key)
+
+
+@router.get(
+    "/following",
+    responses={
+        200: {"model": ResponseItems[SubscriptionInDBModel]},
+        404: {
+            "model": HTTPError,
+            "description": "If the user is not found",
+        },
+    },
+    summary="Getting the users the user is subscribed to",
+)
+async def get_following(
+    username: str = Query(example="ivanov"),
+    limit: int = Query(default=100),
+    last_subscription_key: str = Query(default=None),
+    subscription_controller: SubscriptionController = Depends(get_subscription_controller),
+):
+    return await subscription_controller.get_following(
+        username, limit, last_subscription_key
+    )
 
-    return await inside_func(credentials.credentials, limit)
+
+@router.get(
+    "/followers",
+    responses={
+        200: {"model": ResponseItems[SubscriptionInDBModel]},
+        404: {
+            "model": HTTPError,
+            "description": "If the user is not found",
+        },
+    },
+    summary="Getting the followers of the user",
+)
+async def get_followers(
+    username: str = Query(example="ivanov"),
+    limit: int = Query(default=100),
+    last_subscription_key: str = Query(default=None),
+    subscription_controller: SubscriptionController = Depends(get_subscription_controller),
+):
+    return await subscription_controller.get_followers(
+        username, limit, last_subscription_key
+    )
@@ -4,8 +4,8 @@ from fastapi import Security
 
 from consts.name_roles import ADMIN, SUPER_ADMIN, USER
 from controllers.suggestion_controller import SuggestionController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_suggestion_controller
 from handlers.access.role_access import RoleAccess
 from handlers.access_handler import AccessHandler
 from models.http_error import HTTPError
@@ -48,13 +48,11 @@ router = APIRouter(tags=["Suggestion"])
 async def post_suggestion(
     suggestion: SuggestionInputModel,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    suggestion_controller: SuggestionController = Depends(get_suggestion_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(suggestion, token):
-        suggestion_controller = SuggestionController(db)
         return await suggestion_controller.add_suggestion(suggestion, token)
 
     return await inside_func(suggestion, credentials.credentials)
@@ -90,16 +88,14 @@ async def get_all_suggestions(
     limit: int = Query(default=1000),
     last_key: str = Query(default=None),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    suggestion_controller: SuggestionController = Depends(get_suggestion_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
     )
     async def inside_func(readed, completed):
-        suggestion_controller = SuggestionController(db)
         return await suggestion_controller.get_all_suggestions(
             readed, completed, limit, last_key
         )
@@ -136,16 +132,14 @@ async def tick_suggestion(
     suggestion: SuggestionTickModel,
     suggestion_key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    suggestion_controller: SuggestionController = Depends(get_suggestion_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
     )
     async def inside_func(suggestion, suggestion_key):
-        suggestion_controller = SuggestionController(db)
         return await suggestion_controller.tick_suggestion(suggestion, suggestion_key)
 
     return await inside_func(suggestion, suggestion_key)
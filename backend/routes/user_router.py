@@ -2,14 +2,15 @@ from fastapi import APIRouter, Depends, Path, Query, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from consts.name_roles import ADMIN, SUPER_ADMIN, USER
-from controllers.event_controller import EventController
+from controllers.deletion_controller import DeletionController
 from controllers.user_controller import UserController
-from db.database_handler import DatabaseHandler
-from depends.get_db import get_db
+from depends.get_access import get_access_handler
+from depends.get_controllers import get_deletion_controller, get_user_controller
 from handlers.access.owner.any_owner import AnyOwner
 from handlers.access.owner.own_owner import OwnOwner
 from handlers.access.role_access import RoleAccess
 from handlers.access_handler import AccessHandler
+from models.deletion_job_model import DeletionJobModel, DeletionStartedModel
 from models.http_error import HTTPError
 from models.message_model import MessageModel
 from models.response_items import ResponseItems
@@ -25,7 +26,7 @@ router = APIRouter(tags=["User"])
         200: {"model": ResponseItems[UserModelResponse]},
         400: {
             "model": HTTPError,
-            "description": "If the user key is invalid",
+            "description": "If the user key is invalid or the user has no such field",
         },
         401: {
             "model": HTTPError,
@@ -47,19 +48,18 @@ async def get_all_users(
     credentials: HTTPAuthorizationCredentials = Security(security),
     limit: int = Query(default=1000),
     last_user_key: str = Query(default=None),
-    db: DatabaseHandler = Depends(get_db),
+    fields: str = Query(default=None, example="summary"),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    user_controller: UserController = Depends(get_user_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [RoleAccess(SUPER_ADMIN), RoleAccess(ADMIN)],
     )
-    async def inside_func(limit, last_user_key):
-        user_controller = UserController(db)
-        return await user_controller.get_user_all(limit, last_user_key)
+    async def inside_func(limit, last_user_key, fields):
+        return await user_controller.get_user_all(limit, last_user_key, fields)
 
-    return await inside_func(limit, last_user_key)
+    return await inside_func(limit, last_user_key, fields)
 
 
 @router.get(
@@ -71,9 +71,8 @@ async def get_all_users(
 )
 async def get_user_by_username(
     username: str = Path(example="ivanov"),
-    db: DatabaseHandler = Depends(get_db),
+    user_controller: UserController = Depends(get_user_controller),
 ):
-    user_controller = UserController(db)
     return await user_controller.get_user_by_username(username)
 
 
@@ -104,9 +103,8 @@ async def get_user_by_username(
 )
 async def get_user_by_token(
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    user_controller: UserController = Depends(get_user_controller),
 ):
-    user_controller = UserController(db)
     user = await user_controller.get_user_by_token(credentials.credentials)
     print(user)
     return FullUserModelResponse(**user.dict())
@@ -115,10 +113,10 @@ async def get_user_by_token(
 @router.delete(
     "/",
     responses={
-        200: {"model": MessageModel},
+        200: {"model": DeletionStartedModel},
         400: {
             "model": HTTPError,
-            "description": "If the user key is invalid or events are not deleted",
+            "description": "If the user key is invalid",
         },
         401: {
             "model": HTTPError,
@@ -131,18 +129,21 @@ async def get_user_by_token(
         },
         500: {
             "model": HTTPError,
-            "description": "If an error occurred while verifying access",
+            "description": """If an error occurred while verifying access
+            or the deletion could not be started""",
         },
     },
     summary="Deleting a user by key",
+    description="""The user is deleted at once, their events, posts, likes,
+    comments and subscriptions are deleted in the background.
+    The progress is returned by /user/deletion""",
 )
 async def delete_user_by_key(
     key: str = Query(),
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    deletion_controller: DeletionController = Depends(get_deletion_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(
         credentials.credentials,
         [
@@ -154,14 +155,55 @@ async def delete_user_by_key(
     )
     @access_handler.maker_owner_access(key)
     async def inside_func(key):
-        user_controller = UserController(db)
-        event_controller = EventController(db)
-        await event_controller.delete_event_by_user(key)
-        return await user_controller.delete_user_by_key(key)
+        return await deletion_controller.delete_user(key)
 
     return await inside_func(key)
 
 
+@router.get(
+    "/deletion",
+    responses={
+        200: {"model": DeletionJobModel},
+        400: {
+            "model": HTTPError,
+            "description": "If the user key is invalid",
+        },
+        401: {
+            "model": HTTPError,
+            "description": "If the token is invalid, expired or scope is invalid",
+        },
+        403: {
+            "model": HTTPError,
+            "description": """If authentication failed, invalid authentication credentials 
+            or no access rights to this method""",
+        },
+        404: {
+            "model": HTTPError,
+            "description": "If the job is not found",
+        },
+        500: {
+            "model": HTTPError,
+            "description": "If an error occurred while verifying access",
+        },
+    },
+    summary="Getting the progress of the deletion of a user",
+)
+async def get_deletion_job(
+    job_id: str = Query(),
+    credentials: HTTPAuthorizationCredentials = Security(security),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    deletion_controller: DeletionController = Depends(get_deletion_controller),
+):
+    @access_handler.maker_role_access(
+        credentials.credentials,
+        [RoleAccess(SUPER_ADMIN)],
+    )
+    async def inside_func():
+        return await deletion_controller.get_job(job_id)
+
+    return await inside_func()
+
+
 @router.put(
     "/additional_data",
     responses={
@@ -190,13 +232,11 @@ async def delete_user_by_key(
 async def update_additional_user_data_by_key(
     user: UserAdditionalDataModel,
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: DatabaseHandler = Depends(get_db),
+    access_handler: AccessHandler = Depends(get_access_handler),
+    user_controller: UserController = Depends(get_user_controller),
 ):
-    access_handler = AccessHandler(db)
-
     @access_handler.maker_role_access(credentials.credentials, [RoleAccess(USER)])
     async def inside_func(user, token):
-        user_controller = UserController(db)
         return await user_controller.update_additional_user_data_by_key(user, token)
 
     return await inside_func(user, credentials.credentials)
@@ -0,0 +1,192 @@
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from init import backup
+
+
+class MemoryBase:
+    def __init__(self, items: dict, fail_after: int = None, fail_keys: dict = None):
+        self.items = items
+        self.fail_after = fail_after
+        # Number of put_many requests in which each of these keys fails
+        self.fail_keys = fail_keys or {}
+
+    def fetch(self, query=None, limit=1000, last=None):
+        if self.fail_after is not None:
+            if self.fail_after == 0:
+                raise ConnectionError("Connection lost")
+            self.fail_after -= 1
+        keys = sorted(key for key in self.items if last is None or key > last)
+        page = keys[:limit]
+        return SimpleNamespace(
+            items=[self.items[key] for key in page],
+            last=page[-1] if len(keys) > limit else None,
+        )
+
+    def put_many(self, items: list):
+        assert len(items) <= backup.MAX_PUT_MANY
+        processed, failed = [], []
+        for item in items:
+            if self.fail_keys.get(item["key"], 0) > 0:
+                self.fail_keys[item["key"]] -= 1
+                failed.append(item)
+                continue
+            self.items[item["key"]] = item
+            processed.append(item)
+        result = {"processed": {"items": processed}}
+        if failed:
+            result["failed"] = {"items": failed}
+        return result
+
+
+class MemoryFile:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def read(self):
+        return self.content
+
+    def close(self):
+        pass
+
+
+class MemoryDrive:
+    def __init__(self, files: dict):
+        self.files = files
+
+    def list(self, limit=1000, prefix=None, last=None):
+        names = sorted(name for name in self.files if last is None or name > last)
+        page = names[:limit]
+        paging = {"size": len(page)}
+        if len(names) > limit:
+            paging["last"] = page[-1]
+        return {"names": page, "paging": paging}
+
+    def get(self, name):
+        return MemoryFile(self.files[name]) if name in self.files else None
+
+    def put(self, name, data=None):
+        self.files[name] = data
+
+
+class MemoryDeta:
+    def __init__(self, bases: dict = None, drives: dict = None):
+        self.bases = bases or {}
+        self.drives = drives or {}
+
+    def Base(self, name):
+        return MemoryBase(self.bases.setdefault(name, {}))
+
+    def Drive(self, name):
+        return MemoryDrive(self.drives.setdefault(name, {}))
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    monkeypatch.setattr(backup, "PAGE_SIZE", 3)
+
+
+def export(deta: MemoryDeta, folder: str) -> None:
+    os.makedirs(os.path.join(folder, "bases"), exist_ok=True)
+    os.makedirs(os.path.join(folder, "drives"), exist_ok=True)
+    clients = backup.Clients(deta)
+    checkpoint = backup.Checkpoint(os.path.join(folder, backup.EXPORT_CHECKPOINT))
+    with ThreadPoolExecutor(4) as executor:
+        backup.export_base(clients, "posts", folder, checkpoint)
+        backup.export_drive(clients, "photos", folder, checkpoint, executor, 4)
+
+
+def load(deta: MemoryDeta, folder: str) -> None:
+    clients = backup.Clients(deta)
+    checkpoint = backup.Checkpoint(os.path.join(folder, "import.json"))
+    with ThreadPoolExecutor(4) as executor:
+        backup.import_base(clients, "posts", folder, checkpoint, executor, 2)
+        backup.import_drive(clients, "photos", folder, checkpoint, executor, 4)
+
+
+def make_source() -> MemoryDeta:
+    posts = {f"post{i:03d}": {"key": f"post{i:03d}", "name": "Пост"} for i in range(70)}
+    photos = {f"ivanov/{i}.webp": bytes([i]) * (i + 1) for i in range(8)}
+    return MemoryDeta({"posts": posts}, {"photos": photos})
+
+
+def test_export_import(tmp_path):
+    source = make_source()
+    export(source, str(tmp_path))
+    target = MemoryDeta()
+    load(target, str(tmp_path))
+
+    assert target.bases["posts"] == source.bases["posts"]
+    assert target.drives["photos"] == source.drives["photos"]
+
+
+def test_export_resumes_after_failure(tmp_path, monkeypatch):
+    source = make_source()
+    failing = MemoryBase(source.bases["posts"], fail_after=5)
+    monkeypatch.setattr(source, "Base", lambda name: failing)
+    with pytest.raises(ConnectionError):
+        export(source, str(tmp_path))
+    # A page written after the last checkpoint is dropped on resuming
+    with open(tmp_path / "bases" / "posts.ndjson.gz", "ab") as f:
+        f.write(gzip.compress(b'{"key": "post000"}\n'))
+
+    failing.fail_after = None
+    export(source, str(tmp_path))
+    with gzip.open(tmp_path / "bases" / "posts.ndjson.gz", "rt") as f:
+        keys = [json.loads(line)["key"] for line in f]
+    assert keys == sorted(source.bases["posts"])
+
+
+def test_import_resumes_after_failure(tmp_path):
+    source = make_source()
+    export(source, str(tmp_path))
+    target = MemoryDeta()
+    clients = backup.Clients(target)
+    checkpoint = backup.Checkpoint(os.path.join(str(tmp_path), "import.json"))
+    checkpoint.save("base:posts", {"count": 60, "done": False})
+    with ThreadPoolExecutor(2) as executor:
+        backup.import_base(clients, "posts", str(tmp_path), checkpoint, executor, 2)
+
+    assert sorted(target.bases["posts"]) == sorted(source.bases["posts"])[60:]
+    assert checkpoint.get("base:posts") == {"count": 70, "done": True}
+
+
+def test_import_requires_finished_export(tmp_path):
+    checkpoint = backup.Checkpoint(
+        os.path.join(str(tmp_path), backup.EXPORT_CHECKPOINT)
+    )
+    checkpoint.save("base:posts", {"offset": 10, "last": "post002", "done": False})
+
+    with pytest.raises(SystemExit):
+        backup.check_export(str(tmp_path), ["base:posts", "drive:photos"])
+
+
+def test_import_puts_failed_items_again(tmp_path, monkeypatch):
+    source = make_source()
+    export(source, str(tmp_path))
+    target = MemoryDeta()
+    flaky = MemoryBase(target.bases.setdefault("posts", {}), fail_keys={"post010": 2})
+    monkeypatch.setattr(target, "Base", lambda name: flaky)
+
+    load(target, str(tmp_path))
+
+    assert target.bases["posts"] == source.bases["posts"]
+
+
+def test_import_stops_on_failed_items(tmp_path, monkeypatch):
+    source = make_source()
+    export(source, str(tmp_path))
+    target = MemoryDeta()
+    failing = MemoryBase(target.bases.setdefault("posts", {}), fail_keys={"post060": 3})
+    monkeypatch.setattr(target, "Base", lambda name: failing)
+
+    with pytest.raises(RuntimeError, match="post060"):
+        load(target, str(tmp_path))
+    # The group with the failed item is not counted as imported
+    checkpoint = backup.Checkpoint(os.path.join(str(tmp_path), "import.json"))
+    assert checkpoint.get("base:posts") == {"count": 50, "done": False}
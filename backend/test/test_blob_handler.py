@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+
+from exceptions.update_blob_exception import UpdateBlobException
+from handlers.blob_handler import BlobHandler
+from models.blob_model import BlobInDBModel
+
+
+def test_hash_content():
+    blob_handler = BlobHandler(None)
+    digest, size = asyncio.run(blob_handler.hash_content(b"<h1>Post</h1>"))
+
+    assert digest == hashlib.sha256(b"<h1>Post</h1>").hexdigest()
+    assert size == 13
+
+
+def test_parse_digest():
+    blob_handler = BlobHandler(None)
+    digest = "a" * 64
+
+    assert blob_handler.parse_digest(f"{digest}.html") == digest
+    assert blob_handler.parse_digest("post_uml_zgqeuipptbrjwhd.html") is None
+    assert blob_handler.parse_digest(f"{digest}_w64.webp") is None
+
+
+def test_find_digests():
+    blob_handler = BlobHandler(None)
+    first, second = "a" * 64, "b" * 64
+    html = (
+        f'<img src="http://test/post/photo/{first}.png">'
+        f'<img src="http://test/post/photo/{second}.jpg?w=256">'
+        f'<img src="http://test/post/photo/{first}.png">'
+        f'<img src="http://other/post/photo/{"c" * 64}.png">'
+    )
+
+    assert blob_handler.find_digests(html, "http://test/post/photo") == [first, second]
+
+
+class MemoryBlobs:
+    def __init__(self):
+        self.blobs = {}
+
+    async def update_blob(self, data: dict, key: str) -> None:
+        if key not in self.blobs:
+            raise UpdateBlobException("Updating data was not successful")
+        self.blobs[key] = self.blobs[key].copy(update=data)
+
+    async def get_blob_by_key(self, key: str):
+        return self.blobs.get(key)
+
+    async def create_blob(self, blob: BlobInDBModel):
+        if blob.key in self.blobs:
+            return None
+        self.blobs[blob.key] = blob
+        return blob
+
+
+def test_store_returns_stored_name():
+    blob_handler = BlobHandler(MemoryBlobs())
+    digest = "a" * 64
+    uploads = []
+
+    async def upload(name: str) -> str:
+        uploads.append(name)
+        return name
+
+    async def run():
+        first = await blob_handler.store(
+            "photo",
+            digest,
+            f"photo/{digest}.jpg",
+            3,
+            lambda: upload(f"photo/{digest}.jpg"),
+        )
+        # The same bytes uploaded with another extension
+        second = await blob_handler.store(
+            "photo",
+            digest,
+            f"photo/{digest}.jpeg",
+            3,
+            lambda: upload(f"photo/{digest}.jpeg"),
+        )
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == (f"photo/{digest}.jpg", True)
+    assert second == (f"photo/{digest}.jpg", False)
+    assert uploads == [f"photo/{digest}.jpg"]
@@ -52,13 +52,61 @@ async def test_add_remove_comment_to_post():
 
     assert response.status_code == 200
     result = response.json()
-    assert len(result) == 0
+    assert "message" in result
+    assert result["message"] == "Deletion successful"
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
         response = await ac.delete(f"/post/?post_key={post_key}", headers=headers)
     await delete_auth(SOBOLEV_REGISTRATION_VALID_DATA)
 
 
+# ----------------------Get comments----------------------
+@pytest.mark.asyncio
+async def test_get_comments_to_post_by_pages():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.post("/auth/signup", json=SOBOLEV_REGISTRATION_VALID_DATA)
+        headers = await get_header(SOBOLEV_AUTH_VALID_DATA)
+
+        response = await ac.post("/post/create", json=POST_DATA, headers=headers)
+        post_key = response.json()["key"]
+
+        comment_keys = []
+        for _ in range(3):
+            response = await ac.post(
+                f"/comment/?post_key={post_key}",
+                json=COMMENT_DATA,
+                headers=headers,
+            )
+            comment_keys.append(response.json()["key"])
+
+        response = await ac.get(f"/comment/?post_key={post_key}&limit=2")
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["count"] == 2
+    assert result["last"] is not None
+    last = result["last"]
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get(
+            f"/comment/?post_key={post_key}&limit=2&last_comment_key={last}"
+        )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["count"] == 1
+    assert result["items"][0]["post_key"] == post_key
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for comment_key in comment_keys:
+            await ac.delete(
+                f"/comment/?post_key={post_key}&comment_key={comment_key}",
+                headers=headers,
+            )
+        response = await ac.delete(f"/post/?post_key={post_key}", headers=headers)
+    await delete_auth(SOBOLEV_REGISTRATION_VALID_DATA)
+
+
 # ----------------------Delete comment----------------------
 @pytest.mark.asyncio
 async def test_delete_comment_to_post_admin():
@@ -84,7 +132,8 @@ async def test_delete_comment_to_post_admin():
 
     assert response.status_code == 200
     result = response.json()
-    assert len(result) == 0
+    assert "message" in result
+    assert result["message"] == "Deletion successful"
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
         response = await ac.delete(f"/post/?post_key={post_key}", headers=headers)
@@ -0,0 +1,35 @@
+import asyncio
+import gzip
+
+from handlers.compression_handler import CompressionHandler, compress_gzip
+
+
+def test_negotiate():
+    compression_handler = CompressionHandler()
+    encodings = ["br", "gzip"]
+
+    assert compression_handler.negotiate("gzip, deflate, br", encodings) == "br"
+    assert compression_handler.negotiate("gzip, br;q=0.5", encodings) == "gzip"
+    assert compression_handler.negotiate("br;q=0, gzip", encodings) == "gzip"
+    assert compression_handler.negotiate("*", encodings) == "br"
+    assert compression_handler.negotiate("identity", encodings) is None
+    assert compression_handler.negotiate(None, encodings) is None
+    assert compression_handler.negotiate("br", ["gzip"]) is None
+
+
+def test_decompress_gzip():
+    compression_handler = CompressionHandler()
+    data = b"<p>Post</p>" * 1000
+    compressed = compress_gzip(data)
+
+    async def chunks():
+        for i in range(0, len(compressed), 100):
+            yield compressed[i : i + 100]
+
+    async def read() -> bytes:
+        return b"".join(
+            [chunk async for chunk in compression_handler.decompress_gzip(chunks())]
+        )
+
+    assert gzip.decompress(compressed) == data
+    assert asyncio.run(read()) == data
@@ -0,0 +1,78 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from httpx import AsyncClient
+
+from middlewares.compression_middleware import CompressionMiddleware
+
+pytest_plugins = ("pytest_asyncio",)
+
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+
+@app.get("/items")
+async def get_items():
+    return {"items": [{"name": f"item {i}", "number": i} for i in range(100)]}
+
+
+@app.get("/small")
+async def get_small():
+    return {"name": "item"}
+
+
+@app.get("/photo")
+async def get_photo():
+    return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+
+@app.get("/stream")
+async def get_stream():
+    async def lines():
+        for i in range(10):
+            yield f'{{"number": {i}}}\n'.encode() * 20
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+async def test_compress_large_json(encoding):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/items", headers={"Accept-Encoding": encoding})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.json()["items"]) == 100
+
+
+@pytest.mark.asyncio
+async def test_small_json_is_not_compressed():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"name": "item"}
+
+
+@pytest.mark.asyncio
+async def test_photo_is_not_compressed():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/photo", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_without_accept_encoding():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/items", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert len(response.json()["items"]) == 100
+
+
+@pytest.mark.asyncio
+async def test_compress_stream():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text.count("\n") == 200
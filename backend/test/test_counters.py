@@ -0,0 +1,260 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from controllers.comment_controller import CommentController
+from controllers.like_controller import LikeController
+from controllers.subscription_controller import SubscriptionController
+from db.cache.ttl_cache import TTLCache
+from db.database_handler import DatabaseHandler
+from db.handlers.user_database_handler import UserDatabaseHandler
+from db.query_planner import QueryPlanner
+from db.transport.sqlite_transport import SqliteBase, SqliteTransport
+from exceptions.update_item_exception import UpdateItemException
+from exceptions.update_post_exception import UpdatePostException
+from handlers.jwt_handler import JWTHandler
+from models.comment_model import CommentInputModel
+
+ROLE = {"name_ru": "Пользователь", "name_en": "user", "url": None}
+SKILL = {"key": "uml", "name": "UML", "scope": "Программирование", "url": None}
+
+
+def make_user(key: str) -> dict:
+    return {
+        "key": key,
+        "username": key,
+        "firstname": "Иван",
+        "lastname": "Иванов",
+        "email": f"{key}@mail.ru",
+        "password": "hash",
+        "links": [],
+        "skills": [],
+        "role": ROLE,
+        "followers_count": 0,
+        "subscriptions_count": 0,
+    }
+
+
+def make_author(key: str) -> dict:
+    return {"key": key, "username": key, "firstname": "Иван", "lastname": "Иванов"}
+
+
+@pytest.fixture(autouse=True)
+def tokens_are_keys(monkeypatch):
+    # The token of a user is the user's key
+    monkeypatch.setattr(JWTHandler, "decode_token", lambda self, token: token)
+
+
+def run_with_database(path, func):
+    async def run():
+        transport = SqliteTransport(str(path))
+        # The users are indexed by username
+        await UserDatabaseHandler(transport, TTLCache("users", 100, 60)).put_many(
+            [make_user("ivanov"), make_user("petrov")]
+        )
+        await transport.open_base("posts").put(
+            {
+                "key": "post",
+                "name": "Post",
+                "url_content": "http://test/post/content/post.html",
+                "skill": SKILL,
+                "author": make_author("petrov"),
+                "date_create": 1690000000000,
+                "like_count": 1,
+                "comment_count": 1,
+            }
+        )
+        await transport.open_base("likes").put(
+            {
+                "key": "post:ivanov",
+                "post_key": "post",
+                "user": make_author("ivanov"),
+                "date_create": 1690000000000,
+            }
+        )
+        await transport.open_base("comments").put(
+            {
+                "key": "post:comment",
+                "post_key": "post",
+                "text": "Текст",
+                "name": "Комментарий",
+                "author": make_author("ivanov"),
+                "date_create": 1690000000000,
+            }
+        )
+        try:
+            return await func(
+                transport,
+                DatabaseHandler(
+                    transport, TTLCache("users", 100, 60), QueryPlanner(20)
+                ),
+            )
+        finally:
+            await transport.close()
+
+    return asyncio.run(run())
+
+
+async def fail_post_counter(value: int, post_key: str) -> None:
+    raise UpdatePostException("Updating post data was not successful")
+
+
+def test_remove_like_keeps_like_if_counter_fails(tmp_path):
+    async def func(transport, database_handler):
+        database_handler.change_like_count_of_post = fail_post_counter
+        with pytest.raises(HTTPException):
+            await LikeController(database_handler).remove_like("post", "ivanov")
+        assert await transport.open_base("likes").get("post:ivanov") is not None
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_delete_comment_keeps_comment_if_counter_fails(tmp_path):
+    async def func(transport, database_handler):
+        database_handler.change_comment_count_of_post = fail_post_counter
+        with pytest.raises(HTTPException):
+            await CommentController(database_handler).delete_comment(
+                "post:comment", "post"
+            )
+        assert await transport.open_base("comments").get("post:comment") is not None
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+@pytest.fixture
+def fail_followers_count(monkeypatch):
+    """Making the followers counters fail from the call on, the subscriptions
+    counters keep changing"""
+    increment_counter = UserDatabaseHandler.increment_counter
+
+    async def fail(self, name: str, value: int, key: str) -> None:
+        if name == "followers_count":
+            raise UpdateItemException("Updating data was not successful")
+        await increment_counter(self, name, value, key)
+
+    return lambda: monkeypatch.setattr(UserDatabaseHandler, "increment_counter", fail)
+
+
+def test_subscribe_reverts_counter_if_other_fails(tmp_path, fail_followers_count):
+    async def func(transport, database_handler):
+        fail_followers_count()
+        with pytest.raises(HTTPException) as error:
+            await SubscriptionController(database_handler).subscribe("petrov", "ivanov")
+        assert error.value.detail == "Subscription failed"
+        users = transport.open_base("users")
+        assert (await users.get("ivanov"))["subscriptions_count"] == 0
+        assert (await users.get("petrov"))["followers_count"] == 0
+        subscriptions = transport.open_base("subscriptions")
+        assert await subscriptions.get("ivanov:petrov") is None
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_annul_keeps_subscription_if_counter_fails(tmp_path, fail_followers_count):
+    async def func(transport, database_handler):
+        controller = SubscriptionController(database_handler)
+        await controller.subscribe("petrov", "ivanov")
+        fail_followers_count()
+        with pytest.raises(HTTPException) as error:
+            await controller.annul("petrov", "ivanov")
+        assert error.value.detail == "Unsubscribe failed"
+
+        users = transport.open_base("users")
+        assert (await users.get("ivanov"))["subscriptions_count"] == 1
+        assert (await users.get("petrov"))["followers_count"] == 1
+        subscriptions = transport.open_base("subscriptions")
+        assert await subscriptions.get("ivanov:petrov") is not None
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_put_like_twice(tmp_path):
+    async def func(transport, database_handler):
+        with pytest.raises(HTTPException) as error:
+            await LikeController(database_handler).put_like("post", "ivanov")
+        assert error.value.detail == "Like already put"
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_put_like_raises_transport_errors(tmp_path, monkeypatch):
+    async def insert(*args, **kwargs):
+        raise ConnectionError("Connection lost")
+
+    async def func(transport, database_handler):
+        monkeypatch.setattr(SqliteBase, "insert", insert)
+        with pytest.raises(ConnectionError):
+            await LikeController(database_handler).put_like("post", "petrov")
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_subscribe_twice(tmp_path):
+    async def func(transport, database_handler):
+        controller = SubscriptionController(database_handler)
+        await controller.subscribe("petrov", "ivanov")
+        with pytest.raises(HTTPException) as error:
+            await controller.subscribe("petrov", "ivanov")
+        assert error.value.detail == "Subscription already exists"
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_subscribe_raises_transport_errors(tmp_path, monkeypatch):
+    async def insert(*args, **kwargs):
+        raise ConnectionError("Connection lost")
+
+    async def func(transport, database_handler):
+        monkeypatch.setattr(SqliteBase, "insert", insert)
+        with pytest.raises(ConnectionError):
+            await SubscriptionController(database_handler).subscribe("petrov", "ivanov")
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_post_comment_raises_transport_errors(tmp_path, monkeypatch):
+    async def insert(*args, **kwargs):
+        raise ConnectionError("Connection lost")
+
+    async def func(transport, database_handler):
+        monkeypatch.setattr(SqliteBase, "insert", insert)
+        with pytest.raises(ConnectionError):
+            await CommentController(database_handler).post_comment(
+                CommentInputModel(text="Текст", name="Комментарий"), "post", "ivanov"
+            )
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_concurrent_remove_like_changes_counter_once(tmp_path):
+    async def func(transport, database_handler):
+        controller = LikeController(database_handler)
+        results = await asyncio.gather(
+            *[controller.remove_like("post", "ivanov") for _ in range(3)],
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        assert len(errors) == 2
+        assert all(error.detail == "Like not found" for error in errors)
+        assert (await transport.open_base("posts").get("post"))["like_count"] == 0
+        assert await transport.open_base("likes").get("post:ivanov") is None
+
+    run_with_database(tmp_path / "base.db", func)
+
+
+def test_like_removed_again_after_failed_removal(tmp_path):
+    async def func(transport, database_handler):
+        controller = LikeController(database_handler)
+        change_like_count_of_post = database_handler.change_like_count_of_post
+        database_handler.change_like_count_of_post = fail_post_counter
+        with pytest.raises(HTTPException):
+            await controller.remove_like("post", "ivanov")
+        database_handler.change_like_count_of_post = change_like_count_of_post
+
+        # The like put back can be removed
+        await controller.remove_like("post", "ivanov")
+        assert (await transport.open_base("posts").get("post"))["like_count"] == 0
+        assert await transport.open_base("likes").get("post:ivanov") is None
+
+    run_with_database(tmp_path / "base.db", func)
@@ -0,0 +1,205 @@
+import asyncio
+
+from controllers.deletion_controller import DeletionController
+from controllers.post_controller import PostController
+from db.cache.ttl_cache import TTLCache
+from db.database_handler import DatabaseHandler
+from db.query_planner import QueryPlanner
+from db.transport.sqlite_transport import SqliteTransport
+from handlers.datetime_handler import DatetimeHandler
+from models.deletion_job_model import DeletionJobModel
+
+SKILL = {"key": "uml", "name": "UML", "scope": "Программирование", "url": None}
+
+
+def make_user(key: str) -> dict:
+    return {
+        "key": key,
+        "username": key,
+        "firstname": "Иван",
+        "lastname": "Иванов",
+        "email": f"{key}@mail.ru",
+        "password": "hash",
+        "links": [],
+        "skills": [],
+        "role": None,
+        "followers_count": 1,
+        "subscriptions_count": 1,
+    }
+
+
+def make_author(key: str) -> dict:
+    return {"key": key, "username": key, "firstname": "Иван", "lastname": "Иванов"}
+
+
+def make_post(key: str, author: str, like_count: int = 0) -> dict:
+    return {
+        "key": key,
+        "name": f"Post {key}",
+        "url_content": f"http://test/post/content/{key}.html",
+        "skill": SKILL,
+        "author": make_author(author),
+        "date_create": 1690000000000,
+        "like_count": like_count,
+        "comment_count": 0,
+    }
+
+
+async def put_all(base, items: list) -> None:
+    for i in range(0, len(items), 25):
+        await base.put_many(items[i : i + 25])
+
+
+async def fill(transport: SqliteTransport) -> None:
+    await put_all(
+        transport.open_base("users"), [make_user("ivanov"), make_user("petrov")]
+    )
+    posts = [make_post(f"ivanov{i:03d}", "ivanov") for i in range(30)]
+    posts.append(make_post("petrov000", "petrov", like_count=60))
+    await put_all(transport.open_base("posts"), posts)
+    likes = [
+        {
+            "key": f"petrov000:ivanov{i:03d}",
+            "post_key": "petrov000",
+            "user": make_author("ivanov"),
+            "date_create": 1690000000000,
+        }
+        for i in range(60)
+    ]
+    likes.append(
+        {
+            "key": "ivanov000:petrov",
+            "post_key": "ivanov000",
+            "user": make_author("petrov"),
+            "date_create": 1690000000000,
+        }
+    )
+    await put_all(transport.open_base("likes"), likes)
+    comments = [
+        {
+            "key": f"{post}:{1690000000000 + i:015d}",
+            "post_key": post,
+            "text": "Текст",
+            "name": "Комментарий",
+            "author": make_author("petrov"),
+            "date_create": 1690000000000 + i,
+        }
+        for post in ["petrov000", "petrov0000"]
+        for i in range(30)
+    ]
+    await put_all(transport.open_base("comments"), comments)
+    subscriptions = [
+        {
+            "key": "ivanov:petrov",
+            "favorite": make_author("petrov"),
+            "follower": make_author("ivanov"),
+            "number_visits": 1,
+            "date_create": 1690000000000,
+        },
+        {
+            "key": "petrov:ivanov",
+            "favorite": make_author("ivanov"),
+            "follower": make_author("petrov"),
+            "number_visits": 1,
+            "date_create": 1690000000000,
+        },
+    ]
+    await put_all(transport.open_base("subscriptions"), subscriptions)
+
+
+def test_delete_user_content(tmp_path):
+    async def run():
+        transport = SqliteTransport(str(tmp_path / "base.db"))
+        await fill(transport)
+        database_handler = DatabaseHandler(
+            transport, TTLCache("users", 100, 60), QueryPlanner(20)
+        )
+        controller = DeletionController(
+            database_handler, PostController(database_handler, None), concurrency=2
+        )
+        started = await controller.delete_user("ivanov")
+        for _ in range(200):
+            job = await controller.get_job(started.job_id)
+            if job.status != "running":
+                break
+            await asyncio.sleep(0.01)
+
+        assert job.status == "done"
+        assert job.deleted == {
+            "posts": 30,
+            "likes": 60,
+            "subscriptions": 1,
+            "followers": 1,
+        }
+        assert await transport.open_base("users").get("ivanov") is None
+        posts = (await transport.open_base("posts").fetch()).items
+        assert [post["key"] for post in posts] == ["petrov000"]
+        assert posts[0]["like_count"] == 0
+        assert (await transport.open_base("likes").fetch()).count == 0
+        assert (await transport.open_base("subscriptions").fetch()).count == 0
+        petrov = await transport.open_base("users").get("petrov")
+        assert petrov["followers_count"] == 0 and petrov["subscriptions_count"] == 0
+
+        await controller.close()
+        await transport.close()
+
+    asyncio.run(run())
+
+
+def test_delete_post_deletes_likes_and_comments(tmp_path):
+    async def run():
+        transport = SqliteTransport(str(tmp_path / "base.db"))
+        await fill(transport)
+        database_handler = DatabaseHandler(
+            transport, TTLCache("users", 100, 60), QueryPlanner(20)
+        )
+        await PostController(database_handler, None).delete_post_by_key("petrov000")
+
+        assert await transport.open_base("posts").get("petrov000") is None
+        likes = (await transport.open_base("likes").fetch()).items
+        assert [like["key"] for like in likes] == ["ivanov000:petrov"]
+        # The comments of a post whose key starts with the same letters are kept
+        comments = (await transport.open_base("comments").fetch()).items
+        assert len(comments) == 30
+        assert all(comment["post_key"] == "petrov0000" for comment in comments)
+        await transport.close()
+
+    asyncio.run(run())
+
+
+def test_resume_job_stopped_within_lease(tmp_path):
+    async def run():
+        transport = SqliteTransport(str(tmp_path / "base.db"))
+        await fill(transport)
+        database_handler = DatabaseHandler(
+            transport, TTLCache("users", 100, 60), QueryPlanner(20)
+        )
+        # The process has stopped just now, the job is not stale yet at the start
+        now = DatetimeHandler().now()
+        await database_handler.put_deletion_job(
+            DeletionJobModel(
+                key="job",
+                user_key="ivanov",
+                status="running",
+                date_create=now,
+                date_update=now,
+            )
+        )
+        controller = DeletionController(
+            database_handler, PostController(database_handler, None), lease=0.2
+        )
+        await controller.start()
+        assert (await controller.get_job("job")).deleted == {}
+
+        for _ in range(100):
+            job = await controller.get_job("job")
+            if job.status != "running":
+                break
+            await asyncio.sleep(0.02)
+        assert job.status == "done"
+        assert job.deleted["posts"] == 30
+
+        await controller.close()
+        await transport.close()
+
+    asyncio.run(run())
@@ -0,0 +1,197 @@
+import asyncio
+
+import pytest
+
+import handlers.disk_cache as disk_cache
+from handlers.async_drive import DriveFile
+from handlers.disk_cache import CachedFile, DiskCache
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class Clock:
+    """Time of the cache moved by the test"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(disk_cache, "time", clock)
+    # Evicted files are deleted at once
+    monkeypatch.setattr(disk_cache, "REMOVE_DELAY", 0)
+    return clock
+
+
+class FakeDrive:
+    """Loader of files counting the loads, a load may wait for the test"""
+
+    def __init__(self, files: dict):
+        self.files = files
+        self.loads = 0
+        self.gate = None
+
+    def loader(self, name: str):
+        async def load():
+            self.loads += 1
+            if self.gate is not None:
+                await self.gate.wait()
+            if name not in self.files:
+                return None
+            data = self.files[name]
+
+            async def chunks():
+                yield data
+
+            return DriveFile(chunks(), len(data), f'"{name}"', None)
+
+        return load
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = DiskCache(str(tmp_path), max_size=10, max_file_size=8, ttl=60)
+    yield cache
+    cache.close()
+
+
+async def read(cache: DiskCache, item: CachedFile) -> bytes:
+    return b"".join([chunk async for chunk in cache.iter_range(item, 0, item.size - 1)])
+
+
+async def settle() -> None:
+    # The evicted files are deleted by callbacks of the event loop
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_load_once(cache):
+    drive = FakeDrive({"a": b"aaaa"})
+    drive.gate = asyncio.Event()
+    gets = [asyncio.create_task(cache.get("a", drive.loader("a"))) for _ in range(5)]
+    await asyncio.sleep(0)
+    drive.gate.set()
+    items = await asyncio.gather(*gets)
+
+    assert drive.loads == 1
+    assert all(item is items[0] for item in items)
+    assert await read(cache, items[0]) == b"aaaa"
+    assert items[0].etag == '"a"'
+    assert cache.get_stats().size == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_load_error(cache):
+    drive = FakeDrive({})
+    gate = asyncio.Event()
+
+    async def load():
+        drive.loads += 1
+        await gate.wait()
+        raise ConnectionError("Connection lost")
+
+    gets = [asyncio.create_task(cache.get("a", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*gets, return_exceptions=True)
+    assert drive.loads == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+    # The error is not cached
+    drive.files["a"] = b"aaaa"
+    assert await cache.get("a", drive.loader("a")) is not None
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used(cache):
+    drive = FakeDrive({"a": b"aaaa", "b": b"bbbb", "c": b"cccc"})
+    a = await cache.get("a", drive.loader("a"))
+    b = await cache.get("b", drive.loader("b"))
+    # "a" becomes the most recently used
+    assert await cache.get("a", drive.loader("a")) is a
+    await cache.get("c", drive.loader("c"))
+    await settle()
+
+    stats = cache.get_stats()
+    assert stats.evictions == 1
+    assert stats.size == 8
+    assert drive.loads == 3
+    with pytest.raises(FileNotFoundError):
+        await read(cache, b)
+    assert await cache.get("a", drive.loader("a")) is a
+    assert await cache.get("b", drive.loader("b")) is not b
+    assert drive.loads == 4
+
+
+@pytest.mark.asyncio
+async def test_large_file_is_not_cached(cache):
+    drive = FakeDrive({"large": b"l" * 9})
+    file = await cache.get("large", drive.loader("large"))
+    assert isinstance(file, DriveFile)
+    assert cache.get_stats().size == 0
+    await cache.get("large", drive.loader("large"))
+    assert drive.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_file_is_loaded_again(cache, clock):
+    drive = FakeDrive({"a": b"aaaa"})
+    item = await cache.get("a", drive.loader("a"))
+    clock.now += 59
+    assert await cache.get("a", drive.loader("a")) is item
+    clock.now += 2
+    drive.files["a"] = b"AAAA"
+    item = await cache.get("a", drive.loader("a"))
+    assert drive.loads == 2
+    assert await read(cache, item) == b"AAAA"
+    assert cache.get_stats().size == 4
+
+
+@pytest.mark.asyncio
+async def test_missing_file_is_remembered(cache, clock):
+    drive = FakeDrive({})
+    assert await cache.get("a", drive.loader("a")) is None
+    assert await cache.get("a", drive.loader("a")) is None
+    assert drive.loads == 1
+    assert cache.get_stats().hits == 1
+
+    # The file appears on the drive, it is seen after the TTL
+    drive.files["a"] = b"aaaa"
+    clock.now += 61
+    assert await cache.get("a", drive.loader("a")) is not None
+    assert drive.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_invalidates_file(cache):
+    drive = FakeDrive({"a": b"aaaa"})
+    await cache.get("a", drive.loader("a"))
+    drive.files["a"] = b"AAAA"
+    cache.invalidate("a")
+    item = await cache.get("a", drive.loader("a"))
+    assert drive.loads == 2
+    assert await read(cache, item) == b"AAAA"
+    assert cache.get_stats().invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_during_load_is_not_cached(cache):
+    drive = FakeDrive({"a": b"aaaa"})
+    drive.gate = asyncio.Event()
+    get = asyncio.create_task(cache.get("a", drive.loader("a")))
+    await asyncio.sleep(0)
+    # The file is uploaded again while the old one is loaded
+    cache.invalidate("a")
+    drive.gate.set()
+    assert await get is not None
+    assert cache.get_stats().size == 0
+
+    drive.files["a"] = b"AAAA"
+    item = await cache.get("a", drive.loader("a"))
+    assert drive.loads == 2
+    assert await read(cache, item) == b"AAAA"
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+
+from exceptions.range_not_satisfiable_exception import RangeNotSatisfiableException
+from handlers.http_cache_handler import HTTPCacheHandler
+
+
+def test_make_etag_is_stable():
+    http_cache_handler = HTTPCacheHandler()
+    etag = http_cache_handler.make_etag("post/photo/a.png", "256")
+
+    assert etag == http_cache_handler.make_etag("post/photo/a.png", "256")
+    assert etag != http_cache_handler.make_etag("post/photo/a.png", "None")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_is_not_modified():
+    http_cache_handler = HTTPCacheHandler()
+    etag = http_cache_handler.make_etag("a")
+
+    assert http_cache_handler.is_not_modified(etag, etag)
+    assert http_cache_handler.is_not_modified(etag, f'"other", W/{etag}')
+    assert http_cache_handler.is_not_modified(etag, "*")
+    assert not http_cache_handler.is_not_modified(etag, '"other"')
+    assert not http_cache_handler.is_not_modified(etag, None)
+    assert not http_cache_handler.is_not_modified(None, "*")
+
+
+def test_parse_range():
+    http_cache_handler = HTTPCacheHandler()
+
+    assert http_cache_handler.parse_range("bytes=0-99", 1000) == (0, 99)
+    assert http_cache_handler.parse_range("bytes=900-", 1000) == (900, 999)
+    assert http_cache_handler.parse_range("bytes=900-5000", 1000) == (900, 999)
+    assert http_cache_handler.parse_range("bytes=-100", 1000) == (900, 999)
+    assert http_cache_handler.parse_range("bytes=0-1,5-6", 1000) is None
+    assert http_cache_handler.parse_range("items=0-1", 1000) is None
+    assert http_cache_handler.parse_range("bytes=0-1", None) is None
+    assert http_cache_handler.parse_range(None, 1000) is None
+    with pytest.raises(RangeNotSatisfiableException):
+        http_cache_handler.parse_range("bytes=1000-", 1000)
+
+
+def test_parse_range_with_if_range():
+    http_cache_handler = HTTPCacheHandler()
+
+    assert http_cache_handler.parse_range("bytes=0-9", 100, '"a"', '"a"') == (0, 9)
+    assert http_cache_handler.parse_range("bytes=0-9", 100, '"a"', '"b"') is None
+
+
+def test_slice_chunks():
+    http_cache_handler = HTTPCacheHandler()
+
+    async def chunks():
+        for chunk in (b"0123", b"4567", b"89"):
+            yield chunk
+
+    async def read(start: int, end: int) -> bytes:
+        return b"".join(
+            [
+                chunk
+                async for chunk in http_cache_handler.slice_chunks(
+                    chunks(), start, end
+                )
+            ]
+        )
+
+    assert asyncio.run(read(2, 5)) == b"2345"
+    assert asyncio.run(read(0, 9)) == b"0123456789"
+    assert asyncio.run(read(8, 9)) == b"89"
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from db.cache.ttl_cache import TTLCache
+from db.database_handler import DatabaseHandler
+from db.handlers.user_database_handler import UserDatabaseHandler
+from db.identity_map import IdentityMap, identity_map_scope, identity_map_var
+from db.query_planner import QueryPlanner
+from db.transport.sqlite_transport import SqliteTransport
+from middlewares.identity_map_middleware import IdentityMapMiddleware
+
+pytest_plugins = ("pytest_asyncio",)
+
+app = FastAPI()
+app.add_middleware(IdentityMapMiddleware)
+
+
+@app.get("/map")
+async def get_map():
+    identity_map = identity_map_var.get()
+    if identity_map is None:
+        return {"map": None}
+    seen = identity_map.contains("users", "ivanov")
+    identity_map.set("users", "ivanov", "Иван")
+    return {"map": id(identity_map), "seen": seen}
+
+
+def test_set_and_get():
+    identity_map = IdentityMap()
+    assert not identity_map.contains("users", "ivanov")
+    identity_map.set("users", "ivanov", "Иван")
+    identity_map.set("posts", "ivanov", None)
+    assert identity_map.get("users", "ivanov") == "Иван"
+    # A missing document is remembered too
+    assert identity_map.contains("posts", "ivanov")
+    assert identity_map.get("posts", "ivanov") is None
+
+
+def test_discard():
+    identity_map = IdentityMap()
+    identity_map.set("users", "ivanov", "Иван")
+    identity_map.discard("users", "ivanov")
+    identity_map.discard("users", "petrov")
+    assert not identity_map.contains("users", "ivanov")
+
+
+def test_set_ignores_documents_loaded_before_a_change():
+    identity_map = IdentityMap()
+    generation = identity_map.generation
+    identity_map.discard("users", "petrov")
+    identity_map.set("users", "ivanov", "Иван", generation)
+    assert not identity_map.contains("users", "ivanov")
+
+    identity_map.set("users", "ivanov", "Иван", identity_map.generation)
+    assert identity_map.get("users", "ivanov") == "Иван"
+
+
+def test_scope():
+    assert identity_map_var.get() is None
+    with identity_map_scope():
+        assert isinstance(identity_map_var.get(), IdentityMap)
+    assert identity_map_var.get() is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_opens_map_per_request():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        first = (await ac.get("/map")).json()
+        second = (await ac.get("/map")).json()
+    assert first["map"] is not None
+    assert not first["seen"]
+    # The document remembered by the first request is not seen by the second
+    assert not second["seen"]
+    assert identity_map_var.get() is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_passes_other_scopes():
+    scopes = []
+
+    async def inner(scope, receive, send):
+        scopes.append(identity_map_var.get())
+
+    await IdentityMapMiddleware(inner)({"type": "lifespan"}, None, None)
+    assert scopes == [None]
+
+
+def make_user(key: str) -> dict:
+    return {
+        "key": key,
+        "username": key,
+        "firstname": "Иван",
+        "lastname": "Иванов",
+        "email": f"{key}@mail.ru",
+        "password": "hash",
+        "links": [],
+        "skills": [],
+        "role": {"name_ru": "Пользователь", "name_en": "user", "url": None},
+        "followers_count": 0,
+        "subscriptions_count": 0,
+    }
+
+
+def test_read_during_update_is_not_remembered(tmp_path, monkeypatch):
+    simple_data_update = UserDatabaseHandler.simple_data_update
+
+    async def run():
+        transport = SqliteTransport(str(tmp_path / "base.db"))
+        await UserDatabaseHandler(transport, TTLCache("users", 100, 60)).put_many(
+            [make_user("ivanov")]
+        )
+        database_handler = DatabaseHandler(
+            transport, TTLCache("users", 100, 60), QueryPlanner(20)
+        )
+
+        async def update(self, data: dict, key: str) -> None:
+            # A read of the same request runs while the document is written
+            await database_handler.get_user_by_key(key)
+            await simple_data_update(self, data, key)
+
+        monkeypatch.setattr(UserDatabaseHandler, "simple_data_update", update)
+        try:
+            with identity_map_scope():
+                assert (await database_handler.get_user_by_key("ivanov")) is not None
+                await database_handler.update_simple_data_to_user(
+                    {"firstname": "Пётр"}, "ivanov"
+                )
+                user = await database_handler.get_user_by_key("ivanov")
+            assert user.firstname == "Пётр"
+        finally:
+            await transport.close()
+
+    asyncio.run(run())
@@ -0,0 +1,38 @@
+import io
+from PIL import Image
+
+from handlers.image_handler import ImageHandler
+
+
+def make_image(width: int, height: int) -> bytes:
+    img_byte_arr = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(img_byte_arr, format="png")
+    return img_byte_arr.getvalue()
+
+
+def test_make_derivatives_keeps_aspect_ratio():
+    image_handler = ImageHandler([64, 256])
+    derivatives = image_handler.make_derivatives(make_image(1000, 500))
+
+    assert set(derivatives) == {64, 256}
+    img = Image.open(io.BytesIO(derivatives[64]))
+    assert img.format == "WEBP"
+    assert img.size == (64, 32)
+
+
+def test_make_derivatives_does_not_enlarge():
+    image_handler = ImageHandler([64, 256])
+    derivatives = image_handler.make_derivatives(make_image(100, 100))
+
+    assert Image.open(io.BytesIO(derivatives[256])).size == (100, 100)
+
+
+def test_choose_size():
+    image_handler = ImageHandler([1024, 64, 256])
+
+    assert image_handler.choose_size(None) is None
+    assert image_handler.choose_size(50) == 64
+    assert image_handler.choose_size(64) == 64
+    assert image_handler.choose_size(300) == 1024
+    assert image_handler.choose_size(2000) is None
+    assert image_handler.get_derivative_name("abc_photo.png", 64) == "abc_photo_w64.webp"
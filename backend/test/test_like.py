@@ -41,9 +41,41 @@ async def test_add_remove_like_to_post():
 
     assert response.status_code == 200
     result = response.json()
-    assert len(result) == 0
+    assert "message" in result
+    assert result["message"] == "The like has been removed successfully"
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.delete(f"/post/?post_key={post_key}", headers=headers)
+    await delete_auth(SOBOLEV_REGISTRATION_VALID_DATA)
+
+
+@pytest.mark.asyncio
+async def test_add_like_twice_to_post():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.post("/auth/signup", json=SOBOLEV_REGISTRATION_VALID_DATA)
+        headers = await get_header(SOBOLEV_AUTH_VALID_DATA)
+
+        response = await ac.post("/post/create", json=POST_DATA, headers=headers)
+        post_key = response.json()["key"]
+
+        await ac.post(f"/like/?post_key={post_key}", headers=headers)
+        response = await ac.post(f"/like/?post_key={post_key}", headers=headers)
+
+    assert response.status_code == 400
+    result = response.json()
+    assert "detail" in result
+    assert result["detail"] == "Like already put"
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get(f"/like/?post_key={post_key}")
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["count"] == 1
+    assert result["items"][0]["post_key"] == post_key
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.delete(f"/like/?post_key={post_key}", headers=headers)
         response = await ac.delete(f"/post/?post_key={post_key}", headers=headers)
     await delete_auth(SOBOLEV_REGISTRATION_VALID_DATA)
 
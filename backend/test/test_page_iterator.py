@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from db.page_iterator import iterate_pages
+from models.response_items import ResponseItems
+
+
+class ItemModel(BaseModel):
+    key: str
+    text: str = ""
+
+
+class FakeBase:
+    """Base with numbered items that records the pages read"""
+
+    def __init__(self, count: int, text: str = "", fail_after: int = None):
+        self.items = [{"key": f"{i:04d}", "text": text} for i in range(count)]
+        self.reads = []
+        self.fail_after = fail_after
+
+    async def fetch(self, limit: int, last: str = None) -> ResponseItems[dict]:
+        await asyncio.sleep(0)
+        if self.fail_after is not None and len(self.reads) == self.fail_after:
+            raise RuntimeError("Base is not available")
+        start = 0 if last is None else int(last) + 1
+        items = self.items[start : start + limit]
+        self.reads.append(start)
+        more = start + limit < len(self.items)
+        return ResponseItems[dict](
+            items=items, count=len(items), last=items[-1]["key"] if more else None
+        )
+
+
+async def collect(iterator, on_item=None) -> list:
+    keys = []
+    async for item in iterator:
+        keys.append(item.key)
+        if on_item is not None:
+            await on_item()
+    return keys
+
+
+@pytest.mark.parametrize("read_ahead", [0, 1, 3])
+def test_reads_all_pages(read_ahead):
+    base = FakeBase(25)
+    keys = asyncio.run(
+        collect(iterate_pages(base.fetch, ItemModel, read_ahead, page_size=10))
+    )
+    assert keys == [f"{i:04d}" for i in range(25)]
+    assert base.reads == [0, 10, 20]
+
+
+def test_read_ahead_is_bounded():
+    base = FakeBase(100)
+
+    async def run():
+        iterator = iterate_pages(base.fetch, ItemModel, 2, page_size=10)
+        assert (await iterator.__anext__()).key == "0000"
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # The current page and two pages ahead of it
+        assert base.reads == [0, 10, 20]
+        await iterator.aclose()
+
+    asyncio.run(run())
+
+
+def test_byte_budget_limits_read_ahead():
+    base = FakeBase(100, text="x" * 100)
+
+    async def run():
+        iterator = iterate_pages(base.fetch, ItemModel, 5, 500, page_size=10)
+        await iterator.__anext__()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # One page takes more than the budget, so only one is read ahead
+        assert base.reads == [0, 10]
+        await iterator.aclose()
+
+    asyncio.run(run())
+
+
+def test_error_is_raised_after_read_pages():
+    base = FakeBase(30, fail_after=2)
+    keys = []
+
+    async def run():
+        async for item in iterate_pages(base.fetch, ItemModel, page_size=10):
+            keys.append(item.key)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert len(keys) == 20
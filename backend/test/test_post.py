@@ -101,6 +101,30 @@ async def test_get_all_posts():
     await delete_auth(SMIRNOV_REGISTRATION_VALID_DATA)
 
 
+@pytest.mark.asyncio
+async def test_get_all_posts_fields():
+    headers = await get_header(USER_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/post/create", json=POST_DATA, headers=headers)
+        post_key = response.json()["key"]
+        response_summary = await ac.get("/post/all?fields=summary")
+        response_fields = await ac.get("/post/all?fields=name,like_count")
+        response_invalid = await ac.get("/post/all?fields=name,likes")
+        await ac.delete(f"/post/?post_key={post_key}", headers=headers)
+
+    assert response_summary.status_code == 200
+    post = response_summary.json()["items"][0]
+    assert "author" in post
+    assert "url_content" not in post
+
+    assert response_fields.status_code == 200
+    post = response_fields.json()["items"][0]
+    assert set(post) == {"key", "name", "like_count"}
+
+    assert response_invalid.status_code == 400
+    assert response_invalid.json()["detail"] == "Unknown fields: likes"
+
+
 # ----------------------Get posts by skill----------------------
 @pytest.mark.asyncio
 async def test_get_posts_by_no_exist_skill():
@@ -0,0 +1,50 @@
+import pytest
+
+from db.trusted_model import construct_trusted
+from exceptions.invalid_fields_exception import InvalidFieldsException
+from handlers.projection_handler import ProjectionHandler
+from models.post_model import PostInDBModel, PostSummaryModel
+
+post = {
+    "key": "post1",
+    "name": "UML диаграммы",
+    "url_content": "http://test/post/content/uml.html",
+    "date_create": 1690000000000,
+    "like_count": 2,
+    "skill": {"key": "uml", "name": "UML", "scope": "Программирование"},
+    "author": {"key": "ivanov", "username": "ivanov", "firstname": "Иван"},
+}
+
+
+def test_get_model_full_and_summary():
+    projection_handler = ProjectionHandler()
+
+    assert projection_handler.get_model(PostInDBModel, None, PostSummaryModel) is (
+        PostInDBModel
+    )
+    assert projection_handler.get_model(PostInDBModel, "summary", PostSummaryModel) is (
+        PostSummaryModel
+    )
+
+
+def test_get_model_fields():
+    projection_handler = ProjectionHandler()
+    model = projection_handler.get_model(
+        PostInDBModel, "name, like_count,", PostSummaryModel
+    )
+    result = construct_trusted(model, post)
+
+    assert list(model.__fields__) == ["key", "name", "like_count"]
+    assert result.dict() == {"key": "post1", "name": "UML диаграммы", "like_count": 2}
+    assert projection_handler.get_model(
+        PostInDBModel, "like_count,name", PostSummaryModel
+    ) is projection_handler.get_model(
+        PostInDBModel, "like_count,name", PostSummaryModel
+    )
+
+
+def test_get_model_unknown_field():
+    projection_handler = ProjectionHandler()
+
+    with pytest.raises(InvalidFieldsException):
+        projection_handler.get_model(PostInDBModel, "name,likes", PostSummaryModel)
@@ -0,0 +1,168 @@
+import base64
+import json
+
+import pytest
+
+from db.query_planner import QueryPlanner
+from exceptions.invalid_cursor_exception import InvalidCursorException
+from models.event_model import EventInDBModel
+from models.response_items import ResponseItems
+
+pytest_plugins = ("pytest_asyncio",)
+
+AUTHOR = {"username": "ivanov", "firstname": "Иван", "lastname": "Иванов"}
+EVENTS = [
+    EventInDBModel(
+        name=f"event {i}",
+        date=(i * 7) % 10,
+        format_event="online",
+        place={},
+        key=f"key{i:02d}",
+        author={**AUTHOR, "key": f"author{i % 5}"},
+    )
+    for i in range(30)
+]
+
+
+def make_fetch(queries: list):
+    async def fetch(query, limit, last):
+        queries.append(query)
+        items = [
+            event
+            for event in EVENTS
+            if any(
+                event.author.key == clause["author.key"]
+                and event.date >= clause.get("date?gte", event.date)
+                and event.date <= clause.get("date?lte", event.date)
+                and event.date < clause.get("date?lt", event.date + 1)
+                for clause in query
+            )
+        ]
+        start = 0 if last is None else int(last)
+        page = items[start : start + limit]
+        end = start + limit
+        return ResponseItems[EventInDBModel](
+            count=len(page), items=page, last=str(end) if end < len(items) else None
+        )
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_query_planner_merges_groups_by_date():
+    queries = []
+    planner = QueryPlanner(chunk_size=2, page_size=4)
+    clauses = [{"author.key": f"author{i}"} for i in range(5)]
+
+    items, cursor = await planner.fetch_merged(
+        make_fetch(queries), clauses, "date", limit=100
+    )
+
+    assert cursor is None
+    assert [(event.date, event.key) for event in items] == sorted(
+        (event.date, event.key) for event in EVENTS
+    )
+    assert max(len(query) for query in queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_planner_continues_from_cursor():
+    planner = QueryPlanner(chunk_size=2, page_size=4)
+    clauses = [{"author.key": f"author{i}"} for i in range(5)]
+
+    received = []
+    cursor = None
+    while True:
+        items, cursor = await planner.fetch_merged(
+            make_fetch([]), clauses, "date", limit=7, cursor=cursor
+        )
+        received += items
+        if cursor is None:
+            break
+
+    assert [event.key for event in received] == [
+        event.key for event in sorted(EVENTS, key=lambda event: (event.date, event.key))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_planner_accepts_cursor_without_ranges():
+    planner = QueryPlanner(chunk_size=2, page_size=4)
+    clauses = [{"author.key": f"author{i}"} for i in range(5)]
+    ordered = sorted(EVENTS, key=lambda event: (event.date, event.key))
+    position = [ordered[9].date, ordered[9].key]
+    cursor = base64.urlsafe_b64encode(json.dumps(position).encode("utf-8"))
+
+    items, _ = await planner.fetch_merged(
+        make_fetch([]), clauses, "date", limit=5, cursor=cursor.decode("ascii")
+    )
+
+    assert [event.key for event in items] == [event.key for event in ordered[10:15]]
+
+
+@pytest.mark.asyncio
+async def test_query_planner_invalid_cursor():
+    planner = QueryPlanner(chunk_size=2)
+    with pytest.raises(InvalidCursorException):
+        await planner.fetch_merged(
+            make_fetch([]), [{"author.key": "author0"}], "date", 10, "invalid"
+        )
+
+
+@pytest.mark.asyncio
+async def test_query_planner_reads_about_limit_items_per_page():
+    # The keys are random, so the base does not return the events by date
+    many = [
+        EventInDBModel(
+            name=f"event {i}",
+            date=1690000000000 + (i * 7919 % 3000) * 60000,
+            format_event="online",
+            place={},
+            key=f"{i * 104729 % 3000:04d}",
+            author={**AUTHOR, "key": f"author{i % 10}"},
+        )
+        for i in range(3000)
+    ]
+    read = []
+
+    async def fetch(query, limit, last):
+        items = sorted(
+            [
+                event
+                for event in many
+                if any(
+                    event.author.key == clause["author.key"]
+                    and event.date >= clause.get("date?gte", event.date)
+                    and event.date <= clause.get("date?lte", event.date)
+                    and event.date < clause.get("date?lt", event.date + 1)
+                    for clause in query
+                )
+            ],
+            key=lambda event: event.key,
+        )
+        start = 0 if last is None else int(last)
+        page = items[start : start + limit]
+        read.append(len(page))
+        end = start + limit
+        return ResponseItems[EventInDBModel](
+            count=len(page), items=page, last=str(end) if end < len(items) else None
+        )
+
+    planner = QueryPlanner(chunk_size=5)
+    clauses = [{"author.key": f"author{i}"} for i in range(10)]
+    received = []
+    cursor = None
+    while True:
+        read.clear()
+        items, cursor = await planner.fetch_merged(
+            fetch, clauses, "date", limit=20, cursor=cursor
+        )
+        assert max(read) <= 21
+        assert sum(read) < 600
+        received += items
+        if cursor is None:
+            break
+
+    assert [event.key for event in received] == [
+        event.key for event in sorted(many, key=lambda event: (event.date, event.key))
+    ]
@@ -0,0 +1,37 @@
+import pytest
+from httpx import AsyncClient
+
+from main import app
+from test.common import *
+from test.data.post_data import *
+from test.data.user_auth_data import *
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+# ----------------------Search----------------------
+@pytest.mark.asyncio
+async def test_search_created_post():
+    headers = await get_header(USER_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/post/create", json=POST_DATA, headers=headers)
+        post_key = response.json()["key"]
+        response = await ac.get("/search?q=test nam&kind=post")
+        await ac.delete(f"/post/?post_key={post_key}", headers=headers)
+        response_deleted = await ac.get("/search?q=test nam&kind=post")
+
+    assert response.status_code == 200
+    result = response.json()
+    assert post_key in [hit["key"] for hit in result["items"]]
+    assert post_key not in [hit["key"] for hit in response_deleted.json()["items"]]
+
+
+@pytest.mark.asyncio
+async def test_search_unknown_kind():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/search?q=python&kind=comment")
+
+    assert response.status_code == 400
+    result = response.json()
+    assert "detail" in result
+    assert result["detail"] == "Unknown kinds: comment"
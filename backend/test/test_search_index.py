@@ -0,0 +1,84 @@
+import os
+
+from db.search_index import SearchIndex, read_snapshot, write_snapshot
+from models.post_model import PostInDBModel
+from models.short_user_model_response import ShortUserModelResponse
+from models.skill_model import SkillInDBModel
+
+skill = SkillInDBModel(key="uml", name="UML-диаграммы", scope="Программирование")
+author = ShortUserModelResponse(
+    key="ivanov", username="ivanov", firstname="Иван", lastname="Иванов"
+)
+
+
+def make_post(key: str, name: str) -> PostInDBModel:
+    return PostInDBModel(
+        key=key,
+        name=name,
+        url_content=f"http://test/post/content/{key}.html",
+        skill=skill,
+        author=author,
+        date_create=1690000000000,
+    )
+
+
+def make_index() -> SearchIndex:
+    search_index = SearchIndex()
+    search_index.add_post(make_post("post1", "UML диаграммы классов"))
+    search_index.add_post(make_post("post2", "Асинхронный Python"))
+    search_index.add_skill(skill)
+    search_index.add_user(author)
+    return search_index
+
+
+def test_search_exact_prefix_and_typo():
+    search_index = make_index()
+
+    hits = search_index.search("диаграммы классов")
+    assert [hit.key for hit in hits] == ["post1"]
+    assert hits[0].item["author"]["username"] == "ivanov"
+
+    assert [hit.key for hit in search_index.search("асинх")] == ["post2"]
+    assert [hit.key for hit in search_index.search("pythn")] == ["post2"]
+    assert search_index.search("java") == []
+
+
+def test_search_kinds():
+    search_index = make_index()
+
+    assert {hit.kind for hit in search_index.search("иванов")} == {"user"}
+    assert [hit.kind for hit in search_index.search("uml", ["skill"])] == ["skill"]
+
+
+def test_update_and_remove():
+    search_index = make_index()
+    search_index.add_post(make_post("post2", "Асинхронный Rust"))
+
+    assert search_index.search("python") == []
+    assert [hit.key for hit in search_index.search("rust")] == ["post2"]
+
+    search_index.remove("post", "post2")
+    assert search_index.search("rust") == []
+    assert search_index.size == 3
+
+
+def test_rebuild_keeps_changes():
+    search_index = make_index()
+    fresh = make_index()
+    search_index.begin_rebuild()
+    search_index.add_post(make_post("post3", "Docker"))
+    search_index.remove("post", "post1")
+    search_index.finish_rebuild(fresh)
+
+    assert [hit.key for hit in search_index.search("docker")] == ["post3"]
+    assert search_index.search("классов") == []
+
+
+def test_snapshot(tmp_path):
+    path = os.path.join(tmp_path, "search.json.gz")
+    write_snapshot(path, make_index().get_documents())
+    search_index = SearchIndex()
+    search_index.set_documents(read_snapshot(path))
+
+    assert [hit.key for hit in search_index.search("классов")] == ["post1"]
+    assert read_snapshot(os.path.join(tmp_path, "missing.json.gz")) is None
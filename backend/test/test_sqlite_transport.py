@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from db.transport.sqlite_transport import SqliteTransport
+from exceptions.item_exists_exception import ItemExistsException
+from exceptions.item_not_found_exception import ItemNotFoundException
+
+
+def run_with_base(path, func):
+    async def run():
+        transport = SqliteTransport(str(path))
+        try:
+            return await func(transport.open_base("posts"))
+        finally:
+            await transport.close()
+
+    return asyncio.run(run())
+
+
+def make_post(key: str, author: str, date: int, skill: str) -> dict:
+    return {
+        "key": key,
+        "name": f"Post {key}",
+        "author": {"key": author},
+        "skill": {"name": skill},
+        "date_create": date,
+        "tags": ["python", skill],
+    }
+
+
+POSTS = [
+    make_post("post1", "ivanov", 100, "uml"),
+    make_post("post2", "petrov", 200, "python"),
+    make_post("post3", "ivanov", 300, "python"),
+    make_post("post4", "sidorov", 400, "sql"),
+]
+
+
+def test_put_get_insert(tmp_path):
+    async def func(base):
+        item = await base.put({"name": "first"})
+        assert await base.get(item["key"]) == item
+        await base.insert({"name": "second"}, "second")
+        with pytest.raises(ItemExistsException):
+            await base.insert({"name": "again"}, "second")
+        await base.delete("second")
+        assert await base.get("second") is None
+        assert (await base.put("text", "value"))["value"] == "text"
+
+    run_with_base(tmp_path / "base.db", func)
+
+
+def test_update_operations(tmp_path):
+    async def func(base):
+        await base.put({"count": 1, "links": ["a"], "author": {"name": "x"}}, "k")
+        await base.update(
+            {
+                "count": base.util.increment(2),
+                "links": base.util.append("b"),
+                "author.name": "y",
+                "author.age": base.util.trim(),
+                "tags": base.util.prepend(["first"]),
+            },
+            "k",
+        )
+        item = await base.get("k")
+        assert item["count"] == 3
+        assert item["links"] == ["a", "b"]
+        assert item["author"] == {"name": "y"}
+        assert item["tags"] == ["first"]
+        with pytest.raises(ItemNotFoundException):
+            await base.update({"count": 1}, "missing")
+
+    run_with_base(tmp_path / "base.db", func)
+
+
+def test_fetch_queries(tmp_path):
+    async def func(base):
+        await base.put_many(POSTS)
+
+        async def keys(query, **kwargs):
+            return [item["key"] for item in (await base.fetch(query, **kwargs)).items]
+
+        assert await keys({"author.key": "ivanov"}) == ["post1", "post3"]
+        assert await keys({"date_create?r": [150, 350]}) == ["post2", "post3"]
+        assert await keys([{"author.key": "sidorov"}, {"skill.name": "uml"}]) == [
+            "post1",
+            "post4",
+        ]
+        assert await keys({"skill.name": "python", "date_create?gt": 250}) == ["post3"]
+        assert await keys({"key?pfx": "post"}) == ["post1", "post2", "post3", "post4"]
+        assert await keys({"tags?contains": "sql"}) == ["post4"]
+        assert await keys({"name?contains": "post2"}) == ["post2"]
+        assert await keys({"author.key?ne": "ivanov"}) == ["post2", "post4"]
+
+        first = await base.fetch({}, limit=3)
+        assert first.count == 3 and first.last == "post3"
+        second = await base.fetch({}, limit=3, last=first.last)
+        assert [item["key"] for item in second.items] == ["post4"]
+        assert second.last is None
+
+    run_with_base(tmp_path / "base.db", func)
+
+
+def test_expire(tmp_path):
+    async def func(base):
+        item = await base.put({"name": "soon"}, "soon", expire_in=-1)
+        assert item["__expires"] <= time.time()
+        await base.put({"name": "later"}, "later", expire_at=time.time() + 60)
+        assert await base.get("soon") is None
+        assert [item["key"] for item in (await base.fetch()).items] == ["later"]
+        await base.insert({"name": "again"}, "soon")
+
+    run_with_base(tmp_path / "base.db", func)
+
+
+def test_close_stops_thread(tmp_path):
+    def sqlite_threads() -> int:
+        return len([t for t in threading.enumerate() if t.name.startswith("sqlite")])
+
+    async def func(base):
+        await base.put(make_post("post1", "ivanov", 100, "uml"))
+
+    before = sqlite_threads()
+    run_with_base(tmp_path / "base.db", func)
+    assert sqlite_threads() == before
@@ -0,0 +1,74 @@
+import pytest
+from httpx import AsyncClient
+
+from main import app
+from test.common import *
+from test.data.user_auth_data import *
+
+pytest_plugins = ("pytest_asyncio",)
+
+# ----------------------Transport stats----------------------
+@pytest.mark.asyncio
+async def test_get_transport_stats_user():
+    headers = await get_header(USER_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/stats/transport", headers=headers)
+    assert response.status_code == 403
+    result = response.json()
+    assert "detail" in result
+    assert (
+        result["detail"] == "The user's role is not in the list of roles allowed method"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_transport_stats_admin():
+    headers = await get_header(ADMIN_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/stats/transport", headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert "hits" in result
+    assert "misses" in result
+    assert "wait_time_total_ms" in result
+    assert result["requests"] > 0
+
+
+# ----------------------User cache stats----------------------
+@pytest.mark.asyncio
+async def test_get_user_cache_stats_admin():
+    headers = await get_header(ADMIN_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/user/my", headers=headers)
+        await ac.get("/user/my", headers=headers)
+        response = await ac.get("/stats/user_cache", headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert "hit_rate" in result
+    assert result["hits"] > 0
+
+
+# ----------------------CPU executor stats----------------------
+@pytest.mark.asyncio
+async def test_get_executor_stats_admin():
+    headers = await get_header(ADMIN_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/stats/executor", headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert "queue_depth" in result
+    assert "run_time_total_ms" in result
+    assert result["tasks"] > 0
+
+
+# ----------------------Media cache stats----------------------
+@pytest.mark.asyncio
+async def test_get_media_cache_stats_admin():
+    headers = await get_header(ADMIN_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/skill/icon/python.png")
+        response = await ac.get("/stats/media_cache", headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert "hit_rate" in result
+    assert result["hits"] + result["misses"] > 0
@@ -27,13 +27,14 @@ async def test_subscribe_annul_exist_username():
     assert result["favorite"] is not None
     assert result["favorite"]["email"] == IVANOV_REGISTRATION_VALID_DATA["email"]
     assert result["follower"]["email"] == USER_TEST_AUTH["email"]
-    result = list(
-        filter(
-            lambda item: result["follower"]["username"] == item["username"],
-            result["favorite"]["followers"],
-        )
-    )
-    assert len(result) > 0
+    assert result["favorite"]["followers_count"] == 1
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get(f"/subscription/followers?username={username}")
+    assert response.status_code == 200
+    result = response.json()
+    assert result["count"] == 1
+    assert result["items"][0]["follower"]["username"] == USER_TEST_USERNAME
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
         response = await ac.delete(
@@ -47,13 +48,13 @@ async def test_subscribe_annul_exist_username():
     assert result["favorite"] is not None
     assert result["favorite"]["email"] == IVANOV_REGISTRATION_VALID_DATA["email"]
     assert result["follower"]["email"] == USER_TEST_AUTH["email"]
-    result = list(
-        filter(
-            lambda item: result["follower"]["username"] == item["username"],
-            result["favorite"]["followers"],
-        )
-    )
-    assert len(result) == 0
+    assert result["favorite"]["followers_count"] == 0
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get(f"/subscription/followers?username={username}")
+    assert response.status_code == 200
+    result = response.json()
+    assert result["count"] == 0
 
     await delete_auth(IVANOV_REGISTRATION_VALID_DATA)
 
@@ -216,7 +217,7 @@ async def test_get_my_all_subscribes_user():
 
     assert response.status_code == 200
     result = response.json()
-    assert len(result) == 0
+    assert result["count"] == 0
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
         await ac.post("/auth/signup", json=IVANOV_REGISTRATION_VALID_DATA)
@@ -227,8 +228,8 @@ async def test_get_my_all_subscribes_user():
         response = await ac.get("/subscription/my", headers=headers)
     assert response.status_code == 200
     result = response.json()
-    assert len(result) == 1
-    favorite = result[0]["favorite"]
+    assert result["count"] == 1
+    favorite = result["items"][0]["favorite"]
     assert favorite["username"] == username
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -236,3 +237,46 @@ async def test_get_my_all_subscribes_user():
             f"/subscription/annul?username_favorite={username}", headers=headers
         )
     await delete_auth(IVANOV_REGISTRATION_VALID_DATA)
+
+
+# ----------------------Followers and following----------------------
+@pytest.mark.asyncio
+async def test_get_following_no_exist_username():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        username = IVANOV_REGISTRATION_VALID_DATA["username"]
+        response = await ac.get(f"/subscription/following?username={username}")
+
+    assert response.status_code == 404
+    result = response.json()
+    assert "detail" in result
+    assert result["detail"] == "User not found"
+
+
+@pytest.mark.asyncio
+async def test_get_following_exist_username():
+    headers = await get_header(USER_TEST_AUTH)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.post("/auth/signup", json=IVANOV_REGISTRATION_VALID_DATA)
+        username = IVANOV_REGISTRATION_VALID_DATA["username"]
+        await ac.post(
+            f"/subscription/arrange?username_favorite={username}", headers=headers
+        )
+        response = await ac.get(
+            f"/subscription/following?username={USER_TEST_USERNAME}"
+        )
+
+    assert response.status_code == 200
+    result = response.json()
+    result = list(
+        filter(
+            lambda item: username == item["favorite"]["username"],
+            result["items"],
+        )
+    )
+    assert len(result) == 1
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.delete(
+            f"/subscription/annul?username_favorite={username}", headers=headers
+        )
+    await delete_auth(IVANOV_REGISTRATION_VALID_DATA)
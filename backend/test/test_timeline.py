@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+
+from controllers.timeline_controller import TimelineController
+from db.cache.ttl_cache import TTLCache
+from db.database_handler import DatabaseHandler
+from db.handlers import timeline_database_handler
+from db.handlers.timeline_database_handler import TimelineDatabaseHandler
+from db.query_planner import QueryPlanner
+from db.transport.sqlite_transport import SqliteBase, SqliteTransport
+from handlers.datetime_handler import DatetimeHandler
+from models.event_model import EventInDBModel
+
+FOLLOWERS = 150
+DAY = 24 * 60 * 60 * 1000
+
+
+def make_author(key: str) -> dict:
+    return {"key": key, "username": key, "firstname": "Иван", "lastname": "Иванов"}
+
+
+def make_event(key: str, date: int) -> EventInDBModel:
+    return EventInDBModel(
+        name=f"Event {key}",
+        date=date,
+        format_event="online",
+        place={},
+        key=key,
+        author=make_author("ivanov"),
+    )
+
+
+def make_subscription(follower_key: str) -> dict:
+    return {
+        "key": f"{follower_key}:ivanov",
+        "favorite": make_author("ivanov"),
+        "follower": make_author(follower_key),
+        "number_visits": 1,
+        "date_create": 1690000000000,
+    }
+
+
+@pytest.fixture(autouse=True)
+def fanout(monkeypatch):
+    monkeypatch.setenv("EVENT_FEED", "fanout")
+
+
+@pytest.fixture
+def in_flight(monkeypatch):
+    """Counting the writes sent at once, only the timelines are written"""
+    counter = {"current": 0, "max": 0}
+
+    def track(method):
+        async def wrapper(self, *args, **kwargs):
+            counter["current"] += 1
+            counter["max"] = max(counter["max"], counter["current"])
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                counter["current"] -= 1
+
+        return wrapper
+
+    monkeypatch.setattr(SqliteBase, "put_many", track(SqliteBase.put_many))
+    monkeypatch.setattr(SqliteBase, "delete", track(SqliteBase.delete))
+    return counter
+
+
+def run_with_timeline(path, func):
+    async def run():
+        transport = SqliteTransport(str(path))
+        subscriptions = [make_subscription(f"user{i:03d}") for i in range(FOLLOWERS)]
+        for i in range(0, len(subscriptions), 25):
+            await transport.open_base("subscriptions").put_many(
+                subscriptions[i : i + 25]
+            )
+        database_handler = DatabaseHandler(
+            transport, TTLCache("users", 100, 60), QueryPlanner(20)
+        )
+        try:
+            return await func(
+                transport, database_handler, TimelineController(database_handler)
+            )
+        finally:
+            await transport.close()
+
+    return asyncio.run(run())
+
+
+async def get_entries(transport: SqliteTransport) -> list:
+    return (await transport.open_base("timelines").fetch()).items
+
+
+def test_add_and_remove_event(tmp_path, in_flight):
+    async def func(transport, database_handler, controller):
+        event = make_event("event", DatetimeHandler().now() + DAY)
+        await controller.add_event(event)
+        entries = await get_entries(transport)
+        assert sorted(entry["follower_key"] for entry in entries) == [
+            f"user{i:03d}" for i in range(FOLLOWERS)
+        ]
+        assert in_flight["max"] <= timeline_database_handler.MAX_CONCURRENT_BATCHES
+
+        await controller.remove_event(event)
+        assert await get_entries(transport) == []
+        assert in_flight["max"] <= (
+            timeline_database_handler.MAX_CONCURRENT_BATCHES
+            * timeline_database_handler.MAX_PUT_MANY
+        )
+
+    run_with_timeline(tmp_path / "base.db", func)
+
+
+def test_update_event(tmp_path):
+    async def func(transport, database_handler, controller):
+        now = DatetimeHandler().now()
+        event = make_event("event", now + DAY)
+        await controller.add_event(event)
+        await controller.update_event(event, make_event("event", now + 2 * DAY))
+
+        entries = await get_entries(transport)
+        assert len(entries) == FOLLOWERS
+        assert {entry["date"] for entry in entries} == {now + 2 * DAY}
+
+    run_with_timeline(tmp_path / "base.db", func)
+
+
+def test_subscription_backfills_upcoming_events(tmp_path):
+    async def func(transport, database_handler, controller):
+        now = DatetimeHandler().now()
+        events = transport.open_base("events")
+        await events.put(make_event("past", now - DAY).dict(), "past")
+        await events.put(make_event("first", now + DAY).dict(), "first")
+        await events.put(make_event("second", now + 2 * DAY).dict(), "second")
+
+        await controller.add_subscription("petrov", "ivanov")
+        timeline = await controller.get_timeline("petrov", 10)
+        assert [event.key for event in timeline.items] == ["first", "second"]
+
+        await controller.remove_subscription("petrov", "ivanov")
+        assert (await controller.get_timeline("petrov", 10)).items == []
+
+    run_with_timeline(tmp_path / "base.db", func)
+
+
+def test_remove_event_does_not_search_timelines(tmp_path, monkeypatch):
+    async def func(transport, database_handler, controller):
+        event = make_event("event", DatetimeHandler().now() + DAY)
+        await controller.add_event(event)
+        other = make_event("other", DatetimeHandler().now() + DAY)
+        await controller.add_event(other)
+
+        def iterate(self, *args, **kwargs):
+            raise AssertionError("The timelines are searched")
+
+        monkeypatch.setattr(TimelineDatabaseHandler, "iterate", iterate)
+        await controller.remove_event(event)
+
+        entries = await get_entries(transport)
+        assert {entry["event_key"] for entry in entries} == {"other"}
+        assert len(entries) == FOLLOWERS
+
+    run_with_timeline(tmp_path / "base.db", func)
+
+
+def test_put_entries_again_if_failed(tmp_path, monkeypatch):
+    put_many = SqliteBase.put_many
+    failures = {"left": 2}
+
+    async def fail_first(self, items, **kwargs):
+        if failures["left"] > 0:
+            failures["left"] -= 1
+            # The first item of the batch is not put
+            await put_many(self, items[1:], **kwargs)
+            return {
+                "processed": {"items": items[1:]},
+                "failed": {"items": items[:1]},
+            }
+        return await put_many(self, items, **kwargs)
+
+    async def func(transport, database_handler, controller):
+        monkeypatch.setattr(SqliteBase, "put_many", fail_first)
+        await controller.add_event(make_event("event", DatetimeHandler().now() + DAY))
+        assert len(await get_entries(transport)) == FOLLOWERS
+
+    run_with_timeline(tmp_path / "base.db", func)
@@ -0,0 +1,46 @@
+import pytest
+from pydantic import ValidationError
+
+from db.trusted_model import construct_trusted, construct_trusted_or_none
+from models.post_model import PostInDBModel
+from models.response_items import ResponseItems
+from models.user_model import UserModelResponse
+
+user = {
+    "key": "ivanov",
+    "username": "ivanov",
+    "firstname": "Иван",
+    "lastname": "Иванов",
+    "email": "ivanov@mail.ru",
+    "password": "secret",
+    "links": [{"name": "VK", "url": "https://example"}],
+    "skills": [{"key": "python", "name": "Python", "scope": "Программирование"}],
+    "role": {"name_ru": "Пользователь", "name_en": "User", "url": None},
+}
+
+
+def test_construct_trusted_as_validated():
+    users = construct_trusted(
+        ResponseItems[UserModelResponse], {"count": 1, "last": None, "items": [user]}
+    )
+    validated = ResponseItems[UserModelResponse](count=1, last=None, items=[user])
+
+    assert users == validated
+    assert users.items[0].skills[0].url is None
+    assert users.items[0].followers_count == 0
+    assert "password" not in users.items[0].dict()
+
+
+def test_construct_trusted_copies_lists():
+    result = construct_trusted(UserModelResponse, user)
+    result.links.append(result.links[0])
+
+    assert len(user["links"]) == 1
+
+
+def test_construct_trusted_missing_field():
+    post = {"name": "UML", "url_content": "http://test/post/content/uml.html"}
+
+    with pytest.raises(ValidationError):
+        construct_trusted(PostInDBModel, post)
+    assert construct_trusted_or_none(PostInDBModel, None) is None
@@ -130,7 +130,8 @@ async def test_delete_user_by_super_admin():
     assert response.status_code == 200
     result = response.json()
     assert "message" in result
-    assert result["message"] == "Deletion successful"
+    assert result["message"] == "Deletion started"
+    assert "job_id" in result
 
 
 @pytest.mark.asyncio
@@ -151,7 +152,8 @@ async def test_delete_user_by_user():
     assert response.status_code == 200
     result = response.json()
     assert "message" in result
-    assert result["message"] == "Deletion successful"
+    assert result["message"] == "Deletion started"
+    assert "job_id" in result
 
 
 @pytest.mark.asyncio
@@ -162,7 +164,8 @@ async def test_delete_user_by_no_exist_key():
     assert response.status_code == 200
     result = response.json()
     assert "message" in result
-    assert result["message"] == "Deletion successful"
+    assert result["message"] == "Deletion started"
+    assert "job_id" in result
 
 
 @pytest.mark.asyncio
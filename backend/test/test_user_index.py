@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from db.cache.ttl_cache import TTLCache
+from db.handlers.user_database_handler import UserDatabaseHandler
+from db.transport.sqlite_transport import SqliteBase, SqliteTransport
+from exceptions.user_exists_exception import UserExistsException
+from handlers.datetime_handler import DatetimeHandler
+from models.user_model import UserInDBModel
+
+
+def make_user(email: str, username: str) -> UserInDBModel:
+    return UserInDBModel(
+        email=email,
+        username=username,
+        password="hash",
+        firstname="Иван",
+        lastname="Иванов",
+        links=[],
+        skills=[],
+    )
+
+
+def run_with_handler(path, func):
+    async def run():
+        transport = SqliteTransport(str(path))
+        try:
+            return await func(
+                UserDatabaseHandler(transport, TTLCache("users", 100, 60))
+            )
+        finally:
+            await transport.close()
+
+    return asyncio.run(run())
+
+
+def test_create_and_get_by_unique(tmp_path):
+    async def func(handler: UserDatabaseHandler):
+        user = await handler.create(make_user("Ivanov@mail.ru", "ivanov"))
+        found = await handler.get_by_unique("email", " ivanov@MAIL.ru")
+        assert found.key == user.key
+        assert (await handler.get_by_unique("username", "Ivanov")).key == user.key
+        assert await handler.get_by_unique("email", "petrov@mail.ru") is None
+
+    run_with_handler(tmp_path / "users.db", func)
+
+
+def test_create_rejects_taken_values(tmp_path):
+    async def func(handler: UserDatabaseHandler):
+        await handler.create(make_user("ivanov@mail.ru", "ivanov"))
+        with pytest.raises(UserExistsException, match="Account already exists"):
+            await handler.create(make_user("IVANOV@mail.ru", "other"))
+        with pytest.raises(UserExistsException, match="Username is already used"):
+            await handler.create(make_user("other@mail.ru", "IVANOV"))
+        # The email reserved by the failed signup is released
+        other = await handler.create(make_user("other@mail.ru", "other"))
+        assert (await handler.get_by_unique("email", "other@mail.ru")).key == other.key
+
+    run_with_handler(tmp_path / "users.db", func)
+
+
+def test_concurrent_signups(tmp_path):
+    async def func(handler: UserDatabaseHandler):
+        results = await asyncio.gather(
+            *[handler.create(make_user("same@mail.ru", f"user{i}")) for i in range(5)],
+            return_exceptions=True,
+        )
+        created = [result for result in results if isinstance(result, UserInDBModel)]
+        assert len(created) == 1
+
+    run_with_handler(tmp_path / "users.db", func)
+
+
+def test_delete_releases_values(tmp_path):
+    async def func(handler: UserDatabaseHandler):
+        user = await handler.create(make_user("ivanov@mail.ru", "ivanov"))
+        await handler.delete_by_key(user.key)
+        assert await handler.get_by_unique("email", "ivanov@mail.ru") is None
+        assert await handler.create(make_user("ivanov@mail.ru", "ivanov")) is not None
+
+    run_with_handler(tmp_path / "users.db", func)
+
+
+def test_create_replaces_stale_entries(tmp_path):
+    async def run():
+        transport = SqliteTransport(str(tmp_path / "users.db"))
+        handler = UserDatabaseHandler(transport, TTLCache("users", 100, 60))
+        emails = transport.open_base("users_by_email")
+        # Left by a release that failed long ago, the user is gone
+        await emails.put({"user_key": "gone", "date_create": 0}, "ivanov@mail.ru")
+        # Left by a user who has another email now
+        await handler.create(make_user("petrov@mail.ru", "petrov"))
+        petrov = await handler.get_by_unique("username", "petrov")
+        await emails.put({"user_key": petrov.key, "date_create": 0}, "old@mail.ru")
+
+        user = await handler.create(make_user("ivanov@mail.ru", "ivanov"))
+        assert (await handler.get_by_unique("email", "ivanov@mail.ru")).key == user.key
+        other = await handler.create(make_user("old@mail.ru", "other"))
+        assert (await handler.get_by_unique("email", "old@mail.ru")).key == other.key
+        await transport.close()
+
+    asyncio.run(run())
+
+
+def test_create_keeps_entries_of_signups_in_progress(tmp_path):
+    async def run():
+        transport = SqliteTransport(str(tmp_path / "users.db"))
+        handler = UserDatabaseHandler(transport, TTLCache("users", 100, 60))
+        # Reserved by a signup that has not written its user yet
+        await transport.open_base("users_by_email").put(
+            {"user_key": "pending", "date_create": DatetimeHandler().now()},
+            "ivanov@mail.ru",
+        )
+
+        with pytest.raises(UserExistsException, match="Account already exists"):
+            await handler.create(make_user("ivanov@mail.ru", "ivanov"))
+        await transport.close()
+
+    asyncio.run(run())
+
+
+def test_create_raises_transport_errors(tmp_path, monkeypatch):
+    async def run():
+        transport = SqliteTransport(str(tmp_path / "users.db"))
+        handler = UserDatabaseHandler(transport, TTLCache("users", 100, 60))
+
+        async def put(*args, **kwargs):
+            raise ConnectionError("Connection lost")
+
+        # The index entries are inserted, only the user is put
+        monkeypatch.setattr(SqliteBase, "put", put)
+        with pytest.raises(ConnectionError):
+            await handler.create(make_user("ivanov@mail.ru", "ivanov"))
+        # The reserved values are released
+        assert await transport.open_base("users_by_email").get("ivanov@mail.ru") is None
+        assert await transport.open_base("users_by_username").get("ivanov") is None
+        await transport.close()
+
+    asyncio.run(run())
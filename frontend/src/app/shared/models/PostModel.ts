@@ -1,5 +1,3 @@
-import { CommentModel } from './CommentModel';
-import { LikeModel } from './LikeModel';
 import { ShortUserResponseModel } from './ShortUserResponseModel';
 import { SkillModel } from './SkillModel';
 
@@ -10,8 +8,8 @@ export class PostModel {
     public skill: SkillModel,
     public date_create: number,
     public author: ShortUserResponseModel,
-    public likes: LikeModel[],
-    public comments: CommentModel[],
+    public like_count: number,
+    public comment_count: number,
     public key: string
   ) {}
 }
@@ -1,6 +1,5 @@
 import { LinkModel } from "./LinkModel";
 import { RoleModel } from "./RoleModel";
-import { ShortUserResponseModel } from "./ShortUserResponseModel";
 import { SkillModel } from "./SkillModel";
 import { SubscribeModel } from "./SubscribeModel";
 
@@ -14,7 +13,8 @@ export class UserModel {
     public place_residence: string,
     public email: string,
     public birth_date: number,
-    public folovers: ShortUserResponseModel[],
+    public followers_count: number,
+    public subscriptions_count: number,
     public links: LinkModel[],
     public role: RoleModel,
     public skills: SkillModel,
@@ -32,6 +32,15 @@ export class ProfileService {
     this.userService.GetFullInformationAuthUser().subscribe((result) => {
       this.User = result;
       this.userInfoUpdated.emit();
+      this.userService.GetMySubscriptions().subscribe({
+        next: (subs) => {
+          if (this.User) {
+            this.User.subscriptions = subs.items;
+            this.userInfoUpdated.emit();
+          }
+        },
+        error: () => {},
+      });
     });
     this.eventService.GetEventsFavorites().subscribe((result) => {
       this.Events = result ? result.items : [];
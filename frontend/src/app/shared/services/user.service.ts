@@ -3,6 +3,8 @@ import { Injectable } from '@angular/core';
 import { Observable, throwError } from 'rxjs';
 import { catchError } from 'rxjs/operators';
 import { LinkModel } from '../models/LinkModel';
+import { ResponseItemsModel } from '../models/ResponseItemsModel';
+import { SubscribeModel } from '../models/SubscribeModel';
 import { UserAdditionalDataModel } from '../models/UserAdditionalDataModel';
 import { UserModel } from '../models/UserModel';
 import { AuthService } from './auth.service';
@@ -65,6 +67,13 @@ export class UserService {
         );
     });
   }
+  GetMySubscriptions(): Observable<ResponseItemsModel<SubscribeModel>> {
+    let token = this.authService.GetAccessToken();
+    return this.http.get<ResponseItemsModel<SubscribeModel>>(
+      `${url}/subscription/my`,
+      { headers: { Authorization: `Bearer ${token}` } }
+    );
+  }
   GetUserByUsername(username: string) {
     console.log(username);
     return this.http.get(`${url}/user/profile/${username}`);